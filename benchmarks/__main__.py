@@ -0,0 +1,35 @@
+from argparse import ArgumentParser
+
+from pypenguin.opcode_info.data import info_api
+
+from benchmarks.generator import GeneratorConfig
+from benchmarks.runner    import (
+    BENCHMARK_NAMES, run_benchmarks, save_results, load_results, compare_results, format_results,
+)
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="python -m benchmarks", description="Benchmark pypenguin on a synthetic project")
+    defaults = GeneratorConfig()
+    for field_name in defaults.__dataclass_fields__:
+        parser.add_argument(f"--{field_name.replace('_', '-')}", type=int, default=getattr(defaults, field_name))
+    parser.add_argument("--repeat", type=int, default=5, help="how many times to run each benchmark")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARK_NAMES, help="run only these benchmarks")
+    parser.add_argument("--memory", action="store_true", help="also measure the memory usage with and without interning")
+    parser.add_argument("--output", help="write the results into this JSON file")
+    parser.add_argument("--compare", help="compare the results against this JSON file")
+    args = parser.parse_args()
+
+    config = GeneratorConfig(**{
+        field_name: getattr(args, field_name) for field_name in defaults.__dataclass_fields__
+    })
+    results = run_benchmarks(config, info_api=info_api, repeat=args.repeat, names=args.only, memory=args.memory)
+    print(format_results(results))
+    if args.output is not None:
+        save_results(results, args.output)
+    if args.compare is not None:
+        print()
+        print(compare_results(load_results(args.compare), results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+from json    import dumps
+from random  import Random
+from struct  import pack
+from wave    import open as open_wave
+from zipfile import ZipFile, ZIP_DEFLATED
+from zlib    import compress, crc32
+from io      import BytesIO
+from typing  import Any
+
+from pypenguin.important_consts import (
+    OPCODE_CB_DEF, OPCODE_CB_PROTOTYPE, OPCODE_CB_ARG_TEXT, OPCODE_CB_CALL,
+    SHA256_SEC_VARIABLE, SHA256_SEC_LIST, SHA256_SEC_BROADCAST_MSG, SHA256_SEC_LOCAL_ARGUMENT_NAME,
+    SHA256_SEC_DROPDOWN_VALUE, SHA256_SEC_TARGET_NAME,
+)
+from pypenguin.opcode_info.api import OpcodeInfoAPI
+from pypenguin.utility         import grepr_dataclass, string_to_sha256, number_to_token, generate_md5
+
+from pypenguin.core.meta    import PENGUINMOD_META_DATA
+from pypenguin.core.project import FRProject, SRProject
+
+
+CB_COLOR = '["#FF6680","#FF4D6A","#FF3355"]'
+
+
+@grepr_dataclass(grepr_fields=[
+    "sprites", "scripts_per_sprite", "script_depth", "blocks_per_level", "custom_blocks_per_sprite",
+    "variables_per_target", "lists_per_target", "broadcasts", "costumes_per_sprite", "sounds_per_sprite", "seed",
+])
+class GeneratorConfig:
+    """
+    The knobs of the synthetic project generator. The same config always generates the same project
+    """
+
+    sprites: int = 4
+    scripts_per_sprite: int = 8
+    script_depth: int = 3 # nesting levels of "repeat" blocks within a script
+    blocks_per_level: int = 4 # statement blocks per script level
+    custom_blocks_per_sprite: int = 2
+    variables_per_target: int = 4
+    lists_per_target: int = 2
+    broadcasts: int = 4
+    costumes_per_sprite: int = 2 # alternating svg and png
+    sounds_per_sprite: int = 1
+    seed: int = 0
+
+
+def _svg_bytes(rng: Random) -> bytes:
+    """
+    *[Helper Function]* Create a small, valid svg file
+    """
+    width, height = rng.randint(2, 200), rng.randint(2, 200)
+    color = "#%06x" % rng.randrange(0x1000000)
+    return (
+        f'<svg version="1.1" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'xmlns="http://www.w3.org/2000/svg"><rect width="{width}" height="{height}" fill="{color}"/></svg>'
+    ).encode("utf-8")
+
+def _png_bytes(rng: Random) -> bytes:
+    """
+    *[Helper Function]* Create a small, valid RGB png file without any imaging library
+    """
+    width, height = rng.randint(1, 32), rng.randint(1, 32)
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return pack(">I", len(data)) + kind + data + pack(">I", crc32(kind + data) & 0xFFFFFFFF)
+    pixel = bytes(rng.randrange(256) for _ in range(3))
+    raw_rows = b"".join(b"\x00" + pixel * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", compress(raw_rows))
+        + chunk(b"IEND", b"")
+    )
+
+def _wav_bytes(rng: Random, rate: int, sample_count: int) -> bytes:
+    """
+    *[Helper Function]* Create a small, valid mono 16-bit wav file
+    """
+    bytes_io = BytesIO()
+    with open_wave(bytes_io, "wb") as wave_file:
+        wave_file.setnchannels(1)
+        wave_file.setsampwidth(2)
+        wave_file.setframerate(rate)
+        wave_file.writeframes(b"".join(pack("<h", rng.randint(-3000, 3000)) for _ in range(sample_count)))
+    return bytes_io.getvalue()
+
+
+class _TargetBuilder:
+    """
+    *[Internal Class]* Builds the raw block data of one target
+    """
+
+    def __init__(self, rng: Random, config: GeneratorConfig,
+        variables: list[tuple[str, str]], lists: list[tuple[str, str]], broadcasts: list[tuple[str, str]],
+        sprite_names: list[str], target_name: str | None,
+    ) -> None:
+        self.rng          = rng
+        self.config       = config
+        self.variables    = variables
+        self.lists        = lists
+        self.broadcasts   = broadcasts
+        self.clone_options = ([] if target_name is None else ["_myself_"]) + [
+            sprite_name for sprite_name in sprite_names if sprite_name != target_name
+        ]
+        self.blocks: dict[str, dict[str, Any]] = {}
+        self.custom_blocks: list[tuple[str, list[str]]] = [] # (proccode, argument ids)
+        self._next_id_num = 1
+
+    def new_id(self) -> str:
+        block_id = number_to_token(self._next_id_num)
+        self._next_id_num += 1
+        return block_id
+
+    def add_block(self, block_id: str, opcode: str, parent: str | None,
+        inputs: dict | None = None, fields: dict | None = None, shadow: bool = False,
+        position: tuple[int, int] | None = None, mutation: dict | None = None,
+    ) -> None:
+        block = {
+            "opcode": opcode, "next": None, "parent": parent,
+            "inputs": inputs or {}, "fields": fields or {},
+            "shadow": shadow, "topLevel": position is not None,
+        }
+        if position is not None:
+            block["x"], block["y"] = position
+        if mutation is not None:
+            block["mutation"] = mutation
+        self.blocks[block_id] = block
+
+    def add_reporter(self, parent: str) -> str:
+        """
+        Add an "operator_add" reporter, which sometimes reads a variable
+        """
+        block_id = self.new_id()
+        if self.variables and self.rng.random() < 0.5:
+            name, variable_id = self.rng.choice(self.variables)
+            first_input = [3, [12, name, variable_id], [4, "1"]]
+        else:
+            first_input = [1, [4, str(self.rng.randint(0, 100))]]
+        self.add_block(block_id, "operator_add", parent=parent, inputs={
+            "NUM1": first_input, "NUM2": [1, [4, str(self.rng.randint(0, 100))]],
+        })
+        return block_id
+
+    def add_statement(self, parent: str, depth: int) -> str:
+        """
+        Add a statement block and its children. Returns its id
+        """
+        block_id = self.new_id()
+        choices = ["move", "say"] + (["clone"] if self.clone_options else [])
+        if self.variables    : choices.append("set variable")
+        if self.lists        : choices.append("add to list")
+        if self.broadcasts   : choices.append("broadcast")
+        if self.custom_blocks: choices.append("call")
+        if depth > 1         : choices += ["repeat"] * 2
+        choice = self.rng.choice(choices)
+
+        match choice:
+            case "move":
+                self.add_block(block_id, "motion_movesteps", parent, inputs={
+                    "STEPS": [3, self.add_reporter(block_id), [4, "10"]],
+                })
+            case "say":
+                self.add_block(block_id, "looks_say", parent, inputs={
+                    "MESSAGE": [1, [10, f"hello {self.rng.randint(0, 1000)}"]],
+                })
+            case "clone":
+                menu_id = self.new_id()
+                self.add_block(block_id, "control_create_clone_of", parent, inputs={"CLONE_OPTION": [1, menu_id]})
+                clone_option = self.rng.choice(self.clone_options)
+                self.add_block(menu_id, "control_create_clone_of_menu", block_id, shadow=True, fields={
+                    "CLONE_OPTION": [clone_option, string_to_sha256(clone_option, secondary=SHA256_SEC_DROPDOWN_VALUE)],
+                })
+            case "set variable":
+                name, variable_id = self.rng.choice(self.variables)
+                self.add_block(block_id, "data_setvariableto", parent,
+                    inputs={"VALUE": [1, [10, str(self.rng.randint(0, 100))]]},
+                    fields={"VARIABLE": [name, variable_id, ""]},
+                )
+            case "add to list":
+                name, list_id = self.rng.choice(self.lists)
+                self.add_block(block_id, "data_addtolist", parent,
+                    inputs={"ITEM": [1, [10, "thing"]]},
+                    fields={"LIST": [name, list_id, "list"]},
+                )
+            case "broadcast":
+                name, broadcast_id = self.rng.choice(self.broadcasts)
+                self.add_block(block_id, "event_broadcast", parent, inputs={
+                    "BROADCAST_INPUT": [1, [11, name, broadcast_id]],
+                })
+            case "call":
+                proccode, argument_ids = self.rng.choice(self.custom_blocks)
+                self.add_block(block_id, OPCODE_CB_CALL, parent,
+                    inputs={argument_id: [1, [10, "x"]] for argument_id in argument_ids},
+                    mutation={
+                        "tagName": "mutation", "children": [], "proccode": proccode,
+                        "argumentids": dumps(argument_ids), "warp": "false",
+                        "returns": "false", "edited": "true", "optype": '"statement"', "color": CB_COLOR,
+                    },
+                )
+            case "repeat":
+                self.add_block(block_id, "control_repeat", parent, inputs={
+                    "TIMES": [1, [6, str(self.rng.randint(1, 10))]],
+                })
+                substack_id = self.add_stack(parent=block_id, depth=depth-1)
+                self.blocks[block_id]["inputs"]["SUBSTACK"] = [2, substack_id]
+        return block_id
+
+    def add_stack(self, parent: str, depth: int) -> str:
+        """
+        Add a stack of statement blocks, whose first block is a child of parent. Returns the id of the first block
+        """
+        block_ids = [self.add_statement(parent, depth=depth)]
+        for _ in range(self.config.blocks_per_level - 1):
+            block_ids.append(self.add_statement(parent=block_ids[-1], depth=depth))
+        for block_id, next_id in zip(block_ids, block_ids[1:]):
+            self.blocks[block_id]["next"] = next_id
+        return block_ids[0]
+
+    def add_script(self, index: int, is_stage: bool) -> None:
+        """
+        Add a script with a hat block
+        """
+        hat_id = self.new_id()
+        position = (index * 400, self.rng.randint(0, 2000))
+        choices = ["flag"] + (["broadcast"] if self.broadcasts else []) + ([] if is_stage else ["clone"])
+        match self.rng.choice(choices):
+            case "flag":
+                self.add_block(hat_id, "event_whenflagclicked", None, position=position)
+            case "broadcast":
+                name, broadcast_id = self.rng.choice(self.broadcasts)
+                self.add_block(hat_id, "event_whenbroadcastreceived", None, position=position, fields={
+                    "BROADCAST_OPTION": [name, broadcast_id],
+                })
+            case "clone":
+                self.add_block(hat_id, "control_start_as_clone", None, position=position)
+        self.blocks[hat_id]["next"] = self.add_stack(parent=hat_id, depth=self.config.script_depth)
+
+    def add_custom_block(self, index: int) -> None:
+        """
+        Add a custom block definition with one text argument and a body
+        """
+        definition_id, prototype_id, argument_block_id = self.new_id(), self.new_id(), self.new_id()
+        argument_name = f"arg{index}"
+        argument_id   = string_to_sha256(f"argument {index}", secondary=SHA256_SEC_LOCAL_ARGUMENT_NAME)
+        proccode      = f"custom block {index} %s"
+        self.add_block(definition_id, OPCODE_CB_DEF, None, position=(-400, index * 400), inputs={
+            "custom_block": [1, prototype_id],
+        })
+        self.add_block(prototype_id, OPCODE_CB_PROTOTYPE, definition_id, shadow=True,
+            inputs={argument_id: [1, argument_block_id]},
+            mutation={
+                "tagName": "mutation", "children": [], "proccode": proccode,
+                "argumentids": dumps([argument_id]), "argumentnames": dumps([argument_name]),
+                "argumentdefaults": dumps([""]), "warp": "false", "returns": "false", "edited": "true",
+                "optype": '"statement"', "color": CB_COLOR,
+            },
+        )
+        self.add_block(argument_block_id, OPCODE_CB_ARG_TEXT, prototype_id, shadow=True,
+            fields={"VALUE": [argument_name, string_to_sha256(argument_name, secondary=SHA256_SEC_LOCAL_ARGUMENT_NAME)]},
+            mutation={"tagName": "mutation", "children": [], "color": CB_COLOR},
+        )
+        # the body must not call custom blocks, which prevents recursion
+        custom_blocks, self.custom_blocks = self.custom_blocks, []
+        self.blocks[definition_id]["next"] = self.add_stack(parent=definition_id, depth=1)
+        self.custom_blocks = custom_blocks + [(proccode, [argument_id])]
+
+
+def generate_project_data(config: GeneratorConfig) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """
+    Generate the raw data(project.json content) and asset files of a synthetic project
+
+    Args:
+        config: the generator knobs
+
+    Returns:
+        the raw project data and the asset files
+    """
+    rng = Random(config.seed)
+    asset_files: dict[str, bytes] = {}
+    sprite_names = [f"Sprite{i+1}" for i in range(config.sprites)]
+
+    def make_costume(index: int, is_stage: bool) -> dict[str, Any]:
+        is_vector = is_stage or (index % 2 == 0)
+        file_bytes = _svg_bytes(rng) if is_vector else _png_bytes(rng)
+        data_format = "svg" if is_vector else "png"
+        md5 = generate_md5(file_bytes)
+        asset_files[f"{md5}.{data_format}"] = file_bytes
+        costume = {
+            "name": f"{'backdrop' if is_stage else 'costume'}{index+1}", "dataFormat": data_format,
+            "assetId": md5, "md5ext": f"{md5}.{data_format}", "rotationCenterX": 0, "rotationCenterY": 0,
+        }
+        if not is_stage:
+            costume["bitmapResolution"] = 1
+        return costume
+
+    def make_sound(index: int) -> dict[str, Any]:
+        rate, sample_count = 8000, rng.randint(10, 400)
+        file_bytes = _wav_bytes(rng, rate=rate, sample_count=sample_count)
+        md5 = generate_md5(file_bytes)
+        asset_files[f"{md5}.wav"] = file_bytes
+        return {
+            "name": f"sound{index+1}", "assetId": md5, "dataFormat": "wav",
+            "rate": rate, "sampleCount": sample_count, "md5ext": f"{md5}.wav",
+        }
+
+    def make_vars_lists(prefix: str) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        variables = [(f"{prefix}var{i}", string_to_sha256(f"{prefix}var{i}", secondary=SHA256_SEC_VARIABLE)) for i in range(config.variables_per_target)]
+        lists = [(f"{prefix}list{i}", string_to_sha256(f"{prefix}list{i}", secondary=SHA256_SEC_LIST)) for i in range(config.lists_per_target)]
+        return variables, lists
+
+    broadcasts = [
+        (f"message{i}", string_to_sha256(f"message{i}", secondary=SHA256_SEC_BROADCAST_MSG))
+        for i in range(config.broadcasts)
+    ]
+    global_variables, global_lists = make_vars_lists("global ")
+    targets = []
+    for target_index in range(config.sprites + 1):
+        is_stage = (target_index == 0)
+        name = "Stage" if is_stage else sprite_names[target_index-1]
+        local_variables, local_lists = ([], []) if is_stage else make_vars_lists(f"{name} ")
+        builder = _TargetBuilder(rng, config,
+            variables    = global_variables + local_variables,
+            lists        = global_lists + local_lists,
+            broadcasts   = broadcasts,
+            sprite_names = sprite_names,
+            target_name  = None if is_stage else name,
+        )
+        if not is_stage:
+            for i in range(config.custom_blocks_per_sprite):
+                builder.add_custom_block(i)
+        for i in range(config.scripts_per_sprite):
+            builder.add_script(i, is_stage=is_stage)
+
+        target = {
+            "isStage": is_stage,
+            "name": name,
+            "variables": {variable_id: [name, 0] for name, variable_id in (global_variables if is_stage else local_variables)},
+            "lists": {list_id: [name, []] for name, list_id in (global_lists if is_stage else local_lists)},
+            "broadcasts": {broadcast_id: name for name, broadcast_id in broadcasts} if is_stage else {},
+            "customVars": [],
+            "blocks": builder.blocks,
+            "comments": {},
+            "currentCostume": 0,
+            "costumes": [make_costume(i, is_stage) for i in range(1 if is_stage else max(config.costumes_per_sprite, 1))],
+            "sounds": [] if is_stage else [make_sound(i) for i in range(config.sounds_per_sprite)],
+            "id": string_to_sha256("_stage_" if is_stage else name, secondary=SHA256_SEC_TARGET_NAME),
+            "volume": 100,
+            "layerOrder": target_index,
+        }
+        if is_stage:
+            target |= {"tempo": 60, "videoTransparency": 50, "videoState": "on", "textToSpeechLanguage": None}
+        else:
+            target |= {
+                "visible": True, "x": rng.randint(-240, 240), "y": rng.randint(-180, 180), "size": 100,
+                "direction": 90, "draggable": False, "rotationStyle": "all around",
+            }
+        targets.append(target)
+
+    project_data = {
+        "targets": targets,
+        "monitors": [],
+        "extensionData": {},
+        "extensions": [],
+        "meta": PENGUINMOD_META_DATA,
+    }
+    return project_data, asset_files
+
+def write_project_file(config: GeneratorConfig, file_path: str) -> None:
+    """
+    Generate a synthetic project and write it into a .pmp file
+
+    Args:
+        config: the generator knobs
+        file_path: the absolute path of the .pmp file to create
+
+    Returns:
+        None
+    """
+    project_data, asset_files = generate_project_data(config)
+    with ZipFile(file_path, "w", compression=ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("project.json", dumps(project_data))
+        for file_name, file_bytes in asset_files.items():
+            zip_file.writestr(file_name, file_bytes)
+
+def generate_project(config: GeneratorConfig, info_api: OpcodeInfoAPI) -> SRProject:
+    """
+    Generate a synthetic SRProject.
+    It is generated in first representation and converted, because that is the most reliable way to get a valid SRProject
+
+    Args:
+        config: the generator knobs
+        info_api: the opcode info api used to fetch information about opcodes
+
+    Returns:
+        the SRProject
+    """
+    project_data, asset_files = generate_project_data(config)
+    return FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api).to_second(info_api)
+
+
+__all__ = ["GeneratorConfig", "generate_project_data", "write_project_file", "generate_project"]
+
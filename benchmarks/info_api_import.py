@@ -0,0 +1,4 @@
+# Imported as a top level module (without the benchmarks package) by the "import" benchmark (see runner.py)
+# in a fresh interpreter with `-X importtime`. info_api is loaded lazily on first access,
+# so the cumulative import time of this module includes importing pypenguin and loading the opcode info api
+from pypenguin.opcode_info.data import info_api
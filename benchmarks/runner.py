@@ -0,0 +1,299 @@
+from copy      import deepcopy
+from gc        import collect
+from json      import dump, load
+from os        import path as os_path
+from pickle    import dumps, loads, HIGHEST_PROTOCOL
+from platform  import python_version
+from tempfile  import TemporaryDirectory
+from time      import perf_counter
+from tracemalloc import start as start_tracing, stop as stop_tracing, get_traced_memory, is_tracing
+from typing    import Any, Callable
+
+from pypenguin.opcode_info.api import OpcodeInfoAPI
+from pypenguin.utility         import ValidationConfig
+
+from pypenguin.core.block           import FRBlock
+from pypenguin.core.block_interface import SecondToInterIF
+from pypenguin.core.diff            import diff_projects
+from pypenguin.core.project         import FRProject, SRProject
+from pypenguin.core.scan            import ProjectScan
+
+from benchmarks.generator import GeneratorConfig, generate_project_data, write_project_file
+
+from tests.utility import import_times
+
+
+RESULTS_FORMAT_VERSION = 1
+BENCHMARK_NAMES = ["import", "import_built", "from_file", "from_data", "block_from_data", "scan", "to_second", "validate", "save", "eq", "repr", "pickle", "from_bytes", "diff"]
+
+
+def _time_runs(func: Callable[[Any], Any], setup: Callable[[], Any], repeat: int) -> list[float]:
+    """
+    *[Helper Function]* Time a function several times. The setup is not timed
+
+    Args:
+        func: the function to time, receives the return value of setup
+        setup: creates a fresh input for each run
+        repeat: how many times to run
+
+    Returns:
+        the duration of each run in seconds
+    """
+    durations = []
+    for _ in range(repeat):
+        argument = setup()
+        start = perf_counter()
+        func(argument)
+        durations.append(perf_counter() - start)
+    return durations
+
+def _time_imports(code: str, module: str, repeat: int) -> list[float]:
+    """
+    *[Helper Function]* Run code in a fresh interpreter with `-X importtime` several times
+
+    Args:
+        code: the python code to run
+        module: the module, whose cumulative import time is measured
+        repeat: how many times to run
+
+    Returns:
+        the cumulative import time of the module in each run in seconds
+    """
+    return [import_times(code)[module] / 1e6 for _ in range(repeat)]
+
+def _save_project(project: SRProject, info_api: OpcodeInfoAPI) -> None:
+    """
+    *[Helper Function]* Run the part of saving, which pypenguin currently supports:
+    converting every script into intermediate representation and encoding every asset
+
+    Args:
+        project: the SRProject
+        info_api: the opcode info api used to fetch information about opcodes
+
+    Returns:
+        None
+    """
+    for target in [project.stage] + project.sprites:
+        sti_if = SecondToInterIF(scripts=target.scripts)
+        for script in target.scripts:
+            script.to_inter(sti_if, info_api)
+        for asset in target.costumes + target.sounds:
+            asset.to_first()
+
+def measure_memory(fr_project: FRProject, info_api: OpcodeInfoAPI) -> dict[str, int]:
+    """
+    Measure how much memory the SRProject converted from a FRProject uses, with and without interning
+
+    Args:
+        fr_project: the FRProject
+        info_api: the opcode info api used to fetch information about opcodes
+
+    Returns:
+        the allocated bytes of the plain and of the interned SRProject and the peak during each conversion
+    """
+    assert not is_tracing(), "memory can not be measured while tracemalloc is already tracing"
+    memory = {}
+    for name, intern in (("plain", False), ("interned", True)):
+        collect()
+        start_tracing()
+        try:
+            sr_project = fr_project.to_second(info_api, intern=intern)
+            collect() # also clears the free lists, which would count as allocated
+            memory[f"{name}_bytes"], memory[f"{name}_peak_bytes"] = get_traced_memory()
+        finally:
+            stop_tracing()
+        del sr_project
+    return memory
+
+def run_benchmarks(
+    config: GeneratorConfig,
+    info_api: OpcodeInfoAPI,
+    repeat: int = 5,
+    names: list[str] | None = None,
+    memory: bool = False,
+) -> dict[str, Any]:
+    """
+    Generate a synthetic project and benchmark the main operations on it
+
+    Args:
+        config: the generator knobs
+        info_api: the opcode info api used to fetch information about opcodes
+        repeat: how many times to run each benchmark
+        names: the benchmarks to run, defaults to all of BENCHMARK_NAMES
+        memory: whether to also measure the memory usage of the SRProject (see measure_memory)
+
+    Returns:
+        the JSON compatible results. Contains the best, mean and all durations of each benchmark in seconds
+    """
+    names = BENCHMARK_NAMES if names is None else names
+    project_data, asset_files = generate_project_data(config)
+    fr_project = FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api)
+    sr_project = fr_project.to_second(info_api)
+    sr_project_copy = deepcopy(sr_project)
+    validation_config = ValidationConfig()
+
+    benchmarks: dict[str, Callable[[], list[float]]] = {}
+    with TemporaryDirectory() as directory:
+        file_path = os_path.join(directory, "benchmark.pmp")
+        write_project_file(config, file_path)
+        benchmarks["import"] = lambda: _time_imports( # imports pypenguin.opcode_info.data and loads the snapshot
+            "import sys\nsys.path.insert(0, 'benchmarks')\nimport info_api_import", "info_api_import", repeat=repeat,
+        )
+        benchmarks["import_built"] = lambda: _time_imports( # builds the opcode info api (data.main)
+            "import pypenguin.opcode_info.data.main", "pypenguin.opcode_info.data.main", repeat=repeat,
+        )
+        benchmarks["from_file"] = lambda: _time_runs(
+            lambda _: FRProject.from_file(file_path, info_api), setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["from_data"] = lambda: _time_runs( # parsing only, without reading the zip file
+            lambda _: FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api),
+            setup=lambda: None, repeat=repeat,
+        )
+        block_datas = [
+            block_data for target_data in project_data["targets"] for block_data in target_data["blocks"].values()
+            if isinstance(block_data, dict) # not the variable and list reporters stored as lists
+        ]
+        benchmarks["block_from_data"] = lambda: _time_runs( # FRBlock.from_data for every block, without the rest of a target
+            lambda _: [FRBlock.from_data(block_data, info_api=info_api, memo={}) for block_data in block_datas],
+            setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["scan"] = lambda: _time_runs(
+            lambda _: ProjectScan.from_file(file_path), setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["to_second"] = lambda: _time_runs(
+            lambda project: project.to_second(info_api),
+            setup=lambda: FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api), repeat=repeat,
+        )
+        benchmarks["validate"] = lambda: _time_runs(
+            lambda _: sr_project.validate(validation_config, info_api), setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["save"] = lambda: _time_runs(
+            lambda project: _save_project(project, info_api), setup=lambda: deepcopy(sr_project), repeat=repeat,
+        )
+        benchmarks["eq"] = lambda: _time_runs(
+            lambda _: sr_project == sr_project_copy, setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["repr"] = lambda: _time_runs(
+            lambda _: repr(sr_project), setup=lambda: None, repeat=repeat,
+        )
+        benchmarks["pickle"] = lambda: _time_runs( # round trip, like sending a project to a worker process
+            lambda _: loads(dumps(sr_project, protocol=HIGHEST_PROTOCOL)), setup=lambda: None, repeat=repeat,
+        )
+        def time_from_bytes() -> list[float]: # compare with from_file + to_second
+            sr_project_bytes = sr_project.to_bytes(info_api) # only encoded if requested
+            return _time_runs(lambda _: SRProject.from_bytes(sr_project_bytes, info_api), setup=lambda: None, repeat=repeat)
+        benchmarks["from_bytes"] = time_from_bytes
+        benchmarks["diff"] = lambda: _time_runs(
+            lambda _: diff_projects(sr_project, sr_project_copy), setup=lambda: None, repeat=repeat,
+        )
+
+        results = {}
+        for name in names:
+            durations = benchmarks[name]()
+            results[name] = {
+                "best" : min(durations),
+                "mean" : sum(durations) / len(durations),
+                "runs" : durations,
+            }
+
+    results = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "python_version": python_version(),
+        "config": {field_name: getattr(config, field_name) for field_name in config.__dataclass_fields__},
+        "size": {
+            "targets": 1 + len(sr_project.sprites),
+            "blocks": sum(len(target_data["blocks"]) for target_data in project_data["targets"]),
+            "asset_bytes": sum(len(file_bytes) for file_bytes in asset_files.values()),
+        },
+        "results": results,
+    }
+    if "pickle" in names:
+        results["size"]["pickle_bytes"] = len(dumps(sr_project, protocol=HIGHEST_PROTOCOL))
+    if memory:
+        results["memory"] = measure_memory(fr_project, info_api)
+    return results
+
+def save_results(results: dict[str, Any], file_path: str) -> None:
+    """
+    Write benchmark results into a JSON file
+
+    Args:
+        results: the results of run_benchmarks
+        file_path: the file path
+
+    Returns:
+        None
+    """
+    with open(file_path, "w") as file:
+        dump(results, file, indent=4)
+
+def load_results(file_path: str) -> dict[str, Any]:
+    """
+    Read benchmark results from a JSON file
+
+    Args:
+        file_path: the file path
+
+    Returns:
+        the results
+    """
+    with open(file_path, "r") as file:
+        return load(file)
+
+def compare_results(old: dict[str, Any], new: dict[str, Any], threshold: float = 0.05) -> str:
+    """
+    Compare two benchmark results by their best durations
+
+    Args:
+        old: the baseline results
+        new: the new results
+        threshold: relative change, below which a benchmark counts as unchanged
+
+    Returns:
+        a text report with one line per benchmark
+    """
+    lines = []
+    if old.get("config") != new.get("config"):
+        lines.append("warning: the results were created with different generator configs")
+    for name in new["results"].keys():
+        new_best = new["results"][name]["best"]
+        if name not in old["results"]:
+            lines.append(f"{name:<10} {'-':>10} -> {new_best*1e3:9.2f}ms  (new)")
+            continue
+        old_best = old["results"][name]["best"]
+        ratio = (new_best / old_best) if old_best > 0 else float("inf")
+        if   ratio < 1 - threshold: verdict = "faster"
+        elif ratio > 1 + threshold: verdict = "slower"
+        else                      : verdict = "unchanged"
+        lines.append(f"{name:<10} {old_best*1e3:8.2f}ms -> {new_best*1e3:9.2f}ms  x{ratio:.2f} ({verdict})")
+    return "\n".join(lines)
+
+def format_results(results: dict[str, Any]) -> str:
+    """
+    Format benchmark results as a text report
+
+    Args:
+        results: the results of run_benchmarks
+
+    Returns:
+        the text report
+    """
+    size = results["size"]
+    lines = [f"{size['targets']} targets, {size['blocks']} blocks, {size['asset_bytes']} asset bytes"]
+    if "pickle_bytes" in size: # missing in results of older versions and without the pickle benchmark
+        lines[0] += f", {size['pickle_bytes']} pickled bytes"
+    for name, result in results["results"].items():
+        lines.append(f"{name:<10} best {result['best']*1e3:9.2f}ms  mean {result['mean']*1e3:9.2f}ms")
+    if "memory" in results:
+        memory = results["memory"]
+        lines.append(
+            f"memory     plain {memory['plain_bytes']} bytes, interned {memory['interned_bytes']} bytes "
+            f"(x{memory['interned_bytes'] / memory['plain_bytes']:.2f})"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BENCHMARK_NAMES", "measure_memory", "run_benchmarks", "save_results", "load_results", "compare_results", "format_results",
+]
+
@@ -3,13 +3,27 @@ from pypenguin.core.block_mutation  import *
 from pypenguin.core.block_interface import *
 from pypenguin.core.comment         import *
 from pypenguin.core.block           import *
+from pypenguin.core.block_store     import *
 from pypenguin.core.custom_block    import *
 from pypenguin.core.context         import *
 from pypenguin.core.enums           import *
 from pypenguin.core.dropdown        import *
 from pypenguin.core.monitor         import *
 from pypenguin.core.extension       import *
+from pypenguin.core.index           import *
 from pypenguin.core.target          import *
+from pypenguin.core.traversal       import *
+from pypenguin.core.binary          import *
 from pypenguin.core.project         import *
+from pypenguin.core.diff            import *
+from pypenguin.core.merge           import *
+from pypenguin.core.usage           import *
+from pypenguin.core.dead_code       import *
+from pypenguin.core.call_graph      import *
+from pypenguin.core.metrics         import *
+from pypenguin.core.scan            import *
+from pypenguin.core.manifest        import *
+from pypenguin.core.asset_optimization import *
+from pypenguin.core.cache           import *
 from pypenguin.core.vars_lists      import *
 from pypenguin.core.vars_lists      import *
@@ -1,19 +1,29 @@
-from abc    import ABC, abstractmethod
-from io     import BytesIO
-from lxml   import etree
-from PIL    import Image, UnidentifiedImageError
-from pydub  import AudioSegment
-from typing import Any
+from abc         import ABC, abstractmethod
+from copy        import deepcopy
+from dataclasses import field
+from io          import BytesIO
+from logging     import getLogger
+from typing      import Any, TYPE_CHECKING
+
+# lxml, PIL and pydub are only imported once asset contents are actually decoded or encoded
+if TYPE_CHECKING:
+    from lxml  import etree
+    from PIL   import Image
+    from pydub import AudioSegment
 
 from pypenguin.utility import (
-    grepr_dataclass, xml_equal, image_equal, generate_md5, ValidationConfig,
+    grepr_dataclass, xml_equal, image_equal, xml_fingerprint, image_fingerprint, audio_fingerprint, generate_md5, 
+    ValidationConfig,
     AA_TYPE, AA_COORD_PAIR, AA_EQUAL,
     ThanksError,
 )
 
 
+logger = getLogger(__name__)
+
 EMPTY_SVG_COSTUME_XML = '<svg version="1.1" width="2" height="2" viewBox="-1 -1 2 2" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">\n  <!-- Exported by Scratch - http://scratch.mit.edu/ -->\n</svg>'
 EMPTY_SVG_COSTUME_ROTATION_CENTER = (240, 180)
+_PNG_COMPATIBLE_MODES = {"1", "L", "LA", "I;16", "P", "RGB", "RGBA"} # not "I": png only stores 16 of its 32 bits
 
 
 @grepr_dataclass(grepr_fields=["name", "asset_id", "data_format", "md5ext", "rotation_center_x", "rotation_center_y", "bitmap_resolution"])
@@ -61,8 +71,10 @@ class FRCostume:
         """
         rotation_center = (self.rotation_center_x, self.rotation_center_y)
         content_bytes = asset_files[self.md5ext]
+        logger.debug("Decoding costume %r (%s, %d bytes)", self.name, self.data_format, len(content_bytes))
         
         if self.data_format == "svg":
+            from lxml import etree
             return SRVectorCostume(
                 name              = self.name,
                 file_extension    = self.data_format,
@@ -70,9 +82,11 @@ class FRCostume:
                 content           = etree.fromstring(content_bytes),
             )
         else: # "png", "jpg", "jpeg", "bmp"
+            from PIL import Image, UnidentifiedImageError
             try:
                 image = Image.open(BytesIO(content_bytes))
             except UnidentifiedImageError:
+                logger.debug("Could not identify the image of costume %r", self.name)
                 raise ThanksError()
             image.load()  # Ensure it's fully loaded into memory
             if   self.bitmap_resolution == 1:
@@ -128,7 +142,9 @@ class FRSound:
         Returns:
             the SRSound
         """
+        from pydub import AudioSegment
         content_bytes = asset_files[self.md5ext]
+        logger.debug("Decoding sound %r (%s, %d bytes)", self.name, self.data_format, len(content_bytes))
         audio_segment = AudioSegment.from_file(BytesIO(content_bytes), format=self.data_format)
         
         return SRSound(
@@ -167,6 +183,34 @@ class SRCostume(ABC):
         AA_TYPE(self, path, "file_extension", str)
         AA_COORD_PAIR(self, path, "rotation_center")
 
+    def content_fingerprint(self) -> bytes:
+        """
+        Get the fingerprint of the content. It is cached until another content is assigned.
+        **Call invalidate_content_fingerprint after modifying the content in place**
+
+        Returns:
+            the fingerprint
+        """
+        return _cached_content_fingerprint(self)
+
+    def invalidate_content_fingerprint(self) -> None:
+        """
+        Discard the cached fingerprint of the content
+
+        Returns:
+            None
+        """
+        self.__dict__.pop("_content_fingerprint_cache", None)
+
+    @abstractmethod
+    def _calculate_content_fingerprint(self) -> bytes:
+        """
+        *[Internal Method]* Calculate the fingerprint of the content without caching it
+
+        Returns:
+            the fingerprint
+        """
+
     @abstractmethod
     def to_first(self) -> tuple["FRCostume", bytes]: 
         """
@@ -182,10 +226,11 @@ class SRVectorCostume(SRCostume):
     The second representation for a vector(SVG) costume. It is more user friendly then the first representation
     """
     
-    content: etree._Element
+    content: "etree._Element"
         
     @classmethod
     def create_empty(cls, name: str = "empty") -> "SRCostume":
+        from lxml import etree
         return cls(
             name            = name,
             file_extension  = "svg",
@@ -193,6 +238,35 @@ class SRVectorCostume(SRCostume):
             content         = etree.fromstring(EMPTY_SVG_COSTUME_XML),
         )
 
+    def __reduce__(self) -> tuple:
+        """
+        Pickle a SRVectorCostume with its content as svg bytes, because lxml elements can not be pickled
+
+        Returns:
+            the reduce tuple
+        """
+        from lxml import etree
+        return (_vector_costume_from_svg_bytes, (
+            self.name, self.file_extension, self.rotation_center, etree.tostring(self.content),
+        ))
+
+    def __deepcopy__(self, memo: dict) -> "SRVectorCostume":
+        """
+        Copy a SRVectorCostume without serializing its content (see __reduce__)
+
+        Args:
+            memo: the memo of deepcopy
+
+        Returns:
+            the copy
+        """
+        return SRVectorCostume(
+            name            = self.name,
+            file_extension  = self.file_extension,
+            rotation_center = self.rotation_center,
+            content         = deepcopy(self.content, memo),
+        )
+
     def __eq__(self, other) -> bool:
         """
         Checks whether a SRVectorCostume is equal to another.
@@ -207,7 +281,25 @@ class SRVectorCostume(SRCostume):
         if not super().__eq__(other):
             return False
         other: SRVectorCostume = other
-        return xml_equal(self.content, other.content)
+        return (self.content is other.content) or xml_equal(self.content, other.content)
+
+    def _fingerprint_parts(self) -> tuple:
+        """
+        *[Internal Method]* Get the values, which make up the fingerprint (see fingerprint)
+
+        Returns:
+            the values
+        """
+        return (self.name, self.file_extension, self.rotation_center, self.content_fingerprint())
+
+    def _calculate_content_fingerprint(self) -> bytes:
+        """
+        *[Internal Method]* Calculate the fingerprint of the content without caching it
+
+        Returns:
+            the fingerprint
+        """
+        return xml_fingerprint(self.content)
         
     def validate(self, path: list, config: ValidationConfig) -> None:
         """
@@ -223,6 +315,7 @@ class SRVectorCostume(SRCostume):
         Raises:
             ValidationError: if the SRVectorCostume is invalid
         """
+        from lxml import etree
         super().validate(path, config)
         
         AA_EQUAL(self, path, "file_extension", "svg")
@@ -235,8 +328,10 @@ class SRVectorCostume(SRCostume):
         Returns:
             the FRCostume
         """
+        from lxml import etree
         file_bytes: bytes = etree.tostring(self.content, method="c14n")
         md5 = generate_md5(file_bytes) 
+        logger.debug("Encoded costume %r (%s, %d bytes)", self.name, self.file_extension, len(file_bytes))
         # I am using the md5 hash here(guessed by "md5ext"). 
         # I do not know which hashing method Scratch uses. 
         # Scratch md5ext and mine do NOT match. I have uploaded generated project multiple times
@@ -258,9 +353,46 @@ class SRBitmapCostume(SRCostume):
     """
     
     # file_extension: i've only seen "png", "jpg"; others might work
-    content: Image.Image
+    content: "Image.Image"
     has_double_resolution: bool
+    encoder_options: dict[str, Any] = field(default_factory=dict, compare=False) # passed to Image.save by to_first e.g. {"optimize": True}
     
+    def __reduce__(self) -> tuple:
+        """
+        Pickle a SRBitmapCostume with its content as (quickly compressed) png bytes instead of raw pixel data.
+        Images with modes png does not support are pickled as PIL pickles them (raw pixel data)
+
+        Returns:
+            the reduce tuple
+        """
+        content = self.content
+        if content.mode in _PNG_COMPATIBLE_MODES:
+            bytes_io = BytesIO()
+            content.save(bytes_io, format="png", compress_level=1)
+            content = bytes_io.getvalue()
+        return (_bitmap_costume_from_content, (
+            self.name, self.file_extension, self.rotation_center, self.has_double_resolution, content, self.encoder_options,
+        ))
+
+    def __deepcopy__(self, memo: dict) -> "SRBitmapCostume":
+        """
+        Copy a SRBitmapCostume without encoding its content (see __reduce__)
+
+        Args:
+            memo: the memo of deepcopy
+
+        Returns:
+            the copy
+        """
+        return SRBitmapCostume(
+            name                  = self.name,
+            file_extension        = self.file_extension,
+            rotation_center       = self.rotation_center,
+            has_double_resolution = self.has_double_resolution,
+            content               = self.content.copy(),
+            encoder_options       = deepcopy(self.encoder_options, memo),
+        )
+
     def __eq__(self, other) -> bool:
         """
         Checks whether a SRBitmapCostume is equal to another.
@@ -277,8 +409,29 @@ class SRBitmapCostume(SRCostume):
         other: SRBitmapCostume = other
         return (
             (self.has_double_resolution == other.has_double_resolution)
-            and image_equal(self.content, other.content)
+            and ((self.content is other.content) or image_equal(self.content, other.content))
         )
+
+    def _fingerprint_parts(self) -> tuple:
+        """
+        *[Internal Method]* Get the values, which make up the fingerprint (see fingerprint)
+
+        Returns:
+            the values
+        """
+        return (
+            self.name, self.file_extension, self.rotation_center, 
+            self.has_double_resolution, self.content_fingerprint(),
+        )
+
+    def _calculate_content_fingerprint(self) -> bytes:
+        """
+        *[Internal Method]* Calculate the fingerprint of the content without caching it
+
+        Returns:
+            the fingerprint
+        """
+        return image_fingerprint(self.content)
     
     def validate(self, path: list, config: ValidationConfig) -> None:
         """
@@ -294,10 +447,12 @@ class SRBitmapCostume(SRCostume):
         Raises:
             ValidationError: if the SRBitmapCostume is invalid
         """
+        from PIL import Image
         super().validate(path, config)
         
         AA_TYPE(self, path, "content", Image.Image)
         AA_TYPE(self, path, "has_double_resolution", bool)
+        AA_TYPE(self, path, "encoder_options", dict)
 
     def to_first(self) -> tuple["FRCostume", bytes]:
         """
@@ -306,10 +461,13 @@ class SRBitmapCostume(SRCostume):
         Returns:
             the FRCostume
         """
+        from PIL import Image
         bytes_io = BytesIO()
-        self.content.save(bytes_io, format=self.file_extension)
+        image_format = Image.registered_extensions().get(f".{self.file_extension.lower()}", self.file_extension) # e.g. jpg -> JPEG
+        self.content.save(bytes_io, format=image_format, **self.encoder_options)
         file_bytes = bytes_io.getvalue()
         md5 = generate_md5(file_bytes)
+        logger.debug("Encoded costume %r (%s, %d bytes)", self.name, self.file_extension, len(file_bytes))
         # I am using the md5 hash here(guessed by "md5ext"). 
         # I do not know which hashing method Scratch uses. 
         # Scratch md5ext and mine do NOT match. I have uploaded generated project multiple times
@@ -333,7 +491,64 @@ class SRSound:
 
     name: str
     file_extension: str # i've only seen "wav", "mp3", "ogg"; others might work
-    content: AudioSegment
+    content: "AudioSegment"
+    encoder_options: dict[str, Any] = field(default_factory=dict, compare=False) # passed to AudioSegment.export by to_first e.g. {"bitrate": "128k"}
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks whether a SRSound is equal to another.
+        Requires same audio data. Ignores wrong identity of content.
+
+        Args:
+            other: the object to compare to
+
+        Returns:
+            bool: wether self is equal to other
+        """
+        if not isinstance(other, SRSound):
+            return NotImplemented
+        return (
+            (self.name == other.name)
+            and (self.file_extension == other.file_extension)
+            and ((self.content is other.content) or (self.content == other.content))
+        )
+
+    def content_fingerprint(self) -> bytes:
+        """
+        Get the fingerprint of the content. It is cached until another content is assigned.
+        **Call invalidate_content_fingerprint after modifying the content in place**
+
+        Returns:
+            the fingerprint
+        """
+        return _cached_content_fingerprint(self)
+
+    def invalidate_content_fingerprint(self) -> None:
+        """
+        Discard the cached fingerprint of the content
+
+        Returns:
+            None
+        """
+        self.__dict__.pop("_content_fingerprint_cache", None)
+
+    def _fingerprint_parts(self) -> tuple:
+        """
+        *[Internal Method]* Get the values, which make up the fingerprint (see fingerprint)
+
+        Returns:
+            the values
+        """
+        return (self.name, self.file_extension, self.content_fingerprint())
+
+    def _calculate_content_fingerprint(self) -> bytes:
+        """
+        *[Internal Method]* Calculate the fingerprint of the content without caching it
+
+        Returns:
+            the fingerprint
+        """
+        return audio_fingerprint(self.content)
     
     def validate(self, path: list, config: ValidationConfig) -> None:
         """
@@ -349,9 +564,11 @@ class SRSound:
         Raises:
             ValidationError: if the SRSound is invalid
         """
+        from pydub import AudioSegment
         AA_TYPE(self, path, "name", str)
         AA_TYPE(self, path, "file_extension", str)
         AA_TYPE(self, path, "content", AudioSegment)
+        AA_TYPE(self, path, "encoder_options", dict)
     
     def to_first(self) -> tuple["FRSound", bytes]:
         """
@@ -361,9 +578,10 @@ class SRSound:
             the FRSound
         """
         bytes_io = BytesIO()
-        self.content.export(bytes_io, format=self.file_extension)
+        self.content.export(bytes_io, format=self.file_extension, **self.encoder_options)
         file_bytes = bytes_io.getvalue()
         md5 = generate_md5(file_bytes)
+        logger.debug("Encoded sound %r (%s, %d bytes)", self.name, self.file_extension, len(file_bytes))
         # I am using the md5 hash here(guessed by "md5ext"). 
         # I do not know which hashing method Scratch uses. 
         # Scratch md5ext and mine do NOT match. I have uploaded generated project multiple times
@@ -378,5 +596,51 @@ class SRSound:
         ), file_bytes)
  
 
+def _cached_content_fingerprint(asset: SRCostume | SRSound) -> bytes:
+    """
+    *[Helper Function]* Get the cached fingerprint of the content of an asset or calculate and cache it.
+    The cache remembers the content it was calculated for, so assigning another content invalidates it
+    """
+    cache = asset.__dict__.get("_content_fingerprint_cache")
+    if (cache is None) or (cache[0] is not asset.content):
+        cache = (asset.content, asset._calculate_content_fingerprint())
+        asset.__dict__["_content_fingerprint_cache"] = cache
+    return cache[1]
+
+def _vector_costume_from_svg_bytes(
+    name: str, file_extension: str, rotation_center: tuple[int | float, int | float], svg_bytes: bytes,
+) -> SRVectorCostume:
+    """
+    *[Helper Function]* Recreate a pickled SRVectorCostume
+    """
+    from lxml import etree
+    return SRVectorCostume(
+        name            = name,
+        file_extension  = file_extension,
+        rotation_center = rotation_center,
+        content         = etree.fromstring(svg_bytes),
+    )
+
+def _bitmap_costume_from_content(
+    name: str, file_extension: str, rotation_center: tuple[int | float, int | float], 
+    has_double_resolution: bool, content: "Image.Image | bytes", encoder_options: dict[str, Any] | None = None,
+) -> SRBitmapCostume:
+    """
+    *[Helper Function]* Recreate a pickled SRBitmapCostume. content is either png bytes or an image
+    """
+    if isinstance(content, bytes):
+        from PIL import Image
+        content = Image.open(BytesIO(content))
+        content.load()
+    return SRBitmapCostume(
+        name                  = name,
+        file_extension        = file_extension,
+        rotation_center       = rotation_center,
+        has_double_resolution = has_double_resolution,
+        content               = content,
+        encoder_options       = {} if encoder_options is None else encoder_options,
+    )
+
+
 __all__ = ["FRCostume", "SRVectorCostume", "SRBitmapCostume", "FRSound", "SRCostume", "SRSound"]
 
@@ -0,0 +1,357 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy               import deepcopy
+from logging            import getLogger
+from re                 import compile as re_compile
+from typing             import TYPE_CHECKING
+
+# lxml, PIL and pydub are only imported once assets are actually optimized
+if TYPE_CHECKING:
+    from lxml  import etree
+    from PIL   import Image
+    from pydub import AudioSegment
+    from pypenguin.core.project import SRProject
+
+from pypenguin.utility import grepr_dataclass
+
+from pypenguin.core.asset  import SRCostume, SRVectorCostume, SRBitmapCostume, SRSound
+from pypenguin.core.target import SRTarget, SRSprite
+
+
+logger = getLogger(__name__)
+
+# The namespaces of editor specific data, which has no effect on rendering
+SVG_EDITOR_NAMESPACES = {
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://ns.adobe.com/AdobeIllustrator/10.0/",
+    "http://www.bohemiancoding.com/sketch/ns",
+}
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+# Whitespace is significant within these elements
+_SVG_TEXT_TAGS = {f"{{{SVG_NAMESPACE}}}text", f"{{{SVG_NAMESPACE}}}tspan", f"{{{SVG_NAMESPACE}}}textPath", f"{{{SVG_NAMESPACE}}}style"}
+_SVG_METADATA_TAGS = {f"{{{SVG_NAMESPACE}}}metadata", f"{{{SVG_NAMESPACE}}}title", f"{{{SVG_NAMESPACE}}}desc"}
+# Attributes, which only contain numbers and separators (and path commands), so their numbers can be rounded
+_SVG_NUMERIC_ATTRIBUTES = {
+    "d", "points", "transform", "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry",
+    "width", "height", "viewBox", "stroke-width", "offset",
+}
+_NUMBER_PATTERN = re_compile(r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?")
+_PATH_COMMANDS = set("MmLlHhVvCcSsQqTtAaZz")
+_ARC_FLAG_PATTERN = re_compile(r"[\s,]*([01])") # the flags of an arc can be written without separators e.g. "a1 1 0 011 1"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+@grepr_dataclass(grepr_fields=["optimize_bitmaps", "minify_vectors", "vector_precision", "sound_format", "sound_bitrate", "max_sample_rate", "mono_sounds", "max_workers"])
+class AssetOptimizationConfig:
+    """
+    Which optimizations optimize_assets applies and within which quality bounds.
+    The defaults are lossless: only metadata, editor data and redundant encoding are removed
+    """
+
+    optimize_bitmaps: bool = True # strip metadata, reduce the PNG color mode (e.g. RGBA without transparency -> RGB) and save PNGs with optimize
+    minify_vectors: bool = True # remove comments, metadata, editor data and whitespace from SVG costumes
+    vector_precision: int | None = None # round SVG coordinates to this many decimal places. None keeps them exact
+    sound_format: str | None = None # transcode sounds into this format e.g. "mp3". None keeps the format
+    sound_bitrate: str | None = "128k" # the bitrate of transcoded sounds (for lossy formats). None lets ffmpeg decide
+    max_sample_rate: int | None = None # resample sounds with a higher sample rate. None keeps the sample rate
+    mono_sounds: bool = False # mix stereo sounds down to mono
+    max_workers: int | None = None # the number of threads. None lets ThreadPoolExecutor decide
+
+@grepr_dataclass(grepr_fields=["sprite_name", "kind", "name", "original_size", "optimized_size", "is_changed", "error"])
+class AssetOptimizationResult:
+    """
+    The result of optimizing a costume or sound. The sizes are the sizes of the files created by to_first
+    """
+
+    sprite_name: str | None # None for the stage
+    kind: str # "costume" or "sound"
+    name: str
+    original_size: int # 0 if the asset can not be encoded
+    optimized_size: int
+    is_changed: bool # an asset is only changed if the optimization made its file smaller
+    error: str | None = None # why the asset (or its optimized version) could not be encoded. The asset is unchanged then
+
+    @property
+    def bytes_saved(self) -> int:
+        """
+        Get the number of bytes the optimization saved
+
+        Returns:
+            the saved bytes
+        """
+        return self.original_size - self.optimized_size
+
+@grepr_dataclass(grepr_fields=["results", "bytes_saved"])
+class AssetOptimizationReport:
+    """
+    The results of optimize_assets for every asset of a project
+    """
+
+    results: list[AssetOptimizationResult]
+
+    @property
+    def bytes_saved(self) -> int:
+        """
+        Get the number of bytes saved over all assets
+
+        Returns:
+            the saved bytes
+        """
+        return sum(result.bytes_saved for result in self.results)
+
+
+def optimize_assets(project: "SRProject", config: AssetOptimizationConfig | None = None) -> AssetOptimizationReport:
+    """
+    Optimize the costumes and sounds of a SRProject in place and in parallel.
+    An asset is only replaced if its optimized file (see to_first) is smaller than the original one.
+    Assets, which can not be encoded, are left unchanged and reported with an error instead of aborting the run
+
+    Args:
+        project: the SRProject
+        config: which optimizations to apply. Defaults to AssetOptimizationConfig()
+
+    Returns:
+        the bytes saved per asset
+    """
+    if config is None:
+        config = AssetOptimizationConfig()
+    jobs: list[tuple[SRTarget, str, SRCostume | SRSound]] = []
+    for target in [project.stage] + project.sprites:
+        jobs.extend((target, "costume", costume) for costume in target.costumes)
+        jobs.extend((target, "sound", sound) for sound in target.sounds)
+    # Image encoding, compression and ffmpeg run without the GIL, so threads are enough
+    with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+        results = list(executor.map(lambda job: _optimize_asset(*job, config), jobs))
+    return AssetOptimizationReport(results=results)
+
+def _optimize_asset(
+    target: SRTarget, kind: str, asset: SRCostume | SRSound, config: AssetOptimizationConfig,
+) -> AssetOptimizationResult:
+    """
+    *[Helper Function]* Optimize a costume or sound and replace its content if that made its file smaller
+    """
+    def create_result(original_size: int, optimized_size: int, error: Exception | None = None) -> AssetOptimizationResult:
+        if error is not None:
+            logger.debug("Could not optimize %s %r: %s", kind, asset.name, error)
+        return AssetOptimizationResult(
+            sprite_name    = target.name if isinstance(target, SRSprite) else None,
+            kind           = kind,
+            name           = asset.name,
+            original_size  = original_size,
+            optimized_size = optimized_size,
+            is_changed     = optimized_size < original_size,
+            error          = None if error is None else f"{type(error).__name__}: {error}",
+        )
+
+    try:
+        original_size = len(asset.to_first()[1])
+    except Exception as error: # e.g. an image mode, which the file format does not support
+        return create_result(0, 0, error)
+    if isinstance(asset, SRBitmapCostume) and config.optimize_bitmaps:
+        changes = {"content": _optimize_bitmap(asset.content, asset.file_extension)}
+        if asset.file_extension == "png":
+            changes["encoder_options"] = asset.encoder_options | {"optimize": True}
+    elif isinstance(asset, SRVectorCostume) and (config.minify_vectors or (config.vector_precision is not None)):
+        changes = {"content": _optimize_vector(asset.content, config)}
+    elif isinstance(asset, SRSound):
+        changes = _optimize_sound(asset, config)
+    else:
+        changes = {}
+
+    optimized_size = original_size
+    if changes:
+        original_values = {name: getattr(asset, name) for name in changes}
+        for name, value in changes.items():
+            setattr(asset, name, value)
+        try:
+            optimized_size = len(asset.to_first()[1])
+        except Exception as error: # e.g. a sound format ffmpeg can not encode
+            for name, value in original_values.items():
+                setattr(asset, name, value)
+            return create_result(original_size, original_size, error)
+        if optimized_size >= original_size:
+            for name, value in original_values.items():
+                setattr(asset, name, value)
+            optimized_size = original_size
+    return create_result(original_size, optimized_size)
+
+def _optimize_bitmap(image: "Image.Image", file_extension: str) -> "Image.Image":
+    """
+    *[Helper Function]* Strip the metadata of an image and losslessly reduce its color mode if it is a png
+    """
+    optimized = image.copy()
+    optimized.info = {key: value for key, value in image.info.items() if key == "transparency"}
+    if file_extension != "png":
+        return optimized
+
+    if (optimized.mode == "RGBA") and (optimized.getextrema()[3] == (255, 255)):
+        optimized = optimized.convert("RGB") # fully opaque
+    if (optimized.mode in ("RGB", "RGBA")) and ("transparency" not in optimized.info):
+        colors = optimized.getcolors(256)
+        if colors is not None: # at most 256 colors fit into an exact palette
+            from PIL import Image
+            color_indexes = {color: index for index, (_, color) in enumerate(colors)}
+            paletted = Image.new("P", optimized.size)
+            pixel_bytes = iter(optimized.tobytes())
+            pixels = zip(*[pixel_bytes] * len(optimized.mode)) # one tuple per pixel like in getcolors
+            paletted.putdata([color_indexes[color] for color in pixels])
+            paletted.putpalette([channel for _, color in colors for channel in color], rawmode=optimized.mode)
+            if paletted.convert(optimized.mode).tobytes() == optimized.tobytes(): # only if lossless
+                return paletted
+    return optimized
+
+def _optimize_vector(element: "etree._Element", config: AssetOptimizationConfig) -> "etree._Element":
+    """
+    *[Helper Function]* Create a minified copy of the root element of a SVG
+    """
+    from lxml import etree
+    optimized = deepcopy(element)
+    if config.minify_vectors:
+        for child in list(optimized.iter()):
+            if child is optimized:
+                continue
+            if isinstance(child, (etree._Comment, etree._ProcessingInstruction)) or (child.tag in _SVG_METADATA_TAGS) or (
+                etree.QName(child).namespace in SVG_EDITOR_NAMESPACES
+            ):
+                _remove_keeping_tail(child)
+        for child in optimized.iter(etree.Element):
+            for name in list(child.attrib):
+                if name.startswith("{") and (etree.QName(name).namespace in SVG_EDITOR_NAMESPACES):
+                    del child.attrib[name]
+        _strip_whitespace(optimized, preserve=False)
+        etree.cleanup_namespaces(optimized)
+    if config.vector_precision is not None:
+        for child in optimized.iter(etree.Element):
+            for name, value in child.attrib.items():
+                if name == "d":
+                    child.attrib[name] = _round_path_data(value, config.vector_precision)
+                elif name in _SVG_NUMERIC_ATTRIBUTES:
+                    child.attrib[name] = _round_numbers(value, config.vector_precision)
+    return optimized
+
+def _remove_keeping_tail(element: "etree._Element") -> None:
+    """
+    *[Helper Function]* Remove an element from its parent without removing the text after it
+    """
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is None:
+            parent.text = (parent.text or "") + element.tail
+        else:
+            previous.tail = (previous.tail or "") + element.tail
+    parent.remove(element)
+
+def _strip_whitespace(element: "etree._Element", preserve: bool) -> None:
+    """
+    *[Helper Function]* Remove whitespace-only text and tails, except within text elements and xml:space="preserve"
+    """
+    preserve = preserve or (element.tag in _SVG_TEXT_TAGS) or (element.get(_XML_SPACE) == "preserve")
+    if (not preserve) and (element.text is not None) and (not element.text.strip()):
+        element.text = None
+    for child in element:
+        _strip_whitespace(child, preserve)
+        if (not preserve) and (child.tail is not None) and (not child.tail.strip()):
+            child.tail = None
+
+def _round_numbers(text: str, precision: int) -> str:
+    """
+    *[Helper Function]* Round all numbers within an attribute value. Numbers, which directly followed each other
+    (e.g. "1.5.5" in path data), are separated by a space because rounding can change where one ends
+    """
+    parts = []
+    last_end = None
+    for match in _NUMBER_PATTERN.finditer(text):
+        start = match.start()
+        if (start == last_end) and (match.group()[0] not in "+-"):
+            parts.append(" ")
+        else:
+            parts.append(text[0 if last_end is None else last_end:start])
+        parts.append(_format_number(float(match.group()), precision))
+        last_end = match.end()
+    parts.append(text[0 if last_end is None else last_end:])
+    return "".join(parts)
+
+def _round_path_data(text: str, precision: int) -> str:
+    """
+    *[Helper Function]* Round the numbers of SVG path data like _round_numbers, but keep the flags of arc commands,
+    which are single digits and may be written without separators
+    """
+    parts = []
+    position = 0
+    command = None
+    argument_index = 0
+    follows_number = False # whether the previous token was a number, which the next number must be separated from
+    while position < len(text):
+        char = text[position]
+        if char in _PATH_COMMANDS:
+            parts.append(char)
+            command = char
+            argument_index = 0
+            follows_number = False
+            position += 1
+            continue
+        if (command in ("A", "a")) and (argument_index % 7 in (3, 4)): # large-arc-flag and sweep-flag
+            match = _ARC_FLAG_PATTERN.match(text, position)
+            if match is None: # invalid path data, keep the rest as is
+                break
+            parts.append(" " if follows_number else text[position:match.start(1)])
+            parts.append(match.group(1))
+            argument_index += 1
+            follows_number = True
+            position = match.end()
+            continue
+        match = _NUMBER_PATTERN.match(text, position)
+        if match is None: # a separator
+            parts.append(char)
+            follows_number = False
+            position += 1
+            continue
+        number = _format_number(float(match.group()), precision)
+        if follows_number and (number[0] != "-"):
+            parts.append(" ")
+        parts.append(number)
+        argument_index += 1
+        follows_number = True
+        position = match.end()
+    parts.append(text[position:])
+    return "".join(parts)
+
+def _format_number(number: float, precision: int) -> str:
+    """
+    *[Helper Function]* Format a rounded number as short as possible e.g. 0.50 -> .5
+    """
+    text = f"{round(number, precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        text = "0"
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return text
+
+def _optimize_sound(sound: SRSound, config: AssetOptimizationConfig) -> dict:
+    """
+    *[Helper Function]* Get the changed attributes of a resampled, downmixed and/or transcoded sound
+    """
+    content: "AudioSegment" = sound.content
+    if (config.max_sample_rate is not None) and (content.frame_rate > config.max_sample_rate):
+        content = content.set_frame_rate(config.max_sample_rate)
+    if config.mono_sounds and (content.channels > 1):
+        content = content.set_channels(1)
+    changes = {}
+    if content is not sound.content:
+        changes["content"] = content
+    if (config.sound_format is not None) and (config.sound_format != sound.file_extension):
+        changes["file_extension"] = config.sound_format
+        if config.sound_bitrate is not None:
+            changes["encoder_options"] = sound.encoder_options | {"bitrate": config.sound_bitrate}
+    return changes
+
+
+__all__ = ["AssetOptimizationConfig", "AssetOptimizationResult", "AssetOptimizationReport", "optimize_assets"]
+
@@ -0,0 +1,432 @@
+from dataclasses import fields, is_dataclass
+from enum        import Enum
+from hashlib     import sha256
+from struct      import Struct
+from sys         import modules
+from typing      import Any
+from uuid        import UUID
+
+from pypenguin.opcode_info.api import OpcodeInfoAPI, DropdownValueKind
+from pypenguin.utility         import DeserializationError
+
+
+BINARY_MAGIC = b"PPSR"
+BINARY_FORMAT_VERSION = 2
+
+_HEADER = Struct(">4sH32s") # magic, format version, schema fingerprint (opcode table, enum members and record fields)
+_FLOAT = Struct(">d")
+
+# value tags
+_T_NONE, _T_TRUE, _T_FALSE, _T_INT, _T_FLOAT, _T_STR, _T_BYTES = range(7)
+_T_LIST, _T_TUPLE, _T_DICT, _T_ENUM, _T_OBJECT, _T_UUID, _T_OPCODE = range(7, 14)
+_T_SVG, _T_IMAGE, _T_AUDIO = range(14, 17)
+
+_OPCODE_FIELD_CLASS_NAMES = {"SRBlock", "SRMonitor", "SRVariableMonitor", "SRListMonitor"}
+
+_class_registry: dict[str, type] | None = None
+_class_schema: bytes | None = None
+
+def _get_class_registry() -> dict[str, type]:
+    """
+    *[Helper Function]* Get all classes, which may appear in an encoded SR tree, by name (FR classes for SRProject.unloaded_targets).
+    Only these classes can be created when decoding
+    """
+    global _class_registry
+    if _class_registry is None:
+        from pypenguin.core import (
+            asset, block, block_mutation, comment, custom_block, dropdown, enums, extension,
+            monitor, project, target, vars_lists,
+        )
+        _class_registry = {DropdownValueKind.__name__: DropdownValueKind}
+        for module in (
+            asset, block, block_mutation, comment, custom_block, dropdown, enums, extension,
+            monitor, project, target, vars_lists,
+        ):
+            for name, obj in vars(module).items():
+                if isinstance(obj, type) and name.startswith(("SR", "FR")) and (obj.__module__ == module.__name__):
+                    _class_registry[name] = obj
+    return _class_registry
+
+def _describe_classes(registry: dict[str, type]) -> bytes:
+    """
+    *[Helper Function]* Describe the member names of every enum and the field names of every dataclass in a class registry.
+    Enum members and fields are encoded by their index, so data can only be decoded with the same description
+    """
+    lines = []
+    for name, cls in sorted(registry.items()):
+        if isinstance(cls, type) and issubclass(cls, Enum):
+            lines.append(f"{name}:{','.join(member.name for member in cls)}")
+        elif is_dataclass(cls):
+            lines.append(f"{name}({','.join(field.name for field in fields(cls))})")
+    return "\n".join(lines).encode("utf-8")
+
+def _get_class_schema() -> bytes:
+    """
+    *[Helper Function]* Get the description of the class registry (see _describe_classes)
+    """
+    global _class_schema
+    if _class_schema is None:
+        _class_schema = _describe_classes(_get_class_registry())
+    return _class_schema
+
+def _opcode_table(info_api: OpcodeInfoAPI) -> tuple[list[str], bytes]:
+    """
+    *[Helper Function]* Get the new opcodes of an opcode info api and a fingerprint of them and of the class schema.
+    Opcodes are encoded as their index in this table
+    """
+    opcodes = list(info_api.opcode_info.keys_key2())
+    hasher = sha256("\n".join(opcodes).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(_get_class_schema())
+    return opcodes, hasher.digest()
+
+def _write_varint(out: bytearray, number: int) -> None:
+    """
+    *[Helper Function]* Write a non-negative int as LEB128 varint
+    """
+    while number >= 0x80:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+class _Encoder:
+    """
+    *[Internal Class]* Encodes a SR tree. Strings, classes and asset contents are collected into tables,
+    which are written in front of the encoded value
+    """
+
+    def __init__(self, info_api: OpcodeInfoAPI) -> None:
+        opcodes, self.opcode_fingerprint = _opcode_table(info_api)
+        self.opcode_numbers = {opcode: number for number, opcode in enumerate(opcodes)}
+        self.strings: dict[str, int] = {}
+        self.classes: dict[type, int] = {}
+        self.assets: dict[bytes, int] = {}
+        self.field_names: dict[type, tuple[str, ...]] = {}
+        self.registry = _get_class_registry()
+
+    def encode(self, obj: Any) -> bytes:
+        body = bytearray()
+        self.value(body, obj)
+        out = bytearray(_HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, self.opcode_fingerprint))
+        _write_varint(out, len(self.classes))
+        for cls in self.classes.keys():
+            self.raw_bytes(out, cls.__name__.encode("utf-8"))
+        _write_varint(out, len(self.strings))
+        for string in self.strings.keys():
+            self.raw_bytes(out, string.encode("utf-8", "surrogatepass"))
+        _write_varint(out, len(self.assets))
+        for asset_bytes in self.assets.keys():
+            self.raw_bytes(out, asset_bytes)
+        out += body
+        return bytes(out)
+
+    def raw_bytes(self, out: bytearray, data: bytes) -> None:
+        _write_varint(out, len(data))
+        out += data
+
+    def string(self, out: bytearray, string: str) -> None:
+        number = self.strings.get(string)
+        if number is None:
+            number = self.strings[string] = len(self.strings)
+        _write_varint(out, number)
+
+    def class_number(self, cls: type) -> int:
+        number = self.classes.get(cls)
+        if number is None:
+            if self.registry.get(cls.__name__) is not cls:
+                raise TypeError(f"Can not encode instances of {cls.__qualname__}")
+            number = self.classes[cls] = len(self.classes)
+        return number
+
+    def asset(self, out: bytearray, asset_bytes: bytes) -> None:
+        number = self.assets.get(asset_bytes)
+        if number is None:
+            number = self.assets[asset_bytes] = len(self.assets)
+        _write_varint(out, number)
+
+    def value(self, out: bytearray, obj: Any) -> None:
+        obj_type = type(obj)
+        if obj is None:
+            out.append(_T_NONE)
+        elif obj_type is bool:
+            out.append(_T_TRUE if obj else _T_FALSE)
+        elif obj_type is int:
+            out.append(_T_INT)
+            _write_varint(out, (obj << 1) if obj >= 0 else (((-obj) << 1) - 1)) # zigzag
+        elif obj_type is float:
+            out.append(_T_FLOAT)
+            out += _FLOAT.pack(obj)
+        elif obj_type is str:
+            out.append(_T_STR)
+            self.string(out, obj)
+        elif (obj_type is list) or (obj_type is tuple):
+            out.append(_T_LIST if obj_type is list else _T_TUPLE)
+            _write_varint(out, len(obj))
+            for item in obj:
+                self.value(out, item)
+        elif obj_type is dict:
+            out.append(_T_DICT)
+            _write_varint(out, len(obj))
+            for key, item in obj.items():
+                self.value(out, key)
+                self.value(out, item)
+        elif obj_type is bytes:
+            out.append(_T_BYTES)
+            self.raw_bytes(out, obj)
+        elif obj_type is UUID:
+            out.append(_T_UUID)
+            out += obj.bytes
+        elif isinstance(obj, Enum):
+            out.append(_T_ENUM)
+            _write_varint(out, self.class_number(obj_type))
+            _write_varint(out, list(obj_type).index(obj))
+        elif is_dataclass(obj):
+            self.object(out, obj)
+        else:
+            self.asset_content(out, obj)
+
+    def object(self, out: bytearray, obj: Any) -> None:
+        """
+        Encode a dataclass instance as a length-prefixed record of the fields, which are set
+        """
+        cls = type(obj)
+        field_names = self.field_names.get(cls)
+        if field_names is None:
+            field_names = self.field_names[cls] = tuple(field.name for field in fields(cls))
+        instance_dict = obj.__dict__
+        present_mask = 0
+        for index, name in enumerate(field_names):
+            if name in instance_dict:
+                present_mask |= (1 << index)
+        record = bytearray()
+        _write_varint(record, present_mask)
+        encode_opcode = cls.__name__ in _OPCODE_FIELD_CLASS_NAMES
+        for name in field_names:
+            if name not in instance_dict:
+                continue
+            field_value = instance_dict[name]
+            if encode_opcode and (name == "opcode") and (field_value in self.opcode_numbers):
+                record.append(_T_OPCODE)
+                _write_varint(record, self.opcode_numbers[field_value])
+            else:
+                self.value(record, field_value)
+        out.append(_T_OBJECT)
+        _write_varint(out, self.class_number(cls))
+        _write_varint(out, len(record))
+        out += record
+
+    def asset_content(self, out: bytearray, obj: Any) -> None:
+        """
+        Encode the content of a costume or sound as a reference to raw bytes and the data needed to interpret them
+        """
+        etree_module = modules.get("lxml.etree")
+        image_module = modules.get("PIL.Image")
+        audio_module = modules.get("pydub.audio_segment")
+        if (etree_module is not None) and isinstance(obj, etree_module._Element):
+            out.append(_T_SVG)
+            self.asset(out, etree_module.tostring(obj))
+        elif (image_module is not None) and isinstance(obj, image_module.Image):
+            out.append(_T_IMAGE)
+            self.value(out, obj.mode)
+            self.value(out, obj.size)
+            has_palette = obj.mode in ("P", "PA")
+            self.value(out, obj.palette.mode if has_palette else None)
+            self.value(out, obj.palette.tobytes() if has_palette else None)
+            self.value(out, {
+                key: value for key, value in obj.info.items()
+                if (type(key) is str) and (type(value) in (int, float, str, bytes, tuple))
+            })
+            self.asset(out, obj.tobytes())
+        elif (audio_module is not None) and isinstance(obj, audio_module.AudioSegment):
+            out.append(_T_AUDIO)
+            self.value(out, obj.sample_width)
+            self.value(out, obj.frame_rate)
+            self.value(out, obj.channels)
+            self.asset(out, obj.raw_data)
+        else:
+            raise TypeError(f"Can not encode instances of {type(obj).__qualname__}")
+
+
+class _Decoder:
+    """
+    *[Internal Class]* Decodes data created by _Encoder
+    """
+
+    def __init__(self, data: bytes, info_api: OpcodeInfoAPI) -> None:
+        self.data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise DeserializationError("Invalid SR binary data: too short")
+        magic, format_version, opcode_fingerprint = _HEADER.unpack_from(self.data, 0)
+        if magic != BINARY_MAGIC:
+            raise DeserializationError("Invalid SR binary data: wrong magic")
+        if format_version != BINARY_FORMAT_VERSION:
+            raise DeserializationError(f"Unsupported SR binary format version: {format_version}")
+        self.opcodes, expected_fingerprint = _opcode_table(info_api)
+        if opcode_fingerprint != expected_fingerprint:
+            raise DeserializationError("SR binary data was created with a different opcode table or class schema")
+        self.position = _HEADER.size
+
+        registry = _get_class_registry()
+        self.classes: list[type] = []
+        for _ in range(self.varint()):
+            name = self.raw_bytes().decode("utf-8")
+            if name not in registry:
+                raise DeserializationError(f"Unknown class in SR binary data: {name}")
+            self.classes.append(registry[name])
+        self.enum_members: dict[type, list[Enum]] = {}
+        self.field_names: dict[type, tuple[str, ...]] = {}
+        self.strings = [self.raw_bytes().decode("utf-8", "surrogatepass") for _ in range(self.varint())]
+        self.assets = [self.raw_bytes() for _ in range(self.varint())]
+
+    def decode(self) -> Any:
+        obj = self.value()
+        if self.position != len(self.data):
+            raise DeserializationError("Invalid SR binary data: trailing bytes")
+        return obj
+
+    def varint(self) -> int:
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.position]
+            self.position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def raw_bytes(self) -> bytes:
+        length = self.varint()
+        start = self.position
+        self.position += length
+        if self.position > len(self.data):
+            raise DeserializationError("Invalid SR binary data: truncated")
+        return self.data[start:self.position].tobytes()
+
+    def value(self) -> Any:
+        tag = self.data[self.position]
+        self.position += 1
+        if   tag == _T_STR:
+            return self.strings[self.varint()]
+        elif tag == _T_OBJECT:
+            return self.object()
+        elif tag == _T_NONE:
+            return None
+        elif tag == _T_TRUE:
+            return True
+        elif tag == _T_FALSE:
+            return False
+        elif tag == _T_INT:
+            number = self.varint()
+            return (number >> 1) if not (number & 1) else -((number + 1) >> 1)
+        elif tag == _T_FLOAT:
+            number = _FLOAT.unpack_from(self.data, self.position)[0]
+            self.position += _FLOAT.size
+            return number
+        elif tag == _T_LIST:
+            return [self.value() for _ in range(self.varint())]
+        elif tag == _T_TUPLE:
+            return tuple([self.value() for _ in range(self.varint())])
+        elif tag == _T_DICT:
+            result = {}
+            for _ in range(self.varint()):
+                key = self.value()
+                result[key] = self.value()
+            return result
+        elif tag == _T_ENUM:
+            cls = self.classes[self.varint()]
+            members = self.enum_members.get(cls)
+            if members is None:
+                members = self.enum_members[cls] = list(cls)
+            return members[self.varint()]
+        elif tag == _T_OPCODE:
+            return self.opcodes[self.varint()]
+        elif tag == _T_UUID:
+            start = self.position
+            self.position += 16
+            return UUID(bytes=self.data[start:self.position].tobytes())
+        elif tag == _T_BYTES:
+            return self.raw_bytes()
+        elif tag == _T_SVG:
+            from lxml import etree
+            return etree.fromstring(self.assets[self.varint()])
+        elif tag == _T_IMAGE:
+            from PIL import Image
+            mode, size, palette_mode, palette, info = (self.value() for _ in range(5))
+            image = Image.frombytes(mode, size, self.assets[self.varint()])
+            if palette is not None:
+                image.putpalette(palette, palette_mode)
+            image.info.update(info)
+            return image
+        elif tag == _T_AUDIO:
+            from pydub import AudioSegment
+            sample_width, frame_rate, channels = (self.value() for _ in range(3))
+            return AudioSegment(
+                data=self.assets[self.varint()], sample_width=sample_width, frame_rate=frame_rate, channels=channels,
+            )
+        raise DeserializationError(f"Invalid SR binary data: unknown tag {tag}")
+
+    def object(self) -> Any:
+        cls = self.classes[self.varint()]
+        length = self.varint()
+        end = self.position + length
+        field_names = self.field_names.get(cls)
+        if field_names is None:
+            if not is_dataclass(cls):
+                raise DeserializationError(f"Invalid SR binary data: {cls.__name__} is not a record class")
+            field_names = self.field_names[cls] = tuple(field.name for field in fields(cls))
+        present_mask = self.varint()
+        obj = cls.__new__(cls)
+        instance_dict = obj.__dict__ # bypasses __init__, __post_init__ and __setattr__ guards like for SRSprite.uuid
+        for index, name in enumerate(field_names):
+            if present_mask & (1 << index):
+                instance_dict[name] = self.value()
+        if self.position != end:
+            raise DeserializationError(f"Invalid SR binary data: {cls.__name__} record has the wrong length")
+        return obj
+
+
+def encode_sr(obj: Any, info_api: OpcodeInfoAPI) -> bytes:
+    """
+    Encode a second representation object (e.g. a SRProject, SRScript or SRBlock) in the compact binary SR format.
+    Opcodes and enums are encoded as small ints, dataclasses as length-prefixed records
+    and asset contents as references to raw bytes (svg source, image pixels, audio samples)
+
+    Args:
+        obj: the object to encode
+        info_api: the opcode info api used to encode opcodes. Decoding requires an api with the same opcodes
+
+    Returns:
+        the encoded data
+
+    Raises:
+        TypeError: if the object contains values, which can not be encoded
+    """
+    return _Encoder(info_api).encode(obj)
+
+def decode_sr(data: bytes, info_api: OpcodeInfoAPI) -> Any:
+    """
+    Decode data in the compact binary SR format
+
+    Args:
+        data: the encoded data
+        info_api: the opcode info api used to decode opcodes
+
+    Returns:
+        the decoded object
+
+    Raises:
+        DeserializationError: if the data is invalid, was created by another format version, with other opcodes 
+            or with other enum members or record fields
+    """
+    try:
+        return _Decoder(data, info_api).decode()
+    except DeserializationError:
+        raise
+    except Exception as error: # corrupted data can fail anywhere, e.g. in lxml, PIL or while building records
+        raise DeserializationError(f"Invalid SR binary data: {error}") from error
+
+
+__all__ = ["BINARY_FORMAT_VERSION", "encode_sr", "decode_sr"]
+
@@ -1,5 +1,6 @@
 from abc         import ABC, abstractmethod
 from dataclasses import field
+from logging     import getLogger
 from typing      import Any, TYPE_CHECKING
 
 from pypenguin.important_consts import (
@@ -14,7 +15,8 @@ from pypenguin.opcode_info.api  import (
     OpcodeType, SpecialCaseType,
 )
 from pypenguin.utility          import (
-    grepr_dataclass, get_closest_matches, tuplify, string_to_sha256, ValidationConfig,
+    grepr_dataclass, get_closest_matches, tuplify, string_to_sha256, ValidationConfig, Interner,
+    fingerprint_hash, drop_fingerprint_cache,
     AA_TYPE, AA_NONE, AA_NONE_OR_TYPE, AA_COORD_PAIR, AA_LIST_OF_TYPE, AA_DICT_OF_TYPE, AA_MIN_LEN,
     DeserializationError, ConversionError,
     UnnecessaryInputError, MissingInputError, UnnecessaryDropdownError, MissingDropdownError, InvalidOpcodeError, InvalidBlockShapeError,
@@ -29,6 +31,9 @@ from pypenguin.core.context        import CompleteContext
 from pypenguin.core.dropdown       import SRDropdownValue
 
 
+logger = getLogger(__name__)
+
+
 @grepr_dataclass(grepr_fields=["opcode", "next", "parent", "inputs", "fields", "shadow", "top_level", "x", "y", "comment", "mutation"])
 class FRBlock:
     """
@@ -51,41 +56,68 @@ class FRBlock:
     mutation: "FRMutation | None" = None
 
     @classmethod
-    def from_data(cls, data: dict[str, Any], info_api: OpcodeInfoAPI) -> "FRBlock":
+    def from_data(cls, 
+        data: dict[str, Any], 
+        info_api: OpcodeInfoAPI, 
+        memo: dict | None = None,
+    ) -> "FRBlock":
         """
-        Deserializes raw data into a FRBlock
+        Deserializes raw data into a FRBlock. 
+        The opcode and the input and field ids are interned against the opcode info api, 
+        so equal strings of many blocks share one object
         
         Args:
             data: the raw data
             info_api: the opcode info api used to fetch information about opcodes
+            memo: if given, equal block references and input/field values share one object (see tuplify)
         
         Returns:
             the FRBlock
         """
         opcode = data["opcode"]
         opcode_info = info_api.get_info_by_old(opcode)
-        if opcode_info.old_mutation_cls is None:
-            if "mutation" in data:
-                raise DeserializationError(f"Invalid mutation for FRBlock with opcode {repr(opcode)}: {data['mutation']}")
-            mutation = None
-        else:
-            if "mutation" not in data:
-                cls_name = opcode_info.old_mutation_cls.__name__
-                raise DeserializationError(f"Missing mutation of type {cls_name} for FRBlock with opcode {repr(opcode)}")
-            mutation = opcode_info.old_mutation_cls.from_data(data["mutation"])
+        intern_input_id = opcode_info.inputs   .intern_key1
+        intern_field_id = opcode_info.dropdowns.intern_key1
         return cls(
-            opcode    = opcode,
-            next      = data["next"    ],
-            parent    = data["parent"  ],
-            inputs    = tuplify(data["inputs"]),
-            fields    = tuplify(data["fields"]),
+            opcode    = info_api.opcode_info.intern_key1(opcode),
+            next      = tuplify(data["next"  ], memo),
+            parent    = tuplify(data["parent"], memo),
+            inputs    = {
+                intern_input_id(input_id): tuplify(input_value, memo)
+                for input_id, input_value in data["inputs"].items()
+            },
+            fields    = {
+                intern_field_id(field_id): tuplify(field_value, memo)
+                for field_id, field_value in data["fields"].items()
+            },
             shadow    = data["shadow"  ],
             top_level = data["topLevel"],
             x         = data.get("x", None),
             y         = data.get("y", None),
             comment   = data.get("comment", None),
-            mutation  = mutation,
+            mutation  = FRBlock._mutation_from_data(data, opcode_info=opcode_info),
         )
+
+    @staticmethod
+    def _mutation_from_data(data: dict[str, Any], opcode_info: OpcodeInfo) -> "FRMutation | None":
+        """
+        *[Helper Method]* Deserializes the mutation of a block's raw data, if the opcode requires one
+        
+        Args:
+            data: the raw data of the block
+            opcode_info: the information about the block's opcode
+        
+        Returns:
+            the FRMutation or None
+        """
+        if opcode_info.old_mutation_cls is None:
+            if "mutation" in data:
+                raise DeserializationError(f"Invalid mutation for FRBlock with opcode {repr(data['opcode'])}: {data['mutation']}")
+            return None
+        if "mutation" not in data:
+            cls_name = opcode_info.old_mutation_cls.__name__
+            raise DeserializationError(f"Missing mutation of type {cls_name} for FRBlock with opcode {repr(data['opcode'])}")
+        return opcode_info.old_mutation_cls.from_data(data["mutation"])
     
     @classmethod
     def from_tuple(cls, 
@@ -186,6 +218,7 @@ class FRBlock:
         opcode_info = info_api.get_info_by_old(self.opcode)
         pre_handler = opcode_info.get_special_case(SpecialCaseType.PRE_FIRST_TO_INTER)
         if pre_handler is not None:
+            logger.debug("Applying special case PRE_FIRST_TO_INTER to block %r (%s)", own_id, self.opcode)
             self = pre_handler.call(block=self, block_id=own_id, fti_if=fti_if)
         
         instead_handler = opcode_info.get_special_case(SpecialCaseType.INSTEAD_FIRST_TO_INTER)
@@ -213,6 +246,7 @@ class FRBlock:
                 is_top_level = self.top_level,
             )
         else:
+            logger.debug("Applying special case INSTEAD_FIRST_TO_INTER to block %r (%s)", own_id, self.opcode)
             new_block = instead_handler.call(block=self, block_id=own_id, fti_if=fti_if)
         return new_block
 
@@ -399,6 +433,7 @@ class IRBlock:
 
         post_handler = opcode_info.get_special_case(SpecialCaseType.POST_INTER_TO_FIRST)
         if post_handler is not None:
+            logger.debug("Applying special case POST_INTER_TO_FIRST to block %r (%s)", own_id, self.opcode)
             old_block = post_handler.call(block=old_block, block_id=own_id, itf_if=itf_if)
         if self.opcode in ANY_OPCODE_IMMEDIATE_BLOCK:
             return old_block.to_tuple()
@@ -408,6 +443,7 @@ class IRBlock:
     def to_second(self, 
         all_blocks: dict[str, "IRBlock"],
         info_api: OpcodeInfoAPI,
+        interner: Interner | None = None,
     ) -> tuple[tuple[int|float,int|float] | None, list["SRBlock | str"]]:
         """
         Converts a IRBlock into a SRBlock
@@ -415,6 +451,7 @@ class IRBlock:
         Args:
             all_blocks: a dictionary of all blocks
             info_api: the opcode info api used to fetch information about opcodes
+            interner: shares identical SRBlocks and their children if given
         
         Returns:
             the SRBlock
@@ -440,6 +477,7 @@ class IRBlock:
                 _, sub_blocks = input_value.immediate_block.to_second(
                     all_blocks = all_blocks,
                     info_api   = info_api,
+                    interner   = interner,
                 )
                 sub_scripts.append(sub_blocks)
             
@@ -448,6 +486,7 @@ class IRBlock:
                 _, sub_blocks = sub_block.to_second(
                     all_blocks    = all_blocks,
                     info_api      = info_api,
+                    interner      = interner,
                 )
                 sub_scripts.append(sub_blocks)
             
@@ -535,12 +574,15 @@ class IRBlock:
             comment   = self.comment,
             mutation  = self.mutation,
         )
+        if interner is not None:
+            new_block = interner.intern(new_block)
         new_blocks = [new_block]
         if self.next is not None:
             next_block = all_blocks[self.next]
             _, next_blocks = next_block.to_second(
                 all_blocks    = all_blocks,
                 info_api      = info_api,
+                interner      = interner,
             )
             new_blocks.extend(next_blocks)
         
@@ -569,6 +611,27 @@ class SRScript:
     position: tuple[int | float, int | float]
     blocks: list["SRBlock"]
 
+    _cache_fingerprint = True
+
+    def __hash__(self) -> int:
+        """
+        Get a hash of the structure of a SRScript (see fingerprint). 
+        **Do not modify a SRScript while it is in a set or used as a dict key**
+
+        Returns:
+            the hash
+        """
+        return fingerprint_hash(self)
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state for copying and pickling without the cached fingerprint
+
+        Returns:
+            the state
+        """
+        return drop_fingerprint_cache(self.__dict__)
+
     def validate(self, 
         path: list, 
         config: ValidationConfig,
@@ -658,7 +721,28 @@ class SRBlock:
     dropdowns: dict[str, SRDropdownValue]
     comment: SRComment | None
     mutation: "SRMutation | None"
-    
+
+    _cache_fingerprint = True
+
+    def __hash__(self) -> int:
+        """
+        Get a hash of the structure of a SRBlock (see fingerprint). 
+        **Do not modify a SRBlock while it is in a set or used as a dict key**
+
+        Returns:
+            the hash
+        """
+        return fingerprint_hash(self)
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state for copying and pickling without the cached fingerprint
+
+        Returns:
+            the state
+        """
+        return drop_fingerprint_cache(self.__dict__)
+
     def validate(self, 
         path: list, 
         config: ValidationConfig,
@@ -718,6 +802,7 @@ class SRBlock:
         input_infos = opcode_info.get_new_input_ids_infos(block=self, fti_if=None) 
         # maps input ids to their types # fti_if isn't necessary for a IRBlock
         
+        # recursive instead of walk_sr_blocks, because the input type decides how the sub blocks are validated
         for new_input_id, input in self.inputs.items():
             if new_input_id not in input_infos.keys():
                 raise UnnecessaryInputError(path, 
@@ -1,4 +1,6 @@
 from dataclasses import field
+from logging     import getLogger
+from typing      import Iterator
 
 from pypenguin.utility import grepr_dataclass, number_to_token, ConversionError, ValidationError
 
@@ -6,6 +8,10 @@ from pypenguin.core.comment        import FRComment, SRComment
 from pypenguin.core.block_mutation import FRCustomBlockMutation, SRCustomBlockMutation
 from pypenguin.core.block          import FRBlock, IRBlock, SRBlock, SRScript
 from pypenguin.core.custom_block   import SRCustomBlockOpcode
+from pypenguin.core.traversal      import walk_sr_blocks
+
+
+logger = getLogger(__name__)
 
 
 @grepr_dataclass(grepr_fields=["blocks", "block_comments", "scheduled_block_deletions"])
@@ -53,6 +59,7 @@ class FirstToInterIF:
         Returns:
             None
         """
+        logger.debug("Scheduling deletion of block %r", block_id)
         self.scheduled_block_deletions.append(block_id)
 
     def get_cb_mutation(self, proccode: str) -> "FRCustomBlockMutation":
@@ -134,6 +141,7 @@ class InterToFirstIF:
         Returns:
             None
         """
+        logger.debug("Scheduling addition of block %r", block_id)
         self.added_blocks[block_id] = block
 
     def add_comment(self, comment: FRComment) -> str:
@@ -185,7 +193,7 @@ class InterToFirstIF:
 class SecondReprIF:
     scripts: list["SRScript"]
     cb_mutations: dict[SRCustomBlockOpcode, "SRCustomBlockMutation"] = field(default_factory=dict)
-    # Safe access is needed because blocks haven't actually been validated yet (see get_all_blocks)
+    # Safe access is needed because blocks haven't actually been validated yet (see _iter_all_blocks)
     
     def __post_init__(self) -> None:
         """
@@ -194,8 +202,7 @@ class SecondReprIF:
         Returns:
             None
         """
-        all_blocks = self._get_all_blocks()
-        for block in all_blocks:
+        for block in self._iter_all_blocks():
             if not isinstance(getattr(block, "mutation", None), SRCustomBlockMutation):
                 continue
             mutation: SRCustomBlockMutation = block.mutation
@@ -203,32 +210,14 @@ class SecondReprIF:
                 continue
             self.cb_mutations[mutation.custom_opcode] = mutation
 
-    def _get_all_blocks(self) -> list["SRBlock"]:
+    def _iter_all_blocks(self) -> Iterator["SRBlock"]:
         """
-        *[Internal Method]* Get all blocks in the same target
+        *[Internal Method]* Iterate over all blocks in the same target (see walk_sr_blocks)
         
         Returns:
-            all blocks in the target 
-        """
-        def recursive_block_search(block: "SRBlock") -> None:
-            blocks.append(block)
-            if not isinstance(getattr(block, "inputs", None), dict):
-                return
-            for input in block.inputs.values(): 
-                if isinstance(getattr(input, "block", None), SRBlock):
-                    recursive_block_search(input.block)
-                if isinstance(getattr(input, "blocks", None), list):
-                    [recursive_block_search(sub_block) for sub_block in input.blocks if isinstance(sub_block, SRBlock)]
-        
-        blocks = []
-        for script in self.scripts:
-            if not isinstance(getattr(script, "blocks", None), list):
-                continue
-            for block in script.blocks:
-                if not isinstance(block, SRBlock):
-                    continue
-                recursive_block_search(block)
-        return blocks
+            an iterator of all blocks in the target 
+        """
+        return (block for _, block in walk_sr_blocks(self.scripts, with_paths=False))
 
 @grepr_dataclass(grepr_fields=["added_blocks", "_next_block_id_num"], parent_cls=SecondReprIF)
 class SecondToInterIF(SecondReprIF):
@@ -262,6 +251,7 @@ class SecondToInterIF(SecondReprIF):
         Returns:
             None
         """
+        logger.debug("Scheduling addition of block %r", block_id)
         self.added_blocks[block_id] = block
 
     def get_cb_mutation(self, custom_opcode: SRCustomBlockOpcode) -> "SRCustomBlockMutation":
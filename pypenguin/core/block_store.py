@@ -0,0 +1,375 @@
+from array       import array
+from itertools   import compress
+from json        import loads
+from typing      import Any
+
+from pypenguin.opcode_info.api  import OpcodeInfoAPI
+from pypenguin.utility          import grepr_dataclass, read_file_of_zip, tuplify, DeserializationError
+
+from pypenguin.core.block          import FRBlock
+from pypenguin.core.block_mutation import FRMutation
+
+
+NO_INDEX = -1 # stands for None in the int32 columns
+
+
+@grepr_dataclass(grepr_fields=["block_ids", "opcode_table", "tuple_blocks"], eq=False)
+class FRBlockStore:
+    """
+    A columnar alternative to the `blocks` dict of a FRTarget.
+    Every block has a row index; opcodes are interned into `opcode_table`
+    and `next`/`parent` are stored as int32 row indices (`NO_INDEX` for None).
+    Inputs and fields live in flat side tables, which are sliced by per-block offsets.
+    Tuple blocks (top level variable/list reporters) are kept as is in `tuple_blocks`
+    """
+
+    block_ids: list[str]
+    opcode_table: list[str]
+    opcodes: array          # int32, index into opcode_table
+    nexts: array            # int32, row index or NO_INDEX
+    parents: array          # int32, row index or NO_INDEX
+    shadows: array          # int8, bool
+    top_levels: array       # int8, bool
+    xs: list[int | float | None]
+    ys: list[int | float | None]
+    input_offsets: array    # int32, len(block_ids)+1 entries
+    input_ids: list[str]
+    input_values: list[tuple]
+    field_offsets: array    # int32, len(block_ids)+1 entries
+    field_ids: list[str]
+    field_values: list[tuple]
+    comments: dict[int, str]
+    mutations: dict[int, FRMutation]
+    tuple_blocks: dict[str, tuple]
+
+    def __post_init__(self) -> None:
+        """
+        Build the lookup table from block id to row index
+        
+        Returns:
+            None
+        """
+        self._rows: dict[str, int] = {block_id: row for row, block_id in enumerate(self.block_ids)}
+
+    @classmethod
+    def new_empty(cls) -> "FRBlockStore":
+        """
+        Creates an empty FRBlockStore
+
+        Returns:
+            the empty FRBlockStore
+        """
+        return cls(
+            block_ids     = [],
+            opcode_table  = [],
+            opcodes       = array("i"),
+            nexts         = array("i"),
+            parents       = array("i"),
+            shadows       = array("b"),
+            top_levels    = array("b"),
+            xs            = [],
+            ys            = [],
+            input_offsets = array("i", [0]),
+            input_ids     = [],
+            input_values  = [],
+            field_offsets = array("i", [0]),
+            field_ids     = [],
+            field_values  = [],
+            comments      = {},
+            mutations     = {},
+            tuple_blocks  = {},
+        )
+
+    @classmethod
+    def from_data(cls, data: dict[str, dict[str, Any] | list], info_api: OpcodeInfoAPI) -> "FRBlockStore":
+        """
+        Deserializes the raw "blocks" data of a target into a FRBlockStore
+
+        Args:
+            data: the raw blocks data
+            info_api: the opcode info api used to fetch information about opcodes
+
+        Returns:
+            the FRBlockStore
+        """
+        store = cls.new_empty()
+        opcode_numbers: dict[str, int] = {}
+        row_refs: list[tuple[str | None, str | None]] = []
+        memo = {}
+        for block_id, block_data in data.items():
+            if isinstance(block_data, list):
+                store.tuple_blocks[block_id] = tuple(block_data)
+                continue
+            opcode = block_data["opcode"]
+            opcode_number = opcode_numbers.get(opcode)
+            if opcode_number is None:
+                opcode_number = len(store.opcode_table)
+                opcode_numbers[opcode] = opcode_number
+                store.opcode_table.append(opcode)
+            mutation = FRBlock._mutation_from_data(block_data, opcode_info=info_api.get_info_by_old(opcode))
+            store._append_row(
+                block_id      = block_id,
+                opcode_number = opcode_number,
+                inputs        = {
+                    input_id: tuplify(input_value, memo) 
+                    for input_id, input_value in block_data["inputs"].items()
+                },
+                fields        = {
+                    field_id: tuplify(field_value, memo) 
+                    for field_id, field_value in block_data["fields"].items()
+                },
+                shadow        = block_data["shadow"],
+                top_level     = block_data["topLevel"],
+                x             = block_data.get("x", None),
+                y             = block_data.get("y", None),
+                comment       = block_data.get("comment", None),
+                mutation      = mutation,
+            )
+            row_refs.append((block_data["next"], block_data["parent"]))
+        store._link_rows(row_refs)
+        return store
+
+    @classmethod
+    def from_blocks(cls, blocks: dict[str, tuple | FRBlock]) -> "FRBlockStore":
+        """
+        Creates a FRBlockStore from the blocks of a FRTarget
+
+        Args:
+            blocks: the blocks of a FRTarget
+
+        Returns:
+            the FRBlockStore
+        """
+        store = cls.new_empty()
+        opcode_numbers: dict[str, int] = {}
+        row_refs: list[tuple[str | None, str | None]] = []
+        for block_id, block in blocks.items():
+            if isinstance(block, tuple):
+                store.tuple_blocks[block_id] = block
+                continue
+            opcode_number = opcode_numbers.get(block.opcode)
+            if opcode_number is None:
+                opcode_number = len(store.opcode_table)
+                opcode_numbers[block.opcode] = opcode_number
+                store.opcode_table.append(block.opcode)
+            store._append_row(
+                block_id      = block_id,
+                opcode_number = opcode_number,
+                inputs        = block.inputs,
+                fields        = block.fields,
+                shadow        = block.shadow,
+                top_level     = block.top_level,
+                x             = block.x,
+                y             = block.y,
+                comment       = block.comment,
+                mutation      = block.mutation,
+            )
+            row_refs.append((block.next, block.parent))
+        store._link_rows(row_refs)
+        return store
+
+    @classmethod
+    def from_file(cls, file_path: str, info_api: OpcodeInfoAPI) -> dict[str, "FRBlockStore"]:
+        """
+        Reads only the project.json of a project file(.sb3 or .pmp) and creates a FRBlockStore for every target.
+        Does not touch or decode any assets
+
+        Args:
+            file_path: file path to the .sb3 or .pmp file
+            info_api: the opcode info api used to fetch information about opcodes
+
+        Returns:
+            the FRBlockStores by target name
+        """
+        assert file_path.endswith(".sb3") or file_path.endswith(".pmp")
+        project_data = loads(read_file_of_zip(file_path, "project.json").decode("utf-8"))
+        return {
+            target_data["name"]: cls.from_data(target_data["blocks"], info_api=info_api)
+            for target_data in project_data["targets"]
+        }
+
+    def _append_row(self,
+        block_id: str,
+        opcode_number: int,
+        inputs: dict[str, tuple],
+        fields: dict[str, tuple],
+        shadow: bool,
+        top_level: bool,
+        x: int | float | None,
+        y: int | float | None,
+        comment: str | None,
+        mutation: FRMutation | None,
+    ) -> None:
+        """
+        *[Internal Method]* Appends a block row without links. Must be followed by `_link_rows`
+
+        Returns:
+            None
+        """
+        row = len(self.block_ids)
+        self.block_ids.append(block_id)
+        self.opcodes.append(opcode_number)
+        self.shadows.append(shadow)
+        self.top_levels.append(top_level)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.input_ids.extend(inputs.keys())
+        self.input_values.extend(inputs.values())
+        self.input_offsets.append(len(self.input_ids))
+        self.field_ids.extend(fields.keys())
+        self.field_values.extend(fields.values())
+        self.field_offsets.append(len(self.field_ids))
+        if comment is not None:
+            self.comments[row] = comment
+        if mutation is not None:
+            self.mutations[row] = mutation
+
+    def _link_rows(self, row_refs: list[tuple[str | None, str | None]]) -> None:
+        """
+        *[Internal Method]* Resolves the next and parent references of all rows into row indices
+
+        Args:
+            row_refs: the next and parent block id of every row
+
+        Returns:
+            None
+        """
+        self.__post_init__()
+        rows = self._rows
+        def resolve(reference: str | None) -> int:
+            if reference is None:
+                return NO_INDEX
+            if reference not in rows:
+                raise DeserializationError(f"Invalid block reference in FRBlockStore: {repr(reference)}")
+            return rows[reference]
+        self.nexts   = array("i", (resolve(next_id  ) for next_id, _   in row_refs))
+        self.parents = array("i", (resolve(parent_id) for _, parent_id in row_refs))
+
+    def __len__(self) -> int:
+        return len(self.block_ids) + len(self.tuple_blocks)
+
+    def __contains__(self, block_id: str) -> bool:
+        return (block_id in self._rows) or (block_id in self.tuple_blocks)
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks whether a FRBlockStore is equal to another. Compares the blocks, not the internal layout
+
+        Args:
+            other: the object to compare to
+
+        Returns:
+            bool: wether self is equal to other
+        """
+        if not isinstance(other, FRBlockStore):
+            return NotImplemented
+        return self.to_blocks() == other.to_blocks()
+
+    def row_of(self, block_id: str) -> int:
+        """
+        Get the row index of a (non-tuple) block
+
+        Args:
+            block_id: the reference id of the block
+
+        Returns:
+            the row index
+        """
+        return self._rows[block_id]
+
+    def top_level_block_ids(self) -> list[str]:
+        """
+        Get the ids of all top level (non-tuple) blocks
+
+        Returns:
+            the block ids
+        """
+        return list(compress(self.block_ids, self.top_levels))
+
+    def child_block_ids(self, block_id: str) -> list[str]:
+        """
+        Get the ids of all blocks, whose parent is the given block.
+        This includes the next block and the blocks within inputs
+
+        Args:
+            block_id: the reference id of the parent block
+
+        Returns:
+            the block ids
+        """
+        row = self._rows[block_id]
+        return list(compress(self.block_ids, (parent == row for parent in self.parents)))
+
+    def block_ids_with_opcode(self, opcode: str) -> list[str]:
+        """
+        Get the ids of all blocks with the given opcode
+
+        Args:
+            opcode: the (old) opcode to search for
+
+        Returns:
+            the block ids
+        """
+        if opcode not in self.opcode_table:
+            return []
+        opcode_number = self.opcode_table.index(opcode)
+        return list(compress(self.block_ids, (number == opcode_number for number in self.opcodes)))
+
+    def get_block(self, block_id: str) -> tuple | FRBlock:
+        """
+        Get a block in the FRBlock API format
+
+        Args:
+            block_id: the reference id of the block
+
+        Returns:
+            the FRBlock or the tuple of a tuple block
+        """
+        if block_id in self.tuple_blocks:
+            return self.tuple_blocks[block_id]
+        return self._row_to_block(self._rows[block_id])
+
+    def _row_to_block(self, row: int) -> FRBlock:
+        """
+        *[Internal Method]* Builds a FRBlock from a row
+
+        Args:
+            row: the row index
+
+        Returns:
+            the FRBlock
+        """
+        next_row   = self.nexts[row]
+        parent_row = self.parents[row]
+        input_slice = slice(self.input_offsets[row], self.input_offsets[row+1])
+        field_slice = slice(self.field_offsets[row], self.field_offsets[row+1])
+        return FRBlock(
+            opcode    = self.opcode_table[self.opcodes[row]],
+            next      = None if next_row   == NO_INDEX else self.block_ids[next_row  ],
+            parent    = None if parent_row == NO_INDEX else self.block_ids[parent_row],
+            inputs    = dict(zip(self.input_ids[input_slice], self.input_values[input_slice])),
+            fields    = dict(zip(self.field_ids[field_slice], self.field_values[field_slice])),
+            shadow    = bool(self.shadows[row]),
+            top_level = bool(self.top_levels[row]),
+            x         = self.xs[row],
+            y         = self.ys[row],
+            comment   = self.comments.get(row, None),
+            mutation  = self.mutations.get(row, None),
+        )
+
+    def to_blocks(self) -> dict[str, tuple | FRBlock]:
+        """
+        Converts the FRBlockStore into the blocks format of a FRTarget
+
+        Returns:
+            the blocks
+        """
+        blocks: dict[str, tuple | FRBlock] = {
+            block_id: self._row_to_block(row) for row, block_id in enumerate(self.block_ids)
+        }
+        blocks.update(self.tuple_blocks)
+        return blocks
+
+
+__all__ = ["FRBlockStore"]
+
@@ -0,0 +1,321 @@
+import os
+from functools import lru_cache
+from hashlib   import sha256
+from logging   import getLogger
+from pickle    import dumps, loads, UnpicklingError, HIGHEST_PROTOCOL
+from sys       import version_info
+from tempfile  import mkstemp
+from time      import time
+
+from pypenguin.opcode_info.api import OpcodeInfoAPI, OpcodeInfoSnapshot
+from pypenguin.utility         import grepr_dataclass, ensure_correct_path, get_instrumentation, instrumented_phase
+
+from pypenguin.core.project import FRProject, SRProject
+
+
+logger = getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+CACHE_MAGIC = b"pypenguin-project-cache\n"
+CACHE_FILE_SUFFIX = ".srproject"
+TEMP_FILE_SUFFIX = ".tmp"
+STALE_TEMP_FILE_AGE = 60 * 60 # in seconds. Older temporary files were left behind by crashed writers
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _pypenguin_source_version() -> str:
+    """
+    *[Helper Function]* Hash the source code of pypenguin. A cache entry is only valid for the exact same pypenguin code
+    """
+    package_directory = ensure_correct_path("")
+    hasher = sha256()
+    for directory, directory_names, file_names in os.walk(package_directory):
+        directory_names.sort() # walk the subdirectories in a deterministic order
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py"):
+                continue
+            file_path = os.path.join(directory, file_name)
+            hasher.update(os.path.relpath(file_path, package_directory).encode("utf-8"))
+            with open(file_path, "rb") as file:
+                hasher.update(file.read())
+    return hasher.hexdigest()
+
+
+@grepr_dataclass(grepr_fields=["directory", "max_size"])
+class ProjectCache:
+    """
+    An opt-in, persistent cache of converted SRProjects.
+    Entries are keyed by the content hash of the project file, the pypenguin version and the opcode table.
+    It can be shared by multiple processes: entries are written atomically
+    and entries, which disappear or are corrupted, count as misses.
+    When the total size exceeds max_size, the least recently used entries are evicted
+    """
+
+    directory: str
+    max_size: int = 512 * 1024 * 1024 # in bytes
+
+    def __post_init__(self) -> None:
+        """
+        Create the cache directory if it doesn't exist
+
+        Returns:
+            None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._opcode_table_versions: dict[int, tuple[OpcodeInfoAPI, str]] = {}
+
+    def _opcode_table_version(self, info_api: OpcodeInfoAPI) -> str:
+        """
+        *[Internal Method]* Hash the opcode table of an opcode info api. The result is remembered for each api
+
+        Args:
+            info_api: the opcode info api
+
+        Returns:
+            the hash
+        """
+        entry = self._opcode_table_versions.get(id(info_api))
+        if (entry is None) or (entry[0] is not info_api):
+            tables = OpcodeInfoSnapshot.from_api(info_api).tables
+            entry = (info_api, sha256(repr(tuple(tables.items())).encode("utf-8")).hexdigest())
+            self._opcode_table_versions[id(info_api)] = entry
+        return entry[1]
+
+    def key_for_file(self, file_path: str, info_api: OpcodeInfoAPI) -> str:
+        """
+        Calculate the cache key of a project file
+
+        Args:
+            file_path: file path to the .sb3 or .pmp file
+            info_api: the opcode info api used to fetch information about opcodes
+
+        Returns:
+            the cache key
+        """
+        hasher = sha256()
+        hasher.update(f"{CACHE_FORMAT_VERSION}:{version_info[0]}.{version_info[1]}:".encode("utf-8"))
+        hasher.update(_pypenguin_source_version().encode("utf-8"))
+        hasher.update(self._opcode_table_version(info_api).encode("utf-8"))
+        hasher.update(os.path.splitext(file_path)[1].encode("utf-8"))
+        with open(ensure_correct_path(file_path), "rb") as file:
+            while chunk := file.read(_HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """
+        *[Internal Method]* Get the file path of a cache entry
+
+        Args:
+            key: the cache key
+
+        Returns:
+            the file path
+        """
+        return os.path.join(self.directory, key + CACHE_FILE_SUFFIX)
+
+    def get(self, key: str) -> SRProject | None:
+        """
+        Load a SRProject from the cache
+
+        Args:
+            key: the cache key
+
+        Returns:
+            the SRProject or None if there is no valid entry
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as file:
+                read_stat = os.fstat(file.fileno())
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        header = CACHE_MAGIC + key.encode("utf-8") + b"\n"
+        try:
+            if not data.startswith(header):
+                raise UnpicklingError("Invalid cache entry header")
+            project = loads(memoryview(data)[len(header):])
+            if not isinstance(project, SRProject):
+                raise UnpicklingError("Cache entry does not contain a SRProject")
+        except Exception as error:
+            logger.debug("Discarding corrupted cache entry %s: %s", entry_path, error)
+            self._remove_if_unchanged(entry_path, read_stat)
+            return None
+        try:
+            os.utime(entry_path) # mark as recently used
+        except OSError:
+            pass
+        return project
+
+    def put(self, key: str, project: SRProject) -> None:
+        """
+        Store a SRProject in the cache and evict old entries if necessary
+
+        Args:
+            key: the cache key
+            project: the SRProject
+
+        Returns:
+            None
+        """
+        data = CACHE_MAGIC + key.encode("utf-8") + b"\n" + dumps(project, protocol=HIGHEST_PROTOCOL)
+        file_descriptor, temp_path = mkstemp(dir=self.directory, suffix=TEMP_FILE_SUFFIX)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self._entry_path(key)) # atomic, readers never see a partial entry
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    def load_project(self, file_path: str, info_api: OpcodeInfoAPI) -> SRProject:
+        """
+        Get the SRProject of a project file from the cache or convert and cache it.
+        Equivalent to `FRProject.from_file(file_path, info_api).to_second(info_api)`
+
+        Args:
+            file_path: file path to the .sb3 or .pmp file
+            info_api: the opcode info api used to fetch information about opcodes
+
+        Returns:
+            the SRProject
+        """
+        with instrumented_phase("cache_lookup"):
+            key = self.key_for_file(file_path, info_api)
+            project = self.get(key)
+        instrumentation = get_instrumentation()
+        if project is not None:
+            logger.debug("Loaded %s from the project cache", file_path)
+            if instrumentation is not None:
+                instrumentation.count("cache_hits")
+            return project
+        if instrumentation is not None:
+            instrumentation.count("cache_misses")
+        project = FRProject.from_file(file_path, info_api).to_second(info_api)
+        with instrumented_phase("cache_store"):
+            self.put(key, project)
+        return project
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """
+        *[Internal Method]* List the cache entries
+
+        Returns:
+            the modification time, size and path of every entry
+        """
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            entry_path = os.path.join(self.directory, file_name)
+            try:
+                stat_result = os.stat(entry_path)
+            except FileNotFoundError: # removed by another process
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, entry_path))
+        return entries
+
+    def size(self) -> int:
+        """
+        Get the total size of all cache entries
+
+        Returns:
+            the size in bytes
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the total size does not exceed max_size.
+        Also removes stale temporary files of crashed writers
+
+        Returns:
+            None
+        """
+        self._remove_stale_temp_files()
+        entries = sorted(self._entries())
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size:
+                break
+            logger.debug("Evicting cache entry %s", entry_path)
+            self._remove(entry_path)
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries
+
+        Returns:
+            None
+        """
+        for _, _, entry_path in self._entries():
+            self._remove(entry_path)
+
+    def _remove_stale_temp_files(self) -> None:
+        """
+        *[Internal Method]* Remove the temporary files, which are older than STALE_TEMP_FILE_AGE.
+        Newer ones might still be written by another process
+
+        Returns:
+            None
+        """
+        min_mtime = time() - STALE_TEMP_FILE_AGE
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(TEMP_FILE_SUFFIX):
+                continue
+            temp_path = os.path.join(self.directory, file_name)
+            try:
+                if os.stat(temp_path).st_mtime >= min_mtime:
+                    continue
+            except FileNotFoundError: # renamed or removed by another process
+                continue
+            logger.debug("Removing stale temporary file %s", temp_path)
+            self._remove(temp_path)
+
+    @classmethod
+    def _remove_if_unchanged(cls, file_path: str, expected_stat: os.stat_result) -> None:
+        """
+        *[Internal Method]* Remove a file only if it is still the same file as expected_stat.
+        Another process might have replaced it with a valid entry in the meantime
+
+        Args:
+            file_path: the file path
+            expected_stat: the stat result of the file when it was read
+
+        Returns:
+            None
+        """
+        try:
+            current_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return
+        if (
+            (current_stat.st_ino      == expected_stat.st_ino     ) and 
+            (current_stat.st_dev      == expected_stat.st_dev     ) and
+            (current_stat.st_mtime_ns == expected_stat.st_mtime_ns)
+        ):
+            cls._remove(file_path)
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        """
+        *[Internal Method]* Remove a file, which might already have been removed by another process
+
+        Args:
+            file_path: the file path
+
+        Returns:
+            None
+        """
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+__all__ = ["ProjectCache"]
+
@@ -0,0 +1,276 @@
+from typing import TYPE_CHECKING, Hashable
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import SRProject
+
+from pypenguin.opcode_info.api import DropdownValueKind
+from pypenguin.utility         import grepr_dataclass, find_cyclic_components, PypenguinEnum
+
+from pypenguin.core.block          import SRScript, SRBlock
+from pypenguin.core.block_mutation import SRCustomBlockMutation, SRCustomBlockCallMutation
+from pypenguin.core.target         import SRTarget, SRSprite
+from pypenguin.core.traversal      import walk_sr_blocks
+
+
+BROADCAST_OPCODES   = {"broadcast ([MESSAGE])", "broadcast ([MESSAGE]) and wait"}
+RECEIVE_OPCODE      = "when I receive [MESSAGE]"
+CREATE_CLONE_OPCODE = "create clone of ([TARGET])"
+START_CLONE_OPCODE  = "when I start as a clone"
+
+
+class SRCallKind(PypenguinEnum):
+    """
+    How a script triggers other scripts
+    """
+
+    BROADCAST    = 0 # broadcast ([MESSAGE]) -> when I receive [MESSAGE]
+    CUSTOM_BLOCK = 1 # call of a custom block -> its definition
+    CLONE        = 2 # create clone of ([TARGET]) -> when I start as a clone
+
+@grepr_dataclass(grepr_fields=["target_path", "script_index"], eq=False)
+class SRScriptNode:
+    """
+    A script within a SRCallGraph
+    """
+
+    index: int # the index within SRCallGraph.nodes
+    target_path: list # e.g. ["stage"] or ["sprites", 0]
+    target: SRTarget
+    script_index: int
+    script: SRScript
+
+# A channel connects the scripts, which trigger it, with the scripts, which are triggered by it (e.g. a broadcast message).
+# It is (kind, key), the key is the message name, (target index, custom opcode) or the sprite name.
+# A key of None means a dynamic channel (e.g. a broadcast of a reporter value), which triggers every script of the kind
+Channel = tuple[SRCallKind, Hashable]
+
+@grepr_dataclass(grepr_fields=["nodes"], eq=False)
+class SRCallGraph:
+    """
+    Which scripts of a SRProject trigger which other scripts through broadcasts, custom block calls and clones.
+    Scripts are connected through channels instead of direct edges, so building and querying are linear
+    in the size of the project even if many scripts send the same broadcast to many receivers
+    """
+
+    nodes: list[SRScriptNode]
+    node_sends: list[list[Channel]] # the distinct channels each node triggers
+    node_listens: list[Channel | None] # the channel, which triggers each node (determined by its first block)
+    channel_senders: dict[Channel, list[int]]
+    channel_receivers: dict[Channel, list[int]]
+
+    @classmethod
+    def from_project(cls, project: "SRProject") -> "SRCallGraph":
+        """
+        Build the call graph of a SRProject in one pass over all blocks
+
+        Args:
+            project: the SRProject
+
+        Returns:
+            the call graph
+        """
+        graph = cls(nodes=[], node_sends=[], node_listens=[], channel_senders={}, channel_receivers={})
+        targets = [(["stage"], project.stage)] + [(["sprites", i], sprite) for i, sprite in enumerate(project.sprites)]
+        for target_index, (target_path, target) in enumerate(targets):
+            for script_index, script in enumerate(target.scripts):
+                node = SRScriptNode(
+                    index        = len(graph.nodes),
+                    target_path  = target_path,
+                    target       = target,
+                    script_index = script_index,
+                    script       = script,
+                )
+                graph.nodes.append(node)
+                graph._add_script(node, target_index)
+
+        for kind in (SRCallKind.BROADCAST, SRCallKind.CLONE):
+            graph.channel_receivers[(kind, None)] = [
+                node.index for node in graph.nodes
+                if (graph.node_listens[node.index] is not None) and (graph.node_listens[node.index][0] is kind)
+            ]
+        return graph
+
+    def _add_script(self, node: SRScriptNode, target_index: int) -> None:
+        """
+        *[Internal Method]* Add the channels a script listens to and triggers
+        """
+        listens = None
+        if node.script.blocks:
+            listens = _get_listened_channel(node.script.blocks[0], node.target, target_index)
+        self.node_listens.append(listens)
+        if listens is not None:
+            self.channel_receivers.setdefault(listens, []).append(node.index)
+
+        sends = {}
+        for _, block in walk_sr_blocks(node.script, with_paths=False):
+            channel = _get_triggered_channel(block, node.target, target_index)
+            if channel is not None:
+                sends.setdefault(channel, None)
+        # A dynamic channel already includes all specific channels of the same kind
+        dynamic_kinds = {channel[0] for channel in sends if channel[1] is None}
+        sends = [channel for channel in sends if (channel[1] is None) or (channel[0] not in dynamic_kinds)]
+        self.node_sends.append(sends)
+        for channel in sends:
+            self.channel_senders.setdefault(channel, []).append(node.index)
+
+    def get_callees(self, node: SRScriptNode) -> list[SRScriptNode]:
+        """
+        Get the scripts, which a script triggers
+
+        Args:
+            node: the script node
+
+        Returns:
+            the triggered script nodes without duplicates
+        """
+        return [self.nodes[i] for channel in self.node_sends[node.index] for i in self.channel_receivers.get(channel, [])]
+
+    def get_callers(self, node: SRScriptNode) -> list[SRScriptNode]:
+        """
+        Get the scripts, which trigger a script
+
+        Args:
+            node: the script node
+
+        Returns:
+            the triggering script nodes without duplicates
+        """
+        return [self.nodes[i] for i in self._get_sender_indexes(self.node_listens[node.index])]
+
+    def _get_sender_indexes(self, channel: Channel | None) -> list[int]:
+        """
+        *[Internal Method]* Get the indexes of the nodes, which trigger a channel directly or through its dynamic channel
+        """
+        if channel is None:
+            return []
+        senders = self.channel_senders.get(channel, [])
+        if channel[1] is None:
+            return senders
+        return senders + self.channel_senders.get((channel[0], None), [])
+
+    def get_fan_out(self, node: SRScriptNode) -> int:
+        """
+        Get the number of scripts a script triggers
+
+        Args:
+            node: the script node
+
+        Returns:
+            the fan-out
+        """
+        return sum(len(self.channel_receivers.get(channel, [])) for channel in self.node_sends[node.index])
+
+    def get_fan_in(self, node: SRScriptNode) -> int:
+        """
+        Get the number of scripts, which trigger a script
+
+        Args:
+            node: the script node
+
+        Returns:
+            the fan-in
+        """
+        return len(self._get_sender_indexes(self.node_listens[node.index]))
+
+    def get_entry_points(self) -> list[SRScriptNode]:
+        """
+        Get the scripts, which are not triggered through a channel, e.g. green flag scripts.
+        Scripts without a hat block are included because they can be run by clicking them
+
+        Returns:
+            the entry point script nodes
+        """
+        return [node for node in self.nodes if self.node_listens[node.index] is None]
+
+    def get_reachable(self, roots: list[SRScriptNode] | None = None) -> list[SRScriptNode]:
+        """
+        Get all scripts, which can be triggered directly or indirectly from some scripts
+
+        Args:
+            roots: the start script nodes. Defaults to the entry points (see get_entry_points)
+
+        Returns:
+            the reachable script nodes including the roots in graph order
+        """
+        if roots is None:
+            roots = self.get_entry_points()
+        is_reached = [False] * len(self.nodes)
+        expanded_channels = set()
+        stack = []
+        for node in roots:
+            if not is_reached[node.index]:
+                is_reached[node.index] = True
+                stack.append(node.index)
+        while stack:
+            for channel in self.node_sends[stack.pop()]:
+                if channel in expanded_channels:
+                    continue
+                expanded_channels.add(channel)
+                for i in self.channel_receivers.get(channel, []):
+                    if not is_reached[i]:
+                        is_reached[i] = True
+                        stack.append(i)
+        return [node for node in self.nodes if is_reached[node.index]]
+
+    def find_recursion(self) -> list[list[SRScriptNode]]:
+        """
+        Find groups of scripts, which (indirectly) trigger themselves, e.g. recursive custom blocks
+        or a receiver, which broadcasts its own message (strongly connected components with a cycle)
+
+        Returns:
+            the groups of script nodes in graph order
+        """
+        # The channels are vertices too (after the script nodes), so the graph stays linear in size
+        channel_ids = {channel: len(self.nodes) + i for i, channel in enumerate(self.channel_receivers)}
+        successors = [[channel_ids[channel] for channel in sends if channel in channel_ids] for sends in self.node_sends]
+        successors.extend(self.channel_receivers.values())
+        groups = [
+            [self.nodes[vertex] for vertex in component if vertex < len(self.nodes)]
+            for component in find_cyclic_components(successors)
+        ]
+        groups.sort(key=lambda group: group[0].index)
+        return groups
+
+
+def _get_listened_channel(block: SRBlock, target: SRTarget, target_index: int) -> Channel | None:
+    """
+    *[Helper Function]* Get the channel, which triggers a script starting with a block
+    """
+    if isinstance(block.mutation, SRCustomBlockMutation):
+        return (SRCallKind.CUSTOM_BLOCK, (target_index, block.mutation.custom_opcode))
+    if block.opcode == RECEIVE_OPCODE:
+        dropdown_value = block.dropdowns.get("MESSAGE")
+        if dropdown_value is not None:
+            return (SRCallKind.BROADCAST, dropdown_value.value)
+    if (block.opcode == START_CLONE_OPCODE) and isinstance(target, SRSprite):
+        return (SRCallKind.CLONE, target.name)
+    return None
+
+def _get_triggered_channel(block: SRBlock, target: SRTarget, target_index: int) -> Channel | None:
+    """
+    *[Helper Function]* Get the channel a block triggers
+    """
+    if isinstance(block.mutation, SRCustomBlockCallMutation):
+        return (SRCallKind.CUSTOM_BLOCK, (target_index, block.mutation.custom_opcode))
+    if block.opcode in BROADCAST_OPCODES:
+        kind, input_id = SRCallKind.BROADCAST, "MESSAGE"
+    elif block.opcode == CREATE_CLONE_OPCODE:
+        kind, input_id = SRCallKind.CLONE, "TARGET"
+    else:
+        return None
+    input_value = block.inputs.get(input_id)
+    if input_value is None:
+        return None
+    if getattr(input_value, "block", None) is not None:
+        return (kind, None) # the reporter value is unknown
+    dropdown_value = input_value.dropdown
+    if kind is SRCallKind.CLONE:
+        if dropdown_value.kind is DropdownValueKind.MYSELF:
+            return (kind, target.name) if isinstance(target, SRSprite) else None
+        if dropdown_value.kind is not DropdownValueKind.SPRITE:
+            return None
+    return (kind, dropdown_value.value)
+
+
+__all__ = ["SRCallKind", "SRScriptNode", "SRCallGraph"]
+
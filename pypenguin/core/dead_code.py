@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import SRProject
+
+from pypenguin.opcode_info.api import OpcodeInfoAPI, OpcodeType
+from pypenguin.utility         import grepr_dataclass, PypenguinEnum
+
+from pypenguin.core.block           import SRScript
+from pypenguin.core.block_interface import ValidationIF
+from pypenguin.core.block_mutation  import SRCustomBlockMutation, SRCustomBlockCallMutation
+from pypenguin.core.custom_block    import SRCustomBlockOpcode
+from pypenguin.core.target          import SRTarget
+from pypenguin.core.traversal       import walk_sr_blocks
+
+
+class SRDeadScriptReason(PypenguinEnum):
+    """
+    Why a script is never executed
+    """
+
+    NO_HAT                = 0 # the first block is not a hat block e.g. a floating reporter or a stack without a hat
+    UNCALLED_CUSTOM_BLOCK = 1 # the script defines a custom block, which is never called from an executed script
+
+@grepr_dataclass(grepr_fields=["script_index", "reason", "block_count"])
+class SRDeadScript:
+    """
+    A script of a target, which is never executed
+    """
+
+    target: SRTarget
+    script: SRScript
+    script_index: int
+    reason: SRDeadScriptReason
+    block_count: int # the number of blocks of the script including the blocks in inputs
+
+@grepr_dataclass(grepr_fields=["dead_scripts", "is_removed"], eq=False)
+class SRDeadCodeReport:
+    """
+    The result of a dead code elimination pass
+    """
+
+    dead_scripts: list[SRDeadScript]
+    is_removed: bool # whether the dead scripts were removed or only detected
+
+    @property
+    def blocks_saved(self) -> int:
+        """
+        Get the number of blocks of all dead scripts, which are (or would be) saved by removing them
+
+        Returns:
+            the number of blocks
+        """
+        return sum(dead_script.block_count for dead_script in self.dead_scripts)
+
+
+def find_dead_scripts(target: SRTarget, info_api: OpcodeInfoAPI) -> list[SRDeadScript]:
+    """
+    Find the scripts of a SRTarget, which are never executed. These are scripts,
+    whose first block is not a hat block, and custom block definitions, which are not reachable through calls
+    from the executed scripts (this includes recursive custom blocks, which only call themselves)
+
+    Args:
+        target: the SRTarget
+        info_api: the opcode info api used to fetch information about opcodes
+
+    Returns:
+        the dead scripts in script order
+    """
+    validation_if = ValidationIF(scripts=target.scripts)
+    definitions: dict[SRCustomBlockOpcode, int] = {}
+    live_indexes = []
+    reasons: dict[int, SRDeadScriptReason] = {}
+    for i, script in enumerate(target.scripts):
+        if not script.blocks:
+            continue
+        first_block = script.blocks[0]
+        if isinstance(first_block.mutation, SRCustomBlockMutation):
+            definitions[first_block.mutation.custom_opcode] = i
+            reasons[i] = SRDeadScriptReason.UNCALLED_CUSTOM_BLOCK # until a call from a live script is found
+            continue
+        opcode_info = info_api.get_info_by_new(first_block.opcode)
+        if opcode_info.get_opcode_type(block=first_block, validation_if=validation_if) is OpcodeType.HAT:
+            live_indexes.append(i)
+        else:
+            reasons[i] = SRDeadScriptReason.NO_HAT
+
+    # Every script is visited at most once, so this is linear in the number of blocks
+    while live_indexes:
+        script = target.scripts[live_indexes.pop()]
+        for _, block in walk_sr_blocks(script, with_paths=False):
+            if not isinstance(block.mutation, SRCustomBlockCallMutation):
+                continue
+            definition_index = definitions.get(block.mutation.custom_opcode)
+            if (definition_index is not None) and (definition_index in reasons):
+                del reasons[definition_index]
+                live_indexes.append(definition_index)
+
+    return [
+        SRDeadScript(
+            target       = target,
+            script       = target.scripts[i],
+            script_index = i,
+            reason       = reason,
+            block_count  = sum(1 for _ in walk_sr_blocks(target.scripts[i], with_paths=False)),
+        )
+        for i, reason in sorted(reasons.items())
+    ]
+
+def eliminate_dead_code(root: "SRProject | SRTarget", info_api: OpcodeInfoAPI, remove: bool = True) -> SRDeadCodeReport:
+    """
+    Find and optionally remove the scripts of a SRProject or SRTarget, which are never executed (see find_dead_scripts)
+
+    Args:
+        root: the SRProject or SRTarget. Is modified in place if remove is True
+        info_api: the opcode info api used to fetch information about opcodes
+        remove: whether to remove the dead scripts or only report them
+
+    Returns:
+        the report, which contains the dead scripts and the number of saved blocks
+    """
+    targets = [root] if isinstance(root, SRTarget) else [root.stage] + root.sprites
+    dead_scripts = []
+    for target in targets:
+        target_dead_scripts = find_dead_scripts(target, info_api)
+        if remove and target_dead_scripts:
+            dead_indexes = {dead_script.script_index for dead_script in target_dead_scripts}
+            target.scripts = [script for i, script in enumerate(target.scripts) if i not in dead_indexes]
+        dead_scripts.extend(target_dead_scripts)
+    return SRDeadCodeReport(dead_scripts=dead_scripts, is_removed=remove)
+
+
+__all__ = ["SRDeadScriptReason", "SRDeadScript", "SRDeadCodeReport", "find_dead_scripts", "eliminate_dead_code"]
+
@@ -0,0 +1,453 @@
+from dataclasses import fields
+from difflib     import SequenceMatcher
+from typing      import Any, Callable, Hashable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import SRProject
+    from pypenguin.core.target  import SRTarget
+
+from pypenguin.utility import grepr_dataclass, fingerprint, generate_path_string, PypenguinEnum
+
+from pypenguin.core.block   import SRScript, SRBlock, SRInputValue
+from pypenguin.core.monitor import SRMonitor
+
+
+# These fields of SRTarget/SRSprite are diffed item by item, all others are compared as a whole
+_TARGET_ITEM_FIELDS = {
+    "scripts", "comments", "costumes", "sounds", "sprite_only_variables", "sprite_only_lists", "local_monitors",
+}
+_INPUT_VALUE_FIELDS = ("blocks", "block", "text", "dropdown")
+
+
+class SRChangeKind(PypenguinEnum):
+    """
+    The kind of a change between two SRProjects
+    """
+
+    ADDED    = 0
+    REMOVED  = 1
+    MODIFIED = 2
+
+@grepr_dataclass(grepr_fields=["kind", "old_path", "new_path"])
+class SRChange:
+    """
+    A single change between two SRProjects.
+    The paths have the same format as the paths of validation errors
+    """
+
+    kind: SRChangeKind
+    old_path: list | None # None if ADDED
+    new_path: list | None # None if REMOVED
+    old_value: Any
+    new_value: Any
+
+    @property
+    def path(self) -> list:
+        """
+        Get the path of the change in the new project or in the old project if the value was removed
+
+        Returns:
+            the path
+        """
+        return self.old_path if self.new_path is None else self.new_path
+
+    def to_string(self) -> str:
+        """
+        Describe the change in a single line
+
+        Returns:
+            the description
+        """
+        if self.kind is SRChangeKind.MODIFIED and (self.old_path != self.new_path):
+            return f"modified {generate_path_string(self.old_path)} -> {generate_path_string(self.new_path)}"
+        return f"{self.kind.name.lower()} {generate_path_string(self.path)}"
+
+@grepr_dataclass(grepr_fields=["changes"])
+class SRProjectDiff:
+    """
+    The structural difference between two SRProjects (see diff_projects)
+    """
+
+    changes: list[SRChange]
+
+    def __bool__(self) -> bool:
+        """
+        Check whether there are any changes
+
+        Returns:
+            wether there are any changes
+        """
+        return bool(self.changes)
+
+    def filter(self, kind: SRChangeKind | None = None, path_prefix: list | None = None) -> list[SRChange]:
+        """
+        Get the changes of a kind and/or below a path
+
+        Args:
+            kind: only return changes of this kind
+            path_prefix: only return changes, whose path starts with this path
+
+        Returns:
+            the matching changes
+        """
+        return [
+            change for change in self.changes
+            if ((kind is None) or (change.kind is kind))
+            and ((path_prefix is None) or (change.path[:len(path_prefix)] == path_prefix))
+        ]
+
+    def to_text(self) -> str:
+        """
+        Create a text report of the changes with one line per change
+
+        Returns:
+            the text report
+        """
+        return "\n".join(change.to_string() for change in self.changes)
+
+
+class _Differ:
+    """
+    *[Internal Class]* Collects the changes between two SRProjects.
+    Identical and equal subtrees are skipped as a whole. Fingerprints are only calculated for the scripts
+    and blocks, which have no equal counterpart at the same position, to find where they were moved to
+    """
+
+    def __init__(self) -> None:
+        self.changes: list[SRChange] = []
+        self.memo: dict[int, tuple[Any, bytes]] = {}
+
+    def added(self, new_path: list, new_value: Any) -> None:
+        self.changes.append(SRChange(SRChangeKind.ADDED, None, new_path, None, new_value))
+
+    def removed(self, old_path: list, old_value: Any) -> None:
+        self.changes.append(SRChange(SRChangeKind.REMOVED, old_path, None, old_value, None))
+
+    def modified(self, old_path: list, new_path: list, old_value: Any, new_value: Any) -> None:
+        self.changes.append(SRChange(SRChangeKind.MODIFIED, old_path, new_path, old_value, new_value))
+
+    def compare(self, old_path: list, new_path: list, old_value: Any, new_value: Any) -> None:
+        """
+        Record a modification if two values are not equal
+        """
+        if (old_value is not new_value) and (old_value != new_value):
+            self.modified(old_path, new_path, old_value, new_value)
+
+    def diff_project(self, old: "SRProject", new: "SRProject") -> None:
+        for field_name in ("tempo", "video_transparency", "video_state", "text_to_speech_language"):
+            self.compare([field_name], [field_name], getattr(old, field_name), getattr(new, field_name))
+        self.diff_target(old.stage, new.stage, ["stage"], ["stage"])
+        self.diff_keyed(old.sprites, new.sprites, ["sprites"], ["sprites"], key=lambda sprite: sprite.name,
+            diff_item=self.diff_target,
+        )
+        old_layer_names = old.get_sprite_layer_names()
+        new_layer_names = new.get_sprite_layer_names()
+        if old_layer_names != new_layer_names:
+            self.modified(["sprite_layer_stack"], ["sprite_layer_stack"], old_layer_names, new_layer_names)
+        self.diff_keyed(old.all_sprite_variables, new.all_sprite_variables,
+            ["all_sprite_variables"], ["all_sprite_variables"], key=lambda variable: variable.name,
+        )
+        self.diff_keyed(old.all_sprite_lists, new.all_sprite_lists,
+            ["all_sprite_lists"], ["all_sprite_lists"], key=lambda list_: list_.name,
+        )
+        self.diff_keyed(old.global_monitors, new.global_monitors,
+            ["global_monitors"], ["global_monitors"], key=SRMonitor.get_display_key,
+        )
+        self.diff_keyed(old.extensions, new.extensions,
+            ["extensions"], ["extensions"], key=lambda extension: extension.id,
+        )
+        # unloaded sprites and their monitors are only compared as a whole. Their asset files are named after their content
+        old_unloaded, new_unloaded = old.unloaded_targets, new.unloaded_targets
+        self.diff_keyed([] if old_unloaded is None else old_unloaded.sprites, [] if new_unloaded is None else new_unloaded.sprites,
+            ["unloaded_targets", "sprites"], ["unloaded_targets", "sprites"], key=lambda sprite: sprite.name,
+        )
+        self.diff_keyed([] if old_unloaded is None else old_unloaded.monitors, [] if new_unloaded is None else new_unloaded.monitors,
+            ["unloaded_targets", "monitors"], ["unloaded_targets", "monitors"], key=lambda monitor: monitor.id,
+        )
+
+    def diff_target(self, old: "SRTarget", new: "SRTarget", old_path: list, new_path: list) -> None:
+        if old is new:
+            return
+        if type(old) is not type(new):
+            self.modified(old_path, new_path, old, new)
+            return
+        for field in fields(old):
+            if (not field.compare) or (field.name in _TARGET_ITEM_FIELDS):
+                continue
+            self.compare(old_path+[field.name], new_path+[field.name], getattr(old, field.name), getattr(new, field.name))
+        self.diff_scripts(old.scripts, new.scripts, old_path+["scripts"], new_path+["scripts"])
+        self.diff_unordered(old.comments, new.comments, old_path+["comments"], new_path+["comments"])
+        self.diff_keyed(old.costumes, new.costumes, old_path+["costumes"], new_path+["costumes"],
+            key=lambda costume: costume.name,
+        )
+        self.diff_keyed(old.sounds, new.sounds, old_path+["sounds"], new_path+["sounds"],
+            key=lambda sound: sound.name,
+        )
+        if hasattr(old, "sprite_only_variables"): # SRSprite
+            self.diff_keyed(old.sprite_only_variables, new.sprite_only_variables,
+                old_path+["sprite_only_variables"], new_path+["sprite_only_variables"], key=lambda variable: variable.name,
+            )
+            self.diff_keyed(old.sprite_only_lists, new.sprite_only_lists,
+                old_path+["sprite_only_lists"], new_path+["sprite_only_lists"], key=lambda list_: list_.name,
+            )
+            self.diff_keyed(old.local_monitors, new.local_monitors,
+                old_path+["local_monitors"], new_path+["local_monitors"], key=SRMonitor.get_display_key,
+            )
+
+    def diff_keyed(self,
+        old_items: list, new_items: list, old_path: list, new_path: list,
+        key: Callable[[Any], Hashable], diff_item: Callable[[Any, Any, list, list], None] | None = None,
+    ) -> None:
+        """
+        Diff two lists, whose items are identified by a key (e.g. the name of a sprite).
+        Items with the same key are compared with diff_item or as a whole
+        """
+        old_indexes_by_key: dict[Hashable, list[int]] = {}
+        for i, item in enumerate(old_items):
+            old_indexes_by_key.setdefault(key(item), []).append(i)
+        matched_old_indexes = set()
+        for j, new_item in enumerate(new_items):
+            old_indexes = old_indexes_by_key.get(key(new_item))
+            if not old_indexes:
+                self.added(new_path+[j], new_item)
+                continue
+            i = old_indexes.pop(0)
+            matched_old_indexes.add(i)
+            if diff_item is None:
+                self.compare(old_path+[i], new_path+[j], old_items[i], new_item)
+            else:
+                diff_item(old_items[i], new_item, old_path+[i], new_path+[j])
+        for i, old_item in enumerate(old_items):
+            if i not in matched_old_indexes:
+                self.removed(old_path+[i], old_item)
+
+    def diff_unordered(self, old_items: list, new_items: list, old_path: list, new_path: list) -> None:
+        """
+        Diff two lists of items without identity. Items are only added or removed
+        """
+        unmatched_new_indexes = list(range(len(new_items)))
+        for i, old_item in enumerate(old_items):
+            for position, j in enumerate(unmatched_new_indexes):
+                if new_items[j] == old_item:
+                    del unmatched_new_indexes[position]
+                    break
+            else:
+                self.removed(old_path+[i], old_item)
+        for j in unmatched_new_indexes:
+            self.added(new_path+[j], new_items[j])
+
+    def diff_scripts(self, old_scripts: list[SRScript], new_scripts: list[SRScript], old_path: list, new_path: list) -> None:
+        """
+        Diff the scripts of two targets. Scripts, which were only moved within the list, are no change.
+        Scripts, which were not matched exactly, are paired by position or first opcode and diffed block by block
+        """
+        _, old_unmatched, new_unmatched = match_scripts(old_scripts, new_scripts, self.memo)
+        pairs, remaining_old, remaining_new = pair_scripts(old_scripts, old_unmatched, new_scripts, new_unmatched)
+        for i, j in pairs:
+            self.diff_script(old_scripts[i], new_scripts[j], old_path+[i], new_path+[j])
+        for i in remaining_old:
+            self.removed(old_path+[i], old_scripts[i])
+        for j in remaining_new:
+            self.added(new_path+[j], new_scripts[j])
+
+    def diff_script(self, old: SRScript, new: SRScript, old_path: list, new_path: list) -> None:
+        self.compare(old_path+["position"], new_path+["position"], old.position, new.position)
+        self.diff_blocks(old.blocks, new.blocks, old_path+["blocks"], new_path+["blocks"])
+
+    def diff_blocks(self, old_blocks: list[SRBlock], new_blocks: list[SRBlock], old_path: list, new_path: list) -> None:
+        """
+        Diff two block sequences (a script or substack).
+        The blocks are aligned by their fingerprints, so inserted and removed blocks are detected
+        """
+        start = 0
+        end_offset = 0
+        max_length = min(len(old_blocks), len(new_blocks))
+        while (start < max_length) and (old_blocks[start] == new_blocks[start]):
+            start += 1
+        while (end_offset < max_length-start) and (old_blocks[-end_offset-1] == new_blocks[-end_offset-1]):
+            end_offset += 1
+        old_middle = old_blocks[start:len(old_blocks)-end_offset]
+        new_middle = new_blocks[start:len(new_blocks)-end_offset]
+        if not (old_middle or new_middle):
+            return
+
+        matcher = SequenceMatcher(None,
+            [fingerprint(block, self.memo) for block in old_middle],
+            [fingerprint(block, self.memo) for block in new_middle],
+            autojunk=False,
+        )
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            # pair replaced blocks by position, report the rest as removed or added
+            paired_length = min(old_end-old_start, new_end-new_start) if tag == "replace" else 0
+            for offset in range(paired_length):
+                i = start + old_start + offset
+                j = start + new_start + offset
+                self.diff_block(old_blocks[i], new_blocks[j], old_path+[i], new_path+[j])
+            for i in range(start + old_start + paired_length, start + old_end):
+                self.removed(old_path+[i], old_blocks[i])
+            for j in range(start + new_start + paired_length, start + new_end):
+                self.added(new_path+[j], new_blocks[j])
+
+    def diff_block(self, old: SRBlock, new: SRBlock, old_path: list, new_path: list) -> None:
+        if (old is new) or (old == new):
+            return
+        if old.opcode != new.opcode:
+            self.modified(old_path, new_path, old, new)
+            return
+        self.diff_dict(old.inputs, new.inputs, old_path+["inputs"], new_path+["inputs"], diff_item=self.diff_input)
+        self.diff_dict(old.dropdowns, new.dropdowns, old_path+["dropdowns"], new_path+["dropdowns"])
+        for field_name in ("comment", "mutation"):
+            old_value = getattr(old, field_name)
+            new_value = getattr(new, field_name)
+            if   (old_value is None) and (new_value is not None):
+                self.added(new_path+[field_name], new_value)
+            elif (old_value is not None) and (new_value is None):
+                self.removed(old_path+[field_name], old_value)
+            else:
+                self.compare(old_path+[field_name], new_path+[field_name], old_value, new_value)
+
+    def diff_dict(self,
+        old_items: dict[str, Any], new_items: dict[str, Any], old_path: list, new_path: list,
+        diff_item: Callable[[Any, Any, list, list], None] | None = None,
+    ) -> None:
+        """
+        Diff two dicts like the inputs or dropdowns of a block. Keys appear as (key,) in paths
+        """
+        for key, old_value in old_items.items():
+            if key not in new_items:
+                self.removed(old_path+[(key,)], old_value)
+            elif diff_item is None:
+                self.compare(old_path+[(key,)], new_path+[(key,)], old_value, new_items[key])
+            else:
+                diff_item(old_value, new_items[key], old_path+[(key,)], new_path+[(key,)])
+        for key, new_value in new_items.items():
+            if key not in old_items:
+                self.added(new_path+[(key,)], new_value)
+
+    def diff_input(self, old: SRInputValue, new: SRInputValue, old_path: list, new_path: list) -> None:
+        if (old is new) or (old == new):
+            return
+        if type(old) is not type(new):
+            self.modified(old_path, new_path, old, new)
+            return
+        for field_name in _INPUT_VALUE_FIELDS:
+            old_value = getattr(old, field_name, None)
+            new_value = getattr(new, field_name, None)
+            current_old_path = old_path+[field_name]
+            current_new_path = new_path+[field_name]
+            if field_name == "blocks":
+                self.diff_blocks(old_value or [], new_value or [], current_old_path, current_new_path)
+            elif (field_name == "block") and (old_value is not None) and (new_value is not None):
+                self.diff_block(old_value, new_value, current_old_path, current_new_path)
+            elif (old_value is None) and (new_value is not None):
+                self.added(current_new_path, new_value)
+            elif (old_value is not None) and (new_value is None):
+                self.removed(current_old_path, old_value)
+            else:
+                self.compare(current_old_path, current_new_path, old_value, new_value)
+
+def match_scripts(
+    old_scripts: list[SRScript], new_scripts: list[SRScript], memo: dict[int, tuple[Any, bytes]],
+) -> tuple[dict[int, int], list[int], list[int]]:
+    """
+    Find the scripts, which are unchanged between two revisions of a target, even if they were moved within the list.
+    Scripts at the same index are compared directly, only the others are matched by their fingerprints
+
+    Args:
+        old_scripts: the scripts of the old revision
+        new_scripts: the scripts of the new revision
+        memo: the fingerprint memo (see fingerprint)
+
+    Returns:
+        the old index -> new index of the unchanged scripts, the old indexes and the new indexes of the other scripts
+    """
+    unchanged = {}
+    old_unmatched = []
+    new_unmatched = []
+    for i in range(max(len(old_scripts), len(new_scripts))):
+        if (i < len(old_scripts)) and (i < len(new_scripts)):
+            if (old_scripts[i] is new_scripts[i]) or (old_scripts[i] == new_scripts[i]):
+                unchanged[i] = i
+                continue
+        if i < len(old_scripts):
+            old_unmatched.append(i)
+        if i < len(new_scripts):
+            new_unmatched.append(i)
+    if not (old_unmatched and new_unmatched):
+        return (unchanged, old_unmatched, new_unmatched)
+
+    old_indexes_by_fingerprint: dict[bytes, list[int]] = {}
+    for i in old_unmatched:
+        old_indexes_by_fingerprint.setdefault(fingerprint(old_scripts[i], memo), []).append(i)
+    remaining_new = []
+    for j in new_unmatched:
+        old_indexes = old_indexes_by_fingerprint.get(fingerprint(new_scripts[j], memo))
+        if old_indexes:
+            unchanged[old_indexes.pop(0)] = j
+        else:
+            remaining_new.append(j)
+    remaining_old = sorted(i for old_indexes in old_indexes_by_fingerprint.values() for i in old_indexes)
+    return (unchanged, remaining_old, remaining_new)
+
+def pair_scripts(
+    old_scripts: list[SRScript], old_indexes: list[int], new_scripts: list[SRScript], new_indexes: list[int],
+) -> tuple[list[tuple[int, int]], list[int], list[int]]:
+    """
+    Pair changed scripts of two revisions of a target, which are probably the same script:
+    first by their position, then by the opcode of their first block
+
+    Args:
+        old_scripts: the scripts of the old revision
+        old_indexes: the indexes of the changed old scripts (see match_scripts)
+        new_scripts: the scripts of the new revision
+        new_indexes: the indexes of the changed new scripts (see match_scripts)
+
+    Returns:
+        the (old index, new index) pairs, the removed old indexes and the added new indexes
+    """
+    pairs = []
+    for pair_key in (
+        lambda script: tuple(script.position),
+        lambda script: script.blocks[0].opcode if script.blocks else None,
+    ):
+        old_indexes_by_key: dict[Hashable, list[int]] = {}
+        for i in old_indexes:
+            old_indexes_by_key.setdefault(pair_key(old_scripts[i]), []).append(i)
+        paired_old = set()
+        remaining_new = []
+        for j in new_indexes:
+            candidates = old_indexes_by_key.get(pair_key(new_scripts[j]))
+            if not candidates:
+                remaining_new.append(j)
+                continue
+            i = candidates.pop(0)
+            paired_old.add(i)
+            pairs.append((i, j))
+        old_indexes = [i for i in old_indexes if i not in paired_old]
+        new_indexes = remaining_new
+    return (pairs, old_indexes, new_indexes)
+
+def diff_projects(old: "SRProject", new: "SRProject") -> SRProjectDiff:
+    """
+    Calculate the structural difference between two revisions of a project.
+    Sprites, costumes, sounds and variables are matched by name, monitors by what they show,
+    scripts by content and position and blocks by their position in a script.
+    Unloaded sprites (see SRProject.unloaded_targets) are compared as a whole.
+    Unchanged subtrees are skipped as a whole
+
+    Args:
+        old: the old revision
+        new: the new revision
+
+    Returns:
+        the added, removed and modified sprites, scripts, blocks, variables, monitors, assets etc.
+    """
+    differ = _Differ()
+    differ.diff_project(old, new)
+    return SRProjectDiff(changes=differ.changes)
+
+
+__all__ = ["SRChangeKind", "SRChange", "SRProjectDiff", "diff_projects", "match_scripts", "pair_scripts"]
+
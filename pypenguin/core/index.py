@@ -0,0 +1,298 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import SRProject
+
+from pypenguin.opcode_info.api import DropdownValueKind
+from pypenguin.utility         import grepr_dataclass, fingerprint, PypenguinEnum
+
+from pypenguin.core.block          import SRBlock
+from pypenguin.core.block_mutation import SRCustomBlockMutation, SRCustomBlockCallMutation
+from pypenguin.core.custom_block   import SRCustomBlockOpcode
+from pypenguin.core.dropdown       import SRDropdownValue
+from pypenguin.core.target         import SRTarget
+from pypenguin.core.traversal      import walk_sr_blocks
+
+
+# The dropdowns (and inputs with a dropdown), which modify the referenced variable or list or send the referenced broadcast.
+# All other references read
+WRITING_DROPDOWNS: set[tuple[str, str]] = {
+    ("set [VARIABLE] to (VALUE)"                  , "VARIABLE"),
+    ("change [VARIABLE] by (VALUE)"               , "VARIABLE"),
+    ("for each [VARIABLE] in (RANGE) {BODY}"      , "VARIABLE"),
+    ("For each item [VARIABLE] in [LIST] {BODY}"  , "VARIABLE"),
+    ("For each item # [VARIABLE] in [LIST] {BODY}", "VARIABLE"),
+    ("add (ITEM) to [LIST]"                       , "LIST"),
+    ("delete (INDEX) of [LIST]"                   , "LIST"),
+    ("delete all of [LIST]"                       , "LIST"),
+    ("shift [LIST] by (INDEX)"                    , "LIST"),
+    ("insert (ITEM) at (INDEX) of [LIST]"         , "LIST"),
+    ("replace item (INDEX) of [LIST] with (ITEM)" , "LIST"),
+    ("reverse [LIST]"                             , "LIST"),
+    ("set [LIST] to array (VALUE)"                , "LIST"),
+    ("broadcast ([MESSAGE])"                      , "MESSAGE"),
+    ("broadcast ([MESSAGE]) and wait"             , "MESSAGE"),
+}
+INDEXED_DROPDOWN_KINDS = (DropdownValueKind.VARIABLE, DropdownValueKind.LIST, DropdownValueKind.BROADCAST_MSG)
+
+
+class SRAccessKind(PypenguinEnum):
+    """
+    How a block accesses a variable, list or broadcast. Sending a broadcast counts as writing it
+    """
+
+    READ  = 0
+    WRITE = 1
+
+@grepr_dataclass(grepr_fields=["path", "block"])
+class SRBlockLocation:
+    """
+    Where a block is within a SRProject.
+    The path is stored relative to the parent block and built on demand
+    """
+
+    target: SRTarget
+    block: SRBlock
+    parent: "SRBlockLocation | None" # the block, which contains this block in an input. None for top level blocks
+    steps: tuple # the path from the parent block or from the project for top level blocks
+
+    @property
+    def path(self) -> list:
+        """
+        Get the path from the project to the block. It has the same format as the paths of validation errors
+
+        Returns:
+            the path
+        """
+        parts = []
+        location = self
+        while location is not None:
+            parts.append(location.steps)
+            location = location.parent
+        return [step for steps in reversed(parts) for step in steps]
+
+    @property
+    def target_path(self) -> list:
+        """
+        Get the path of the target, which contains the block
+
+        Returns:
+            the path of the target
+        """
+        location = self
+        while location.parent is not None:
+            location = location.parent
+        return list(location.steps[:1] if location.steps[0] == "stage" else location.steps[:2])
+
+@grepr_dataclass(grepr_fields=["location", "access"])
+class SRDataReference:
+    """
+    A reference of a block to a variable, list or broadcast
+    """
+
+    location: SRBlockLocation
+    access: SRAccessKind
+
+@grepr_dataclass(grepr_fields=["block_count"], eq=False)
+class SRBlockIndex:
+    """
+    An index of all blocks of a SRProject, which is built in one pass (see from_project).
+    **The index does not notice modifications of the project, get it with SRProject.get_block_index instead**
+    """
+
+    block_count: int
+    opcode_locations: dict[str, list[SRBlockLocation]]
+    data_references: dict[tuple[DropdownValueKind, str], list[SRDataReference]]
+    custom_block_definitions: dict[SRCustomBlockOpcode, list[SRBlockLocation]]
+    custom_block_calls: dict[SRCustomBlockOpcode, list[SRBlockLocation]]
+    project_fingerprint: bytes # the cached fingerprint of the project when the index was built (see fingerprint)
+
+    @classmethod
+    def from_project(cls, project: "SRProject") -> "SRBlockIndex":
+        """
+        Index all blocks of a SRProject
+
+        Args:
+            project: the SRProject
+
+        Returns:
+            the index
+        """
+        index = cls(
+            block_count              = 0,
+            opcode_locations         = {},
+            data_references          = {},
+            custom_block_definitions = {},
+            custom_block_calls       = {},
+            project_fingerprint      = fingerprint(project),
+        )
+        targets = [(["stage"], project.stage)] + [(["sprites", i], sprite) for i, sprite in enumerate(project.sprites)]
+        for target_path, target in targets:
+            ancestors: list[tuple[int, SRBlockLocation]] = [] # the path lengths and locations from the top level block to the last block
+            for path, block in walk_sr_blocks(target, target_path):
+                # nested blocks are at [..., "inputs", (input id,), "block"] or [..., "inputs", (input id,), "blocks", i]
+                if path[-1] == "block":
+                    parent_length = len(path) - 3
+                elif path[-4] == "inputs":
+                    parent_length = len(path) - 4
+                else:
+                    parent_length = None # top level block
+                if parent_length is None:
+                    ancestors.clear()
+                    parent, steps = None, tuple(path)
+                else:
+                    # in pre-order, the parent is the deepest remaining ancestor
+                    while ancestors[-1][0] > parent_length:
+                        ancestors.pop()
+                    parent, steps = ancestors[-1][1], tuple(path[parent_length:])
+                location = SRBlockLocation(target=target, block=block, parent=parent, steps=steps)
+                ancestors.append((len(path), location))
+                index._add_block(location)
+        return index
+
+    def _add_block(self, location: SRBlockLocation) -> None:
+        """
+        *[Internal Method]* Add a block to the index. The blocks in its inputs are added separately
+        """
+        block = location.block
+        self.block_count += 1
+        self.opcode_locations.setdefault(block.opcode, []).append(location)
+        for dropdown_id, dropdown_value in block.dropdowns.items():
+            self._add_data_reference(location, dropdown_id, dropdown_value)
+        if isinstance(block.mutation, SRCustomBlockMutation):
+            self.custom_block_definitions.setdefault(block.mutation.custom_opcode, []).append(location)
+        elif isinstance(block.mutation, SRCustomBlockCallMutation):
+            self.custom_block_calls.setdefault(block.mutation.custom_opcode, []).append(location)
+        for input_id, input_value in block.inputs.items():
+            self._add_data_reference(location, input_id, getattr(input_value, "dropdown", None))
+
+    def _add_data_reference(self, location: SRBlockLocation, dropdown_id: str, dropdown_value: SRDropdownValue | None) -> None:
+        """
+        *[Internal Method]* Add a reference to a variable, list or broadcast if the dropdown value is one
+        """
+        if (dropdown_value is None) or (dropdown_value.kind not in INDEXED_DROPDOWN_KINDS):
+            return
+        if (location.block.opcode, dropdown_id) in WRITING_DROPDOWNS:
+            access = SRAccessKind.WRITE
+        else:
+            access = SRAccessKind.READ
+        self.data_references.setdefault((dropdown_value.kind, dropdown_value.value), []).append(
+            SRDataReference(location=location, access=access)
+        )
+
+    def find_blocks(self, opcode: str) -> list[SRBlockLocation]:
+        """
+        Find all blocks with an opcode
+
+        Args:
+            opcode: the new opcode (e.g. "create clone of ([TARGET])")
+
+        Returns:
+            the locations of the blocks in project order
+        """
+        return list(self.opcode_locations.get(opcode, []))
+
+    def targets_using(self, opcode: str) -> list[SRTarget]:
+        """
+        Find all targets, which use an opcode
+
+        Args:
+            opcode: the new opcode
+
+        Returns:
+            the targets in project order without duplicates
+        """
+        targets = {}
+        for location in self.opcode_locations.get(opcode, []):
+            targets.setdefault(id(location.target), location.target)
+        return list(targets.values())
+
+    def find_references(self,
+        kind: DropdownValueKind,
+        name: str,
+        access: SRAccessKind | None = None,
+        target: SRTarget | None = None,
+    ) -> list[SRDataReference]:
+        """
+        Find the blocks, which reference a variable, list or broadcast
+
+        Args:
+            kind: VARIABLE, LIST or BROADCAST_MSG
+            name: the name of the variable, list or broadcast
+            access: only return READ or only WRITE references if given
+            target: only return references within this target if given. Useful for sprite only variables and lists
+
+        Returns:
+            the references in project order
+        """
+        return [
+            reference for reference in self.data_references.get((kind, name), [])
+            if ((access is None) or (reference.access is access))
+            and ((target is None) or (reference.location.target is target))
+        ]
+
+    def find_readers(self, kind: DropdownValueKind, name: str, target: SRTarget | None = None) -> list[SRBlockLocation]:
+        """
+        Find the blocks, which read a variable or list or receive a broadcast
+
+        Args:
+            kind: VARIABLE, LIST or BROADCAST_MSG
+            name: the name of the variable, list or broadcast
+            target: only return blocks within this target if given
+
+        Returns:
+            the locations of the blocks in project order
+        """
+        return [reference.location for reference in self.find_references(kind, name, SRAccessKind.READ, target)]
+
+    def find_writers(self, kind: DropdownValueKind, name: str, target: SRTarget | None = None) -> list[SRBlockLocation]:
+        """
+        Find the blocks, which modify a variable or list or send a broadcast
+
+        Args:
+            kind: VARIABLE, LIST or BROADCAST_MSG
+            name: the name of the variable, list or broadcast
+            target: only return blocks within this target if given
+
+        Returns:
+            the locations of the blocks in project order
+        """
+        return [reference.location for reference in self.find_references(kind, name, SRAccessKind.WRITE, target)]
+
+    def find_custom_block_definition(self, custom_opcode: SRCustomBlockOpcode, target: SRTarget) -> SRBlockLocation | None:
+        """
+        Find the definition of a custom block. Custom blocks are local to their target
+
+        Args:
+            custom_opcode: the custom opcode
+            target: the target
+
+        Returns:
+            the location of the definition or None if it does not exist
+        """
+        for location in self.custom_block_definitions.get(custom_opcode, []):
+            if location.target is target:
+                return location
+        return None
+
+    def find_custom_block_calls(self, custom_opcode: SRCustomBlockOpcode, target: SRTarget | None = None) -> list[SRBlockLocation]:
+        """
+        Find the calls of a custom block
+
+        Args:
+            custom_opcode: the custom opcode
+            target: only return calls within this target if given
+
+        Returns:
+            the locations of the calls in project order
+        """
+        return [
+            location for location in self.custom_block_calls.get(custom_opcode, [])
+            if (target is None) or (location.target is target)
+        ]
+
+
+__all__ = [
+    "WRITING_DROPDOWNS", "SRAccessKind", "SRBlockLocation", "SRDataReference", "SRBlockIndex",
+]
+
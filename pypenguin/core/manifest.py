@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import FRProject
+
+from pypenguin.utility import grepr_dataclass, read_image_size, read_audio_info
+
+from pypenguin.core.asset import FRCostume, FRSound
+
+
+@grepr_dataclass(grepr_fields=["target_name", "kind", "name", "md5ext", "file_size", "width", "height", "rate", "sample_count"])
+class AssetManifestEntry:
+    """
+    The information about a costume or sound of a FRProject, which is read from the file headers without decoding the file.
+    ProjectScan uses it too, but does not read the file headers
+    """
+
+    target_name: str
+    kind: str # "costume" or "sound"
+    name: str
+    asset_id: str # the md5 hash of the file
+    md5ext: str # the file name within the project file
+    data_format: str
+    file_size: int | None # None if the file is missing or unknown
+    width: int | float | None # in pixels, only for costumes. None if unknown
+    height: int | float | None
+    bitmap_resolution: int | None # only for bitmap costumes
+    rate: int | None # only for sounds. None if unknown
+    sample_count: int | None
+
+    @property
+    def duration(self) -> float | None:
+        """
+        Get the duration of a sound
+
+        Returns:
+            the duration in seconds or None if unknown or not a sound
+        """
+        if (self.rate is None) or (self.sample_count is None) or (self.rate == 0):
+            return None
+        return self.sample_count / self.rate
+
+
+def build_asset_manifest(project: "FRProject") -> list[AssetManifestEntry]:
+    """
+    List the costumes and sounds of all targets of a FRProject with their sizes, dimensions and durations.
+    Only the file headers are read (see read_image_size and read_audio_info), no asset is decoded
+
+    Args:
+        project: the FRProject
+
+    Returns:
+        the manifest entries in target order, costumes before sounds
+    """
+    entries = []
+    for target in project.targets:
+        for costume in target.costumes:
+            entries.append(_build_entry(target.name, "costume", costume, project.asset_files.get(costume.md5ext)))
+        for sound in target.sounds:
+            entries.append(_build_entry(target.name, "sound", sound, project.asset_files.get(sound.md5ext)))
+    return entries
+
+def _build_entry(target_name: str, kind: str, asset: FRCostume | FRSound, data: bytes | None) -> AssetManifestEntry:
+    """
+    *[Helper Function]* Create the manifest entry of a costume or sound from the header of its file
+    """
+    size = rate = sample_count = None
+    if data is not None:
+        if kind == "costume":
+            size = read_image_size(data, asset.data_format)
+        else:
+            audio_info = read_audio_info(data, asset.data_format)
+            if audio_info is not None:
+                rate, sample_count = audio_info
+    return AssetManifestEntry(
+        target_name       = target_name,
+        kind              = kind,
+        name              = asset.name,
+        asset_id          = asset.asset_id,
+        md5ext            = asset.md5ext,
+        data_format       = asset.data_format,
+        file_size         = None if data is None else len(data),
+        width             = None if size is None else size[0],
+        height            = None if size is None else size[1],
+        bitmap_resolution = asset.bitmap_resolution if (kind == "costume") and (asset.data_format != "svg") else None,
+        rate              = rate,
+        sample_count      = sample_count,
+    )
+
+
+__all__ = ["AssetManifestEntry", "build_asset_manifest"]
+
@@ -0,0 +1,402 @@
+from copy        import copy
+from dataclasses import fields
+from typing      import Any, Callable, Hashable
+
+from pypenguin.utility import grepr_dataclass, fingerprint, generate_path_string
+
+from pypenguin.core.block   import SRScript
+from pypenguin.core.diff    import match_scripts, pair_scripts
+from pypenguin.core.monitor import SRMonitor
+from pypenguin.core.project import FRUnloadedTargets, SRProject
+from pypenguin.core.target  import SRTarget
+
+
+_MISSING = object() # marks an item, which does not exist in a revision
+
+# These fields of SRTarget/SRSprite are merged item by item, all others are merged as a whole
+_TARGET_ITEM_FIELDS = {
+    "scripts", "comments", "costume_index", "costumes", "sounds",
+    "sprite_only_variables", "sprite_only_lists", "local_monitors",
+}
+
+
+@grepr_dataclass(grepr_fields=["path", "message"])
+class SRMergeConflict:
+    """
+    A conflict of a three-way merge, which was resolved in favor of ours.
+    The path has the same format as the paths of validation errors.
+    It points into ours or into base if the conflicting item does not exist in ours
+    """
+
+    path: list
+    message: str
+    base: Any
+    ours: Any
+    theirs: Any
+
+    def to_string(self) -> str:
+        """
+        Describe the conflict in a single line
+
+        Returns:
+            the description
+        """
+        return f"{generate_path_string(self.path)}: {self.message}"
+
+@grepr_dataclass(grepr_fields=["project", "conflicts"])
+class SRMergeResult:
+    """
+    The result of a three-way merge (see merge_projects)
+    """
+
+    project: SRProject
+    conflicts: list[SRMergeConflict]
+
+    @property
+    def has_conflicts(self) -> bool:
+        """
+        Check whether the merge had any conflicts
+
+        Returns:
+            wether the merge had any conflicts
+        """
+        return bool(self.conflicts)
+
+
+class _Merger:
+    """
+    *[Internal Class]* Merges the changes of two revisions (ours, theirs) of a common base revision.
+    Targets, which were only changed on one side, are taken as a whole.
+    Scripts are matched like in diff_projects, so only the changed scripts are fingerprinted
+    """
+
+    def __init__(self) -> None:
+        self.conflicts: list[SRMergeConflict] = []
+        self.memo: dict[int, tuple[Any, bytes]] = {}
+
+    def conflict(self, path: list, message: str, base: Any, ours: Any, theirs: Any) -> None:
+        self.conflicts.append(SRMergeConflict(
+            path=path, message=message,
+            base=None if base is _MISSING else base, ours=None if ours is _MISSING else ours, theirs=None if theirs is _MISSING else theirs,
+        ))
+
+    def merge_value(self, path: list, base: Any, ours: Any, theirs: Any) -> Any:
+        """
+        Merge a value as a whole
+        """
+        if (ours is theirs) or (ours == theirs):
+            return ours
+        if (base is not _MISSING) and ((base is ours) or (base == ours)):
+            return theirs
+        if (base is not _MISSING) and ((base is theirs) or (base == theirs)):
+            return ours
+        if base is _MISSING:
+            self.conflict(path, "added differently on both sides", base, ours, theirs)
+        else:
+            self.conflict(path, "modified differently on both sides", base, ours, theirs)
+        return ours
+
+    def merge_keyed(self,
+        path: list, base_items: list, ours_items: list, theirs_items: list, key: Callable[[Any], Hashable],
+        merge_item: Callable[[list, Any, Any, Any], Any] | None = None,
+    ) -> list:
+        """
+        Merge lists, whose items are identified by a key (e.g. the name of a sprite).
+        The merged list has the order of ours, items added by theirs are appended
+        """
+        if merge_item is None:
+            merge_item = self.merge_value
+        base_by_key = {}
+        for i, item in enumerate(base_items):
+            base_by_key.setdefault(key(item), (i, item))
+        theirs_by_key = {}
+        for item in theirs_items:
+            theirs_by_key.setdefault(key(item), item)
+
+        merged = []
+        ours_keys = set()
+        for j, ours_item in enumerate(ours_items):
+            item_key = key(ours_item)
+            ours_keys.add(item_key)
+            _, base_item = base_by_key.get(item_key, (None, _MISSING))
+            theirs_item = theirs_by_key.get(item_key, _MISSING)
+            if theirs_item is _MISSING:
+                if base_item is _MISSING: # added by ours
+                    merged.append(ours_item)
+                elif (ours_item is not base_item) and (ours_item != base_item):
+                    self.conflict(path+[j], "modified by ours, deleted by theirs", base_item, ours_item, theirs_item)
+                    merged.append(ours_item)
+                # otherwise deleted by theirs
+            elif base_item is _MISSING:
+                merged.append(self.merge_value(path+[j], base_item, ours_item, theirs_item))
+            else:
+                merged.append(merge_item(path+[j], base_item, ours_item, theirs_item))
+
+        for theirs_item in theirs_items:
+            item_key = key(theirs_item)
+            if item_key in ours_keys:
+                continue
+            i, base_item = base_by_key.get(item_key, (None, _MISSING))
+            if base_item is _MISSING: # added by theirs
+                merged.append(theirs_item)
+            elif (theirs_item is not base_item) and (theirs_item != base_item):
+                self.conflict(path+[i], "deleted by ours, modified by theirs", base_item, _MISSING, theirs_item)
+            # otherwise deleted by ours
+        return merged
+
+    def merge_unordered(self, base_items: list, ours_items: list, theirs_items: list) -> list:
+        """
+        Merge lists of items without identity (e.g. comments) as multisets. Items can only be added or removed
+        """
+        def counts(items: list) -> dict[bytes, int]:
+            result = {}
+            for item in items:
+                item_fingerprint = fingerprint(item, self.memo)
+                result[item_fingerprint] = result.get(item_fingerprint, 0) + 1
+            return result
+
+        base_counts = counts(base_items)
+        theirs_counts = counts(theirs_items)
+        removed_by_theirs = {
+            item_fingerprint: count - theirs_counts.get(item_fingerprint, 0)
+            for item_fingerprint, count in base_counts.items()
+        }
+        merged = []
+        for item in ours_items:
+            item_fingerprint = fingerprint(item, self.memo)
+            if removed_by_theirs.get(item_fingerprint, 0) > 0:
+                removed_by_theirs[item_fingerprint] -= 1
+            else:
+                merged.append(item)
+        added_by_ours = counts(ours_items)
+        for item_fingerprint, count in base_counts.items():
+            added_by_ours[item_fingerprint] = added_by_ours.get(item_fingerprint, 0) - count
+        for item in theirs_items:
+            item_fingerprint = fingerprint(item, self.memo)
+            if theirs_counts[item_fingerprint] <= base_counts.get(item_fingerprint, 0):
+                continue # not added by theirs
+            if added_by_ours.get(item_fingerprint, 0) > 0: # added on both sides
+                added_by_ours[item_fingerprint] -= 1
+            else:
+                merged.append(item)
+            theirs_counts[item_fingerprint] -= 1
+        return merged
+
+    def merge_project(self, base: SRProject, ours: SRProject, theirs: SRProject) -> SRProject:
+        merged = copy(ours)
+        for field_name in ("tempo", "video_transparency", "video_state", "text_to_speech_language"):
+            setattr(merged, field_name, self.merge_value(
+                [field_name], getattr(base, field_name), getattr(ours, field_name), getattr(theirs, field_name),
+            ))
+        merged.stage = self.merge_target(["stage"], base.stage, ours.stage, theirs.stage)
+        merged.sprites = self.merge_keyed(["sprites"], base.sprites, ours.sprites, theirs.sprites,
+            key=lambda sprite: sprite.name, merge_item=self.merge_target,
+        )
+        merged.sprite_layer_stack = self.merge_layer_stack(base, ours, theirs, merged.sprites)
+        merged.all_sprite_variables = self.merge_keyed(["all_sprite_variables"],
+            base.all_sprite_variables, ours.all_sprite_variables, theirs.all_sprite_variables, key=lambda variable: variable.name,
+        )
+        merged.all_sprite_lists = self.merge_keyed(["all_sprite_lists"],
+            base.all_sprite_lists, ours.all_sprite_lists, theirs.all_sprite_lists, key=lambda list_: list_.name,
+        )
+        merged.global_monitors = self.merge_keyed(["global_monitors"],
+            base.global_monitors, ours.global_monitors, theirs.global_monitors, key=SRMonitor.get_display_key,
+        )
+        merged.extensions = self.merge_keyed(["extensions"],
+            base.extensions, ours.extensions, theirs.extensions, key=lambda extension: extension.id,
+        )
+        merged.unloaded_targets = self.merge_unloaded_targets(base, ours, theirs, merged.sprites)
+        return merged
+
+    def merge_unloaded_targets(self,
+        base: SRProject, ours: SRProject, theirs: SRProject, merged_sprites: list,
+    ) -> FRUnloadedTargets | None:
+        """
+        Merge the unloaded sprites and their monitors as a whole. A sprite, which is loaded on only one side, is kept loaded
+        """
+        sides = [project.unloaded_targets for project in (base, ours, theirs)]
+        if all(unloaded_targets is None for unloaded_targets in sides):
+            return None
+        sprites = self.merge_keyed(["unloaded_targets", "sprites"],
+            *[[] if unloaded_targets is None else unloaded_targets.sprites for unloaded_targets in sides],
+            key=lambda sprite: sprite.name,
+        )
+        loaded_names = {sprite.name for sprite in merged_sprites}
+        for j, sprite in enumerate(sprites):
+            if sprite.name in loaded_names:
+                self.conflict(["unloaded_targets", "sprites", j], "loaded on only one side", _MISSING, _MISSING, sprite)
+        sprites = [sprite for sprite in sprites if sprite.name not in loaded_names]
+        if not sprites:
+            return None
+        unloaded_names = {sprite.name for sprite in sprites}
+        monitors = self.merge_keyed(["unloaded_targets", "monitors"],
+            *[[] if unloaded_targets is None else unloaded_targets.monitors for unloaded_targets in sides],
+            key=lambda monitor: monitor.id,
+        )
+        asset_files = {}
+        for unloaded_targets in sides:
+            if unloaded_targets is not None:
+                asset_files.update(unloaded_targets.asset_files)
+        return FRUnloadedTargets(
+            sprites     = sprites,
+            monitors    = [monitor for monitor in monitors if monitor.sprite_name in unloaded_names],
+            asset_files = {asset.md5ext: asset_files[asset.md5ext] for sprite in sprites for asset in sprite.costumes + sprite.sounds},
+        )
+
+    def merge_layer_stack(self, base: SRProject, ours: SRProject, theirs: SRProject, merged_sprites: list) -> list:
+        """
+        Merge the sprite layer order. Sprites added by theirs are put on top
+        """
+        base_names = base.get_sprite_layer_names()
+        ours_names = ours.get_sprite_layer_names()
+        theirs_names = theirs.get_sprite_layer_names()
+        def reordered(names: list[str]) -> bool:
+            return (
+                [name for name in names if name in base_names]
+                != [name for name in base_names if name in names]
+            )
+
+        order = ours_names
+        if reordered(theirs_names):
+            if not reordered(ours_names):
+                order = theirs_names
+            elif [name for name in ours_names if name in theirs_names] != [name for name in theirs_names if name in ours_names]:
+                self.conflict(["sprite_layer_stack"], "reordered differently on both sides", base_names, ours_names, theirs_names)
+        uuid_by_name = {sprite.name: sprite.uuid for sprite in merged_sprites}
+        merged_names = [name for name in order if name in uuid_by_name]
+        merged_names += [name for name in theirs_names if (name in uuid_by_name) and (name not in merged_names)]
+        merged_names += [sprite.name for sprite in merged_sprites if sprite.name not in merged_names]
+        return [uuid_by_name[name] for name in merged_names]
+
+    def merge_target(self, path: list, base: SRTarget, ours: SRTarget, theirs: SRTarget) -> SRTarget:
+        if (theirs is base) or (ours is theirs):
+            return ours
+        if ours is base:
+            return theirs
+        if type(ours) is not type(theirs):
+            return self.merge_value(path, base, ours, theirs)
+        merged = copy(ours) # keeps the UUID of ours
+        for field in fields(ours):
+            if (not field.compare) or (field.name in _TARGET_ITEM_FIELDS):
+                continue
+            setattr(merged, field.name, self.merge_value(path+[field.name],
+                getattr(base, field.name), getattr(ours, field.name), getattr(theirs, field.name),
+            ))
+        merged.scripts = self.merge_scripts(path+["scripts"], base.scripts, ours.scripts, theirs.scripts)
+        merged.comments = self.merge_unordered(base.comments, ours.comments, theirs.comments)
+        merged.costumes = self.merge_keyed(path+["costumes"], base.costumes, ours.costumes, theirs.costumes,
+            key=lambda costume: costume.name,
+        )
+        merged.sounds = self.merge_keyed(path+["sounds"], base.sounds, ours.sounds, theirs.sounds,
+            key=lambda sound: sound.name,
+        )
+        costume_name = self.merge_value(path+["costume_index"],
+            _costume_name(base), _costume_name(ours), _costume_name(theirs),
+        )
+        costume_names = [costume.name for costume in merged.costumes]
+        merged.costume_index = costume_names.index(costume_name) if costume_name in costume_names else 0
+        if hasattr(ours, "sprite_only_variables"): # SRSprite
+            merged.sprite_only_variables = self.merge_keyed(path+["sprite_only_variables"],
+                base.sprite_only_variables, ours.sprite_only_variables, theirs.sprite_only_variables,
+                key=lambda variable: variable.name,
+            )
+            merged.sprite_only_lists = self.merge_keyed(path+["sprite_only_lists"],
+                base.sprite_only_lists, ours.sprite_only_lists, theirs.sprite_only_lists,
+                key=lambda list_: list_.name,
+            )
+            merged.local_monitors = self.merge_keyed(path+["local_monitors"],
+                base.local_monitors, ours.local_monitors, theirs.local_monitors, key=SRMonitor.get_display_key,
+            )
+        return merged
+
+    def merge_scripts(self,
+        path: list, base_scripts: list[SRScript], ours_scripts: list[SRScript], theirs_scripts: list[SRScript],
+    ) -> list[SRScript]:
+        """
+        Merge the scripts of a target. A script is the smallest unit:
+        if both sides changed the same script differently, it is a conflict
+        """
+        ours_unchanged, ours_changed, ours_new = match_scripts(base_scripts, ours_scripts, self.memo)
+        theirs_unchanged, theirs_changed, theirs_new = match_scripts(base_scripts, theirs_scripts, self.memo)
+        if not (theirs_changed or theirs_new):
+            return ours_scripts
+        if not (ours_changed or ours_new):
+            return theirs_scripts
+        ours_modified, ours_deleted, ours_added = pair_scripts(base_scripts, ours_changed, ours_scripts, ours_new)
+        theirs_modified, theirs_deleted, theirs_added = pair_scripts(base_scripts, theirs_changed, theirs_scripts, theirs_new)
+        ours_origin = {j: i for i, j in ours_unchanged.items()}
+        ours_modified_origin = {j: i for i, j in ours_modified}
+        theirs_modified_by_base = dict(theirs_modified)
+        theirs_deleted = set(theirs_deleted)
+
+        merged = []
+        for j, ours_script in enumerate(ours_scripts):
+            if j in ours_origin:
+                i = ours_origin[j]
+                if i in theirs_unchanged:
+                    merged.append(ours_script)
+                elif i in theirs_modified_by_base:
+                    merged.append(theirs_scripts[theirs_modified_by_base[i]])
+                # otherwise deleted by theirs
+            elif j in ours_modified_origin:
+                i = ours_modified_origin[j]
+                if i in theirs_modified_by_base:
+                    theirs_script = theirs_scripts[theirs_modified_by_base[i]]
+                    if fingerprint(ours_script, self.memo) != fingerprint(theirs_script, self.memo):
+                        self.conflict(path+[j], "modified differently on both sides", base_scripts[i], ours_script, theirs_script)
+                elif i in theirs_deleted:
+                    self.conflict(path+[j], "modified by ours, deleted by theirs", base_scripts[i], ours_script, _MISSING)
+                merged.append(ours_script)
+            else: # added by ours
+                merged.append(ours_script)
+
+        for i in ours_deleted:
+            if i in theirs_modified_by_base:
+                theirs_script = theirs_scripts[theirs_modified_by_base[i]]
+                self.conflict(path+[i], "deleted by ours, modified by theirs", base_scripts[i], _MISSING, theirs_script)
+
+        ours_added_fingerprints = {}
+        for j in ours_added:
+            script_fingerprint = fingerprint(ours_scripts[j], self.memo)
+            ours_added_fingerprints[script_fingerprint] = ours_added_fingerprints.get(script_fingerprint, 0) + 1
+        for j in theirs_added:
+            script_fingerprint = fingerprint(theirs_scripts[j], self.memo)
+            if ours_added_fingerprints.get(script_fingerprint, 0) > 0: # added on both sides
+                ours_added_fingerprints[script_fingerprint] -= 1
+            else:
+                merged.append(theirs_scripts[j])
+        return merged
+
+
+def _costume_name(target: SRTarget) -> str | None:
+    """
+    *[Helper Function]* Get the name of the current costume of a target
+    """
+    if 0 <= target.costume_index < len(target.costumes):
+        return target.costumes[target.costume_index].name
+    return None
+
+def merge_projects(base: SRProject, ours: SRProject, theirs: SRProject) -> SRMergeResult:
+    """
+    Merge two revisions (ours and theirs) of a common base revision.
+    Sprites, costumes, sounds and variables are matched by name, monitors by what they show and scripts like in diff_projects.
+    Unloaded sprites (see SRProject.unloaded_targets) are merged as a whole.
+    Changes made by only one side are applied. Changes of the same item (e.g. the same script or variable)
+    on both sides are conflicts, which are resolved in favor of ours and reported.
+    **The merged project shares unchanged objects with ours and theirs; deepcopy it before modifying it in place**
+
+    Args:
+        base: the common base revision
+        ours: our revision
+        theirs: their revision
+
+    Returns:
+        the merged project and the conflicts
+    """
+    merger = _Merger()
+    project = merger.merge_project(base, ours, theirs)
+    return SRMergeResult(project=project, conflicts=merger.conflicts)
+
+
+__all__ = ["SRMergeConflict", "SRMergeResult", "merge_projects"]
+
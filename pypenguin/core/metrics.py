@@ -0,0 +1,219 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import FRProject
+
+from pypenguin.utility import grepr_dataclass, find_cyclic_components
+
+from pypenguin.core.block          import FRBlock
+from pypenguin.core.block_mutation import FRCustomBlockMutation, FRCustomBlockCallMutation
+
+
+TUPLE_BLOCK_KINDS = {12: "data", 13: "data"} # the first item of the tuples of top level or inline variable and list reporters
+LOOP_OPCODES = {
+    "control_repeat", "control_forever", "control_for_each", "control_repeat_until", "control_while",
+}
+# Each of these blocks adds one decision point to the cyclomatic-style complexity
+DECISION_OPCODES = {
+    "control_if", "control_if_else", "control_repeat", "control_for_each", "control_repeat_until", "control_while",
+    "control_if_return_else_return", "control_case", "control_try_catch", "operator_and", "operator_or",
+}
+DEFINITION_OPCODES = {"procedures_definition", "procedures_definition_return"}
+
+
+@grepr_dataclass(grepr_fields=["block_count", "category_counts", "max_nesting_depth", "loop_count", "complexity"])
+class ScriptMetrics:
+    """
+    Static complexity metrics of a script
+    """
+
+    top_level_id: str # the reference id of the first block
+    block_count: int # shadow blocks like menus are not counted, variable and list reporters are
+    category_counts: dict[str, int] # maps categories (the opcode prefix e.g. "motion") to block counts
+    max_nesting_depth: int # how deep substacks (e.g. of if or repeat) are nested
+    loop_count: int
+    complexity: int # 1 + the number of decision points (see DECISION_OPCODES)
+    custom_block: str | None # the proccode if the script defines a custom block
+    is_recursive: bool # whether the script defines a custom block, which (indirectly) calls itself
+
+@grepr_dataclass(grepr_fields=["name", "block_count", "category_counts", "max_nesting_depth", "loop_count", "complexity", "recursive_custom_blocks"])
+class TargetMetrics:
+    """
+    Static complexity metrics of a sprite or the stage
+    """
+
+    name: str | None
+    scripts: list[ScriptMetrics]
+    block_count: int
+    category_counts: dict[str, int]
+    max_nesting_depth: int
+    loop_count: int
+    complexity: int # the sum of the complexities of the scripts
+    recursive_custom_blocks: list[str] # the proccodes of the recursive custom blocks
+
+@grepr_dataclass(grepr_fields=["block_count", "category_counts", "max_nesting_depth", "loop_count", "complexity"])
+class ProjectMetrics:
+    """
+    Static complexity metrics of a project
+    """
+
+    targets: list[TargetMetrics]
+    block_count: int
+    category_counts: dict[str, int]
+    max_nesting_depth: int
+    loop_count: int
+    complexity: int
+
+
+def compute_target_metrics(blocks: dict[str, FRBlock | tuple], name: str | None = None) -> TargetMetrics:
+    """
+    Compute the static complexity metrics of a target directly from its first representation blocks (FRTarget.blocks).
+    This does not require the conversion into intermediate or second representation
+
+    Args:
+        blocks: maps the reference ids to the blocks
+        name: the name of the target
+
+    Returns:
+        the metrics
+    """
+    scripts = []
+    calls: dict[str, set[str]] = {} # maps proccodes of definitions to the proccodes they call
+    for block_id, block in blocks.items():
+        if isinstance(block, tuple):
+            script = ScriptMetrics(
+                top_level_id      = block_id,
+                block_count       = 1,
+                category_counts   = {TUPLE_BLOCK_KINDS.get(block[0], "data"): 1},
+                max_nesting_depth = 0,
+                loop_count        = 0,
+                complexity        = 1,
+                custom_block      = None,
+                is_recursive      = False,
+            )
+        elif block.top_level and not block.shadow:
+            script, called = _compute_script_metrics(blocks, block_id)
+            if script.custom_block is not None:
+                calls.setdefault(script.custom_block, set()).update(called)
+        else:
+            continue
+        scripts.append(script)
+
+    proccodes = list(calls)
+    proccode_indexes = {proccode: i for i, proccode in enumerate(proccodes)}
+    successors = [
+        [proccode_indexes[called] for called in calls[proccode] if called in proccode_indexes]
+        for proccode in proccodes
+    ]
+    recursive = {proccodes[i] for component in find_cyclic_components(successors) for i in component}
+    for script in scripts:
+        script.is_recursive = script.custom_block in recursive
+
+    return TargetMetrics(
+        name                    = name,
+        scripts                 = scripts,
+        recursive_custom_blocks = [proccode for proccode in proccodes if proccode in recursive],
+        **_sum_metrics(scripts),
+    )
+
+def _compute_script_metrics(blocks: dict[str, FRBlock | tuple], top_level_id: str) -> tuple[ScriptMetrics, set[str]]:
+    """
+    *[Helper Function]* Compute the metrics of the script starting at a top level block and get the called proccodes
+    """
+    top_level_block = blocks[top_level_id]
+    custom_block = None
+    if top_level_block.opcode in DEFINITION_OPCODES:
+        prototype_reference = top_level_block.inputs.get("custom_block", (None, None))[1]
+        prototype = blocks.get(prototype_reference) if isinstance(prototype_reference, str) else None
+        if isinstance(getattr(prototype, "mutation", None), FRCustomBlockMutation):
+            custom_block = prototype.mutation.proccode
+
+    block_count = loop_count = max_nesting_depth = 0
+    complexity = 1
+    category_counts: dict[str, int] = {}
+    called = set()
+    stack = [(top_level_id, 0)]
+    while stack:
+        block_id, depth = stack.pop()
+        block = blocks[block_id]
+        if isinstance(block, tuple):
+            category = TUPLE_BLOCK_KINDS.get(block[0], "data")
+            category_counts[category] = category_counts.get(category, 0) + 1
+            block_count += 1
+            continue
+        if block.next is not None:
+            stack.append((block.next, depth))
+        if block.shadow:
+            continue # menus, prototypes and argument reporters of prototypes
+
+        opcode = block.opcode
+        block_count += 1
+        category = opcode.split("_", 1)[0]
+        category_counts[category] = category_counts.get(category, 0) + 1
+        if opcode in LOOP_OPCODES:
+            loop_count += 1
+        if opcode in DECISION_OPCODES:
+            complexity += 1
+        if depth > max_nesting_depth:
+            max_nesting_depth = depth
+        if isinstance(block.mutation, FRCustomBlockCallMutation):
+            called.add(block.mutation.proccode)
+
+        for input_id, input_value in block.inputs.items():
+            if len(input_value) < 2:
+                continue
+            child = input_value[1] # the other items are shadows
+            if isinstance(child, str):
+                if child in blocks:
+                    stack.append((child, depth+1 if input_id.startswith("SUBSTACK") else depth))
+            elif isinstance(child, tuple) and child and (child[0] in TUPLE_BLOCK_KINDS):
+                category = TUPLE_BLOCK_KINDS[child[0]]
+                category_counts[category] = category_counts.get(category, 0) + 1
+                block_count += 1
+
+    return ScriptMetrics(
+        top_level_id      = top_level_id,
+        block_count       = block_count,
+        category_counts   = category_counts,
+        max_nesting_depth = max_nesting_depth,
+        loop_count        = loop_count,
+        complexity        = complexity,
+        custom_block      = custom_block,
+        is_recursive      = False, # determined by compute_target_metrics
+    ), called
+
+def _sum_metrics(items: list[ScriptMetrics | TargetMetrics]) -> dict:
+    """
+    *[Helper Function]* Combine the metrics of scripts or targets
+    """
+    category_counts = {}
+    for item in items:
+        for category, count in item.category_counts.items():
+            category_counts[category] = category_counts.get(category, 0) + count
+    return {
+        "block_count"      : sum(item.block_count for item in items),
+        "category_counts"  : category_counts,
+        "max_nesting_depth": max((item.max_nesting_depth for item in items), default=0),
+        "loop_count"       : sum(item.loop_count for item in items),
+        "complexity"       : sum(item.complexity for item in items),
+    }
+
+def compute_project_metrics(project: "FRProject") -> ProjectMetrics:
+    """
+    Compute the static complexity metrics of a FRProject without converting it into second representation
+
+    Args:
+        project: the FRProject
+
+    Returns:
+        the metrics
+    """
+    targets = [compute_target_metrics(target.blocks, target.name) for target in project.targets]
+    return ProjectMetrics(targets=targets, **_sum_metrics(targets))
+
+
+__all__ = [
+    "ScriptMetrics", "TargetMetrics", "ProjectMetrics",
+    "compute_target_metrics", "compute_project_metrics",
+]
+
@@ -1,4 +1,5 @@
-from typing import Any
+from logging import getLogger
+from typing  import Any, Hashable
 
 from pypenguin.opcode_info.api  import OpcodeInfoAPI
 from pypenguin.utility          import (
@@ -13,6 +14,8 @@ from pypenguin.core.dropdown import SRDropdownValue
 from pypenguin.core.enums    import SRVariableMonitorReadoutMode
 
 
+logger = getLogger(__name__)
+
 # TODO: create global config
 STAGE_WIDTH : int = 480
 STAGE_HEIGHT: int = 360
@@ -104,6 +107,7 @@ class FRMonitor:
             the SRMonitor
         """
         if (self.sprite_name is not None) and (self.sprite_name not in sprite_names):
+            logger.debug("Deleting monitor %r of the non-existing sprite %r", self.id, self.sprite_name)
             return None # Delete monitors of non-existing sprites: possibly not needed anymore
         
         opcode_info = info_api.get_info_by_old(self.opcode)
@@ -172,6 +176,18 @@ class SRMonitor:
         else:
             assert not isinstance(self, (SRVariableMonitor, SRListMonitor)), f"Mustn't be a SRVariableMonitor or SRListMonitor if opcode is neither {repr(NEW_OPCODE_VAR_VALUE)} nor {repr(NEW_OPCODE_LIST_VALUE)}"
     
+    def get_display_key(self) -> Hashable:
+        """
+        Get a key, which identifies a monitor by what it shows (its opcode and dropdown values). 
+        Used to match monitors of different project revisions
+
+        Returns:
+            the key
+        """
+        return (self.opcode, repr(sorted(
+            (dropdown_id, dropdown_value.to_tuple()) for dropdown_id, dropdown_value in self.dropdowns.items()
+        )))
+
     def validate(self, path: list, config: ValidationConfig, info_api: OpcodeInfoAPI) -> None:
         """
         Ensure a SRMonitor is valid, raise ValidationError if not
@@ -1,16 +1,22 @@
 from json        import loads
+from logging     import getLogger
 from uuid        import UUID
 
 from pypenguin.important_consts import SHA256_SEC_TARGET_NAME
 from pypenguin.opcode_info.api  import OpcodeInfoAPI, DropdownValueKind
 from pypenguin.utility          import (
-    grepr_dataclass, read_all_files_of_zip, string_to_sha256, ValidationConfig, 
+    grepr_dataclass, read_all_files_of_zip, string_to_sha256, ValidationConfig, Interner,
+    get_instrumentation, instrumented_phase, instrumented, fingerprint, drop_fingerprint_cache,
     AA_TYPE, AA_NONE_OR_TYPE, AA_TYPES, AA_LIST_OF_TYPE, AA_RANGE, AA_EXACT_LEN,
-    ThanksError, SameValueTwiceError, SpriteLayerStackError,
+    ThanksError, SameValueTwiceError, SpriteLayerStackError, DeserializationError, ConversionError,
 )
 
+from pypenguin.core.binary        import encode_sr, decode_sr
 from pypenguin.core.context       import PartialContext
+from pypenguin.core.diff          import SRProjectDiff, diff_projects
 from pypenguin.core.extension     import SRExtension, SRCustomExtension, SRBuiltinExtension
+from pypenguin.core.index         import SRBlockIndex
+from pypenguin.core.manifest      import AssetManifestEntry, build_asset_manifest
 from pypenguin.core.meta          import FRMeta
 from pypenguin.core.monitor       import FRMonitor, SRMonitor
 from pypenguin.core.enums         import SRTTSLanguage, SRVideoState
@@ -18,6 +24,9 @@ from pypenguin.core.target        import FRTarget, FRStage, FRSprite, SRStage, S
 from pypenguin.core.vars_lists    import SRVariable, SRList
 
 
+logger = getLogger(__name__)
+
+
 @grepr_dataclass(grepr_fields=["targets", "monitors", "extension_data", "extensions", "extension_urls", "meta", "asset_files"])
 class FRProject: 
     """
@@ -33,6 +42,7 @@ class FRProject:
     asset_files: dict[str, bytes]
 
     @classmethod
+    @instrumented("from_data")
     def from_data(cls, 
         data: dict, 
         asset_files: dict[str, bytes], 
@@ -94,8 +104,14 @@ class FRProject:
             the FRProject
         """
         assert file_path.endswith(".sb3") or file_path.endswith(".pmp")
-        contents = read_all_files_of_zip(file_path)
-        project_data = loads(contents["project.json"].decode("utf-8"))
+        logger.debug("Reading project file %s", file_path)
+        with instrumented_phase("read_zip"):
+            contents = read_all_files_of_zip(file_path)
+        instrumentation = get_instrumentation()
+        if instrumentation is not None:
+            instrumentation.count("bytes_read", sum(len(file_bytes) for file_bytes in contents.values()))
+        with instrumented_phase("json_decode"):
+            project_data = loads(contents["project.json"].decode("utf-8"))
         del contents["project.json"]
         if   file_path.endswith(".sb3"):
             project_data = FRProject._data_sb3_to_pmp(project_data)
@@ -110,16 +126,44 @@ class FRProject:
         """
         if self.extension_data != {}: raise ThanksError()
 
-    def to_second(self, info_api: OpcodeInfoAPI) -> "SRProject":
+    def get_asset_manifest(self) -> list[AssetManifestEntry]:
+        """
+        List the costumes and sounds with their sizes, dimensions and durations without decoding any asset (see build_asset_manifest)
+        
+        Returns:
+            the manifest entries
+        """
+        return build_asset_manifest(self)
+
+    @instrumented("to_second")
+    def to_second(self, 
+        info_api: OpcodeInfoAPI, 
+        intern: bool = False, 
+        sprite_names: list[str] | None = None,
+    ) -> "SRProject":
         """
         Converts a FRProject into a SRProject
         
         Args:
             info_api: the opcode info api used to fetch information about opcodes
+            intern: whether to share identical blocks and their children (e.g. the same reporter or literal input) 
+                to save memory. **Shared objects must be made writable with unshare before modifying them in place**
+            sprite_names: only convert these sprites (and the stage, which is always converted). Pass [] to convert only the stage.
+                The other sprites, their monitors and asset files are kept unchanged in SRProject.unloaded_targets. Defaults to all sprites
         
         Returns:
             the SRProject
+
+        Raises:
+            ConversionError: if a sprite name does not exist
         """
+        if sprite_names is not None:
+            existing_names = {target.name for target in self.targets if not target.is_stage}
+            missing_names = [name for name in sprite_names if name not in existing_names]
+            if missing_names:
+                raise ConversionError(f"Sprites not found: {missing_names}")
+        interner = Interner() if intern else None
+        unloaded_sprites: list[FRSprite] = []
         old_stage: FRStage
         new_stage: SRStage
         new_sprites: list[SRSprite] = []
@@ -130,28 +174,39 @@ class FRProject:
                 new_stage, all_sprite_variables, all_sprite_lists = old_stage.to_second(
                     asset_files=self.asset_files, 
                     info_api=info_api,
+                    interner=interner,
                 )
+            elif (sprite_names is not None) and (target.name not in sprite_names):
+                unloaded_sprites.append(target)
             else:
                 target: FRSprite
                 new_sprite, _, _ = target.to_second(
                     asset_files=self.asset_files, 
                     info_api=info_api,
+                    interner=interner,
                 )
                 new_sprite: SRSprite
                 new_sprites.append(new_sprite)
                 sprite_layer_stack_dict[target.layer_order] = new_sprite.uuid
         
         global_monitors = []
-        sprite_names = [sprite.name for sprite in new_sprites]
-        for monitor in self.monitors:
-            new_monitor = monitor.to_second(info_api=info_api, sprite_names=sprite_names)
-            if new_monitor is None: 
-                continue
-            if monitor.sprite_name is None:
-                global_monitors.append(new_monitor)
-            else:
-                sprite_index = sprite_names.index(monitor.sprite_name)
-                new_sprites[sprite_index].local_monitors.append(new_monitor)
+        unloaded_monitors = []
+        unloaded_names = {sprite.name for sprite in unloaded_sprites}
+        converted_sprite_names = [sprite.name for sprite in new_sprites]
+        with instrumented_phase("monitors_to_second"):
+            for monitor in self.monitors:
+                if monitor.sprite_name in unloaded_names:
+                    unloaded_monitors.append(monitor)
+                    continue
+                new_monitor = monitor.to_second(info_api=info_api, sprite_names=converted_sprite_names)
+                if new_monitor is None: 
+                    logger.debug("Skipping monitor %r, which can not be converted", monitor.id)
+                    continue
+                if monitor.sprite_name is None:
+                    global_monitors.append(new_monitor)
+                else:
+                    sprite_index = converted_sprite_names.index(monitor.sprite_name)
+                    new_sprites[sprite_index].local_monitors.append(new_monitor)
        
         if old_stage.text_to_speech_language is None:
             new_tts_language = None
@@ -182,10 +237,40 @@ class FRProject:
             text_to_speech_language = new_tts_language,
             global_monitors         = global_monitors,
             extensions              = new_extensions,
+            unloaded_targets        = FRUnloadedTargets(
+                sprites     = unloaded_sprites,
+                monitors    = unloaded_monitors,
+                asset_files = {
+                    asset.md5ext: self.asset_files[asset.md5ext]
+                    for sprite in unloaded_sprites for asset in sprite.costumes + sprite.sounds
+                },
+            ) if unloaded_sprites else None,
         )
 
 
-@grepr_dataclass(grepr_fields=["stage", "sprites", "sprite_layer_stack", "all_sprite_variables", "all_sprite_lists", "tempo", "video_transparency", "video_state", "text_to_speech_language", "global_monitors", "extensions"], eq=False)
+@grepr_dataclass(grepr_fields=["sprites", "monitors"])
+class FRUnloadedTargets:
+    """
+    The sprites, which were not selected for conversion by FRProject.to_second. They are kept as opaque
+    first representation data together with their monitors and asset files, so they can be written back unchanged
+    """
+
+    sprites: list[FRSprite]
+    monitors: list[FRMonitor]
+    asset_files: dict[str, bytes]
+
+    @property
+    def sprite_names(self) -> list[str]:
+        """
+        Get the names of the unloaded sprites
+
+        Returns:
+            the names
+        """
+        return [sprite.name for sprite in self.sprites]
+
+
+@grepr_dataclass(grepr_fields=["stage", "sprites", "sprite_layer_stack", "all_sprite_variables", "all_sprite_lists", "tempo", "video_transparency", "video_state", "text_to_speech_language", "global_monitors", "extensions", "unloaded_targets"], eq=False)
 class SRProject:
     """
     The second representation (SR) of a Scratch/PenguinMod Project
@@ -202,6 +287,9 @@ class SRProject:
     text_to_speech_language: SRTTSLanguage | None
     global_monitors: list[SRMonitor]
     extensions: list[SRExtension]
+    unloaded_targets: FRUnloadedTargets | None = None # the sprites, which were not converted (see FRProject.to_second). None if all were
+
+    _cache_fingerprint = True
 
     @classmethod
     def create_empty(cls) -> "SRProject":
@@ -249,7 +337,8 @@ class SRProject:
             self.video_transparency != other.video_transparency or
             self.text_to_speech_language != other.text_to_speech_language or
             self.global_monitors != other.global_monitors or
-            self.extensions != other.extensions
+            self.extensions != other.extensions or
+            self.unloaded_targets != other.unloaded_targets
         ):
             return False
 
@@ -265,6 +354,112 @@ class SRProject:
 
         return True
 
+    def _fingerprint_parts(self) -> tuple:
+        """
+        *[Internal Method]* Get the values, which make up the fingerprint (see fingerprint).
+        Like __eq__, it ignores the UUIDs and represents the sprite layer stack by the sprites themselves
+
+        Returns:
+            the values
+        """
+        uuid_to_sprite = {sprite.uuid: sprite for sprite in self.sprites}
+        return (
+            self.stage, self.sprites, [uuid_to_sprite.get(uuid) for uuid in self.sprite_layer_stack],
+            self.all_sprite_variables, self.all_sprite_lists, self.tempo, self.video_transparency,
+            self.text_to_speech_language, self.global_monitors, self.extensions, self.unloaded_targets,
+        )
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state for copying and pickling without the cached block index and fingerprint
+
+        Returns:
+            the state
+        """
+        state = drop_fingerprint_cache(self.__dict__)
+        state.pop("_block_index_cache", None)
+        return state
+
+    def get_block_index(self) -> SRBlockIndex:
+        """
+        Get the index of all blocks (see SRBlockIndex). The index is cached and rebuilt
+        when anything in the project was modified, replaced, added or removed since it was built
+
+        Returns:
+            the index
+        """
+        index = self.__dict__.get("_block_index_cache")
+        # The cached fingerprint is replaced by a new object whenever it is recalculated (see fingerprint).
+        # Identity instead of equality also notices blocks, which were replaced by equal copies
+        if (index is None) or (index.project_fingerprint is not fingerprint(self)):
+            index = SRBlockIndex.from_project(self)
+            self.__dict__["_block_index_cache"] = index
+        return index
+
+    def get_sprite_layer_names(self) -> list[str | None]:
+        """
+        Get the sprite layer stack as sprite names. UUIDs, which belong to no sprite, become None
+
+        Returns:
+            the sprite names
+        """
+        uuid_to_name = {sprite.uuid: sprite.name for sprite in self.sprites}
+        return [uuid_to_name.get(uuid) for uuid in self.sprite_layer_stack]
+
+    def invalidate_block_index(self) -> None:
+        """
+        Discard the cached block index, so the next get_block_index call rebuilds it
+
+        Returns:
+            None
+        """
+        self.__dict__.pop("_block_index_cache", None)
+
+    def diff(self, new: "SRProject") -> SRProjectDiff:
+        """
+        Calculate the structural difference between this project and a newer revision (see diff_projects)
+        
+        Args:
+            new: the newer revision
+        
+        Returns:
+            the changes
+        """
+        return diff_projects(self, new)
+
+    def to_bytes(self, info_api: OpcodeInfoAPI) -> bytes:
+        """
+        Serializes a SRProject into the compact binary SR format (see encode_sr)
+        
+        Args:
+            info_api: the opcode info api used to encode opcodes
+        
+        Returns:
+            the serialized SRProject
+        """
+        return encode_sr(self, info_api)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, info_api: OpcodeInfoAPI) -> "SRProject":
+        """
+        Deserializes a SRProject from the compact binary SR format (see decode_sr)
+        
+        Args:
+            data: the serialized SRProject
+            info_api: the opcode info api used to decode opcodes. Must have the same opcodes as during serialization
+        
+        Returns:
+            the SRProject
+        
+        Raises:
+            DeserializationError: if the data is invalid or does not contain a SRProject
+        """
+        project = decode_sr(data, info_api)
+        if not isinstance(project, cls):
+            raise DeserializationError(f"SR binary data does not contain a {cls.__name__}")
+        return project
+
+    @instrumented("validate")
     def validate(self, config: ValidationConfig, info_api: OpcodeInfoAPI) -> None:
         """
         Ensure a SRProject is valid, raise ValidationError if not
@@ -296,6 +491,7 @@ class SRProject:
         AA_NONE_OR_TYPE(self, path, "text_to_speech_language", SRTTSLanguage)
         AA_LIST_OF_TYPE(self, path, "global_monitors", SRMonitor)
         AA_LIST_OF_TYPE(self, path, "extensions", SRExtension)
+        AA_NONE_OR_TYPE(self, path, "unloaded_targets", FRUnloadedTargets)
         
         self.stage.validate(path+["stage"], config, info_api)
 
@@ -330,6 +526,18 @@ class SRProject:
                 (DropdownValueKind.VARIABLE, variable.name) for variable in sprite.sprite_only_variables]
             sprite_only_lists    [sprite.name] = [
                 (DropdownValueKind.LIST    , list_   .name) for list_    in sprite.sprite_only_lists]
+        if self.unloaded_targets is not None:
+            # Unloaded sprites are not validated, but can still be referenced e.g. in "create clone of ([TARGET])"
+            for i, fr_sprite in enumerate(self.unloaded_targets.sprites):
+                current_path = path+["unloaded_targets", "sprites", i]
+                if fr_sprite.name in defined_sprites:
+                    other_path = defined_sprites[fr_sprite.name]
+                    raise SameValueTwiceError(other_path, current_path, "Two sprites mustn't have the same name")
+                defined_sprites[fr_sprite.name] = current_path
+                sprite_only_variables[fr_sprite.name] = [
+                    (DropdownValueKind.VARIABLE, variable[0]) for variable in fr_sprite.variables.values()]
+                sprite_only_lists    [fr_sprite.name] = [
+                    (DropdownValueKind.LIST    , list_   [0]) for list_    in fr_sprite.lists    .values()]
         
         all_sprite_variables = [(DropdownValueKind.VARIABLE, variable.name) for variable in self.all_sprite_variables]
         all_sprite_lists     = [(DropdownValueKind.LIST    , list_   .name) for list_    in self.all_sprite_lists    ]
@@ -477,5 +685,5 @@ class SRProject:
                 defined_lists[list_.name] = current_path
 
 
-__all__ = ["FRProject", "SRProject"]
+__all__ = ["FRProject", "FRUnloadedTargets", "SRProject"]
 
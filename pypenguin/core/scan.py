@@ -0,0 +1,153 @@
+from json   import loads
+from typing import Any
+
+from pypenguin.utility import grepr_dataclass, read_file_of_zip, get_file_sizes_of_zip
+
+from pypenguin.core.manifest import AssetManifestEntry
+
+
+# The opcodes counted for the list form of top level and inline variable and list reporters
+TUPLE_BLOCK_OPCODES = {12: "data_variable", 13: "data_listcontents"}
+
+
+@grepr_dataclass(grepr_fields=["name", "is_stage", "block_count", "variable_names", "list_names", "broadcast_names"])
+class ScanTarget:
+    """
+    The summary of a target within a ProjectScan
+    """
+
+    name: str
+    is_stage: bool
+    block_count: int # shadow blocks like menus are not counted, variable and list reporters are
+    opcode_counts: dict[str, int]
+    variable_names: list[str]
+    list_names: list[str]
+    broadcast_names: list[str]
+
+@grepr_dataclass(grepr_fields=["block_count", "opcode_counts", "extensions", "targets", "assets"])
+class ProjectScan:
+    """
+    A lightweight summary of a project, which is built from the raw project data without creating any FR, IR or SR objects
+    """
+
+    block_count: int
+    opcode_counts: dict[str, int]
+    extensions: list[str]
+    targets: list[ScanTarget]
+    assets: list[AssetManifestEntry] # the file headers are not read, so the header fields are None
+
+    @classmethod
+    def from_data(cls, project_data: dict[str, Any], file_sizes: dict[str, int] | None = None) -> "ProjectScan":
+        """
+        Scan raw project data (the content of project.json)
+
+        Args:
+            project_data: the raw project data in sb3 or pmp format
+            file_sizes: the sizes of the files of the project file by name. Fills AssetManifestEntry.file_size if given
+
+        Returns:
+            the scan
+        """
+        targets = []
+        assets = []
+        opcode_counts: dict[str, int] = {}
+        for target_data in project_data["targets"]:
+            target = _scan_target(target_data)
+            targets.append(target)
+            for opcode, count in target.opcode_counts.items():
+                opcode_counts[opcode] = opcode_counts.get(opcode, 0) + count
+            for kind, assets_data in (("costume", target_data["costumes"]), ("sound", target_data["sounds"])):
+                for asset_data in assets_data:
+                    md5ext = asset_data.get("md5ext", f"{asset_data['assetId']}.{asset_data['dataFormat']}")
+                    is_bitmap = (kind == "costume") and (asset_data["dataFormat"] != "svg")
+                    assets.append(AssetManifestEntry(
+                        target_name       = target.name,
+                        kind              = kind,
+                        name              = asset_data["name"],
+                        asset_id          = asset_data["assetId"],
+                        md5ext            = md5ext,
+                        data_format       = asset_data["dataFormat"],
+                        file_size         = None if file_sizes is None else file_sizes.get(md5ext),
+                        width             = None,
+                        height            = None,
+                        bitmap_resolution = asset_data.get("bitmapResolution") if is_bitmap else None,
+                        rate              = None,
+                        sample_count      = None,
+                    ))
+        return cls(
+            block_count   = sum(target.block_count for target in targets),
+            opcode_counts = opcode_counts,
+            extensions    = list(project_data.get("extensions", [])),
+            targets       = targets,
+            assets        = assets,
+        )
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "ProjectScan":
+        """
+        Scan a project file(.sb3 or .pmp). Only project.json is read, no asset is decoded or even decompressed
+
+        Args:
+            file_path: file path to the .sb3 or .pmp file
+
+        Returns:
+            the scan
+        """
+        assert file_path.endswith(".sb3") or file_path.endswith(".pmp")
+        project_data = loads(read_file_of_zip(file_path, "project.json").decode("utf-8"))
+        return cls.from_data(project_data, file_sizes=get_file_sizes_of_zip(file_path))
+
+    @property
+    def variable_names(self) -> list[str]:
+        """
+        Get the names of the variables of all targets
+
+        Returns:
+            the variable names in target order
+        """
+        return [name for target in self.targets for name in target.variable_names]
+
+    @property
+    def list_names(self) -> list[str]:
+        """
+        Get the names of the lists of all targets
+
+        Returns:
+            the list names in target order
+        """
+        return [name for target in self.targets for name in target.list_names]
+
+
+def _scan_target(target_data: dict[str, Any]) -> ScanTarget:
+    """
+    *[Helper Function]* Count the opcodes of the raw block dicts of a target and collect its names
+    """
+    opcode_counts: dict[str, int] = {}
+    for block_data in target_data["blocks"].values():
+        if isinstance(block_data, list): # top level variable or list reporter
+            opcode = TUPLE_BLOCK_OPCODES.get(block_data[0])
+            if opcode is not None:
+                opcode_counts[opcode] = opcode_counts.get(opcode, 0) + 1
+            continue
+        if block_data.get("shadow"):
+            continue
+        opcode = block_data["opcode"]
+        opcode_counts[opcode] = opcode_counts.get(opcode, 0) + 1
+        for input_data in block_data.get("inputs", {}).values():
+            if (len(input_data) >= 2) and isinstance(input_data[1], list) and input_data[1]: # inline reporter
+                opcode = TUPLE_BLOCK_OPCODES.get(input_data[1][0])
+                if opcode is not None:
+                    opcode_counts[opcode] = opcode_counts.get(opcode, 0) + 1
+    return ScanTarget(
+        name            = target_data["name"],
+        is_stage        = target_data["isStage"],
+        block_count     = sum(opcode_counts.values()),
+        opcode_counts   = opcode_counts,
+        variable_names  = [variable_data[0] for variable_data in target_data.get("variables", {}).values()],
+        list_names      = [list_data[0] for list_data in target_data.get("lists", {}).values()],
+        broadcast_names = list(target_data.get("broadcasts", {}).values()),
+    )
+
+
+__all__ = ["ScanTarget", "ProjectScan"]
+
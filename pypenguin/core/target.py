@@ -1,13 +1,16 @@
 from typing      import Any
 from copy        import deepcopy
+from time        import perf_counter
 from dataclasses import field
+from logging     import getLogger
 from abc         import abstractmethod, ABC
 from uuid        import uuid4, UUID
 
 from pypenguin.important_consts import SHA256_SEC_TARGET_NAME
 from pypenguin.opcode_info.api  import OpcodeInfoAPI, DropdownValueKind
 from pypenguin.utility          import (
-    string_to_sha256, grepr_dataclass, ThanksError, ValidationConfig, 
+    string_to_sha256, grepr_dataclass, ThanksError, ValidationConfig, Interner, get_instrumentation, instrumented_phase,
+    drop_fingerprint_cache,
     AA_TYPE, AA_TYPES, AA_LIST_OF_TYPE, AA_MIN_LEN, AA_MIN, AA_RANGE, AA_COORD_PAIR, AA_NOT_ONE_OF, 
     SameValueTwiceError, ConversionError,
 )
@@ -24,6 +27,9 @@ from pypenguin.core.vars_lists      import SRVariable, SRVariable, SRVariable, S
 from pypenguin.core.vars_lists      import SRList, SRList, SRList
 
 
+logger = getLogger(__name__)
+
+
 @grepr_dataclass(grepr_fields=["is_stage", "name", "variables", "lists", "broadcasts", "custom_vars", "blocks", "comments", "current_costume", "costumes", "sounds", "id", "volume", "layer_order"])
 class FRTarget(ABC):
     """
@@ -71,6 +77,29 @@ class FRTarget(ABC):
         Returns:
             a dict containing the prepared values for common fields
         """
+        memo = {} # lets equal block references and input/field values of different blocks share one object
+        with instrumented_phase("block_from_data"):
+            instrumentation = get_instrumentation()
+            if instrumentation is None:
+                blocks = {
+                    memo.setdefault(block_id, block_id): (
+                        tuple(block_data)
+                        if isinstance(block_data, list)
+                        else FRBlock.from_data(block_data, info_api=info_api, memo=memo)
+                    )
+                    for block_id, block_data in data["blocks"].items()
+                }
+            else:
+                blocks = {}
+                for block_id, block_data in data["blocks"].items():
+                    start = perf_counter()
+                    if isinstance(block_data, list):
+                        block, opcode = tuple(block_data), "<tuple block>"
+                    else:
+                        block = FRBlock.from_data(block_data, info_api=info_api, memo=memo)
+                        opcode = block.opcode
+                    blocks[memo.setdefault(block_id, block_id)] = block
+                    instrumentation.record_opcode("block_from_data", opcode, perf_counter() - start)
         return {
             "is_stage": data["isStage"],
             "name": data["name"],
@@ -78,14 +107,7 @@ class FRTarget(ABC):
             "lists": {key: tuple(value) for key, value in data["lists"].items()},
             "broadcasts": data["broadcasts"],
             "custom_vars": data.get("customVars", []),
-            "blocks": {
-                block_id: (
-                    tuple(block_data)
-                    if isinstance(block_data, list)
-                    else FRBlock.from_data(block_data, info_api=info_api)
-                )
-                for block_id, block_data in data["blocks"].items()
-            },
+            "blocks": blocks,
             "comments": {
                 comment_id: FRComment.from_data(comment_data)
                 for comment_id, comment_data in data["comments"].items()
@@ -106,7 +128,11 @@ class FRTarget(ABC):
         """
         if self.custom_vars != []: raise ThanksError()
 
-    def _to_second_common(self, asset_files: dict[str, bytes], info_api: OpcodeInfoAPI) -> tuple[
+    def _to_second_common(self, 
+        asset_files: dict[str, bytes], 
+        info_api: OpcodeInfoAPI, 
+        interner: Interner | None = None,
+    ) -> tuple[
         list[SRScript], 
         list[SRComment], 
         list[SRCostume], 
@@ -118,11 +144,14 @@ class FRTarget(ABC):
         *[Helper Method]* Convert common fields into second representation
 
         Args:
+            asset_files: the contents of the asset files
             info_api: the opcode info api used to fetch information about opcodes
+            interner: shares identical blocks and their children if given
         
         Returns:
             lists of scripts, floating comments, costumes, sounds, variables and lists
         """
+        logger.debug("Converting target %r with %d blocks into second representation", self.name, len(self.blocks))
         floating_comments = []
         attached_comments = {}
         for comment_id, comment in self.comments.items():
@@ -132,20 +161,26 @@ class FRTarget(ABC):
             else:
                 floating_comments.append(new_comment)
 
-        blocks = deepcopy(self.blocks)
-        for block_reference, block in blocks.items():
-            if isinstance(block, tuple):
-                blocks[block_reference] = FRBlock.from_tuple(block, parent_id=None)
-
-        fti_if = FirstToInterIF(blocks=blocks, block_comments=attached_comments)
-        new_blocks: dict["str", "IRBlock"] = {}
-        for block_reference, block in blocks.items():
-            new_block = block.to_inter(
-                fti_if = fti_if,
-                info_api  = info_api,
-                own_id    = block_reference,
-            )
-            new_blocks[block_reference] = new_block
+        with instrumented_phase("first_to_inter"):
+            blocks = deepcopy(self.blocks)
+            for block_reference, block in blocks.items():
+                if isinstance(block, tuple):
+                    blocks[block_reference] = FRBlock.from_tuple(block, parent_id=None)
+
+            fti_if = FirstToInterIF(blocks=blocks, block_comments=attached_comments)
+            new_blocks: dict["str", "IRBlock"] = {}
+            instrumentation = get_instrumentation()
+            for block_reference, block in blocks.items():
+                if instrumentation is not None:
+                    start = perf_counter()
+                new_block = block.to_inter(
+                    fti_if = fti_if,
+                    info_api  = info_api,
+                    own_id    = block_reference,
+                )
+                new_blocks[block_reference] = new_block
+                if instrumentation is not None:
+                    instrumentation.record_opcode("first_to_inter", block.opcode, perf_counter() - start)
 
         for block_reference in fti_if.scheduled_block_deletions:
             del new_blocks[block_reference]
@@ -164,28 +199,38 @@ class FRTarget(ABC):
                     sub_block = new_blocks[sub_reference]
                     if not sub_block.is_top_level:
                         continue
+                    logger.debug("Block %r of target %r is falsely marked as top level", sub_reference, self.name)
                     sub_block.is_top_level = False
                     sub_block.position     = None
                     top_level_block_refs.remove(sub_reference)
 
         new_scripts = []
-        for top_level_block_ref in top_level_block_refs:
-            block = new_blocks[top_level_block_ref]
-            position, script_blocks = block.to_second(
-                all_blocks    = new_blocks,
-                info_api      = info_api,
-            )
-            new_scripts.append(SRScript(
-                position = position,
-                blocks   = script_blocks,
-            ))
+        with instrumented_phase("inter_to_second"):
+            for top_level_block_ref in top_level_block_refs:
+                block = new_blocks[top_level_block_ref]
+                position, script_blocks = block.to_second(
+                    all_blocks    = new_blocks,
+                    info_api      = info_api,
+                    interner      = interner,
+                )
+                new_scripts.append(SRScript(
+                    position = position,
+                    blocks   = script_blocks,
+                ))
         
         new_variables, new_lists = self._to_second_variables_lists()
+        with instrumented_phase("asset_decode"):
+            new_costumes = [costume.to_second(asset_files) for costume in self.costumes]
+            new_sounds   = [sound  .to_second(asset_files) for sound   in self.sounds  ]
+        if instrumentation is not None:
+            assets = self.costumes + self.sounds
+            instrumentation.count("assets_decoded", len(assets))
+            instrumentation.count("asset_bytes_decoded", sum(len(asset_files[asset.md5ext]) for asset in assets))
         return (
             new_scripts,
             floating_comments,
-            [costume.to_second(asset_files) for costume in self.costumes],
-            [sound  .to_second(asset_files) for sound   in self.sounds  ],
+            new_costumes,
+            new_sounds,
             new_variables,
             new_lists,
         )
@@ -212,8 +257,8 @@ class FRTarget(ABC):
         
         new_lists = []
         for list_ in self.lists.values():
-            print("-", list_, len(list_))
             if len(list_) == 2:
+                logger.debug("Converting list %r of target %r with %d items", list_[0], self.name, len(list_[1]))
                 new_lists.append(
                     SRList(name=list_[0], current_value=list_[1])
                 )
@@ -265,12 +310,15 @@ class FRStage(FRTarget):
     def to_second(self, 
         asset_files: dict[str, bytes],
         info_api: OpcodeInfoAPI,
+        interner: Interner | None = None,
     ) -> tuple["SRStage", list[SRVariable],  list[SRList]]:
         """
         Converts a FRStage into a SRStage
         
         Args:
+            asset_files: the contents of the asset files
             info_api: the opcode info api used to fetch information about opcodes
+            interner: shares identical blocks and their children if given
         
         Returns:
             the SRStage, a list of the global variables, a list of the global lists
@@ -282,7 +330,7 @@ class FRStage(FRTarget):
             sounds,
             all_sprite_variables,
             all_sprite_lists,
-        ) = super()._to_second_common(asset_files, info_api)
+        ) = super()._to_second_common(asset_files, info_api, interner)
         return (SRStage(
             scripts       = scripts,
             comments      = comments,
@@ -341,12 +389,15 @@ class FRSprite(FRTarget):
     def to_second(self, 
         asset_files: dict[str, bytes],
         info_api: OpcodeInfoAPI,
+        interner: Interner | None = None,
     ) -> tuple["SRSprite", None, None]:
         """
         Converts a FRSprite into a SRSprite
         
         Args:
+            asset_files: the contents of the asset files
             info_api: the opcode info api used to fetch information about opcodes
+            interner: shares identical blocks and their children if given
         
         Returns:
             the SRSprite, None, None
@@ -358,7 +409,7 @@ class FRSprite(FRTarget):
             sounds,
             sprite_only_variables,
             sprite_only_lists,
-        ) = super()._to_second_common(asset_files, info_api)
+        ) = super()._to_second_common(asset_files, info_api, interner)
         return (SRSprite(
             name                  = self.name,
             scripts               = scripts,
@@ -391,6 +442,8 @@ class SRTarget:
     sounds: list[SRSound]
     volume: int | float
 
+    _cache_fingerprint = True
+
     @classmethod
     def create_empty(cls) -> "SRTarget":
         """
@@ -408,6 +461,15 @@ class SRTarget:
             volume=100,
         )
 
+    def __getstate__(self) -> dict:
+        """
+        Get the state for copying and pickling without the cached fingerprint
+
+        Returns:
+            the state
+        """
+        return drop_fingerprint_cache(self.__dict__)
+
     def validate(self, path: list, config: ValidationConfig, info_api: OpcodeInfoAPI) -> None:
         """
         Ensure a SRTarget is valid, raise ValidationError if not
@@ -0,0 +1,170 @@
+from typing import Any, Callable, Iterable, Iterator
+
+from pypenguin.core.block import IRBlock, SRScript, SRBlock
+
+
+def walk_sr_blocks(
+    root: Any,
+    path: list | None = None,
+    *,
+    post_order: bool = False,
+    prune: Callable[[list | None, SRBlock], bool] | None = None,
+    with_paths: bool = True,
+) -> Iterator[tuple[list | None, SRBlock]]:
+    """
+    Iterate over all blocks within a part of a SRProject without recursion.
+    The blocks in the inputs of a block are its children. Blocks, which are not valid (yet), are skipped, so it can be used before validation.
+    Stop early by breaking out of the loop.
+    Validation (SRScript.validate, SRBlock.validate) stays recursive on purpose: every block is validated with what its parent expects of it
+    (expects_reporter, the input type for its dropdowns, its position in the substack), which a flat walk doesn't know
+
+    Args:
+        root: a SRProject, SRTarget, SRScript, SRBlock or a list of SRScripts
+        path: the path of the root, the yielded paths start with it. Defaults to [] (to ["stage"]/["sprites", i] for a SRProject)
+        post_order: whether to yield the children of a block before the block. Defaults to pre-order
+        prune: is called with the path and block before its children are visited. If it returns True, the children are skipped
+        with_paths: whether to build the paths. If not, None is yielded instead, which is faster
+
+    Returns:
+        an iterator of (path, block) pairs. The paths have the same format as the paths of validation errors
+    """
+    roots = _get_sr_roots(root, [] if path is None else path)
+    if not (with_paths or post_order or prune):
+        yield from ((None, block) for block in _iter_sr_blocks_fast([block for _, block in roots]))
+        return
+    if not with_paths:
+        roots = [(None, block) for _, block in roots]
+    stack = [(block_path, block, False) for block_path, block in reversed(roots)]
+    while stack:
+        block_path, block, is_expanded = stack.pop()
+        if is_expanded:
+            yield (block_path, block)
+            continue
+        if post_order:
+            stack.append((block_path, block, True))
+        else:
+            yield (block_path, block)
+        if (prune is not None) and prune(block_path, block):
+            continue
+        children = _get_sr_children(block_path, block)
+        children.reverse()
+        stack.extend((child_path, child, False) for child_path, child in children)
+
+def _iter_sr_blocks_fast(roots: list[SRBlock]) -> Iterator[SRBlock]:
+    """
+    *[Helper Function]* Iterate over the blocks in pre-order without paths; the common case of walk_sr_blocks
+    """
+    stack = roots[::-1]
+    while stack:
+        block = stack.pop()
+        yield block
+        inputs = getattr(block, "inputs", None)
+        if not isinstance(inputs, dict):
+            continue
+        children = []
+        for input_value in inputs.values():
+            sub_block = getattr(input_value, "block", None)
+            if isinstance(sub_block, SRBlock):
+                children.append(sub_block)
+            sub_blocks = getattr(input_value, "blocks", None)
+            if isinstance(sub_blocks, list):
+                children.extend(sub_block for sub_block in sub_blocks if isinstance(sub_block, SRBlock))
+        children.reverse()
+        stack.extend(children)
+
+def _get_sr_roots(root: Any, path: list) -> list[tuple[list, SRBlock]]:
+    """
+    *[Helper Function]* Get the top level blocks of the root of a SR walk and their paths
+    """
+    if isinstance(root, SRBlock):
+        return [(path, root)]
+    if isinstance(root, SRScript):
+        blocks = getattr(root, "blocks", None)
+        if not isinstance(blocks, list):
+            return []
+        return [(path+["blocks", i], block) for i, block in enumerate(blocks) if isinstance(block, SRBlock)]
+    if isinstance(root, list):
+        roots = []
+        for i, script in enumerate(root):
+            if isinstance(script, SRScript):
+                roots.extend(_get_sr_roots(script, path+[i]))
+        return roots
+    # SRProject and SRTarget can not be imported here (circular import)
+    if hasattr(root, "stage") and hasattr(root, "sprites"): # SRProject
+        roots = _get_sr_roots(root.stage, path+["stage"])
+        for i, sprite in enumerate(root.sprites):
+            roots.extend(_get_sr_roots(sprite, path+["sprites", i]))
+        return roots
+    if hasattr(root, "scripts"): # SRTarget
+        return _get_sr_roots(root.scripts, path+["scripts"])
+    raise TypeError(f"Can not walk the blocks of {type(root).__name__}")
+
+def _get_sr_children(path: list | None, block: SRBlock) -> list[tuple[list | None, SRBlock]]:
+    """
+    *[Helper Function]* Get the blocks in the inputs of a SRBlock and their paths. The paths are None if path is None
+    """
+    inputs = getattr(block, "inputs", None)
+    if not isinstance(inputs, dict):
+        return []
+    children = []
+    for input_id, input_value in inputs.items():
+        sub_block = getattr(input_value, "block", None)
+        if isinstance(sub_block, SRBlock):
+            children.append((None if path is None else path+["inputs", (input_id,), "block"], sub_block))
+        sub_blocks = getattr(input_value, "blocks", None)
+        if isinstance(sub_blocks, list):
+            children.extend(
+                (None if path is None else path+["inputs", (input_id,), "blocks", i], sub_block)
+                for i, sub_block in enumerate(sub_blocks) if isinstance(sub_block, SRBlock)
+            )
+    return children
+
+def walk_ir_blocks(
+    all_blocks: dict[str, IRBlock],
+    top_level_ids: Iterable[str] | None = None,
+    *,
+    post_order: bool = False,
+    prune: Callable[[list, IRBlock], bool] | None = None,
+) -> Iterator[tuple[list, IRBlock]]:
+    """
+    Iterate over the blocks of a target in intermediate representation without recursion.
+    The blocks referenced by the inputs of a block (and its immediate blocks) are its children, the next block is its sibling.
+    Stop early by breaking out of the loop
+
+    Args:
+        all_blocks: maps the reference ids to the blocks
+        top_level_ids: the ids of the first blocks of the scripts to walk. Defaults to all top level blocks
+        post_order: whether to yield the children of a block before the block. Defaults to pre-order
+        prune: is called with the path and block before its children are visited. If it returns True, the children are skipped
+
+    Returns:
+        an iterator of (path, block) pairs. The path of a referenced block is [(reference id,)],
+        the path of an immediate block is the path of its parent + ["inputs", (input id,), "immediate_block"]
+    """
+    if top_level_ids is None:
+        top_level_ids = [block_id for block_id, block in all_blocks.items() if block.is_top_level]
+    stack = [([(block_id,)], all_blocks[block_id], False) for block_id in reversed(list(top_level_ids))]
+    while stack:
+        block_path, block, is_expanded = stack.pop()
+        if is_expanded:
+            yield (block_path, block)
+            continue
+        if block.next is not None:
+            stack.append(([(block.next,)], all_blocks[block.next], False))
+        if post_order:
+            stack.append((block_path, block, True))
+        else:
+            yield (block_path, block)
+        if (prune is not None) and prune(block_path, block):
+            continue
+        children = []
+        for input_id, input_value in block.inputs.items():
+            if input_value.immediate_block is not None:
+                children.append((block_path+["inputs", (input_id,), "immediate_block"], input_value.immediate_block))
+            children.extend(([(reference,)], all_blocks[reference]) for reference in input_value.references)
+        children.reverse()
+        stack.extend((child_path, child, False) for child_path, child in children)
+
+
+__all__ = ["walk_sr_blocks", "walk_ir_blocks"]
+
@@ -0,0 +1,262 @@
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pypenguin.core.project import SRProject
+
+from pypenguin.important_consts import OPCODE_NUM_VAR_VALUE, OPCODE_NUM_LIST_VALUE
+from pypenguin.opcode_info.api  import DropdownValueKind
+from pypenguin.utility          import grepr_dataclass
+
+from pypenguin.core.block      import SRBlock
+from pypenguin.core.dropdown   import SRDropdownValue
+from pypenguin.core.index      import INDEXED_DROPDOWN_KINDS
+from pypenguin.core.monitor    import SRMonitor
+from pypenguin.core.target     import FRSprite, SRTarget, SRSprite
+from pypenguin.core.traversal  import walk_sr_blocks
+from pypenguin.core.vars_lists import SRVariable, SRList
+
+
+# How the first representation references variables, lists and broadcasts (used for unloaded sprites)
+_FR_PRIMITIVE_KINDS = {
+    11                   : DropdownValueKind.BROADCAST_MSG,
+    OPCODE_NUM_VAR_VALUE : DropdownValueKind.VARIABLE,
+    OPCODE_NUM_LIST_VALUE: DropdownValueKind.LIST,
+}
+_FR_VARIABLE_TYPE_KINDS = {"": DropdownValueKind.VARIABLE, "list": DropdownValueKind.LIST, "broadcast_msg": DropdownValueKind.BROADCAST_MSG}
+_FR_FIELD_KINDS = {"VARIABLE": DropdownValueKind.VARIABLE, "LIST": DropdownValueKind.LIST, "BROADCAST_OPTION": DropdownValueKind.BROADCAST_MSG}
+
+@grepr_dataclass(grepr_fields=["kind", "name", "sprite_name", "block_references", "monitor_references", "visible_monitor_references"])
+class SRDataUsage:
+    """
+    How often a variable, list or broadcast is used within a SRProject
+    """
+
+    kind: DropdownValueKind
+    name: str
+    sprite_name: str | None # the sprite of a sprite only variable or list. None for global variables and lists and broadcasts
+    block_references: int
+    monitor_references: int
+    visible_monitor_references: int
+
+    @property
+    def is_used(self) -> bool:
+        """
+        Check whether any block references the variable, list or broadcast. Monitors do not count as usage
+
+        Returns:
+            whether it is used
+        """
+        return self.block_references > 0
+
+@grepr_dataclass(grepr_fields=["usages"], eq=False)
+class SRCrossReference:
+    """
+    The usage counts of all variables, lists and broadcasts of a SRProject, which are collected in one pass (see from_project).
+    Declared but unused variables and lists are included with zero references.
+    References of unloaded sprites (see SRProject.unloaded_targets) to global variables, lists and broadcasts are counted too
+    """
+
+    usages: dict[tuple[DropdownValueKind, str, str | None], SRDataUsage] # keys are (kind, name, sprite name)
+
+    @classmethod
+    def from_project(cls, project: "SRProject") -> "SRCrossReference":
+        """
+        Count the references of blocks and monitors to all variables, lists and broadcasts of a SRProject
+
+        Args:
+            project: the SRProject
+
+        Returns:
+            the cross reference
+        """
+        cross_reference = cls(usages={})
+        cross_reference._declare(project.all_sprite_variables, project.all_sprite_lists, None)
+        for sprite in project.sprites:
+            cross_reference._declare(sprite.sprite_only_variables, sprite.sprite_only_lists, sprite.name)
+
+        for target in [project.stage] + project.sprites:
+            for _, block in walk_sr_blocks(target, with_paths=False):
+                cross_reference._add_block(target, block)
+        for monitor in project.global_monitors:
+            cross_reference._add_monitor(project.stage, monitor)
+        for sprite in project.sprites:
+            for monitor in sprite.local_monitors:
+                cross_reference._add_monitor(sprite, monitor)
+        if project.unloaded_targets is not None:
+            # their monitors can only show their own variables and lists
+            for fr_sprite in project.unloaded_targets.sprites:
+                cross_reference._add_unloaded_sprite(fr_sprite)
+        return cross_reference
+
+    def _declare(self, variables: list[SRVariable], lists: list[SRList], sprite_name: str | None) -> None:
+        """
+        *[Internal Method]* Add the variables and lists of a scope with zero references
+        """
+        for kind, items in ((DropdownValueKind.VARIABLE, variables), (DropdownValueKind.LIST, lists)):
+            for item in items:
+                self.usages[(kind, item.name, sprite_name)] = SRDataUsage(
+                    kind                       = kind,
+                    name                       = item.name,
+                    sprite_name                = sprite_name,
+                    block_references           = 0,
+                    monitor_references         = 0,
+                    visible_monitor_references = 0,
+                )
+
+    def _resolve(self, target: SRTarget, dropdown_value: SRDropdownValue) -> SRDataUsage:
+        """
+        *[Internal Method]* Get the usage of the variable, list or broadcast a dropdown value of a target references.
+        Sprite only variables and lists shadow global ones. Undeclared ones are added
+        """
+        kind, name = dropdown_value.kind, dropdown_value.value
+        if isinstance(target, SRSprite):
+            usage = self.usages.get((kind, name, target.name))
+            if usage is not None:
+                return usage
+        return self._get_global(kind, name)
+
+    def _get_global(self, kind: DropdownValueKind, name: str) -> SRDataUsage:
+        """
+        *[Internal Method]* Get the usage of a global variable, list or broadcast. Undeclared ones are added
+        """
+        usage = self.usages.get((kind, name, None))
+        if usage is None:
+            usage = self.usages[(kind, name, None)] = SRDataUsage(
+                kind                       = kind,
+                name                       = name,
+                sprite_name                = None,
+                block_references           = 0,
+                monitor_references         = 0,
+                visible_monitor_references = 0,
+            )
+        return usage
+
+    def _add_block(self, target: SRTarget, block: SRBlock) -> None:
+        """
+        *[Internal Method]* Count the references of a block (but not of the blocks in its inputs)
+        """
+        dropdown_values = list(block.dropdowns.values())
+        dropdown_values.extend(getattr(input_value, "dropdown", None) for input_value in block.inputs.values())
+        for dropdown_value in dropdown_values:
+            if (dropdown_value is not None) and (dropdown_value.kind in INDEXED_DROPDOWN_KINDS):
+                self._resolve(target, dropdown_value).block_references += 1
+
+    def _add_unloaded_sprite(self, sprite: FRSprite) -> None:
+        """
+        *[Internal Method]* Count the references of the blocks of an unloaded sprite to global variables, lists and broadcasts
+        """
+        own_data = {(DropdownValueKind.VARIABLE, variable[0]) for variable in sprite.variables.values()}
+        own_data.update((DropdownValueKind.LIST, list_[0]) for list_ in sprite.lists.values())
+        for kind, name in _iter_fr_references(sprite):
+            if (kind, name) not in own_data: # sprite only ones shadow global ones
+                self._get_global(kind, name).block_references += 1
+
+    def _add_monitor(self, target: SRTarget, monitor: SRMonitor) -> None:
+        """
+        *[Internal Method]* Count the references of a monitor
+        """
+        for dropdown_value in monitor.dropdowns.values():
+            if dropdown_value.kind in INDEXED_DROPDOWN_KINDS:
+                usage = self._resolve(target, dropdown_value)
+                usage.monitor_references += 1
+                if monitor.is_visible:
+                    usage.visible_monitor_references += 1
+
+    def get_usage(self, kind: DropdownValueKind, name: str, sprite_name: str | None = None) -> SRDataUsage | None:
+        """
+        Get the usage of a variable, list or broadcast
+
+        Args:
+            kind: VARIABLE, LIST or BROADCAST_MSG
+            name: the name of the variable, list or broadcast
+            sprite_name: the name of the sprite for sprite only variables and lists
+
+        Returns:
+            the usage or None if it is neither declared nor referenced
+        """
+        return self.usages.get((kind, name, sprite_name))
+
+    def get_unused(self, keep_visible_monitors: bool = False) -> list[SRDataUsage]:
+        """
+        Get the variables and lists, which are not referenced by any block
+
+        Args:
+            keep_visible_monitors: whether to treat variables and lists with a visible monitor as used
+
+        Returns:
+            the usages of the unused variables and lists
+        """
+        return [
+            usage for usage in self.usages.values()
+            if (not usage.is_used) and (usage.kind is not DropdownValueKind.BROADCAST_MSG)
+            and not (keep_visible_monitors and usage.visible_monitor_references)
+        ]
+
+
+def _iter_fr_references(sprite: FRSprite) -> Iterator[tuple[DropdownValueKind, str]]:
+    """
+    *[Helper Function]* Iterate over the kinds and names of the variables, lists and broadcasts the blocks of a FRSprite reference
+    """
+    for block in sprite.blocks.values():
+        if isinstance(block, tuple): # a top level variable or list reporter
+            if block[0] in _FR_PRIMITIVE_KINDS:
+                yield (_FR_PRIMITIVE_KINDS[block[0]], block[1])
+            continue
+        for field_id, field_value in block.fields.items():
+            if len(field_value) == 3:
+                kind = _FR_VARIABLE_TYPE_KINDS.get(field_value[2])
+            else:
+                kind = _FR_FIELD_KINDS.get(field_id)
+            if kind is not None:
+                yield (kind, field_value[0])
+        for input_value in block.inputs.values():
+            for item in input_value[1:]:
+                if isinstance(item, tuple) and (item[0] in _FR_PRIMITIVE_KINDS):
+                    yield (_FR_PRIMITIVE_KINDS[item[0]], item[1])
+
+def prune_unused_data(project: "SRProject", keep_visible_monitors: bool = False) -> list[SRDataUsage]:
+    """
+    Remove the variables and lists, which are not referenced by any block, and their monitors from a SRProject.
+    Broadcasts are not declared in SRProjects, so there is nothing to remove for them.
+    Global variables and lists used by unloaded sprites are kept; the data of unloaded sprites is never changed
+
+    Args:
+        project: the SRProject. Is modified in place
+        keep_visible_monitors: whether to keep variables and lists with a visible monitor
+
+    Returns:
+        the usages of the removed variables and lists
+    """
+    cross_reference = SRCrossReference.from_project(project)
+    unused = cross_reference.get_unused(keep_visible_monitors)
+    if not unused:
+        return unused
+    unused_keys = {(usage.kind, usage.name, usage.sprite_name) for usage in unused}
+
+    def is_kept(item: SRVariable | SRList, kind: DropdownValueKind, sprite_name: str | None) -> bool:
+        return (kind, item.name, sprite_name) not in unused_keys
+
+    def is_monitor_kept(target: SRTarget, monitor: SRMonitor) -> bool:
+        for dropdown_value in monitor.dropdowns.values():
+            if dropdown_value.kind in INDEXED_DROPDOWN_KINDS:
+                usage = cross_reference._resolve(target, dropdown_value)
+                if (usage.kind, usage.name, usage.sprite_name) in unused_keys:
+                    return False
+        return True
+
+    project.all_sprite_variables = [item for item in project.all_sprite_variables if is_kept(item, DropdownValueKind.VARIABLE, None)]
+    project.all_sprite_lists     = [item for item in project.all_sprite_lists     if is_kept(item, DropdownValueKind.LIST    , None)]
+    project.global_monitors      = [monitor for monitor in project.global_monitors if is_monitor_kept(project.stage, monitor)]
+    for sprite in project.sprites:
+        sprite.sprite_only_variables = [
+            item for item in sprite.sprite_only_variables if is_kept(item, DropdownValueKind.VARIABLE, sprite.name)
+        ]
+        sprite.sprite_only_lists = [
+            item for item in sprite.sprite_only_lists if is_kept(item, DropdownValueKind.LIST, sprite.name)
+        ]
+        sprite.local_monitors = [monitor for monitor in sprite.local_monitors if is_monitor_kept(sprite, monitor)]
+    return unused
+
+
+__all__ = ["SRDataUsage", "SRCrossReference", "prune_unused_data"]
+
@@ -2,3 +2,4 @@ from pypenguin.opcode_info.api.dropdown     import *
 from pypenguin.opcode_info.api.input        import *
 from pypenguin.opcode_info.api.main         import *
 from pypenguin.opcode_info.api.special_case import *
+from pypenguin.opcode_info.api.snapshot     import *
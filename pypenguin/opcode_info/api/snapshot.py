@@ -0,0 +1,315 @@
+from functools import lru_cache
+from importlib import import_module
+from marshal   import dumps, loads
+from sys       import version_info
+from types     import MappingProxyType
+from typing    import Any, Callable, Iterable, Iterator
+
+from pypenguin.utility import DualKeyDict, grepr_dataclass, OpcodeInfoError, DeserializationError
+
+from pypenguin.opcode_info.api.input        import InputInfo, InputType, MenuInfo
+from pypenguin.opcode_info.api.dropdown     import DropdownInfo, DropdownType
+from pypenguin.opcode_info.api.special_case import SpecialCase, SpecialCaseType
+from pypenguin.opcode_info.api.main         import OpcodeInfo, OpcodeInfoAPI, OpcodeType
+
+
+SNAPSHOT_MAGIC = "pypenguin-opcode-info-snapshot"
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@grepr_dataclass(grepr_fields=["module", "qualname"], frozen=True)
+class ObjectReference:
+    """
+    A reference to a module level function or class by its import path.
+    Calling it imports and calls the referenced function, which allows special cases to be resolved lazily
+    """
+
+    module: str
+    qualname: str
+
+    @classmethod
+    def from_object(cls, obj: Callable) -> "ObjectReference":
+        """
+        Create a reference to a module level function or class
+
+        Args:
+            obj: the function or class
+
+        Returns:
+            the reference
+        """
+        if isinstance(obj, ObjectReference):
+            return obj
+        if "<" in obj.__qualname__:
+            raise OpcodeInfoError(f"Can only reference module level functions and classes, not {obj.__qualname__}")
+        return cls(module=obj.__module__, qualname=obj.__qualname__)
+
+    def resolve(self) -> Any:
+        """
+        Import the referenced object. The result is remembered, because special cases are called very often
+
+        Returns:
+            the referenced object
+        """
+        return _resolve_reference(self.module, self.qualname)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _resolve_reference(module: str, qualname: str) -> Any:
+    """
+    *[Helper Function]* Import a module level function or class by its import path
+    """
+    obj = import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class _LazyOpcodeInfoDict(DualKeyDict[str, str, OpcodeInfo]):
+    """
+    *[Internal Class]* A DualKeyDict, which only builds each OpcodeInfo of the snapshot when it is first accessed.
+    Opcodes added later are stored like in a normal DualKeyDict
+    """
+
+    def __init__(self, keys: Iterable[tuple[str, str]], build: Callable[[str], OpcodeInfo]) -> None:
+        super().__init__()
+        for old_opcode, new_opcode in keys:
+            self._k1_to_k2[old_opcode] = new_opcode
+            self._k2_to_k1[new_opcode] = old_opcode
+            self._k1_objects[old_opcode] = old_opcode
+        self._build = build
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DualKeyDict):
+            return NotImplemented
+        return dict(self.items_key1()) == dict(other.items_key1()) and (self._k1_to_k2 == other._k1_to_k2)
+
+    def get_by_key1(self, key1: str) -> OpcodeInfo:
+        value = self._values.get(key1, None)
+        if value is None:
+            if key1 not in self._k1_to_k2:
+                raise KeyError(key1)
+            value = self._build(key1)
+            self._values[key1] = value
+        return value
+
+    def get_by_key2(self, key2: str) -> OpcodeInfo:
+        return self.get_by_key1(self._k2_to_k1[key2])
+
+    def has_key1(self, key1: str) -> bool:
+        return key1 in self._k1_to_k2
+
+    def __len__(self) -> int:
+        return len(self._k1_to_k2)
+
+    def keys_key1(self) -> Iterator[str]:
+        return self._k1_to_k2.keys()
+
+    def values(self) -> Iterator[OpcodeInfo]:
+        return (self.get_by_key1(key1) for key1 in self._k1_to_k2.keys())
+
+    def items_key1(self) -> Iterator[tuple[str, OpcodeInfo]]:
+        return ((key1, self.get_by_key1(key1)) for key1 in self._k1_to_k2.keys())
+
+
+@grepr_dataclass(grepr_fields=["format_version", "python_version"], frozen=True)
+class OpcodeInfoSnapshot:
+    """
+    A compact, immutable snapshot of a built OpcodeInfoAPI. It only consists of plain tables
+    (strings, bools, enum member names and references to special case functions and mutation classes),
+    so it can be stored with marshal and loaded with minimal work.
+    The OpcodeInfo objects of the resulting api are only built when an opcode is first accessed,
+    special case functions are only imported when first called
+    """
+
+    format_version: int
+    python_version: tuple[int, int]
+    tables: MappingProxyType # old opcode -> plain record, see _opcode_info_to_record
+
+    @classmethod
+    def from_api(cls, info_api: OpcodeInfoAPI) -> "OpcodeInfoSnapshot":
+        """
+        Freeze an OpcodeInfoAPI into a snapshot
+
+        Args:
+            info_api: the opcode info api to freeze
+
+        Returns:
+            the snapshot
+        """
+        return cls(
+            format_version = SNAPSHOT_FORMAT_VERSION,
+            python_version = tuple(version_info[:2]),
+            tables         = MappingProxyType({
+                old_opcode: cls._opcode_info_to_record(new_opcode, opcode_info)
+                for old_opcode, new_opcode, opcode_info in info_api.opcode_info.items_key1_key2()
+            }),
+        )
+
+    @staticmethod
+    def _opcode_info_to_record(new_opcode: str, opcode_info: OpcodeInfo) -> tuple:
+        """
+        *[Helper Method]* Convert an OpcodeInfo into a plain record
+
+        Args:
+            new_opcode: the new opcode of the OpcodeInfo
+            opcode_info: the OpcodeInfo
+
+        Returns:
+            the plain record
+        """
+        def reference_to_record(obj: Callable | None) -> tuple[str, str] | None:
+            if obj is None:
+                return None
+            reference = ObjectReference.from_object(obj)
+            return (reference.module, reference.qualname)
+
+        return (
+            new_opcode,
+            opcode_info.opcode_type.name,
+            opcode_info.can_have_monitor,
+            opcode_info.has_shadow,
+            tuple(
+                (
+                    old_id, new_id, input_info.type.name,
+                    None if input_info.menu is None else (input_info.menu.opcode, input_info.menu.inner),
+                )
+                for old_id, new_id, input_info in opcode_info.inputs.items_key1_key2()
+            ),
+            tuple(
+                (old_id, new_id, dropdown_info.type.name)
+                for old_id, new_id, dropdown_info in opcode_info.dropdowns.items_key1_key2()
+            ),
+            tuple(
+                (case_type.name, reference_to_record(special_case.function))
+                for case_type, special_case in opcode_info.special_cases.items()
+            ),
+            reference_to_record(opcode_info.old_mutation_cls),
+            reference_to_record(opcode_info.new_mutation_cls),
+        )
+
+    @staticmethod
+    def _record_to_opcode_info(record: tuple) -> OpcodeInfo:
+        """
+        *[Helper Method]* Convert a plain record back into an OpcodeInfo
+
+        Args:
+            record: the plain record
+
+        Returns:
+            the OpcodeInfo
+        """
+        (
+            _, opcode_type, can_have_monitor, has_shadow,
+            inputs, dropdowns, special_cases, old_mutation_cls, new_mutation_cls,
+        ) = record
+        opcode_info = OpcodeInfo(
+            opcode_type      = OpcodeType[opcode_type],
+            inputs           = DualKeyDict({
+                (old_id, new_id): InputInfo(
+                    type = InputType[input_type],
+                    menu = None if menu is None else MenuInfo(opcode=menu[0], inner=menu[1]),
+                )
+                for old_id, new_id, input_type, menu in inputs
+            }),
+            dropdowns        = DualKeyDict({
+                (old_id, new_id): DropdownInfo(type=DropdownType[dropdown_type])
+                for old_id, new_id, dropdown_type in dropdowns
+            }),
+            can_have_monitor = can_have_monitor,
+            has_shadow       = has_shadow,
+        )
+        for case_type, function in special_cases:
+            opcode_info.add_special_case(SpecialCase(
+                type     = SpecialCaseType[case_type],
+                function = ObjectReference(*function),
+            ))
+        if (old_mutation_cls is not None) or (new_mutation_cls is not None):
+            opcode_info.set_mutation_class(
+                old_cls = None if old_mutation_cls is None else ObjectReference(*old_mutation_cls).resolve(),
+                new_cls = None if new_mutation_cls is None else ObjectReference(*new_mutation_cls).resolve(),
+            )
+        return opcode_info
+
+    def to_api(self) -> OpcodeInfoAPI:
+        """
+        Create an OpcodeInfoAPI from the snapshot. OpcodeInfos are built on first access
+
+        Returns:
+            the opcode info api
+        """
+        tables = self.tables
+        return OpcodeInfoAPI(opcode_info=_LazyOpcodeInfoDict(
+            keys  = ((old_opcode, record[0]) for old_opcode, record in tables.items()),
+            build = lambda old_opcode: OpcodeInfoSnapshot._record_to_opcode_info(tables[old_opcode]),
+        ))
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the snapshot. The result can only be loaded by the same python version
+
+        Returns:
+            the serialized snapshot
+        """
+        return dumps((SNAPSHOT_MAGIC, self.format_version, self.python_version, dict(self.tables)))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OpcodeInfoSnapshot":
+        """
+        Deserialize a snapshot
+
+        Args:
+            data: the serialized snapshot
+
+        Returns:
+            the snapshot
+        """
+        try:
+            magic, format_version, python_version, tables = loads(data)
+        except (ValueError, EOFError, TypeError):
+            raise DeserializationError("Invalid OpcodeInfoSnapshot data")
+        if magic != SNAPSHOT_MAGIC:
+            raise DeserializationError("Invalid OpcodeInfoSnapshot data")
+        if format_version != SNAPSHOT_FORMAT_VERSION:
+            raise DeserializationError(f"Unsupported OpcodeInfoSnapshot format version: {format_version}")
+        if tuple(python_version) != tuple(version_info[:2]):
+            raise DeserializationError(f"OpcodeInfoSnapshot was created with another python version: {python_version}")
+        return cls(
+            format_version = format_version,
+            python_version = tuple(python_version),
+            tables         = MappingProxyType(tables),
+        )
+
+    def to_file(self, file_path: str) -> None:
+        """
+        Write the serialized snapshot into a file
+
+        Args:
+            file_path: the file path
+
+        Returns:
+            None
+        """
+        with open(file_path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "OpcodeInfoSnapshot":
+        """
+        Read a serialized snapshot from a file
+
+        Args:
+            file_path: the file path
+
+        Returns:
+            the snapshot
+        """
+        with open(file_path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+__all__ = ["ObjectReference", "OpcodeInfoSnapshot"]
+
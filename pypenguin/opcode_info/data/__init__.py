@@ -1 +1,16 @@
-from pypenguin.opcode_info.data.main import *
+from typing import Any
+
+# info_api is only loaded on first access (see loader.load_info_api),
+# so the special case functions can be imported without loading it
+
+
+def __getattr__(name: str) -> Any:
+    if name == "info_api":
+        from pypenguin.opcode_info.data.loader import load_info_api
+        global info_api
+        info_api = load_info_api()
+        return info_api
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["info_api"]
@@ -0,0 +1,129 @@
+import os
+from functools import lru_cache
+from hashlib   import sha256
+from logging   import getLogger
+from sys       import implementation
+from tempfile  import mkstemp
+
+from pypenguin.utility         import DeserializationError
+from pypenguin.opcode_info.api import OpcodeInfoAPI, OpcodeInfoSnapshot
+
+
+logger = getLogger(__name__)
+
+SNAPSHOT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+SNAPSHOT_FILE_PREFIX = "opcode_info."
+SNAPSHOT_FILE_SUFFIX = ".snapshot"
+
+_PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The source code the snapshot is built from: the opcode definitions, the api classes (e.g. enum member names)
+# and the modules of the referenced constants and mutation classes
+_SOURCE_PATHS = ["opcode_info", "important_consts.py", os.path.join("core", "block_mutation.py")]
+
+
+@lru_cache(maxsize=None)
+def get_source_version() -> str:
+    """
+    Hash the source code the opcode info api is built from. A snapshot file is only used for the exact same source code
+
+    Returns:
+        the hash
+    """
+    file_paths = []
+    for source_path in _SOURCE_PATHS:
+        source_path = os.path.join(_PACKAGE_DIRECTORY, source_path)
+        if os.path.isfile(source_path):
+            file_paths.append(source_path)
+            continue
+        for directory, directory_names, file_names in os.walk(source_path):
+            directory_names[:] = [name for name in directory_names if name != "__pycache__"]
+            file_paths.extend(os.path.join(directory, name) for name in file_names if name.endswith(".py"))
+
+    hasher = sha256()
+    for file_path in sorted(file_paths):
+        hasher.update(os.path.relpath(file_path, _PACKAGE_DIRECTORY).encode("utf-8"))
+        with open(file_path, "rb") as file:
+            hasher.update(file.read())
+    return hasher.hexdigest()
+
+def get_snapshot_path() -> str | None:
+    """
+    Get the path of the snapshot file for the current source code and python version
+
+    Returns:
+        the file path or None if the python implementation doesn't support caches
+    """
+    if implementation.cache_tag is None:
+        return None
+    file_name = f"{SNAPSHOT_FILE_PREFIX}{implementation.cache_tag}.{get_source_version()[:16]}{SNAPSHOT_FILE_SUFFIX}"
+    return os.path.join(SNAPSHOT_DIRECTORY, file_name)
+
+def build_info_api() -> OpcodeInfoAPI:
+    """
+    Build the opcode info api from the opcode definitions
+
+    Returns:
+        the opcode info api
+    """
+    from pypenguin.opcode_info.data.main import info_api
+    return info_api
+
+def load_info_api(use_snapshot: bool = True) -> OpcodeInfoAPI:
+    """
+    Load the opcode info api from its snapshot file. If there is no valid snapshot file,
+    the api is built and a snapshot file is written for the next time (like python does with .pyc files)
+
+    Args:
+        use_snapshot: whether to use the snapshot file at all
+
+    Returns:
+        the opcode info api
+    """
+    snapshot_path = get_snapshot_path() if use_snapshot else None
+    if snapshot_path is None:
+        return build_info_api()
+
+    try:
+        return OpcodeInfoSnapshot.from_file(snapshot_path).to_api()
+    except FileNotFoundError:
+        pass
+    except (OSError, DeserializationError) as error:
+        logger.debug("Ignoring the opcode info snapshot %s: %s", snapshot_path, error)
+
+    info_api = build_info_api()
+    try:
+        _write_snapshot(OpcodeInfoSnapshot.from_api(info_api), snapshot_path)
+    except OSError as error: # e.g. a read-only installation
+        logger.debug("Could not write the opcode info snapshot %s: %s", snapshot_path, error)
+    return info_api
+
+def _write_snapshot(snapshot: OpcodeInfoSnapshot, snapshot_path: str) -> None:
+    """
+    *[Helper Function]* Atomically write a snapshot file and remove the snapshot files of older source code
+    """
+    directory = os.path.dirname(snapshot_path)
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(snapshot.to_bytes())
+        os.replace(temporary_path, snapshot_path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+    current_prefix = f"{SNAPSHOT_FILE_PREFIX}{implementation.cache_tag}."
+    for file_name in os.listdir(directory):
+        file_path = os.path.join(directory, file_name)
+        if file_name.startswith(current_prefix) and file_name.endswith(SNAPSHOT_FILE_SUFFIX) and (file_path != snapshot_path):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+
+__all__ = ["get_source_version", "get_snapshot_path", "build_info_api", "load_info_api"]
+
@@ -0,0 +1,191 @@
+from typing import TYPE_CHECKING
+from copy   import copy, deepcopy
+
+from pypenguin.important_consts import (
+    NEW_OPCODE_CB_DEF, NEW_OPCODE_CB_DEF_REP, OPCODE_CB_ARG_TEXT, OPCODE_CB_ARG_BOOL,
+    SHA256_SEC_LOCAL_ARGUMENT_NAME,
+)
+from pypenguin.utility          import string_to_sha256, DualKeyDict, InvalidValueError
+
+from pypenguin.opcode_info.api import OpcodeType, InputType
+
+if TYPE_CHECKING:
+    from pypenguin.core.block_interface import FirstToInterIF, InterToFirstIF, ValidationIF
+    from pypenguin.core.block           import FRBlock, IRBlock, SRBlock
+
+# The special case functions of opcode_info.data.main. They are kept apart from the opcode definitions,
+# so opcode info snapshots can reference them without building the opcode info api
+
+
+def get_stop_script_opcode_type(block: "SRBlock|IRBlock", validation_if: "ValidationIF") -> OpcodeType:
+    from pypenguin.core.block_mutation import SRStopScriptMutation
+    mutation: SRStopScriptMutation = block.mutation
+    return OpcodeType.ENDING_STATEMENT if mutation.is_ending_statement else OpcodeType.STATEMENT
+
+
+def get_cb_call_opcode_type(block: "SRBlock|IRBlock", validation_if: "ValidationIF") -> OpcodeType:
+    # Get the complete mutation and derive OpcodeType from optype
+    from pypenguin.core.block_mutation import SRCustomBlockCallMutation
+    partial_mutation: SRCustomBlockCallMutation = block.mutation
+    complete_mutation = validation_if.get_cb_mutation(partial_mutation.custom_opcode)
+    return complete_mutation.optype.corresponding_opcode_type
+
+
+def get_cb_call_input_ids_info(block: "FRBlock|IRBlock|SRBlock", fti_if: "FirstToInterIF|None") -> DualKeyDict[str, str, InputType]:
+    from pypenguin.core.block_mutation import FRCustomBlockCallMutation, SRCustomBlockCallMutation
+    from pypenguin.core.block import FRBlock
+    if isinstance(block, FRBlock):
+        old_mutation: FRCustomBlockCallMutation = block.mutation
+        assert fti_if is not None, "When a FRBlock is given, fti_if mustn't be None"
+        mutation: SRCustomBlockCallMutation = old_mutation.to_second(fti_if=fti_if)
+    else:
+        mutation: SRCustomBlockCallMutation = block.mutation
+    
+    return DualKeyDict.from_same_keys(mutation.custom_opcode.corresponding_input_info)
+
+
+def pre_fti_cb_def(block: "FRBlock", block_id: str, fti_if: "FirstToInterIF") -> "FRBlock":
+    # Transfer mutation from prototype block to definition block
+    # Order deletion of the prototype block and its argument blocks
+    # Delete "custom_block" input, which references the prototype block
+    block = deepcopy(block)
+    prototype_id    = block.inputs["custom_block"][1]
+    prototype_block = fti_if.get_block(prototype_id)
+    block.mutation  = prototype_block.mutation
+    fti_if.schedule_block_deletion(prototype_id)
+    del block.inputs["custom_block"]
+    
+    target_ids = fti_if.get_block_ids_by_parent_id(prototype_id)
+    [fti_if.schedule_block_deletion(target_id) for target_id in target_ids]
+    return block
+
+
+def pre_fti_cb_arg(block: "FRBlock", block_id: str, fti_if: "FirstToInterIF") -> "FRBlock":
+    # Transfer argument name from a field into the mutation
+    # because only real dropdowns should be listed in "fields"
+    from pypenguin.core.block_mutation import FRCustomBlockArgumentMutation
+    block = deepcopy(block)
+    mutation: FRCustomBlockArgumentMutation = block.mutation
+    mutation.store_argument_name(block.fields["VALUE"][0])
+    del block.fields["VALUE"]
+    return block
+
+
+def pre_fti_cb_call(block: "FRBlock", block_id: str, fti_if: "FirstToInterIF") -> "FRBlock":
+    # => Store input values by argument names instead of argument ids
+    from pypenguin.core.block_mutation import FRCustomBlockCallMutation
+    block = copy(block)
+    partial_mutation: FRCustomBlockCallMutation = block.mutation
+    complete_mutation = fti_if.get_cb_mutation(partial_mutation.proccode)
+    new_inputs = {}
+    for argument_id, input_value in block.inputs.items():
+        argument_index = complete_mutation.argument_ids.index(argument_id)
+        argument_name  = complete_mutation.argument_names[argument_index]
+        new_inputs[argument_name] = input_value
+    block.inputs = new_inputs
+    return block
+
+
+def instead_fti_cb_prototype(block: "FRBlock", block_id: str, fti_if: "FirstToInterIF") -> "IRBlock":
+    # Return an empty, temporary block
+    from pypenguin.core.block import IRBlock
+    return IRBlock(
+        opcode       = block.opcode,
+        inputs       = ...,
+        dropdowns    = ...,
+        position     = ...,
+        comment      = ..., # Can't possibly have a comment
+        mutation     = ...,
+        next         = ...,
+        is_top_level = ...,
+    )
+
+
+def post_itf_cb_def(block: "FRBlock", block_id: str, itf_if: "InterToFirstIF") -> "FRBlock":
+    # Transfer mutation from definition block to prototype block
+    # Create the prototype block and its argument blocks
+    # Create the "custom_block" input, which references the prototype block
+    from pypenguin.core.block_mutation import FRCustomBlockMutation, FRCustomBlockArgumentMutation
+    from pypenguin.core.block          import FRBlock
+
+    mutation: FRCustomBlockMutation = block.mutation
+    prototype_id         = itf_if.get_next_block_id()
+    argument_block_ids   = [itf_if.get_next_block_id() for i in range(len(mutation.argument_names))]
+
+
+    block.inputs["custom_block"] = (1, prototype_id)
+    prototype_inputs = {
+        argument_id: (1, argument_block_id) 
+        for argument_id, argument_block_id in zip(mutation.argument_ids, argument_block_ids)
+    }
+    prototype_block = FRBlock(
+        opcode    = "procedures_prototype",
+        next      = None,
+        parent    = block_id,
+        inputs    = prototype_inputs, 
+        fields    = {},
+        shadow    = True,
+        top_level = False,
+        mutation  = mutation,
+    )
+    itf_if.schedule_block_addition(prototype_id, prototype_block)
+    for argument_name, argument_default, argument_block_id in zip(
+        mutation.argument_names, argument_default, argument_block_ids
+    ):
+        argument_opcode = OPCODE_CB_ARG_TEXT if argument_default == "" else OPCODE_CB_ARG_BOOL
+        argument_block = FRBlock(
+            opcode   = argument_opcode,
+            next     = None,
+            parent   = prototype_id,
+            inputs   = {},
+            fields   = {
+                "VALUE": (argument_name, string_to_sha256(argument_name, secondary=SHA256_SEC_LOCAL_ARGUMENT_NAME))
+            },
+            shadow   = True,
+            topLevel = False,
+            mutation = FRCustomBlockArgumentMutation(color=mutation.color), # use the same colors as the prototype,
+        )
+        itf_if.schedule_block_addition(argument_block_id, argument_block)
+    return block
+
+
+def post_itf_cb_call(block: "FRBlock", block_id: str, itf_if: "InterToFirstIF") -> "FRBlock":
+    # => Store input values by argument ids instead of argument names
+    from pypenguin.core.block_mutation import FRCustomBlockCallMutation
+    block = copy(block)
+    partial_mutation: FRCustomBlockCallMutation = block.mutation
+    complete_mutation = itf_if.get_fr_cb_mutation(partial_mutation.proccode)
+    new_inputs = {}
+    for argument_name, input_value in block.inputs.items():
+        argument_index = complete_mutation.argument_names.index(argument_name)
+        argument_id    = complete_mutation.argument_ids[argument_index]
+        new_inputs[argument_id] = input_value
+    block.inputs = new_inputs
+    return block
+
+
+def post_validation_cb_def(path:list, block: "SRBlock") -> None:
+    from pypenguin.core.block_mutation import SRCustomBlockMutation
+    mutation: SRCustomBlockMutation = block.mutation
+    if block.opcode == NEW_OPCODE_CB_DEF:
+        if mutation.optype.is_reporter():
+            raise InvalidValueError(path, f"If mutation.optype of a {block.__class__.__name__} is ...REPORTER, opcode should be {repr(NEW_OPCODE_CB_DEF_REP)}")
+    elif block.opcode == NEW_OPCODE_CB_DEF_REP:
+        if not mutation.optype.is_reporter():
+            raise InvalidValueError(path, f"If mutation.optype of a {block.__class__.__name__} is NOT ...REPORTER, opcode should be {repr(NEW_OPCODE_CB_DEF)}")
+    else: raise ValueError()
+
+
+__all__ = [
+    "get_stop_script_opcode_type",
+    "get_cb_call_opcode_type",
+    "get_cb_call_input_ids_info",
+    "pre_fti_cb_def",
+    "pre_fti_cb_arg",
+    "pre_fti_cb_call",
+    "instead_fti_cb_prototype",
+    "post_itf_cb_def",
+    "post_itf_cb_call",
+    "post_validation_cb_def",
+]
+
@@ -3,5 +3,9 @@ from pypenguin.utility.data          import *
 from pypenguin.utility.dual_key_dict import *
 from pypenguin.utility.errors        import *
 from pypenguin.utility.file          import *
+from pypenguin.utility.fingerprint   import *
+from pypenguin.utility.instrumentation import *
+from pypenguin.utility.intern        import *
+from pypenguin.utility.media         import *
 from pypenguin.utility.repr          import *
 from pypenguin.utility.validation import *
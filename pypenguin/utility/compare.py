@@ -1,7 +1,15 @@
-from lxml import etree
-from PIL  import Image
+from hashlib import blake2b
+from typing  import TYPE_CHECKING
 
-def xml_equal(xml1: etree._Element, xml2: etree._Element) -> bool:
+from pypenguin.utility.fingerprint import FINGERPRINT_SIZE
+
+# lxml and PIL are only imported once asset contents are actually compared
+if TYPE_CHECKING:
+    from lxml import etree
+    from PIL  import Image
+    from pydub import AudioSegment
+
+def xml_equal(xml1: "etree._Element", xml2: "etree._Element") -> bool:
     """
     Compare two xml elements for equality
     
@@ -12,9 +20,10 @@ def xml_equal(xml1: etree._Element, xml2: etree._Element) -> bool:
     Returns:
         wether the two xml elements are equal
     """
+    from lxml import etree
     return etree.tostring(xml1, method="c14n") == etree.tostring(xml2, method="c14n")
 
-def image_equal(img1: Image.Image, img2: Image.Image) -> bool:
+def image_equal(img1: "Image.Image", img2: "Image.Image") -> bool:
     """
     Compare two PIL Image instances for strict equality:
     same size, mode, and pixel data.
@@ -30,6 +39,45 @@ def image_equal(img1: Image.Image, img2: Image.Image) -> bool:
         return False
     return img1.tobytes() == img2.tobytes()
 
+def xml_fingerprint(xml: "etree._Element") -> bytes:
+    """
+    Calculate a fingerprint of a xml element. Elements are equal (see xml_equal) if their fingerprints are equal
+    
+    Args:
+        xml: the xml element
+    
+    Returns:
+        the fingerprint
+    """
+    from lxml import etree
+    return blake2b(etree.tostring(xml, method="c14n"), digest_size=FINGERPRINT_SIZE).digest()
+
+def image_fingerprint(img: "Image.Image") -> bytes:
+    """
+    Calculate a fingerprint of a PIL Image. Images are equal (see image_equal) if their fingerprints are equal
+    
+    Args:
+        img: the image
+    
+    Returns:
+        the fingerprint
+    """
+    hasher = blake2b(f"{img.mode}:{img.size[0]}x{img.size[1]}:".encode("utf-8"), digest_size=FINGERPRINT_SIZE)
+    hasher.update(img.tobytes())
+    return hasher.digest()
+
+def audio_fingerprint(audio: "AudioSegment") -> bytes:
+    """
+    Calculate a fingerprint of an AudioSegment. Like AudioSegment.__eq__, it only considers the raw data
+    
+    Args:
+        audio: the AudioSegment
+    
+    Returns:
+        the fingerprint
+    """
+    return blake2b(audio.raw_data, digest_size=FINGERPRINT_SIZE).digest()
+
 
-__all__ = ["xml_equal", "image_equal"]
+__all__ = ["xml_equal", "image_equal", "xml_fingerprint", "image_fingerprint", "audio_fingerprint"]
 
@@ -29,16 +29,60 @@ def get_closest_matches(string, possible_values: list[str], n: int) -> list[str]
     sorted_matches = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
     return [i[0] for i in sorted_matches[:n]]   
 
-def tuplify(obj):
-    if isinstance(obj, list):
-        return tuple(tuplify(item) for item in obj)
+def tuplify(obj, memo: dict | None = None):
+    """
+    Recursively converts lists into tuples.
+    
+    Args:
+        obj: the object to convert
+        memo: if given, equal strings and tuples of strings/ints are deduplicated through it and share one object
+    
+    Returns:
+        the converted object
+    """
+    obj_type = type(obj)
+    if (obj_type is int) or (obj is None) or (obj_type is float) or (obj_type is bool):
+        return obj
+    elif obj_type is str:
+        return obj if memo is None else memo.setdefault(obj, obj)
+    elif (obj_type is list) or (obj_type is tuple) or isinstance(obj, list):
+        return _tuplify_sequence(obj, memo)[0]
     elif isinstance(obj, dict):
-        return {tuplify(key): tuplify(value) for key, value in obj.items()}
+        return {tuplify(key, memo): tuplify(value, memo) for key, value in obj.items()}
     elif isinstance(obj, (set, tuple)):
-        return type(obj)(tuplify(item) for item in obj)
+        return type(obj)(tuplify(item, memo) for item in obj)
     else:
         return obj
 
+def _tuplify_sequence(obj: list | tuple, memo: dict | None) -> tuple[tuple, bool]:
+    """
+    *[Helper Function]* Convert a list into a tuple and get whether it may be shared through the memo.
+    Floats and bools compare equal to ints, so tuples containing them are never shared.
+    Raw project values are mostly flat lists of scalars (e.g. input and field values), so these are handled inline
+    """
+    items = []
+    is_shareable = True
+    for item in obj:
+        item_type = type(item)
+        if item_type is str:
+            items.append(item if memo is None else memo.setdefault(item, item))
+        elif (item_type is int) or (item is None):
+            items.append(item)
+        elif (item_type is float) or (item_type is bool):
+            items.append(item)
+            is_shareable = False
+        elif (item_type is list) or (item_type is tuple):
+            sub_result, is_sub_shareable = _tuplify_sequence(item, memo)
+            items.append(sub_result)
+            is_shareable = is_shareable and is_sub_shareable
+        else:
+            items.append(tuplify(item, memo))
+            is_shareable = False
+    result = tuple(items)
+    if (memo is None) or not is_shareable:
+        return (result, is_shareable)
+    return (memo.setdefault(result, result), True)
+
 def string_to_sha256(primary: str, secondary: str|None=None) -> str:
     def _string_to_sha256(input_string: str, digits: int) -> str:
         hex_hash = sha256(input_string.encode()).hexdigest()
@@ -79,9 +123,67 @@ def generate_md5(data: bytes) -> str:
         md5_hash.update(data[i:i+4096])
     return md5_hash.hexdigest()
 
+def find_cyclic_components(successors: list[list[int]]) -> list[list[int]]:
+    """
+    Find the strongly connected components of a directed graph, which contain a cycle
+    (more than one vertex or a vertex with an edge to itself). Uses an iterative version of Tarjan's algorithm,
+    so it runs in linear time and does not hit the recursion limit
+
+    Args:
+        successors: the successor vertices of every vertex. The vertices are 0 ... len(successors)-1
+
+    Returns:
+        the components with their vertices in ascending order, sorted by their first vertex
+    """
+    vertex_count = len(successors)
+    order = [-1] * vertex_count
+    low = [0] * vertex_count
+    is_on_stack = [False] * vertex_count
+    component_stack = []
+    components = []
+    counter = 0
+    for start in range(vertex_count):
+        if order[start] != -1:
+            continue
+        order[start] = low[start] = counter
+        counter += 1
+        component_stack.append(start)
+        is_on_stack[start] = True
+        work = [(start, iter(successors[start]))]
+        while work:
+            vertex, children = work[-1]
+            for child in children:
+                if order[child] == -1:
+                    order[child] = low[child] = counter
+                    counter += 1
+                    component_stack.append(child)
+                    is_on_stack[child] = True
+                    work.append((child, iter(successors[child])))
+                    break
+                if is_on_stack[child]:
+                    low[vertex] = min(low[vertex], order[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[vertex])
+                if low[vertex] != order[vertex]:
+                    continue
+                component = []
+                while True:
+                    member = component_stack.pop()
+                    is_on_stack[member] = False
+                    component.append(member)
+                    if member == vertex:
+                        break
+                if (len(component) > 1) or (vertex in successors[vertex]):
+                    components.append(sorted(component))
+    components.sort()
+    return components
+
 
 __all__ = [
     "remove_duplicates", "lists_equal_ignore_order", "get_closest_matches", "tuplify", 
-    "string_to_sha256", "number_to_token", "generate_md5",
+    "string_to_sha256", "number_to_token", "generate_md5", "find_cyclic_components",
 ]
 
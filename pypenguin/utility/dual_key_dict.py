@@ -13,6 +13,7 @@ class DualKeyDict(Generic[_K1, _K2, _V]):
         self._values  : dict[_K1, _V ] = {}
         self._k2_to_k1: dict[_K2, _K1] = {}
         self._k1_to_k2: dict[_K1, _K2] = {}
+        self._k1_objects: dict[_K1, _K1] = {}
         if data is not None:
             for keys, value in data.items():
                 key1, key2 = keys
@@ -37,6 +38,7 @@ class DualKeyDict(Generic[_K1, _K2, _V]):
         self._values[key1] = value
         self._k2_to_k1[key2] = key1
         self._k1_to_k2[key1] = key2
+        self._k1_objects.setdefault(key1, key1)
 
     def get_by_key1(self, key1: _K1) -> _V:
         return self._values[key1]
@@ -51,6 +53,13 @@ class DualKeyDict(Generic[_K1, _K2, _V]):
     def get_key2_for_key1(self, key1: _K1) -> _K2:
         return self._k1_to_k2[key1]
 
+    def intern_key1(self, key1: _K1) -> _K1:
+        """
+        Get the stored key1 object, which is equal to the given key1. 
+        This allows equal keys to share one object. Returns the given key1 if it is unknown
+        """
+        return self._k1_objects.get(key1, key1)
+
     def has_key1(self, key1: _K1) -> bool:
         return key1 in self._values
     
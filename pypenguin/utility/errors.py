@@ -36,7 +36,16 @@ class ConversionError(PypenguinError): pass
 #                    ERRORS FOR VALIDATION                    #
 ###############################################################
 
-def _generate_path_string(path: list) -> str:
+def generate_path_string(path: list) -> str:
+    """
+    Format a path from the project root like in error messages e.g. `.sprites[0].scripts[1]`
+
+    Args:
+        path: the path as a list of attribute names (str), list indexes (int) and dict keys (1-tuples of str)
+
+    Returns:
+        the formatted path
+    """
     path_string = ""
     for item in path:
         if   isinstance(item, str):
@@ -52,7 +61,7 @@ class ValidationError(PypenguinError): pass
 
 class PathValidationError(ValidationError):
     def __init__(self, path: list, msg: str, condition: str|None = None) -> None:
-        path_string = _generate_path_string(path)
+        path_string = generate_path_string(path)
         full_message = ""
         if path_string != "":
             full_message += f"At {path_string}: "
@@ -79,8 +88,8 @@ class SpriteLayerStackError(PathValidationError): pass
 
 class SameValueTwiceError(ValidationError):
     def __init__(self, path1: list, path2: list, msg: str, condition: str|None = None) -> None:
-        path1_string = _generate_path_string(path1)
-        path2_string = _generate_path_string(path2)
+        path1_string = generate_path_string(path1)
+        path2_string = generate_path_string(path2)
         full_message = f"At {path1_string} and {path2_string}: "
         if condition is not None:
             full_message += f"{condition}: "
@@ -97,6 +106,6 @@ __all__ = [
     "RangeValidationError", "MissingInputError", "UnnecessaryInputError", 
     "MissingDropdownError", "UnnecessaryDropdownError", "InvalidDropdownValueError", 
     "InvalidOpcodeError", "InvalidBlockShapeError", "SpriteLayerStackError", 
-    "SameValueTwiceError",
+    "SameValueTwiceError", "generate_path_string",
 ]
 
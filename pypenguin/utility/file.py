@@ -13,6 +13,17 @@ def read_all_files_of_zip(zip_path: str) -> dict[str, bytes]:
                 contents[file_name] = file_ref.read()
     return contents
 
+def read_file_of_zip(zip_path: str, file_name: str) -> bytes:
+    zip_path = ensure_correct_path(zip_path)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        with zip_ref.open(file_name) as file_ref:
+            return file_ref.read()
+
+def get_file_sizes_of_zip(zip_path: str) -> dict[str, int]:
+    zip_path = ensure_correct_path(zip_path)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        return {info.filename: info.file_size for info in zip_ref.infolist()} # read from the central directory
+
 def ensure_correct_path(_path: str, target_folder_name: str = "pypenguin") -> str:
     if target_folder_name is not None:
         initial_path = __file__
@@ -35,5 +46,5 @@ def ensure_correct_path(_path: str, target_folder_name: str = "pypenguin") -> st
         return final_path
 
 
-__all__ = ["read_all_files_of_zip", "ensure_correct_path"]
+__all__ = ["read_all_files_of_zip", "read_file_of_zip", "get_file_sizes_of_zip", "ensure_correct_path"]
 
@@ -0,0 +1,240 @@
+from dataclasses import fields
+from enum        import Enum
+from hashlib     import blake2b
+from operator    import is_
+from typing      import Any, Iterable
+
+
+FINGERPRINT_SIZE = 16 # in bytes
+_CACHE_ATTR = "_fingerprint_cache"
+
+
+def fingerprint(obj: Any, memo: dict[int, tuple[Any, bytes]] | None = None) -> bytes:
+    """
+    Calculate the structural fingerprint of a (dataclass) object like a SRScript, SRBlock, SRTarget or asset.
+    Objects, which are equal (==), have the same fingerprint.
+    The fingerprint of an object is calculated bottom-up from the fingerprints of the objects it contains,
+    so every subtree has its own fingerprint. The fingerprints of asset contents are cached by the assets themselves 
+    (see content_fingerprint of SRCostume and SRSound).
+    A class can define a _fingerprint_parts method to replace its compared fields (e.g. when it has a custom __eq__).
+    A class can set _cache_fingerprint = True to cache its fingerprint (e.g. SRBlock, SRScript, SRTarget and SRProject).
+    The cache remembers the objects it was calculated from, so it is recalculated 
+    as soon as anything the object contains was modified, replaced, added or removed. 
+    Until then the same fingerprint object is returned, so "is" tells whether the object changed. 
+    Checking the cache still visits the contained objects, but does not hash them. 
+    That is still slower than comparing two objects directly, so __eq__ does not use fingerprints
+
+    Args:
+        obj: the object
+        memo: maps the ids of already fingerprinted objects to the object and its fingerprint.
+            Pass the same dict to multiple calls to fingerprint every object only once
+
+    Returns:
+        the fingerprint (FINGERPRINT_SIZE bytes)
+    """
+    if memo is not None:
+        entry = memo.get(id(obj))
+        if entry is not None:
+            return entry[1]
+    class_info = _get_class_info(type(obj))
+    values = _get_values(obj, class_info)
+    if class_info[2]:
+        if memo is None:
+            memo = {} # check every contained object only once
+        result = _get_cached_fingerprint(obj, class_info[0], values, memo)
+    else:
+        result = _calculate_fingerprint(class_info[0], values, memo)
+    if memo is not None:
+        memo[id(obj)] = (obj, result) # keep obj alive, so its id can not be reused
+    return result
+
+def fingerprint_hash(obj: Any) -> int:
+    """
+    Calculate a hash (for __hash__) from the structural fingerprint of an object
+
+    Args:
+        obj: the object
+
+    Returns:
+        the hash
+    """
+    return int.from_bytes(fingerprint(obj)[:8], "little", signed=True)
+
+def drop_fingerprint_cache(state: dict[str, Any]) -> dict[str, Any]:
+    """
+    Remove the cached fingerprint from the state of an object (e.g. in __getstate__ for copying and pickling)
+
+    Args:
+        state: the state (usually the __dict__ of the object)
+
+    Returns:
+        a copy of the state without the cached fingerprint
+    """
+    state = state.copy()
+    state.pop(_CACHE_ATTR, None)
+    return state
+
+def _get_values(obj: Any, class_info: tuple[bytes, tuple[str, ...] | None, bool]) -> list[Any] | tuple:
+    """
+    *[Helper Function]* Get the values, which make up the fingerprint of an object
+    """
+    field_names = class_info[1]
+    if field_names is None:
+        return obj._fingerprint_parts()
+    instance_dict = obj.__dict__
+    return [instance_dict.get(name) for name in field_names] # unset init=False fields compare like None
+
+def _calculate_fingerprint(type_name: bytes, values: Iterable[Any], memo: dict[int, tuple[Any, bytes]] | None) -> bytes:
+    """
+    *[Helper Function]* Calculate a fingerprint from the type name and the values of an object without caching it
+    """
+    encoded = [type_name]
+    _encode_values(values, encoded, memo)
+    return blake2b(b"".join(encoded), digest_size=FINGERPRINT_SIZE).digest()
+
+def _get_cached_fingerprint(obj: Any, type_name: bytes, values: Iterable[Any], memo: dict[int, tuple[Any, bytes]]) -> bytes:
+    """
+    *[Helper Function]* Get the cached fingerprint of an object or calculate and cache it.
+    The cache remembers the objects and the container lengths it was calculated from. 
+    Contained objects with cached fingerprints are represented by their fingerprint object, 
+    which is replaced whenever it is recalculated, so modifications propagate upwards
+    """
+    state, lengths = [], []
+    _collect_state(values, state, lengths, memo)
+    cache = obj.__dict__.get(_CACHE_ATTR)
+    if (
+        (cache is None) or (cache[1] != lengths) or (len(cache[0]) != len(state)) 
+        or not all(map(is_, cache[0], state))
+    ):
+        cache = (state, lengths, _calculate_fingerprint(type_name, values, memo))
+        obj.__dict__[_CACHE_ATTR] = cache
+    return cache[2]
+
+def _collect_state(values: Iterable[Any], state: list[Any], lengths: list[int], memo: dict[int, tuple[Any, bytes]]) -> None:
+    """
+    *[Helper Function]* Collect the objects, which make up the fingerprint of values, to check a cached fingerprint.
+    Containers are represented by their items and length, objects with cached fingerprints by their fingerprint
+    """
+    append = state.append
+    for value in values:
+        cls = type(value)
+        if (cls is str) or (value is None) or (cls is int) or (cls is float) or (cls is bool):
+            append(value)
+        elif (cls is list) or (cls is tuple):
+            lengths.append(len(value))
+            _collect_state(value, state, lengths, memo)
+        elif cls is dict:
+            lengths.append(len(value))
+            state.extend(value.keys())
+            _collect_state(value.values(), state, lengths, memo)
+        elif hasattr(value, "__dataclass_fields__"):
+            class_info = _get_class_info(cls)
+            if class_info[2]:
+                append(fingerprint(value, memo))
+            else:
+                append(value)
+                _collect_state(_get_values(value, class_info), state, lengths, memo)
+        else:
+            append(value)
+            if not isinstance(value, Enum):
+                for base_cls in (list, tuple, dict): # subclasses are fingerprinted like their base class
+                    if isinstance(value, base_cls):
+                        _collect_state((base_cls(value),), state, lengths, memo)
+                        break
+
+def _type_name(cls: type) -> bytes:
+    """
+    *[Helper Function]* Get the fully qualified name of a class as bytes
+    """
+    return f"<{cls.__module__}.{cls.__qualname__}>".encode("utf-8")
+
+def _get_class_info(cls: type) -> tuple[bytes, tuple[str, ...] | None, bool]:
+    """
+    *[Helper Function]* Get the type name, the names of the compared fields and 
+    whether the fingerprint is cached of a class. The field names are None if the class defines _fingerprint_parts
+    """
+    class_info = _CLASS_INFOS.get(cls)
+    if class_info is None:
+        if hasattr(cls, "_fingerprint_parts"):
+            field_names = None
+        else:
+            field_names = tuple(field.name for field in fields(cls) if field.compare)
+        class_info = _CLASS_INFOS[cls] = (_type_name(cls), field_names, getattr(cls, "_cache_fingerprint", False))
+    return class_info
+
+def _encode_values(values: Iterable[Any], encoded: list[bytes], memo: dict[int, tuple[Any, bytes]] | None) -> None:
+    """
+    *[Helper Function]* Append an unambiguous encoding of values to a list of bytes.
+    Values, which are equal (==), get the same encoding (e.g. 1, 1.0 and True). 
+    The common cases are handled inline, because this is the hot loop of fingerprint
+
+    Raises:
+        TypeError: if a value is not supported
+    """
+    append = encoded.append
+    for value in values:
+        cls = type(value)
+        if cls is str:
+            data = value.encode("utf-8")
+            append(b"S%d:" % len(data))
+            append(data)
+        elif value is None:
+            append(b"N")
+        elif cls in _CLASS_INFOS:
+            append(b"O")
+            append(fingerprint(value, memo))
+        elif (cls is list) or (cls is tuple):
+            append(b"%s%d:" % (b"L" if cls is list else b"T", len(value)))
+            _encode_values(value, encoded, memo)
+        elif cls is dict:
+            items = []
+            for item in value.items():
+                item_encoded = []
+                _encode_values(item, item_encoded, memo)
+                items.append(b"".join(item_encoded))
+            items.sort() # dicts are equal regardless of their order
+            append(b"D%d:" % len(items))
+            encoded.extend(items)
+        elif (cls is int) or (cls is bool):
+            append(b"I%d;" % value)
+        elif cls is float:
+            if value.is_integer():
+                append(b"I%d;" % value)
+            else:
+                append(b"F%s;" % repr(value).encode("ascii"))
+        else:
+            _encode_other(value, encoded, memo)
+
+def _encode_other(value: Any, encoded: list[bytes], memo: dict[int, tuple[Any, bytes]] | None) -> None:
+    """
+    *[Helper Function]* Append the encoding of a value, which is not handled by _encode_values inline
+
+    Raises:
+        TypeError: if the value is not supported
+    """
+    cls = type(value)
+    if isinstance(value, Enum): # before str and int, because enums can subclass them
+        type_name = _ENUM_TYPE_NAMES.get(cls)
+        if type_name is None:
+            type_name = _ENUM_TYPE_NAMES[cls] = _type_name(cls)
+        encoded.append(type_name)
+        encoded.append(value.name.encode("utf-8"))
+    elif cls is bytes:
+        encoded.append(b"B%d:" % len(value))
+        encoded.append(value)
+    elif hasattr(value, "__dataclass_fields__"):
+        encoded.append(b"O")
+        encoded.append(fingerprint(value, memo))
+    else:
+        for base_cls in (str, int, float, list, tuple, dict, bytes): # subclasses compare like their base class
+            if isinstance(value, base_cls):
+                _encode_values((base_cls(value),), encoded, memo)
+                return
+        raise TypeError(f"Can not fingerprint value of type {cls.__name__}: {value!r}")
+
+
+_CLASS_INFOS: dict[type, tuple[bytes, tuple[str, ...] | None, bool]] = {}
+_ENUM_TYPE_NAMES: dict[type, bytes] = {}
+
+__all__ = ["FINGERPRINT_SIZE", "fingerprint", "fingerprint_hash", "drop_fingerprint_cache"]
+
@@ -0,0 +1,247 @@
+from contextlib  import nullcontext
+from contextvars import ContextVar
+from dataclasses import field
+from functools   import wraps
+from json        import dumps
+from logging     import getLogger, DEBUG
+from time        import perf_counter
+from typing      import Any, Callable
+
+from pypenguin.utility.repr import grepr_dataclass
+
+
+_ACTIVE_INSTRUMENTATION: ContextVar["Instrumentation | None"] = ContextVar("pypenguin_instrumentation", default=None)
+_NULL_PHASE = nullcontext()
+_TRACE_LOGGER = getLogger("pypenguin.trace") # logs the start and duration of every phase on DEBUG level
+
+
+@grepr_dataclass(grepr_fields=["calls", "total_time"])
+class TimingStats:
+    """
+    The call count and accumulated wall time of a phase or opcode
+    """
+
+    calls: int = 0
+    total_time: float = 0.0 # in seconds
+
+    def to_data(self) -> dict[str, int | float]:
+        """
+        Serializes the TimingStats into JSON compatible data
+
+        Returns:
+            the data
+        """
+        return {"calls": self.calls, "total_time": self.total_time}
+
+
+class _PhaseTimer:
+    """
+    *[Internal Class]* Times one execution of a phase, records it on exit and traces it if enabled
+    """
+
+    __slots__ = ("_instrumentation", "_name", "_start", "_trace")
+
+    def __init__(self, instrumentation: "Instrumentation | None", name: str, trace: bool) -> None:
+        self._instrumentation = instrumentation
+        self._name = name
+        self._trace = trace
+
+    def __enter__(self) -> None:
+        if self._trace:
+            _TRACE_LOGGER.debug("Starting phase %s", self._name)
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        duration = perf_counter() - self._start
+        if self._instrumentation is not None:
+            self._instrumentation.record_phase(self._name, duration)
+        if self._trace:
+            _TRACE_LOGGER.debug("Finished phase %s in %.3fms", self._name, duration * 1e3)
+
+
+@grepr_dataclass(grepr_fields=["phases", "opcodes", "counters"])
+class Instrumentation:
+    """
+    An opt-in collector of wall time and call counts per conversion phase and per opcode, and of counters
+    (e.g. bytes read, assets decoded). Install it with a with statement;
+    everything pypenguin does within the block is recorded:
+
+        with Instrumentation() as instrumentation:
+            project = FRProject.from_file(file_path, info_api).to_second(info_api)
+        print(instrumentation.to_text())
+
+    While no Instrumentation is installed, the hooks only perform a single lookup per phase
+    and the per block loops run their uninstrumented code path.
+    Independently, the phases are traced by the "pypenguin.trace" logger if it is enabled for DEBUG
+    """
+
+    phases: dict[str, TimingStats] = field(default_factory=dict)
+    opcodes: dict[str, dict[str, TimingStats]] = field(default_factory=dict) # phase -> opcode -> stats
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def __enter__(self) -> "Instrumentation":
+        self._token = _ACTIVE_INSTRUMENTATION.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _ACTIVE_INSTRUMENTATION.reset(self._token)
+
+    def record_phase(self, name: str, duration: float) -> None:
+        """
+        Record one execution of a phase
+
+        Args:
+            name: the name of the phase
+            duration: the wall time in seconds
+
+        Returns:
+            None
+        """
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = TimingStats()
+        stats.calls += 1
+        stats.total_time += duration
+
+    def record_opcode(self, phase_name: str, opcode: str, duration: float) -> None:
+        """
+        Record the processing of one block within a phase
+
+        Args:
+            phase_name: the name of the phase
+            opcode: the opcode of the block
+            duration: the wall time in seconds
+
+        Returns:
+            None
+        """
+        phase_opcodes = self.opcodes.get(phase_name)
+        if phase_opcodes is None:
+            phase_opcodes = self.opcodes[phase_name] = {}
+        stats = phase_opcodes.get(opcode)
+        if stats is None:
+            stats = phase_opcodes[opcode] = TimingStats()
+        stats.calls += 1
+        stats.total_time += duration
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Increase a counter
+
+        Args:
+            name: the name of the counter
+            amount: the amount to add
+
+        Returns:
+            None
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_data(self) -> dict[str, Any]:
+        """
+        Serializes the collected data into JSON compatible data
+
+        Returns:
+            the data
+        """
+        return {
+            "phases": {name: stats.to_data() for name, stats in self.phases.items()},
+            "opcodes": {
+                phase_name: {opcode: stats.to_data() for opcode, stats in phase_opcodes.items()}
+                for phase_name, phase_opcodes in self.opcodes.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, indent: int | None = 4) -> str:
+        """
+        Serializes the collected data into a JSON string
+
+        Args:
+            indent: the indentation of the JSON string
+
+        Returns:
+            the JSON string
+        """
+        return dumps(self.to_data(), indent=indent)
+
+    def to_text(self, max_opcodes: int = 10) -> str:
+        """
+        Create a text report of the collected data. Phases may be nested, so their times are inclusive
+
+        Args:
+            max_opcodes: how many of the slowest opcodes to list per phase
+
+        Returns:
+            the text report
+        """
+        def stats_line(name: str, stats: TimingStats) -> str:
+            return (
+                f"  {name:<40} {stats.calls:>8} calls {stats.total_time*1e3:>10.3f}ms "
+                f"{stats.total_time/stats.calls*1e6:>10.1f}us/call"
+            )
+
+        lines = ["Phases:"]
+        for name, stats in sorted(self.phases.items(), key=lambda item: item[1].total_time, reverse=True):
+            lines.append(stats_line(name, stats))
+        for phase_name, phase_opcodes in self.opcodes.items():
+            lines.append(f"Slowest opcodes in {phase_name}:")
+            ranked = sorted(phase_opcodes.items(), key=lambda item: item[1].total_time, reverse=True)
+            for opcode, stats in ranked[:max_opcodes]:
+                lines.append(stats_line(opcode, stats))
+        lines.append("Counters:")
+        for name, amount in self.counters.items():
+            lines.append(f"  {name:<40} {amount:>8}")
+        return "\n".join(lines)
+
+
+def get_instrumentation() -> Instrumentation | None:
+    """
+    Get the currently installed Instrumentation
+
+    Returns:
+        the Instrumentation or None if none is installed
+    """
+    return _ACTIVE_INSTRUMENTATION.get()
+
+def instrumented_phase(name: str) -> _PhaseTimer | nullcontext:
+    """
+    Get a context manager, which times a phase if an Instrumentation is installed 
+    and traces it if the "pypenguin.trace" logger is enabled for DEBUG
+
+    Args:
+        name: the name of the phase
+
+    Returns:
+        the context manager
+    """
+    instrumentation = _ACTIVE_INSTRUMENTATION.get()
+    trace = _TRACE_LOGGER.isEnabledFor(DEBUG)
+    if (instrumentation is None) and not trace:
+        return _NULL_PHASE
+    return _PhaseTimer(instrumentation, name, trace)
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """
+    Create a decorator, which treats every call of the decorated function as a phase (see instrumented_phase)
+
+    Args:
+        name: the name of the phase
+
+    Returns:
+        the decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation = _ACTIVE_INSTRUMENTATION.get()
+            trace = _TRACE_LOGGER.isEnabledFor(DEBUG)
+            if (instrumentation is None) and not trace:
+                return function(*args, **kwargs)
+            with _PhaseTimer(instrumentation, name, trace):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+__all__ = ["TimingStats", "Instrumentation", "get_instrumentation", "instrumented_phase", "instrumented"]
+
@@ -0,0 +1,198 @@
+from copy        import copy
+from dataclasses import fields
+from enum        import Enum
+from typing      import Any
+
+
+_INTERNED_ATTR = "_is_interned" # an attribute of interned objects, which is not a field
+_UNSET = object() # the value of unset init=False fields
+_ATOM_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class Interner:
+    """
+    Shares identical (dataclass) subtrees like the same "value of [VARIABLE]" reporter or the same literal
+    input value (hash-consing). Interning works bottom-up: the children of an object are interned first,
+    so two objects are identical if their field values are identical atoms (same type and value)
+    or the same interned objects. Interned objects are marked (see is_interned).
+    **Interned objects may be shared, call unshare before modifying them in place (copy-on-write)**
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, Any] = {} # maps hashes to an interned object or a list of interned objects
+        self._interned_ids: set[int] = set() # the interned objects are kept alive by _buckets
+        self.hits: int = 0 # how many objects were replaced by an identical interned object
+        self.misses: int = 0 # how many objects were interned
+
+    def intern(self, obj: Any) -> Any:
+        """
+        Intern a dataclass object and its children
+
+        Args:
+            obj: the object. Other objects than dataclass instances are returned unchanged
+
+        Returns:
+            the interned object identical to obj. Is obj itself if no identical object was interned before
+        """
+        if id(obj) in self._interned_ids:
+            return obj
+        cls = type(obj)
+        if not hasattr(cls, "__dataclass_fields__"):
+            return obj
+        is_frozen = cls.__dataclass_params__.frozen
+        values = []
+        for field in fields(cls):
+            value = getattr(obj, field.name, _UNSET)
+            interned_value = self._intern_value(value)
+            if (interned_value is not value) and not is_frozen:
+                object.__setattr__(obj, field.name, interned_value) # obj is not shared yet, so modifying it is fine
+            values.append(interned_value)
+        values = tuple(values)
+
+        key = hash((cls, self._hash_value(values)))
+        bucket = self._buckets.get(key)
+        candidates = [] if bucket is None else (bucket if type(bucket) is list else [bucket])
+        for candidate in candidates:
+            if (type(candidate) is cls) and _is_identical(self._field_values(candidate), values):
+                self.hits += 1
+                return candidate
+        if bucket is None:
+            self._buckets[key] = obj
+        elif type(bucket) is list:
+            bucket.append(obj)
+        else:
+            self._buckets[key] = [bucket, obj]
+        self._interned_ids.add(id(obj))
+        object.__setattr__(obj, _INTERNED_ATTR, True)
+        self.misses += 1
+        return obj
+
+    def _intern_value(self, value: Any) -> Any:
+        """
+        *[Internal Method]* Intern the dataclass objects within a field value. Lists and dicts are modified in place
+        """
+        cls = type(value)
+        if cls in _ATOM_TYPES:
+            return value
+        if cls is list:
+            for i, item in enumerate(value):
+                interned_item = self._intern_value(item)
+                if interned_item is not item:
+                    value[i] = interned_item
+            return value
+        if cls is tuple:
+            interned_items = tuple(self._intern_value(item) for item in value)
+            return value if all(a is b for a, b in zip(interned_items, value)) else interned_items
+        if cls is dict:
+            for item_key, item in value.items():
+                interned_item = self._intern_value(item)
+                if interned_item is not item:
+                    value[item_key] = interned_item
+            return value
+        return self.intern(value)
+
+    def _hash_value(self, value: Any) -> int:
+        """
+        *[Internal Method]* Hash a field value consistently with _is_identical
+        """
+        cls = type(value)
+        if (cls in _ATOM_TYPES) or isinstance(value, Enum):
+            return hash((cls, value))
+        if (cls is list) or (cls is tuple):
+            return hash((cls, tuple(self._hash_value(item) for item in value)))
+        if cls is dict:
+            return hash(tuple((self._hash_value(item_key), self._hash_value(item)) for item_key, item in value.items()))
+        return id(value) # interned objects and other objects are only identical to themselves
+
+    @staticmethod
+    def _field_values(obj: Any) -> tuple[Any, ...]:
+        """
+        *[Internal Method]* Get the values of all fields of a dataclass object
+        """
+        return tuple(getattr(obj, field.name, _UNSET) for field in fields(obj))
+
+def _is_identical(a: Any, b: Any) -> bool:
+    """
+    *[Helper Function]* Check whether two field values are identical.
+    Unlike ==, atoms must have the same type (1 is not identical to 1.0) and dicts the same order
+    """
+    if a is b:
+        return True
+    cls = type(a)
+    if cls is not type(b):
+        return False
+    if (cls in _ATOM_TYPES) or isinstance(a, Enum):
+        return a == b
+    if (cls is list) or (cls is tuple):
+        return (len(a) == len(b)) and all(_is_identical(item_a, item_b) for item_a, item_b in zip(a, b))
+    if cls is dict:
+        return (len(a) == len(b)) and all(
+            (key_a == key_b) and (type(key_a) is type(key_b)) and _is_identical(item_a, item_b)
+            for (key_a, item_a), (key_b, item_b) in zip(a.items(), b.items())
+        )
+    return False # interned objects and other objects are only identical to themselves
+
+def is_interned(obj: Any) -> bool:
+    """
+    Check whether an object was interned and therefore may be shared
+
+    Args:
+        obj: the object
+
+    Returns:
+        whether the object was interned
+    """
+    return getattr(obj, _INTERNED_ATTR, False)
+
+def _unshared_copy(obj: Any) -> Any:
+    """
+    *[Helper Function]* Copy an interned object and its list and dict field values. The children are still shared
+    """
+    new_obj = copy(obj)
+    object.__delattr__(new_obj, _INTERNED_ATTR)
+    for field in fields(obj):
+        value = getattr(new_obj, field.name, _UNSET)
+        if type(value) in (list, dict):
+            object.__setattr__(new_obj, field.name, copy(value))
+    return new_obj
+
+def unshare(root: Any, path: list) -> Any:
+    """
+    Make the object at a path writable (copy-on-write). Every interned object on the path
+    is replaced by a copy, which is only referenced by its parent, so modifying it does not affect the other places,
+    which share it. The children of the returned object are still shared
+
+    Args:
+        root: the object the path starts at (e.g. a SRProject). Must not be interned itself
+        path: attribute names, list indexes and (key,) tuples for dict keys; the format of validation error paths
+
+    Returns:
+        the writable object at the path
+
+    Raises:
+        ValueError: if the root is interned
+    """
+    if is_interned(root):
+        raise ValueError("The root of the path must not be interned")
+    current = root
+    for step in path:
+        if isinstance(step, tuple):
+            (key,) = step
+            child = current[key]
+            if is_interned(child):
+                child = current[key] = _unshared_copy(child)
+        elif isinstance(step, int):
+            child = current[step]
+            if is_interned(child):
+                child = current[step] = _unshared_copy(child)
+        else:
+            child = getattr(current, step)
+            if is_interned(child):
+                child = _unshared_copy(child)
+                setattr(current, step, child)
+        current = child
+    return current
+
+
+__all__ = ["Interner", "is_interned", "unshare"]
+
@@ -0,0 +1,296 @@
+from re     import compile as re_compile, IGNORECASE
+from struct import unpack_from, error as StructError
+
+# Only the headers of image and sound files are read here, no file content is ever decoded
+
+_SVG_ROOT_PATTERN = re_compile(rb"<svg\b([^>]*)>", IGNORECASE)
+_SVG_LENGTH_PATTERN = re_compile(r"\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*(px)?\s*$")
+_XML_ATTRIBUTE_PATTERN = re_compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_SVG_SCAN_LIMIT = 64 * 1024 # the root element is expected within the first bytes
+
+# JPEG start of frame markers, which contain the image size (C4, C8 and CC are other markers)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_WAV_FORMAT_IMA_ADPCM = 0x11
+
+# MPEG audio frame header tables by version (1, 2, 2.5) and layer (1, 2, 3)
+_MP3_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+_MP3_BITRATES = { # in kbit/s, index 0 means "free" and is not supported
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+def read_image_size(data: bytes, data_format: str) -> tuple[int | float, int | float] | None:
+    """
+    Read the size of an image from its header without decoding it
+
+    Args:
+        data: the content of the image file
+        data_format: the file extension e.g. "png" or "svg"
+
+    Returns:
+        (width, height) in pixels or None if the header can not be read. For svg files these can be floats
+    """
+    reader = _IMAGE_SIZE_READERS.get(data_format.lower())
+    if reader is None:
+        return None
+    try:
+        return reader(data)
+    except (StructError, IndexError, ValueError):
+        return None
+
+def read_audio_info(data: bytes, data_format: str) -> tuple[int, int] | None:
+    """
+    Read the sample rate and sample count of a sound from its header(s) without decoding it.
+    For mp3 files only the frame headers are read. The encoder delay and padding from a LAME/Lavf tag are subtracted from
+    the sample count; without such a tag they can not be known and are included
+
+    Args:
+        data: the content of the sound file
+        data_format: the file extension e.g. "wav" or "mp3"
+
+    Returns:
+        (rate, sample_count) or None if the header can not be read
+    """
+    reader = _AUDIO_INFO_READERS.get(data_format.lower())
+    if reader is None:
+        return None
+    try:
+        return reader(data)
+    except (StructError, IndexError, ValueError):
+        return None
+
+
+def _read_png_size(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the size from the IHDR chunk of a png file
+    """
+    if (data[:8] != b"\x89PNG\r\n\x1a\n") or (data[12:16] != b"IHDR"):
+        return None
+    return unpack_from(">II", data, 16)
+
+def _read_jpeg_size(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the size from the start of frame segment of a jpeg file
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position+1]
+        if marker == 0xFF: # fill byte
+            position += 1
+            continue
+        if (marker == 0x01) or (0xD0 <= marker <= 0xD7): # markers without a segment
+            position += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = unpack_from(">HH", data, position+5)
+            return (width, height)
+        if marker in (0xD9, 0xDA): # end of image or start of scan before any frame header
+            return None
+        position += 2 + unpack_from(">H", data, position+2)[0]
+    return None
+
+def _read_gif_size(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the size from the logical screen descriptor of a gif file
+    """
+    if data[:4] != b"GIF8":
+        return None
+    return unpack_from("<HH", data, 6)
+
+def _read_bmp_size(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the size from the info header of a bmp file
+    """
+    if data[:2] != b"BM":
+        return None
+    if unpack_from("<I", data, 14)[0] == 12: # old OS/2 header
+        return unpack_from("<HH", data, 18)
+    width, height = unpack_from("<ii", data, 18)
+    return (width, abs(height)) # a negative height means top-down rows
+
+def _read_svg_size(data: bytes) -> tuple[int | float, int | float] | None:
+    """
+    *[Helper Function]* Read the size from the width, height and viewBox attributes of the root element of a svg file.
+    Sizes in other units than px fall back to the viewBox
+    """
+    match = _SVG_ROOT_PATTERN.search(data, 0, _SVG_SCAN_LIMIT)
+    if match is None:
+        return None
+    attributes = _parse_xml_attributes(match.group(1).decode("utf-8", "replace"))
+    width  = _parse_svg_length(attributes.get("width"))
+    height = _parse_svg_length(attributes.get("height"))
+    if (width is None) or (height is None):
+        view_box = attributes.get("viewBox", "").replace(",", " ").split()
+        if len(view_box) != 4:
+            return None
+        view_box_width, view_box_height = _to_number(view_box[2]), _to_number(view_box[3])
+        width  = view_box_width  if width  is None else width
+        height = view_box_height if height is None else height
+    return (width, height)
+
+def _parse_xml_attributes(text: str) -> dict[str, str]:
+    """
+    *[Helper Function]* Parse the attributes of a start tag
+    """
+    return {
+        match.group(1): match.group(2) if match.group(2) is not None else match.group(3)
+        for match in _XML_ATTRIBUTE_PATTERN.finditer(text)
+    }
+
+def _parse_svg_length(value: str | None) -> int | float | None:
+    """
+    *[Helper Function]* Parse a svg length without unit or in px
+    """
+    if value is None:
+        return None
+    match = _SVG_LENGTH_PATTERN.match(value)
+    if match is None:
+        return None
+    return _to_number(match.group(1))
+
+def _to_number(text: str) -> int | float:
+    """
+    *[Helper Function]* Convert a number string into an int if possible, otherwise a float
+    """
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def _read_wav_info(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the sample rate and sample count from the fmt, fact and data chunks of a wav file
+    """
+    if (data[:4] != b"RIFF") or (data[8:12] != b"WAVE"):
+        return None
+    rate = block_align = data_size = fact_sample_count = samples_per_block = None
+    audio_format = 1
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id = data[position:position+4]
+        chunk_size = unpack_from("<I", data, position+4)[0]
+        if chunk_id == b"fmt ":
+            audio_format, _, rate, _, block_align = unpack_from("<HHIIH", data, position+8)
+            if (audio_format == _WAV_FORMAT_IMA_ADPCM) and (chunk_size >= 20):
+                samples_per_block = unpack_from("<H", data, position+26)[0]
+        elif chunk_id == b"fact":
+            fact_sample_count = unpack_from("<I", data, position+8)[0]
+        elif chunk_id == b"data":
+            data_size = min(chunk_size, len(data) - position - 8) # the size is sometimes wrong in streamed files
+        position += 8 + chunk_size + (chunk_size & 1) # chunks are padded to an even size
+    if (rate is None) or (data_size is None) or not block_align:
+        return None
+    if (fact_sample_count is not None) and (audio_format != 1):
+        return (rate, fact_sample_count)
+    if samples_per_block:
+        return (rate, (data_size // block_align) * samples_per_block)
+    return (rate, data_size // block_align)
+
+def _read_mp3_info(data: bytes) -> tuple[int, int] | None:
+    """
+    *[Helper Function]* Read the sample rate and sample count from the frame headers of a mp3 file.
+    Uses the frame count of a Xing/Info/VBRI header frame if there is one, otherwise jumps from frame header to frame header.
+    The frame contents are never decoded
+    """
+    position = 0
+    if data[:3] == b"ID3": # ID3v2 tag with a syncsafe size
+        size_bytes = data[6:10]
+        position = 10 + ((size_bytes[0] << 21) | (size_bytes[1] << 14) | (size_bytes[2] << 7) | size_bytes[3])
+        if data[5] & 0x10: # footer
+            position += 10
+    while True: # search the first frame
+        if position + 4 > len(data):
+            return None
+        header = _parse_mp3_frame_header(data, position)
+        if header is not None:
+            break
+        position += 1
+    rate, frame_sample_count, frame_length = header
+
+    info = _read_mp3_info_frame(data, position)
+    if info is not None:
+        frame_count, skipped_sample_count = info
+        if frame_count is not None:
+            return (rate, max(frame_count * frame_sample_count - skipped_sample_count, 0))
+        position += frame_length # contains no audio
+    sample_count = 0
+    while position + 4 <= len(data):
+        header = _parse_mp3_frame_header(data, position)
+        if header is None:
+            break # e.g. an ID3v1 tag at the end
+        sample_count += header[1]
+        position += header[2]
+    if info is not None:
+        sample_count = max(sample_count - info[1], 0)
+    return (rate, sample_count)
+
+def _parse_mp3_frame_header(data: bytes, position: int) -> tuple[int, int, int] | None:
+    """
+    *[Helper Function]* Parse a MPEG audio frame header into (rate, sample count, frame length in bytes)
+    """
+    header = unpack_from(">I", data, position)[0]
+    if (header >> 21) != 0x7FF:
+        return None
+    version = {0: 2.5, 2: 2, 3: 1}.get((header >> 19) & 0b11)
+    layer = {1: 3, 2: 2, 3: 1}.get((header >> 17) & 0b11)
+    bitrate_index = (header >> 12) & 0b1111
+    rate_index = (header >> 10) & 0b11
+    if (version is None) or (layer is None) or (bitrate_index in (0, 15)) or (rate_index == 3):
+        return None
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header >> 9) & 1
+    if layer == 1:
+        return (rate, 384, (12 * bitrate // rate + padding) * 4)
+    frame_sample_count = 1152 if (layer == 2) or (version == 1) else 576
+    return (rate, frame_sample_count, frame_sample_count // 8 * bitrate // rate + padding)
+
+def _read_mp3_info_frame(data: bytes, position: int) -> tuple[int | None, int] | None:
+    """
+    *[Helper Function]* Read a Xing, Info or VBRI header frame at the start of a mp3 file into
+    (audio frame count or None if not included, encoder delay + padding in samples). None if the frame is an audio frame
+    """
+    if data[position+36:position+40] == b"VBRI":
+        return (unpack_from(">I", data, position+36+14)[0], 0)
+    for tag_offset in (13, 21, 36): # after the side information, which depends on the version and channel mode
+        tag_position = position + tag_offset
+        if data[tag_position:tag_position+4] not in (b"Xing", b"Info"):
+            continue
+        flags = unpack_from(">I", data, tag_position+4)[0]
+        field_position = tag_position + 8
+        frame_count = None
+        if flags & 0x1:
+            frame_count = unpack_from(">I", data, field_position)[0]
+            field_position += 4
+        if flags & 0x2: # byte count
+            field_position += 4
+        if flags & 0x4: # seek table
+            field_position += 100
+        if flags & 0x8: # quality
+            field_position += 4
+        skipped_sample_count = 0
+        if data[field_position:field_position+4] in (b"LAME", b"Lavf", b"Lavc"): # encoder tag with delay and padding
+            delay_padding = int.from_bytes(data[field_position+21:field_position+24], "big")
+            skipped_sample_count = (delay_padding >> 12) + (delay_padding & 0xFFF)
+        return (frame_count, skipped_sample_count)
+    return None
+
+
+_IMAGE_SIZE_READERS = {
+    "png": _read_png_size, "jpg": _read_jpeg_size, "jpeg": _read_jpeg_size,
+    "gif": _read_gif_size, "bmp": _read_bmp_size, "svg": _read_svg_size,
+}
+_AUDIO_INFO_READERS = {"wav": _read_wav_info, "mp3": _read_mp3_info}
+
+
+__all__ = ["read_image_size", "read_audio_info"]
+
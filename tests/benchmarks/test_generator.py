@@ -0,0 +1,56 @@
+from json      import dumps
+from os        import path as os_path
+from zipfile   import ZipFile
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import ValidationConfig
+
+from pypenguin.core.project import FRProject, SRProject
+
+from benchmarks.generator import GeneratorConfig, generate_project_data, write_project_file, generate_project
+
+
+SMALL_CONFIG = GeneratorConfig(sprites=2, scripts_per_sprite=3, script_depth=2, blocks_per_level=3)
+
+
+
+def test_generate_project_data_deterministic():
+    first_data , first_assets  = generate_project_data(SMALL_CONFIG)
+    second_data, second_assets = generate_project_data(SMALL_CONFIG)
+    assert dumps(first_data) == dumps(second_data)
+    assert first_assets == second_assets
+    other_data, _ = generate_project_data(GeneratorConfig(sprites=2, scripts_per_sprite=3, script_depth=2, blocks_per_level=3, seed=1))
+    assert dumps(first_data) != dumps(other_data)
+
+def test_generate_project_data_knobs():
+    project_data, asset_files = generate_project_data(SMALL_CONFIG)
+    stage_data, *sprite_datas = project_data["targets"]
+    assert len(sprite_datas) == SMALL_CONFIG.sprites
+    assert len(stage_data["variables"]) == SMALL_CONFIG.variables_per_target
+    assert len(stage_data["broadcasts"]) == SMALL_CONFIG.broadcasts
+    for sprite_data in sprite_datas:
+        assert len(sprite_data["costumes"]) == SMALL_CONFIG.costumes_per_sprite
+        assert len(sprite_data["sounds"]) == SMALL_CONFIG.sounds_per_sprite
+        opcodes = [block_data["opcode"] for block_data in sprite_data["blocks"].values()]
+        assert opcodes.count("procedures_definition") == SMALL_CONFIG.custom_blocks_per_sprite
+        top_level_count = sum(block_data["topLevel"] for block_data in sprite_data["blocks"].values())
+        assert top_level_count == SMALL_CONFIG.scripts_per_sprite + SMALL_CONFIG.custom_blocks_per_sprite
+    for target_data in project_data["targets"]:
+        for asset_data in target_data["costumes"] + target_data["sounds"]:
+            assert asset_data["md5ext"] in asset_files
+
+def test_generate_project():
+    project = generate_project(SMALL_CONFIG, info_api)
+    assert isinstance(project, SRProject)
+    project.validate(ValidationConfig(), info_api)
+    assert project == generate_project(SMALL_CONFIG, info_api)
+
+def test_write_project_file(tmp_path):
+    file_path = os_path.join(tmp_path, "generated.pmp")
+    write_project_file(SMALL_CONFIG, file_path)
+    _, asset_files = generate_project_data(SMALL_CONFIG)
+    with ZipFile(file_path) as zip_file:
+        assert set(zip_file.namelist()) == {"project.json"} | set(asset_files.keys())
+    project = FRProject.from_file(file_path, info_api).to_second(info_api)
+    assert project == generate_project(SMALL_CONFIG, info_api)
+
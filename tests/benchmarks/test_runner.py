@@ -0,0 +1,56 @@
+from os import path as os_path
+
+from pypenguin.opcode_info.data import info_api
+
+from benchmarks.generator import GeneratorConfig
+from benchmarks.runner    import (
+    BENCHMARK_NAMES, run_benchmarks, save_results, load_results, compare_results, format_results,
+)
+
+
+TINY_CONFIG = GeneratorConfig(sprites=1, scripts_per_sprite=2, script_depth=1, blocks_per_level=2)
+
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(TINY_CONFIG, info_api, repeat=2)
+    assert list(results["results"].keys()) == BENCHMARK_NAMES
+    for result in results["results"].values():
+        assert len(result["runs"]) == 2
+        assert result["best"] == min(result["runs"])
+    assert results["config"]["sprites"] == 1
+    assert results["size"]["targets"] == 2
+
+def test_run_benchmarks_names():
+    results = run_benchmarks(TINY_CONFIG, info_api, repeat=1, names=["eq", "repr"])
+    assert list(results["results"].keys()) == ["eq", "repr"]
+    assert "eq" in format_results(results)
+
+def test_run_benchmarks_memory():
+    config = GeneratorConfig(sprites=2, scripts_per_sprite=4) # interning does not pay off for tiny projects
+    results = run_benchmarks(config, info_api, repeat=1, names=[], memory=True)
+    memory = results["memory"]
+    assert 0 < memory["interned_bytes"] <= memory["plain_bytes"]
+    assert "interned" in format_results(results)
+
+def test_save_load_results(tmp_path):
+    results = run_benchmarks(TINY_CONFIG, info_api, repeat=1, names=["validate"])
+    file_path = os_path.join(tmp_path, "results.json")
+    save_results(results, file_path)
+    assert load_results(file_path) == results
+
+def test_compare_results():
+    def make_results(durations: dict[str, float], seed: int = 0) -> dict:
+        return {
+            "config": {"seed": seed},
+            "results": {name: {"best": best, "mean": best, "runs": [best]} for name, best in durations.items()},
+        }
+    old = make_results({"validate": 1.0, "eq": 1.0, "repr": 1.0})
+    new = make_results({"validate": 0.5, "eq": 1.01, "repr": 2.0, "save": 1.0})
+    lines = compare_results(old, new).splitlines()
+    assert "faster"    in lines[0]
+    assert "unchanged" in lines[1]
+    assert "slower"    in lines[2]
+    assert "new"       in lines[3]
+    assert compare_results(old, make_results({"eq": 1.0}, seed=1)).startswith("warning")
+
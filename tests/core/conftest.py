@@ -0,0 +1,30 @@
+from copy   import deepcopy
+from pytest import fixture
+
+from pypenguin.opcode_info.data import info_api
+
+from pypenguin.core.project import FRProject, SRProject
+
+from tests.core.constants import PROJECT_PATH
+
+# The test project is only loaded once. The fixtures are copies, so tests can modify them in place
+
+@fixture(scope="session")
+def _loaded_fr_project() -> FRProject:
+    return FRProject.from_file(PROJECT_PATH, info_api)
+
+@fixture(scope="session")
+def _loaded_project(_loaded_fr_project: FRProject) -> SRProject:
+    return _loaded_fr_project.to_second(info_api)
+
+@fixture
+def fr_project(_loaded_fr_project: FRProject) -> FRProject:
+    return deepcopy(_loaded_fr_project)
+
+@fixture
+def project(_loaded_project: SRProject) -> SRProject:
+    return deepcopy(_loaded_project)
+
+@fixture
+def partially_loaded_project(fr_project: FRProject) -> SRProject:
+    return fr_project.to_second(info_api, sprite_names=[]) # Sprite1 is kept in unloaded_targets
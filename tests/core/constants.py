@@ -1499,9 +1499,11 @@ FR_SPRITE = FRSprite(
 
 
 
+PROJECT_PATH = "../tests/assets/testing_blocks.pmp"
+
 PROJECT_ASSET_FILES = {
     file_name: content 
-    for file_name, content in read_all_files_of_zip("../tests/assets/testing_blocks.pmp").items() 
+    for file_name, content in read_all_files_of_zip(PROJECT_PATH).items() 
     if file_name != "project.json"
 }
 
@@ -409,6 +409,18 @@ def test_SRBitmapCostume_to_first(bitmap_example):
     result.load()
     assert image_equal(result, bitmap_example)
 
+def test_SRBitmapCostume_to_first_jpg():
+    srcostume = SRBitmapCostume(
+        name="my costume",
+        file_extension="jpg",
+        rotation_center=(0, 0),
+        content=Image.new("RGB", (8, 8), (255, 0, 0)),
+        has_double_resolution=False,
+    )
+    frcostume, file_bytes = srcostume.to_first()
+    assert frcostume.md5ext.endswith(".jpg")
+    assert Image.open(BytesIO(file_bytes)).format == "JPEG"
+
 
 
 
@@ -0,0 +1,124 @@
+from io     import BytesIO
+from lxml   import etree
+from PIL    import Image
+from pydub  import AudioSegment
+from pytest import mark
+from random import Random
+from shutil import which
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import ValidationConfig
+
+from pypenguin.core.asset              import SRBitmapCostume, SRVectorCostume, SRSound
+from pypenguin.core.asset_optimization import AssetOptimizationConfig, optimize_assets
+
+
+
+def test_optimize_assets(project):
+    report = optimize_assets(project, AssetOptimizationConfig(max_workers=2))
+    assert [(result.sprite_name, result.kind) for result in report.results] == [
+        (None, "costume"), ("Sprite1", "costume"), ("Sprite1", "sound"),
+    ]
+    for result in report.results:
+        assert result.bytes_saved >= 0
+        assert result.is_changed == (result.bytes_saved > 0)
+    assert report.bytes_saved == sum(result.bytes_saved for result in report.results)
+    assert len(project.sprites[0].costumes[0].to_first()[1]) == report.results[1].optimized_size
+    project.validate(ValidationConfig(), info_api)
+
+def test_optimize_assets_bitmap(project):
+    rng = Random(0)
+    colors = [(rng.randrange(256), rng.randrange(256), rng.randrange(256), 255) for _ in range(16)]
+    image = Image.new("RGBA", (100, 100))
+    image.putdata([rng.choice(colors) for _ in range(100*100)]) # opaque with few colors
+    image.info["icc_profile"] = bytes(range(256))
+    costume = SRBitmapCostume(name="c", file_extension="png", rotation_center=(0, 0), has_double_resolution=False, content=image)
+    project.stage.costumes.append(costume)
+    result = optimize_assets(project).results[1]
+    assert result.is_changed and (result.optimized_size < result.original_size // 2)
+    assert costume.content.mode == "P"
+    assert "icc_profile" not in costume.content.info
+    assert costume.content.convert("RGBA").tobytes() == image.tobytes() # lossless
+    assert costume.encoder_options == {"optimize": True}
+
+def test_SRBitmapCostume_to_first_encoder_options():
+    image = Image.new("RGB", (20, 20), (10, 20, 30))
+    costume = SRBitmapCostume(name="c", file_extension="png", rotation_center=(0, 0), has_double_resolution=False, content=image)
+    plain = BytesIO()
+    image.save(plain, format="PNG")
+    assert costume.to_first()[1] == plain.getvalue() # only the optimization pass sets optimize
+    costume.encoder_options = {"compress_level": 0}
+    assert len(costume.to_first()[1]) > len(plain.getvalue())
+
+def test_optimize_assets_vector(project):
+    content = etree.fromstring(
+        b'<svg xmlns="http://www.w3.org/2000/svg" xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+        b'inkscape:version="1.0"><!-- a comment -->\n  <metadata>some metadata</metadata>\n'
+        b'  <path d="M1.23456.5L-0.004-3.33333"/>\n  <text> keep  this </text>\n</svg>'
+    )
+    costume = SRVectorCostume(name="v", file_extension="svg", rotation_center=(0, 0), content=content)
+    project.stage.costumes.append(costume)
+    result = optimize_assets(project, AssetOptimizationConfig(vector_precision=2)).results[1]
+    assert result.is_changed
+    assert etree.tostring(costume.content, method="c14n") == (
+        b'<svg xmlns="http://www.w3.org/2000/svg"><path d="M1.23 .5L0-3.33"></path><text> keep  this </text></svg>'
+    )
+
+def test_optimize_assets_vector_arc_flags(project):
+    content = etree.fromstring(
+        b'<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0a1.234 1.234 0 011.111 1.111A5 5 0 1,0 2.222 3"/></svg>'
+    )
+    costume = SRVectorCostume(name="v", file_extension="svg", rotation_center=(0, 0), content=content)
+    project.stage.costumes.append(costume)
+    optimize_assets(project, AssetOptimizationConfig(vector_precision=1))
+    assert costume.content[0].get("d") == "M0 0a1.2 1.2 0 0 1 1.1 1.1A5 5 0 1 0 2.2 3"
+
+def test_optimize_assets_jpg(project):
+    image = Image.new("RGB", (50, 50), (200, 100, 50))
+    image.info["comment"] = b"x" * 1000
+    costume = SRBitmapCostume(name="j", file_extension="jpg", rotation_center=(0, 0), has_double_resolution=False, content=image)
+    project.stage.costumes.append(costume)
+    result = optimize_assets(project).results[1]
+    assert (result.error is None) and result.is_changed
+    assert "comment" not in costume.content.info
+
+def test_optimize_assets_encoding_error(project):
+    image = Image.new("RGBA", (10, 10)) # jpg can not store transparency
+    costume = SRBitmapCostume(name="j", file_extension="jpg", rotation_center=(0, 0), has_double_resolution=False, content=image)
+    project.stage.costumes.insert(0, costume)
+    report = optimize_assets(project)
+    assert report.results[0].error.startswith("OSError")
+    assert (report.results[0].original_size, report.results[0].is_changed) == (0, False)
+    assert costume.content is image
+    assert all(result.error is None for result in report.results[1:])
+
+def test_optimize_assets_sound(project):
+    content = AudioSegment.silent(duration=500, frame_rate=44100).set_channels(2)
+    sound = SRSound(name="s", file_extension="wav", content=content)
+    project.stage.sounds.append(sound)
+    config = AssetOptimizationConfig(max_sample_rate=22050, mono_sounds=True)
+    result = [result for result in optimize_assets(project, config).results if result.name == "s"][0]
+    assert result.is_changed and (result.optimized_size < result.original_size // 3)
+    assert (sound.content.frame_rate, sound.content.channels) == (22050, 1)
+
+@mark.skipif(which("ffmpeg") is None, reason="ffmpeg is required to encode mp3 files")
+def test_optimize_assets_sound_bitrate(project):
+    content = AudioSegment(data=Random(0).randbytes(44100), sample_width=1, frame_rate=44100, channels=1) # noise
+    sizes = []
+    for bitrate in ("32k", "128k"):
+        sound = SRSound(name=bitrate, file_extension="wav", content=content)
+        project.stage.sounds.append(sound)
+        config = AssetOptimizationConfig(sound_format="mp3", sound_bitrate=bitrate)
+        result = [result for result in optimize_assets(project, config).results if result.name == bitrate][0]
+        assert result.is_changed and (sound.file_extension == "mp3")
+        assert sound.encoder_options == {"bitrate": bitrate}
+        sizes.append(result.optimized_size)
+    assert sizes[0] < sizes[1]
+
+def test_optimize_assets_lossless_by_default(project):
+    content = AudioSegment.silent(duration=500, frame_rate=44100)
+    sound = SRSound(name="s", file_extension="wav", content=content)
+    project.stage.sounds.append(sound)
+    optimize_assets(project)
+    assert (sound.content is content) and (sound.file_extension == "wav")
+
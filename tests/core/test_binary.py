@@ -0,0 +1,95 @@
+from enum   import Enum
+from random import Random
+
+from pytest import raises
+
+from pypenguin.opcode_info.api  import OpcodeInfoAPI
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import DeserializationError
+
+from pypenguin.core         import binary
+from pypenguin.core.binary  import encode_sr, decode_sr, BINARY_FORMAT_VERSION
+from pypenguin.core.block   import SRScript
+from pypenguin.core.project import FRProject, SRProject
+
+from tests.core.constants import ALL_SR_SCRIPTS, ALL_SR_BLOCKS, SR_PROJECT
+
+
+PROJECT_PATHS = ["../tests/assets/testing_blocks.pmp", "../tests/assets/scratch_project.sb3"]
+
+
+
+def test_SRProject_to_bytes_from_bytes():
+    for project_path in PROJECT_PATHS:
+        project = FRProject.from_file(project_path, info_api).to_second(info_api)
+        decoded_project = SRProject.from_bytes(project.to_bytes(info_api), info_api)
+        assert decoded_project == project
+        assert [sprite.uuid for sprite in decoded_project.sprites] == [sprite.uuid for sprite in project.sprites]
+        assert decoded_project.sprite_layer_stack == project.sprite_layer_stack
+
+def test_SRProject_from_bytes_constant():
+    assert SRProject.from_bytes(SR_PROJECT.to_bytes(info_api), info_api) == SR_PROJECT
+
+def test_encode_sr_scripts_and_blocks():
+    assert decode_sr(encode_sr(ALL_SR_SCRIPTS, info_api), info_api) == ALL_SR_SCRIPTS
+    for block in ALL_SR_BLOCKS:
+        assert decode_sr(encode_sr(block, info_api), info_api) == block
+
+def test_encode_sr_compact_opcodes():
+    script = ALL_SR_SCRIPTS[0]
+    data = encode_sr(script, info_api)
+    for block in script.blocks:
+        if info_api.opcode_info.has_key2(block.opcode):
+            assert block.opcode.encode("utf-8") not in data
+
+def test_encode_sr_unsupported():
+    with raises(TypeError):
+        encode_sr(object(), info_api)
+    with raises(TypeError):
+        encode_sr([{1, 2}], info_api)
+
+def test_decode_sr_invalid():
+    data = SR_PROJECT.to_bytes(info_api)
+    with raises(DeserializationError):
+        decode_sr(b"", info_api)
+    with raises(DeserializationError):
+        decode_sr(b"XXXX" + data[4:], info_api)
+    with raises(DeserializationError):
+        decode_sr(data[:4] + (BINARY_FORMAT_VERSION+1).to_bytes(2, "big") + data[6:], info_api)
+    with raises(DeserializationError):
+        decode_sr(data[:-10], info_api)
+    with raises(DeserializationError):
+        decode_sr(data + b"\0", info_api)
+    with raises(DeserializationError):
+        decode_sr(data, OpcodeInfoAPI())
+    with raises(DeserializationError):
+        SRProject.from_bytes(encode_sr(ALL_SR_SCRIPTS[0], info_api), info_api)
+    assert isinstance(decode_sr(encode_sr(ALL_SR_SCRIPTS[0], info_api), info_api), SRScript)
+
+def test_decode_sr_corrupted():
+    data = FRProject.from_file(PROJECT_PATHS[0], info_api).to_second(info_api).to_bytes(info_api)
+    rng = Random(0)
+    for _ in range(300):
+        corrupted = bytearray(data)
+        for _ in range(3):
+            corrupted[rng.randrange(len(corrupted))] = rng.randrange(256)
+        try:
+            SRProject.from_bytes(bytes(corrupted), info_api)
+        except DeserializationError:
+            pass # any other exception type fails the test
+
+def test_decode_sr_other_class_schema(monkeypatch):
+    data = encode_sr(ALL_SR_SCRIPTS[0], info_api)
+    monkeypatch.setattr(binary, "_class_schema", binary._get_class_schema() + b"\nSRNewClass(field)")
+    with raises(DeserializationError):
+        decode_sr(data, info_api)
+
+def test_describe_classes_enum_members():
+    class Kind(Enum):
+        A = 0
+        B = 1
+    class ReorderedKind(Enum):
+        B = 1
+        A = 0
+    assert binary._describe_classes({"Kind": Kind}) != binary._describe_classes({"Kind": ReorderedKind})
+    assert binary._describe_classes({"Kind": Kind}) == b"Kind:A,B"
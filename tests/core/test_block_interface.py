@@ -217,36 +217,36 @@ def test_SecondReprIF_post_init_invalid_custom_opcode():
     srmutation: SRCustomBlockMutation = scripts[3].blocks[0].mutation
     srmutation.custom_opcode = 6
     sr_if = SecondReprIF(scripts=scripts)
-    assert not lists_equal_ignore_order(sr_if._get_all_blocks(), ALL_SR_BLOCKS)
+    assert not lists_equal_ignore_order(list(sr_if._iter_all_blocks()), ALL_SR_BLOCKS)
 
 def test_SecondReprIF_post_init_invalid_inputs():
     scripts = deepcopy(ALL_SR_SCRIPTS)
     scripts[0].blocks[0].inputs = []
     sr_if = SecondReprIF(scripts=scripts)
-    assert not lists_equal_ignore_order(sr_if._get_all_blocks(), ALL_SR_BLOCKS)
+    assert not lists_equal_ignore_order(list(sr_if._iter_all_blocks()), ALL_SR_BLOCKS)
 
 def test_SecondReprIF_post_init_invalid_substack_blocks():
     scripts = deepcopy(ALL_SR_SCRIPTS)
     scripts[6].blocks[0].inputs["THEN"].blocks = {}
     sr_if = SecondReprIF(scripts=scripts)
-    assert not lists_equal_ignore_order(sr_if._get_all_blocks(), ALL_SR_BLOCKS)
+    assert not lists_equal_ignore_order(list(sr_if._iter_all_blocks()), ALL_SR_BLOCKS)
 
 def test_SecondReprIF_post_init_invalid_script_blocks():
     scripts = deepcopy(ALL_SR_SCRIPTS)
     scripts[0].blocks = {}
     sr_if = SecondReprIF(scripts=scripts)
-    assert not lists_equal_ignore_order(sr_if._get_all_blocks(), ALL_SR_BLOCKS)
+    assert not lists_equal_ignore_order(list(sr_if._iter_all_blocks()), ALL_SR_BLOCKS)
 
 def test_SecondReprIF_post_init_invalid_script_block():
     scripts = deepcopy(ALL_SR_SCRIPTS)
     scripts[0].blocks[0] = ...
     sr_if = SecondReprIF(scripts=scripts)
-    assert not lists_equal_ignore_order(sr_if._get_all_blocks(), ALL_SR_BLOCKS)
+    assert not lists_equal_ignore_order(list(sr_if._iter_all_blocks()), ALL_SR_BLOCKS)
 
 
-def test_SecondReprIF_get_all_blocks(sr_if: SecondReprIF):
+def test_SecondReprIF_iter_all_blocks(sr_if: SecondReprIF):
     sr_if_copy = deepcopy(sr_if)
-    assert lists_equal_ignore_order(sr_if_copy._get_all_blocks(), ALL_SR_BLOCKS)
+    assert lists_equal_ignore_order(list(sr_if_copy._iter_all_blocks()), ALL_SR_BLOCKS)
     assert sr_if_copy == sr_if
 
 
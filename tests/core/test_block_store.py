@@ -0,0 +1,81 @@
+from pytest import raises
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import DeserializationError
+
+from pypenguin.core.block       import FRBlock
+from pypenguin.core.block_store import FRBlockStore, NO_INDEX
+from pypenguin.core.project     import FRProject
+
+from tests.core.constants import ALL_FR_BLOCK_DATAS, ALL_FR_BLOCKS
+
+
+
+def test_FRBlockStore_from_data():
+    store = FRBlockStore.from_data(ALL_FR_BLOCK_DATAS, info_api=info_api)
+    assert isinstance(store, FRBlockStore)
+    assert len(store) == len(ALL_FR_BLOCK_DATAS)
+    assert len(store.opcode_table) == len(set(store.opcode_table))
+    assert store.to_blocks() == ALL_FR_BLOCKS
+
+def test_FRBlockStore_from_data_invalid_reference():
+    data = ALL_FR_BLOCK_DATAS | {"d": ALL_FR_BLOCK_DATAS["d"] | {"next": "does not exist"}}
+    with raises(DeserializationError):
+        FRBlockStore.from_data(data, info_api=info_api)
+
+def test_FRBlockStore_from_blocks():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    assert store == FRBlockStore.from_data(ALL_FR_BLOCK_DATAS, info_api=info_api)
+    assert store.to_blocks() == ALL_FR_BLOCKS
+
+def test_FRBlockStore_from_file():
+    stores = FRBlockStore.from_file("../tests/assets/testing_blocks.pmp", info_api=info_api)
+    project = FRProject.from_file("../tests/assets/testing_blocks.pmp", info_api=info_api)
+    assert list(stores.keys()) == [target.name for target in project.targets]
+    for target in project.targets:
+        assert stores[target.name].to_blocks() == target.blocks
+
+def test_FRBlockStore_links():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    for block_id, block in ALL_FR_BLOCKS.items():
+        if isinstance(block, tuple):
+            continue
+        row = store.row_of(block_id)
+        assert (store.nexts  [row] == NO_INDEX) == (block.next   is None)
+        assert (store.parents[row] == NO_INDEX) == (block.parent is None)
+
+def test_FRBlockStore_contains():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    for block_id in ALL_FR_BLOCKS.keys():
+        assert block_id in store
+    assert "does not exist" not in store
+
+def test_FRBlockStore_top_level_block_ids():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    assert store.top_level_block_ids() == [
+        block_id for block_id, block in ALL_FR_BLOCKS.items()
+        if isinstance(block, FRBlock) and block.top_level
+    ]
+
+def test_FRBlockStore_child_block_ids():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    for parent_id in store.block_ids:
+        assert store.child_block_ids(parent_id) == [
+            block_id for block_id, block in ALL_FR_BLOCKS.items()
+            if isinstance(block, FRBlock) and block.parent == parent_id
+        ]
+
+def test_FRBlockStore_block_ids_with_opcode():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    for opcode in store.opcode_table:
+        assert store.block_ids_with_opcode(opcode) == [
+            block_id for block_id, block in ALL_FR_BLOCKS.items()
+            if isinstance(block, FRBlock) and block.opcode == opcode
+        ]
+    assert store.block_ids_with_opcode("not_an_opcode") == []
+
+def test_FRBlockStore_get_block():
+    store = FRBlockStore.from_blocks(ALL_FR_BLOCKS)
+    for block_id, block in ALL_FR_BLOCKS.items():
+        assert store.get_block(block_id) == block
+
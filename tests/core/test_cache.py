@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor
+from os                 import listdir, replace, utime, path as os_path
+from shutil             import copyfile
+from time               import time
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import Instrumentation
+
+from pypenguin.core        import cache as cache_module
+from pypenguin.core.cache   import ProjectCache, CACHE_FILE_SUFFIX, STALE_TEMP_FILE_AGE
+from pypenguin.core.project import FRProject
+
+from tests.core.constants import PROJECT_PATH
+
+
+OTHER_PROJECT_PATH = "../tests/assets/scratch_project.sb3"
+
+def _entry_names(directory: str) -> list[str]:
+    return [file_name for file_name in listdir(directory) if file_name.endswith(CACHE_FILE_SUFFIX)]
+
+def _load_in_process(directory: str) -> bool:
+    project = ProjectCache(directory).load_project(PROJECT_PATH, info_api)
+    return project == FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+
+
+
+def test_ProjectCache_load_project(tmp_path):
+    cache = ProjectCache(str(tmp_path))
+    expected = FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+    with Instrumentation() as instrumentation:
+        missed_project = cache.load_project(PROJECT_PATH, info_api)
+        hit_project    = cache.load_project(PROJECT_PATH, info_api)
+    assert instrumentation.counters["cache_misses"] == 1
+    assert instrumentation.counters["cache_hits"] == 1
+    assert missed_project == expected
+    assert hit_project == expected
+    assert hit_project is not missed_project
+    assert len(_entry_names(tmp_path)) == 1
+
+def test_ProjectCache_persistent(tmp_path):
+    ProjectCache(str(tmp_path)).load_project(PROJECT_PATH, info_api)
+    key = ProjectCache(str(tmp_path)).key_for_file(PROJECT_PATH, info_api)
+    assert ProjectCache(str(tmp_path)).get(key) == FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+
+def test_ProjectCache_key_for_file(tmp_path):
+    cache = ProjectCache(str(tmp_path / "cache"))
+    copied_path = str(tmp_path / "copy.pmp")
+    copyfile(os_path.join(os_path.dirname(__file__), "..", "assets", "testing_blocks.pmp"), copied_path)
+    key = cache.key_for_file(PROJECT_PATH, info_api)
+    assert cache.key_for_file(copied_path, info_api) == key
+    assert cache.key_for_file(OTHER_PROJECT_PATH, info_api) != key
+    with open(copied_path, "ab") as file:
+        file.write(b"\0")
+    assert cache.key_for_file(copied_path, info_api) != key
+
+def test_ProjectCache_corrupted_entry(tmp_path):
+    cache = ProjectCache(str(tmp_path))
+    cache.load_project(PROJECT_PATH, info_api)
+    key = cache.key_for_file(PROJECT_PATH, info_api)
+    entry_path = os_path.join(tmp_path, _entry_names(tmp_path)[0])
+    with open(entry_path, "r+b") as file:
+        file.truncate(100)
+    assert cache.get(key) is None
+    assert _entry_names(tmp_path) == []
+    assert cache.load_project(PROJECT_PATH, info_api) == FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+
+def test_ProjectCache_corrupted_entry_replaced(tmp_path, monkeypatch):
+    cache = ProjectCache(str(tmp_path))
+    project = cache.load_project(PROJECT_PATH, info_api)
+    key = cache.key_for_file(PROJECT_PATH, info_api)
+    entry_path = os_path.join(tmp_path, _entry_names(tmp_path)[0])
+    copyfile(entry_path, str(tmp_path / "valid"))
+    with open(entry_path, "r+b") as file:
+        file.truncate(100)
+    original_loads = cache_module.loads
+    def replacing_loads(data):
+        # another process replaces the corrupted entry after it was read
+        replace(str(tmp_path / "valid"), entry_path)
+        monkeypatch.setattr(cache_module, "loads", original_loads)
+        return original_loads(data)
+    monkeypatch.setattr(cache_module, "loads", replacing_loads)
+    assert cache.get(key) is None
+    assert cache.get(key) == project
+
+def test_ProjectCache_evict(tmp_path):
+    cache = ProjectCache(str(tmp_path))
+    cache.load_project(PROJECT_PATH, info_api)
+    cache.load_project(OTHER_PROJECT_PATH, info_api)
+    cache.max_size = cache.size() - 1
+    cache.evict() # the least recently used entry is evicted
+    assert _entry_names(tmp_path) == [cache.key_for_file(OTHER_PROJECT_PATH, info_api) + CACHE_FILE_SUFFIX]
+    assert cache.size() <= cache.max_size
+    cache.clear()
+    assert cache.size() == 0
+
+def test_ProjectCache_evict_stale_temp_files(tmp_path):
+    cache = ProjectCache(str(tmp_path))
+    (tmp_path / "stale.tmp").write_bytes(b"partial entry")
+    (tmp_path / "recent.tmp").write_bytes(b"partial entry")
+    stale_time = time() - STALE_TEMP_FILE_AGE - 1
+    utime(str(tmp_path / "stale.tmp"), (stale_time, stale_time))
+    cache.evict()
+    assert sorted(listdir(tmp_path)) == ["recent.tmp"]
+
+def test_ProjectCache_concurrent(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_load_in_process, [str(tmp_path)] * 8))
+    assert all(results)
+    assert len(_entry_names(tmp_path)) == 1
+    assert [file_name for file_name in listdir(tmp_path) if file_name.endswith(".tmp")] == []
+
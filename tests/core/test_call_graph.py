@@ -0,0 +1,76 @@
+from copy import deepcopy
+
+from pypenguin.opcode_info.api import DropdownValueKind
+
+from pypenguin.core.block      import SRScript, SRBlock, SRBlockAndDropdownInputValue
+from pypenguin.core.call_graph import SRCallKind, SRCallGraph
+from pypenguin.core.dropdown   import SRDropdownValue
+
+
+
+def _block(opcode: str, inputs: dict | None = None, dropdowns: dict | None = None) -> SRBlock:
+    return SRBlock(opcode=opcode, inputs=inputs or {}, dropdowns=dropdowns or {}, comment=None, mutation=None)
+
+def _receive_script(message: str, *blocks: SRBlock) -> SRScript:
+    return SRScript(position=(0, 0), blocks=[
+        _block("when I receive [MESSAGE]", dropdowns={"MESSAGE": SRDropdownValue(DropdownValueKind.BROADCAST_MSG, message)}),
+        *blocks,
+    ])
+
+def _broadcast_block(message: str | SRBlock) -> SRBlock:
+    if isinstance(message, SRBlock):
+        input_value = SRBlockAndDropdownInputValue(block=message, dropdown=SRDropdownValue(DropdownValueKind.BROADCAST_MSG, "x"))
+    else:
+        input_value = SRBlockAndDropdownInputValue(block=None, dropdown=SRDropdownValue(DropdownValueKind.BROADCAST_MSG, message))
+    return _block("broadcast ([MESSAGE])", inputs={"MESSAGE": input_value})
+
+
+
+def test_SRCallGraph_from_project(project):
+    sprite = project.sprites[0]
+    sprite.scripts.append(_receive_script("my message"))
+    graph = SRCallGraph.from_project(project)
+    nodes = graph.nodes
+    assert len(nodes) == 8
+    assert nodes[2].target is sprite and nodes[2].target_path == ["sprites", 0] and nodes[2].script is sprite.scripts[2]
+    assert graph.node_listens[2][0] is SRCallKind.CUSTOM_BLOCK
+
+    assert graph.get_callees(nodes[0]) == [nodes[7]] # broadcast -> when I receive
+    assert graph.get_callees(nodes[3]) == [nodes[2]] # call -> definition
+    assert graph.get_callers(nodes[2]) == [nodes[3]]
+    assert (graph.get_fan_in(nodes[7]), graph.get_fan_out(nodes[7])) == (1, 0)
+    assert graph.get_entry_points() == nodes[:2] + nodes[3:7]
+    assert graph.get_reachable() == nodes
+    assert graph.get_reachable([nodes[1]]) == [nodes[1]]
+
+def test_SRCallGraph_dynamic_and_clones(project):
+    sprite = project.sprites[0]
+    sprite.scripts = [
+        _receive_script("a"),
+        _receive_script("b"),
+        SRScript(position=(0, 0), blocks=[_block("when green flag clicked"), _broadcast_block(_block("answer")), _broadcast_block("a")]),
+        SRScript(position=(0, 0), blocks=[_block("when green flag clicked"), _block("create clone of ([TARGET])", inputs={
+            "TARGET": SRBlockAndDropdownInputValue(block=None, dropdown=SRDropdownValue(DropdownValueKind.MYSELF, "myself")),
+        })]),
+        SRScript(position=(0, 0), blocks=[_block("when I start as a clone")]),
+    ]
+    graph = SRCallGraph.from_project(project)
+    nodes = graph.nodes
+    assert graph.node_sends[2] == [(SRCallKind.BROADCAST, None)] # a is included in any message
+    assert graph.get_callees(nodes[2]) == [nodes[0], nodes[1]]
+    assert graph.get_fan_in(nodes[0]) == 1
+    assert graph.get_callees(nodes[3]) == [nodes[4]]
+    assert graph.find_recursion() == []
+
+def test_SRCallGraph_find_recursion(project):
+    sprite = project.sprites[0]
+    sprite.scripts[2].blocks.append(deepcopy(sprite.scripts[3].blocks[0])) # the custom block calls itself
+    sprite.scripts.append(_receive_script("ping", _broadcast_block("pong")))
+    sprite.scripts.append(_receive_script("pong", _broadcast_block("ping")))
+    sprite.scripts.append(_receive_script("other", _broadcast_block("ping")))
+    graph = SRCallGraph.from_project(project)
+    nodes = graph.nodes
+    assert graph.find_recursion() == [[nodes[2]], [nodes[7], nodes[8]]]
+    assert graph.get_fan_in(nodes[7]) == 2
+    assert graph.get_reachable([nodes[9]]) == [nodes[7], nodes[8], nodes[9]]
+
@@ -0,0 +1,40 @@
+from pypenguin.opcode_info.data import info_api
+
+from pypenguin.core.block     import SRBlock
+from pypenguin.core.dead_code import SRDeadScriptReason, find_dead_scripts, eliminate_dead_code
+
+
+
+def _hat_block() -> SRBlock:
+    return SRBlock(opcode="when green flag clicked", inputs={}, dropdowns={}, comment=None, mutation=None)
+
+
+
+def test_find_dead_scripts(project):
+    sprite = project.sprites[0]
+    dead_scripts = find_dead_scripts(sprite, info_api)
+    assert [dead_script.script_index for dead_script in dead_scripts] == [0, 1, 2, 3, 4, 5, 6]
+    assert dead_scripts[2].reason is SRDeadScriptReason.UNCALLED_CUSTOM_BLOCK # only called from a script without hat
+    assert dead_scripts[0].reason is SRDeadScriptReason.NO_HAT
+    assert dead_scripts[1].block_count == 3
+    assert dead_scripts[1].script is sprite.scripts[1]
+
+    sprite.scripts[3].blocks.insert(0, _hat_block()) # now the call is executed
+    assert [dead_script.script_index for dead_script in find_dead_scripts(sprite, info_api)] == [0, 1, 4, 5, 6]
+
+def test_eliminate_dead_code(project):
+    sprite = project.sprites[0]
+    sprite.scripts[3].blocks.insert(0, _hat_block())
+    live_scripts = [sprite.scripts[2], sprite.scripts[3]]
+
+    report = eliminate_dead_code(project, info_api, remove=False)
+    assert not report.is_removed
+    assert report.blocks_saved == 2 + 3 + 1 + 1 + 2
+    assert len(sprite.scripts) == 7
+
+    report = eliminate_dead_code(project, info_api)
+    assert report.is_removed
+    assert report.blocks_saved == 9
+    assert sprite.scripts == live_scripts
+    assert eliminate_dead_code(sprite, info_api).dead_scripts == []
+
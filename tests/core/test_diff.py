@@ -0,0 +1,124 @@
+from copy import deepcopy
+
+from pypenguin.core.diff       import SRChangeKind, SRChange, SRProjectDiff, diff_projects
+from pypenguin.core.target     import SRSprite
+from pypenguin.core.vars_lists import SRVariable
+
+
+
+def _summary(diff: SRProjectDiff) -> list[tuple[SRChangeKind, list]]:
+    return [(change.kind, change.path) for change in diff.changes]
+
+
+
+def test_diff_projects_equal(project):
+    diff = diff_projects(project, deepcopy(project))
+    assert not diff
+    assert diff.to_text() == ""
+
+def test_diff_projects_project_fields(project):
+    new = deepcopy(project)
+    new.tempo = 120
+    new.all_sprite_variables.append(SRVariable(name="new variable", current_value=1))
+    new.all_sprite_variables[0].current_value = 5
+    del new.global_monitors[0]
+    assert _summary(project.diff(new)) == [
+        (SRChangeKind.MODIFIED, ["tempo"]),
+        (SRChangeKind.MODIFIED, ["all_sprite_variables", 0]),
+        (SRChangeKind.ADDED   , ["all_sprite_variables", 1]),
+        (SRChangeKind.REMOVED , ["global_monitors", 0]),
+    ]
+
+def test_diff_projects_sprites(project):
+    new = deepcopy(project)
+    new.sprites[0].name = "Renamed"
+    new.sprites.append(SRSprite.create_empty("Sprite2"))
+    new.sprite_layer_stack = [new.sprites[1].uuid, new.sprites[0].uuid]
+    diff = diff_projects(project, new)
+    assert _summary(diff) == [
+        (SRChangeKind.ADDED  , ["sprites", 0]),
+        (SRChangeKind.ADDED  , ["sprites", 1]),
+        (SRChangeKind.REMOVED, ["sprites", 0]),
+        (SRChangeKind.MODIFIED, ["sprite_layer_stack"]),
+    ]
+    assert diff.changes[0].new_value is new.sprites[0]
+    assert diff.changes[3].new_value == ["Sprite2", "Renamed"]
+
+def test_diff_projects_sprite_fields(project):
+    new = deepcopy(project)
+    sprite = new.sprites[0]
+    sprite.volume = 50
+    sprite.position = (10, 10)
+    sprite.costumes[0].rotation_center = (0, 0)
+    sprite.comments.clear()
+    assert _summary(diff_projects(project, new)) == [
+        (SRChangeKind.MODIFIED, ["sprites", 0, "volume"]),
+        (SRChangeKind.MODIFIED, ["sprites", 0, "position"]),
+    ] + [
+        (SRChangeKind.REMOVED, ["sprites", 0, "comments", i]) for i in range(len(project.sprites[0].comments))
+    ] + [
+        (SRChangeKind.MODIFIED, ["sprites", 0, "costumes", 0]),
+    ]
+
+def test_diff_projects_scripts(project):
+    new = deepcopy(project)
+    scripts = new.sprites[0].scripts
+    scripts.insert(0, scripts.pop()) # moving a script is no change
+    assert not diff_projects(project, new)
+
+    removed_script = scripts.pop(1)
+    scripts.append(deepcopy(removed_script))
+    scripts[-1].position = (0, 0)
+    scripts[-1].blocks[0].opcode = "changed"
+    diff = diff_projects(project, new)
+    assert _summary(diff) == [
+        (SRChangeKind.REMOVED, ["sprites", 0, "scripts", 0]),
+        (SRChangeKind.ADDED  , ["sprites", 0, "scripts", len(scripts)-1]),
+    ]
+
+def test_diff_projects_blocks(project):
+    new = deepcopy(project)
+    script = new.sprites[0].scripts[0]
+    script.blocks[0].inputs["MESSAGE"].dropdown.value = "other message"
+    script.blocks[1].inputs["SECONDS"].text = "2"
+    script.blocks[1].comment = None
+    script.blocks.insert(1, deepcopy(script.blocks[1]))
+    path = ["sprites", 0, "scripts", 0, "blocks"]
+    assert _summary(diff_projects(project, new)) == [
+        (SRChangeKind.MODIFIED, path+[0, "inputs", ("MESSAGE",), "dropdown"]),
+        (SRChangeKind.MODIFIED, path+[1, "inputs", ("SECONDS",), "text"]),
+        (SRChangeKind.REMOVED , path+[1, "comment"]),
+        (SRChangeKind.ADDED   , path+[2]),
+    ]
+
+def test_SRChange_to_string():
+    change = SRChange(
+        kind=SRChangeKind.MODIFIED,
+        old_path=["sprites", 0, "scripts", 1, "blocks", 0, "inputs", ("MESSAGE",)],
+        new_path=["sprites", 0, "scripts", 2, "blocks", 0, "inputs", ("MESSAGE",)],
+        old_value=None,
+        new_value=None,
+    )
+    assert change.to_string() == (
+        "modified .sprites[0].scripts[1].blocks[0].inputs['MESSAGE'] -> .sprites[0].scripts[2].blocks[0].inputs['MESSAGE']"
+    )
+    change.kind = SRChangeKind.REMOVED
+    change.new_path = None
+    assert change.to_string() == "removed .sprites[0].scripts[1].blocks[0].inputs['MESSAGE']"
+
+def test_SRProjectDiff_filter(project):
+    new = deepcopy(project)
+    new.tempo = 100
+    new.sprites[0].volume = 0
+    diff = diff_projects(project, new)
+    assert [change.path for change in diff.filter(path_prefix=["sprites", 0])] == [["sprites", 0, "volume"]]
+    assert len(diff.filter(kind=SRChangeKind.MODIFIED)) == 2
+    assert diff.filter(kind=SRChangeKind.ADDED) == []
+
+def test_diff_projects_unloaded_sprites(partially_loaded_project):
+    new = deepcopy(partially_loaded_project)
+    assert not diff_projects(partially_loaded_project, new)
+    new.unloaded_targets.sprites[0].volume = 0
+    assert _summary(diff_projects(partially_loaded_project, new)) == [(SRChangeKind.MODIFIED, ["unloaded_targets", "sprites", 0])]
+    new.unloaded_targets = None
+    assert _summary(diff_projects(partially_loaded_project, new)) == [(SRChangeKind.REMOVED, ["unloaded_targets", "sprites", 0])]
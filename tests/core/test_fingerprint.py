@@ -0,0 +1,143 @@
+from copy   import deepcopy
+from pickle import dumps, loads
+from lxml   import etree
+from PIL    import Image
+from pytest import raises
+
+from pypenguin.utility import FINGERPRINT_SIZE, fingerprint
+
+from pypenguin.core.asset          import SRVectorCostume, SRBitmapCostume
+from pypenguin.core.block          import SRScript, SRBlock, SRBlockAndTextInputValue
+from pypenguin.core.block_mutation import SRCustomBlockCallMutation
+
+from tests.core.constants import ALL_SR_SCRIPTS, SR_PROJECT
+
+
+
+def _make_script(text: str, position: tuple = (0, 0)) -> SRScript:
+    return SRScript(
+        position=position,
+        blocks=[SRBlock(
+            opcode="looks_say",
+            inputs={"MESSAGE": SRBlockAndTextInputValue(block=None, text=text)},
+            dropdowns={},
+            comment=None,
+            mutation=None,
+        )],
+    )
+
+
+
+def test_fingerprint_equal_objects(project):
+    copied = deepcopy(project)
+    assert len(fingerprint(project)) == FINGERPRINT_SIZE
+    assert fingerprint(project) == fingerprint(copied) # ignores UUIDs like __eq__
+    for target, copied_target in zip([project.stage] + project.sprites, [copied.stage] + copied.sprites):
+        assert fingerprint(target) == fingerprint(copied_target)
+        for costume, copied_costume in zip(target.costumes, copied_target.costumes):
+            assert fingerprint(costume) == fingerprint(copied_costume)
+
+def test_fingerprint_different_objects():
+    fingerprints = {fingerprint(script) for script in ALL_SR_SCRIPTS}
+    assert len(fingerprints) == len(ALL_SR_SCRIPTS)
+    assert fingerprint(_make_script("a")) != fingerprint(_make_script("b"))
+    assert fingerprint(_make_script("a")) != fingerprint(_make_script("a", position=(0, 1)))
+
+def test_fingerprint_equality_semantics():
+    assert fingerprint(_make_script("a", position=(0, 0))) == fingerprint(_make_script("a", position=(0.0, 0.0)))
+    block = _make_script("a").blocks[0]
+    reordered_block = deepcopy(block)
+    reordered_block.dropdowns = {"B": None, "A": None}
+    block.dropdowns = {"A": None, "B": None}
+    assert fingerprint(block) == fingerprint(reordered_block)
+
+def test_fingerprint_mutation():
+    script = _make_script("a")
+    before = fingerprint(script)
+    script.blocks[0].inputs["MESSAGE"].text = "b"
+    assert fingerprint(script) != before
+    assert fingerprint(script) == fingerprint(_make_script("b"))
+    script.blocks.append(deepcopy(script.blocks[0]))
+    assert fingerprint(script) != fingerprint(_make_script("b"))
+
+def test_fingerprint_memo():
+    memo = {}
+    fingerprint(SR_PROJECT, memo)
+    script = SR_PROJECT.sprites[0].scripts[0]
+    assert memo[id(script)][1] == fingerprint(script)
+
+def test_fingerprint_unsupported():
+    with raises(TypeError):
+        fingerprint(SRCustomBlockCallMutation(custom_opcode=object()))
+
+def test_fingerprint_as_key():
+    scripts = {fingerprint(script): script for script in [_make_script("a"), _make_script("a"), _make_script("b")]}
+    assert len(scripts) == 2
+    assert fingerprint(_make_script("a")) in scripts
+
+def test_SRScript_SRBlock_hash():
+    scripts = {_make_script("a"), _make_script("a"), _make_script("b")}
+    assert len(scripts) == 2
+    assert _make_script("a") in scripts
+    assert _make_script("c") not in scripts
+    assert hash(_make_script("a").blocks[0]) == hash(_make_script("a").blocks[0])
+    assert {_make_script("a").blocks[0]: 1}[_make_script("a").blocks[0]] == 1
+
+def test_fingerprint_cache():
+    script = _make_script("a")
+    first = fingerprint(script)
+    assert fingerprint(script) is first # cached
+
+    block = script.blocks[0]
+    block.inputs["MESSAGE"].text = "b" # nested modification
+    assert fingerprint(script) == fingerprint(_make_script("b"))
+    block.inputs["MESSAGE"] = SRBlockAndTextInputValue(block=None, text="a") # in place modification of a dict
+    assert fingerprint(script) == first
+    block.inputs["MESSAGE"].block = deepcopy(block) # new nested block
+    assert fingerprint(script) != first
+    block.inputs["MESSAGE"].block = None
+    assert fingerprint(script) == first
+    script.blocks.append(deepcopy(block)) # in place modification of a list
+    assert fingerprint(script) != first
+    script.blocks.pop()
+    assert fingerprint(script) == first
+
+def test_fingerprint_cache_not_copied(project):
+    fingerprint(project)
+    script = project.sprites[0].scripts[0]
+    assert "_fingerprint_cache" in script.__dict__
+    assert "_fingerprint_cache" not in deepcopy(script).__dict__
+    assert "_fingerprint_cache" not in loads(dumps(project.sprites[0])).__dict__
+    assert "_fingerprint_cache" not in deepcopy(project).__dict__
+
+def test_content_fingerprint_cache():
+    costume = SRVectorCostume.create_empty()
+    other = SRVectorCostume.create_empty()
+    assert costume == other
+    first = costume.content_fingerprint()
+    assert costume.content_fingerprint() is first # cached
+
+    etree.SubElement(costume.content, "rect")
+    assert costume.content_fingerprint() is first # in place modifications are not detected
+    assert costume != other # but __eq__ compares the content itself
+    costume.invalidate_content_fingerprint()
+    assert costume.content_fingerprint() != first
+    assert costume != other
+
+    costume.content = etree.fromstring(etree.tostring(other.content))
+    assert costume.content_fingerprint() == first # assigning another content invalidates the cache
+    assert costume == other
+
+def test_SRBitmapCostume_eq_in_place_edit():
+    def make_costume():
+        return SRBitmapCostume(
+            name="c", file_extension="png", rotation_center=(0, 0), has_double_resolution=False, 
+            content=Image.new("RGB", (4, 4)),
+        )
+    costume, other = make_costume(), make_costume()
+    assert costume.content_fingerprint() == other.content_fingerprint()
+    costume.content.putpixel((0, 0), (255, 0, 0))
+    assert costume != other
+    other.content.putpixel((0, 0), (255, 0, 0))
+    other.invalidate_content_fingerprint()
+    assert costume == other # even though the cached fingerprint of costume is stale
@@ -1,4 +1,5 @@
 from copy   import deepcopy
+from json   import dumps, loads
 from pytest import fixture, raises
 
 from pypenguin.important_consts import (
@@ -7,7 +8,7 @@ from pypenguin.important_consts import (
     SHA256_SEC_MAIN_ARGUMENT_NAME,
 )
 from pypenguin.opcode_info.data import info_api
-from pypenguin.utility          import string_to_sha256, DeserializationError, ConversionError
+from pypenguin.utility          import string_to_sha256, tuplify, DeserializationError, ConversionError
 
 from pypenguin.core.block_interface import FirstToInterIF
 from pypenguin.core.block_mutation  import FRCustomBlockMutation, SRCustomBlockArgumentMutation
@@ -41,6 +42,38 @@ def test_FRBlock_from_data():
     assert frblock.shadow    == data["shadow"]
     assert frblock.top_level == data["topLevel"]
 
+def test_FRBlock_from_data_interning():
+    data1 = loads(dumps(ALL_FR_BLOCK_DATAS["d"]))
+    data2 = loads(dumps(ALL_FR_BLOCK_DATAS["d"]))
+    assert data1["opcode"] is not data2["opcode"]
+    memo = {}
+    frblock1 = FRBlock.from_data(data1, info_api=info_api, memo=memo)
+    frblock2 = FRBlock.from_data(data2, info_api=info_api, memo=memo)
+    assert frblock1 == frblock2
+    assert frblock1.opcode is frblock2.opcode
+    assert frblock1.opcode is info_api.opcode_info.intern_key1("event_broadcast")
+    [input_id1] = frblock1.inputs.keys()
+    [input_id2] = frblock2.inputs.keys()
+    assert input_id1 is input_id2
+    assert frblock1.inputs["BROADCAST_INPUT"] is frblock2.inputs["BROADCAST_INPUT"]
+    assert frblock1.next is frblock2.next
+
+def test_tuplify_memo_keeps_value_types():
+    memo = {}
+    assert tuplify([4, [1]], memo) == (4, (1,))
+    for value in ([4, [1.0]], [4, [True]]):
+        result = tuplify(value, memo)
+        assert type(result[1][0]) is type(value[1][0]) # 1 == 1.0 == True must not share one tuple
+
+def test_tuplify_nested_values():
+    assert tuplify([1, [4, [5]]], {}) == (1, (4, (5,)))
+    assert tuplify([1, [4, {"a": [1]}]], {}) == (1, (4, {"a": (1,)}))
+    memo = {}
+    float_value = tuplify([1, [4, 1.0]], memo)
+    int_value   = tuplify([1, [4, 1  ]], memo)
+    assert type(float_value[1][1]) is float
+    assert type(int_value  [1][1]) is int
+
 def test_FRBlock_from_data_comment():
     data = ALL_FR_BLOCK_DATAS["b"]
     frblock = FRBlock.from_data(data, info_api=info_api)
@@ -0,0 +1,24 @@
+from tests.utility import import_times
+
+
+HEAVY_DEPENDENCIES = {"lxml", "PIL", "pydub"}
+
+def _imported_heavy_dependencies(code: str) -> set[str]:
+    return {module.split(".")[0] for module in import_times(code).keys()} & HEAVY_DEPENDENCIES
+
+
+
+def test_import_core_without_heavy_dependencies():
+    assert _imported_heavy_dependencies("import pypenguin.core") == set()
+
+def test_import_opcode_info_data_without_heavy_dependencies():
+    assert _imported_heavy_dependencies("import pypenguin.opcode_info.data") == set()
+
+def test_import_heavy_dependencies_on_decode():
+    code = (
+        "from pypenguin.opcode_info.data import info_api\n"
+        "from pypenguin.core import FRProject\n"
+        "FRProject.from_file('../tests/assets/testing_blocks.pmp', info_api).to_second(info_api)\n"
+    )
+    assert _imported_heavy_dependencies(code) == {"lxml", "pydub"} # the project has svg costumes and sounds
+
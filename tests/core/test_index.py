@@ -0,0 +1,94 @@
+from copy   import copy, deepcopy
+from pickle import dumps, loads
+
+from pypenguin.opcode_info.api import DropdownValueKind
+
+from pypenguin.core.block    import SRScript, SRBlock
+from pypenguin.core.dropdown import SRDropdownValue
+from pypenguin.core.index    import SRAccessKind, SRBlockIndex
+
+
+
+def _set_variable_script(name: str) -> SRScript:
+    return SRScript(position=(0, 0), blocks=[SRBlock(
+        opcode="set [VARIABLE] to (VALUE)",
+        inputs={},
+        dropdowns={"VARIABLE": SRDropdownValue(kind=DropdownValueKind.VARIABLE, value=name)},
+        comment=None,
+        mutation=None,
+    )])
+
+
+
+def test_SRBlockIndex_find_blocks(project):
+    index = SRBlockIndex.from_project(project)
+    assert index.block_count == 13
+    locations = index.find_blocks("value of [VARIABLE]")
+    assert len(locations) == 2
+    assert locations[0].path == ["sprites", 0, "scripts", 1, "blocks", 0, "inputs", ("OPERAND1",), "block"]
+    assert locations[1].path == ["sprites", 0, "scripts", 4, "blocks", 0]
+    assert locations[1].block is project.sprites[0].scripts[4].blocks[0]
+    assert locations[0].target_path == ["sprites", 0]
+    assert index.targets_using("value of [VARIABLE]") == [project.sprites[0]]
+    assert index.find_blocks("unused opcode") == []
+
+def test_SRBlockIndex_find_references(project):
+    index = SRBlockIndex.from_project(project)
+    sprite = project.sprites[0]
+    readers = index.find_readers(DropdownValueKind.VARIABLE, "my variable")
+    writers = index.find_writers(DropdownValueKind.VARIABLE, "my variable")
+    assert [location.block.opcode for location in readers] == ["value of [VARIABLE]", "value of [VARIABLE]"]
+    assert [location.block.opcode for location in writers] == ["change [VARIABLE] by (VALUE)"]
+    assert len(index.find_references(DropdownValueKind.VARIABLE, "my variable", target=sprite)) == 3
+    assert index.find_references(DropdownValueKind.VARIABLE, "my variable", target=project.stage) == []
+    assert [location.block.opcode for location in index.find_writers(DropdownValueKind.BROADCAST_MSG, "my message")] == [
+        "broadcast ([MESSAGE])",
+    ]
+    assert index.find_readers(DropdownValueKind.BROADCAST_MSG, "my message") == []
+    assert index.find_references(DropdownValueKind.LIST, "my list")[0].access is SRAccessKind.READ
+
+def test_SRBlockIndex_custom_blocks(project):
+    index = SRBlockIndex.from_project(project)
+    sprite = project.sprites[0]
+    custom_opcode = sprite.scripts[2].blocks[0].mutation.custom_opcode
+    assert index.find_custom_block_definition(custom_opcode, sprite).block is sprite.scripts[2].blocks[0]
+    assert index.find_custom_block_definition(custom_opcode, project.stage) is None
+    assert [location.path for location in index.find_custom_block_calls(custom_opcode)] == [
+        ["sprites", 0, "scripts", 3, "blocks", 0],
+    ]
+
+def test_SRProject_get_block_index(project):
+    index = project.get_block_index()
+    assert project.get_block_index() is index # cached
+    project.sprites[0].scripts.append(_set_variable_script("my variable"))
+    new_index = project.get_block_index()
+    assert new_index is not index # adding scripts is noticed
+    assert len(new_index.find_writers(DropdownValueKind.VARIABLE, "my variable")) == 2
+
+    project.sprites[0].scripts[-1].blocks[0].dropdowns["VARIABLE"].value = "other"
+    newer_index = project.get_block_index()
+    assert newer_index is not new_index # modifications within blocks are noticed too
+    assert newer_index.find_writers(DropdownValueKind.VARIABLE, "other") != []
+    project.invalidate_block_index()
+    assert project.get_block_index() is not newer_index
+
+def test_SRProject_get_block_index_nested_modification(project):
+    index = project.get_block_index()
+    assert index.block_count == 13
+    input_value = project.sprites[0].scripts[1].blocks[0].inputs["OPERAND1"]
+    nested_block = input_value.block
+    input_value.block = None
+    index = project.get_block_index()
+    assert index.block_count == 12
+
+    input_value.block = deepcopy(nested_block)
+    assert project.get_block_index().block_count == 13
+    input_value.block = deepcopy(nested_block) # an equal copy
+    assert project.get_block_index().find_blocks("value of [VARIABLE]")[0].block is input_value.block
+
+def test_SRProject_block_index_copies(project):
+    project.get_block_index()
+    for copied in (copy(project), deepcopy(project), loads(dumps(project))):
+        assert "_block_index_cache" not in copied.__dict__
+        assert copied == project
+
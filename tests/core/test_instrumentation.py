@@ -0,0 +1,95 @@
+from json import loads
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import (
+    ValidationConfig, Instrumentation, TimingStats, get_instrumentation, instrumented_phase, instrumented,
+)
+
+from pypenguin.core.project import FRProject
+
+from tests.core.constants import PROJECT_PATH
+
+
+
+def test_Instrumentation_install():
+    assert get_instrumentation() is None
+    with Instrumentation() as instrumentation:
+        assert get_instrumentation() is instrumentation
+        with Instrumentation() as inner_instrumentation:
+            assert get_instrumentation() is inner_instrumentation
+        assert get_instrumentation() is instrumentation
+    assert get_instrumentation() is None
+
+def test_instrumented_phase():
+    with instrumented_phase("unrecorded"):
+        pass
+    with Instrumentation() as instrumentation:
+        for _ in range(3):
+            with instrumented_phase("phase"):
+                pass
+    assert list(instrumentation.phases.keys()) == ["phase"]
+    assert instrumentation.phases["phase"].calls == 3
+
+def test_instrumented():
+    @instrumented("function")
+    def function(value):
+        if value is None:
+            raise ValueError()
+        return value * 2
+    assert function(2) == 4
+    with Instrumentation() as instrumentation:
+        assert function(3) == 6
+        try:
+            function(None)
+        except ValueError:
+            pass
+    assert instrumentation.phases["function"].calls == 2
+
+def test_Instrumentation_project():
+    with Instrumentation() as instrumentation:
+        fr_project = FRProject.from_file(PROJECT_PATH, info_api)
+        sr_project = fr_project.to_second(info_api)
+        sr_project.validate(ValidationConfig(), info_api)
+    for phase_name in [
+        "read_zip", "json_decode", "from_data", "block_from_data", "to_second", "first_to_inter", "inter_to_second", 
+        "asset_decode", "monitors_to_second", "validate",
+    ]:
+        assert instrumentation.phases[phase_name].calls >= 1
+    assert instrumentation.phases["first_to_inter"].calls == len(fr_project.targets)
+    assert instrumentation.phases["first_to_inter"].total_time <= instrumentation.phases["to_second"].total_time
+    block_count = sum(len(target.blocks) for target in fr_project.targets)
+    from_data_opcodes = instrumentation.opcodes["block_from_data"]
+    assert sum(stats.calls for stats in from_data_opcodes.values()) == block_count
+    assert "procedures_call" in instrumentation.opcodes["first_to_inter"]
+    assert instrumentation.counters["bytes_read"] > 0
+    assert instrumentation.counters["assets_decoded"] == sum(
+        len(target.costumes) + len(target.sounds) for target in fr_project.targets
+    )
+
+def test_Instrumentation_disabled_equal_result():
+    fr_project = FRProject.from_file(PROJECT_PATH, info_api)
+    with Instrumentation():
+        instrumented_fr_project = FRProject.from_file(PROJECT_PATH, info_api)
+    assert instrumented_fr_project == fr_project
+    with Instrumentation():
+        instrumented_sr_project = instrumented_fr_project.to_second(info_api)
+    assert instrumented_sr_project == fr_project.to_second(info_api)
+
+def test_Instrumentation_export():
+    instrumentation = Instrumentation()
+    instrumentation.record_phase("phase", 0.5)
+    instrumentation.record_phase("phase", 0.25)
+    instrumentation.record_opcode("phase", "motion_movesteps", 0.125)
+    instrumentation.count("counter", 3)
+    instrumentation.count("counter")
+    assert instrumentation.phases["phase"] == TimingStats(calls=2, total_time=0.75)
+    assert loads(instrumentation.to_json()) == {
+        "phases": {"phase": {"calls": 2, "total_time": 0.75}},
+        "opcodes": {"phase": {"motion_movesteps": {"calls": 1, "total_time": 0.125}}},
+        "counters": {"counter": 4},
+    }
+    text = instrumentation.to_text()
+    assert "phase" in text
+    assert "motion_movesteps" in text
+    assert "counter" in text
+
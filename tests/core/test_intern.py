@@ -0,0 +1,97 @@
+from copy   import deepcopy
+from pickle import dumps, loads
+from pytest import raises
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import Interner, is_interned, unshare
+
+from pypenguin.core.block    import SRScript, SRBlock, SRBlockAndTextInputValue, SRBlockAndDropdownInputValue
+from pypenguin.core.dropdown import SRDropdownValue, DropdownValueKind
+from pypenguin.core.project  import FRProject
+
+from benchmarks.generator import GeneratorConfig, generate_project_data
+
+
+
+def _make_block(text: str | int = "a") -> SRBlock:
+    return SRBlock(
+        opcode="looks_say",
+        inputs={"MESSAGE": SRBlockAndTextInputValue(block=None, text=text)},
+        dropdowns={},
+        comment=None,
+        mutation=None,
+    )
+
+def _all_blocks(project) -> list[SRBlock]:
+    blocks = []
+    def add(block: SRBlock) -> None:
+        blocks.append(block)
+        for input_value in block.inputs.values():
+            for sub_block in getattr(input_value, "blocks", []):
+                add(sub_block)
+            if getattr(input_value, "block", None) is not None:
+                add(input_value.block)
+    for target in [project.stage] + project.sprites:
+        for script in target.scripts:
+            for block in script.blocks:
+                add(block)
+    return blocks
+
+
+
+def test_Interner_intern():
+    interner = Interner()
+    block = interner.intern(_make_block())
+    assert interner.intern(_make_block()) is block
+    assert interner.intern(_make_block("b")) is not block
+    assert interner.intern(_make_block(1)) is not interner.intern(_make_block(1.0)) # 1 == 1.0, but they are not identical
+    assert (interner.hits, interner.misses) == (2, 8) # the block and its input value
+
+def test_Interner_intern_children():
+    interner = Interner()
+    first = interner.intern(SRBlock(
+        opcode="event_broadcast",
+        inputs={"MESSAGE": SRBlockAndDropdownInputValue(
+            block=_make_block(), dropdown=SRDropdownValue(kind=DropdownValueKind.BROADCAST_MSG, value="message"),
+        )},
+        dropdowns={},
+        comment=None,
+        mutation=None,
+    ))
+    second = interner.intern(_make_block())
+    assert first.inputs["MESSAGE"].block is second
+    assert is_interned(first.inputs["MESSAGE"].dropdown)
+    assert not is_interned(_make_block())
+
+def test_to_second_intern(fr_project):
+    assert fr_project.to_second(info_api, intern=True) == fr_project.to_second(info_api)
+
+    project_data, asset_files = generate_project_data(GeneratorConfig(sprites=2, scripts_per_sprite=4))
+    fr_project = FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api)
+    interned = fr_project.to_second(info_api, intern=True)
+    assert interned == fr_project.to_second(info_api)
+    blocks = _all_blocks(interned)
+    assert len({id(block) for block in blocks}) < len(blocks)
+    assert all(is_interned(block) for block in blocks)
+
+def test_interned_copies():
+    interner = Interner()
+    script = SRScript(position=(0, 0), blocks=[interner.intern(_make_block()), interner.intern(_make_block())])
+    for copied in (deepcopy(script), loads(dumps(script))):
+        assert copied.blocks[0] is copied.blocks[1] # sharing is kept
+        assert is_interned(copied.blocks[0])
+
+def test_unshare():
+    interner = Interner()
+    script = SRScript(position=(0, 0), blocks=[interner.intern(_make_block()), interner.intern(_make_block())])
+    shared_block = script.blocks[0]
+    input_value = unshare(script, ["blocks", 1, "inputs", ("MESSAGE",)])
+    input_value.text = "b"
+    assert script.blocks[1].inputs["MESSAGE"] is input_value
+    assert not is_interned(script.blocks[1])
+    assert script.blocks[0] is shared_block
+    assert shared_block == _make_block("a")
+    assert script.blocks[1] == _make_block("b")
+    with raises(ValueError):
+        unshare(shared_block, ["inputs"])
+
@@ -0,0 +1,49 @@
+from logging import DEBUG
+
+from pypenguin.opcode_info.data import info_api
+
+from pypenguin.core.project import FRProject
+
+from tests.core.constants import PROJECT_PATH
+
+
+
+def test_no_output(capsys):
+    FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == ""
+
+def test_core_debug_logging(caplog):
+    fr_project = FRProject.from_file(PROJECT_PATH, info_api)
+    with caplog.at_level(DEBUG, logger="pypenguin.core"):
+        fr_project.to_second(info_api)
+    messages = [record.getMessage() for record in caplog.records if record.name.startswith("pypenguin.core")]
+    for target in fr_project.targets:
+        assert f"Converting target {target.name!r} with {len(target.blocks)} blocks into second representation" in messages
+        for list_name, list_value in target.lists.values():
+            assert f"Converting list {list_name!r} of target {target.name!r} with {len(list_value)} items" in messages
+
+def test_trace_logging(caplog):
+    FRProject.from_file(PROJECT_PATH, info_api)
+    assert not [record for record in caplog.records if record.name == "pypenguin.trace"]
+    with caplog.at_level(DEBUG, logger="pypenguin.trace"):
+        FRProject.from_file(PROJECT_PATH, info_api).to_second(info_api)
+    messages = [record.getMessage() for record in caplog.records if record.name == "pypenguin.trace"]
+    assert "Starting phase to_second" in messages
+    assert any(message.startswith("Finished phase to_second in ") for message in messages)
+    assert any(message.startswith("Finished phase read_zip in ") for message in messages)
+
+
+def test_conversion_module_logging(caplog):
+    fr_project = FRProject.from_file(PROJECT_PATH, info_api)
+    with caplog.at_level(DEBUG, logger="pypenguin.core"):
+        fr_project.to_second(info_api)
+    loggers = {record.name for record in caplog.records}
+    assert {"pypenguin.core.asset", "pypenguin.core.block", "pypenguin.core.block_interface"} <= loggers
+    messages = [record.getMessage() for record in caplog.records if record.name == "pypenguin.core.asset"]
+    for target in fr_project.targets:
+        for costume in target.costumes:
+            assert any(message.startswith(f"Decoding costume {costume.name!r} ({costume.data_format}, ") for message in messages)
+        for sound in target.sounds:
+            assert any(message.startswith(f"Decoding sound {sound.name!r} ({sound.data_format}, ") for message in messages)
@@ -0,0 +1,62 @@
+from io     import BytesIO
+from pytest import mark
+from shutil import which
+
+from PIL   import Image
+from pydub import AudioSegment
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import read_image_size, read_audio_info
+
+from pypenguin.core.project import FRProject
+
+from benchmarks.generator import GeneratorConfig, generate_project_data
+
+
+
+def test_FRProject_get_asset_manifest(fr_project):
+    manifest = fr_project.get_asset_manifest()
+    assert [(entry.target_name, entry.kind, entry.data_format) for entry in manifest] == [
+        ("Stage", "costume", "svg"), ("Sprite1", "costume", "svg"), ("Sprite1", "sound", "wav"),
+    ]
+    assert (manifest[0].width, manifest[0].height) == (2, 2)
+    assert manifest[1].width == 51.51133346557617
+    sound = manifest[2]
+    assert sound.file_size == len(fr_project.asset_files[sound.md5ext])
+    # the same as decoding the sound
+    audio_segment = AudioSegment.from_file(BytesIO(fr_project.asset_files[sound.md5ext]), format="wav")
+    assert (sound.rate, sound.sample_count) == (audio_segment.frame_rate, audio_segment.frame_count())
+    assert sound.duration == sound.sample_count / sound.rate
+    assert (sound.width, sound.height, manifest[1].duration) == (None, None, None)
+
+def test_FRProject_get_asset_manifest_generated():
+    project_data, asset_files = generate_project_data(GeneratorConfig(sprites=1, costumes_per_sprite=2))
+    project = FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api)
+    sprite = project.targets[1]
+    entries = [entry for entry in project.get_asset_manifest() if entry.target_name == sprite.name]
+    bitmap_entry = entries[1]
+    image = Image.open(BytesIO(asset_files[bitmap_entry.md5ext]))
+    assert (bitmap_entry.data_format, bitmap_entry.width, bitmap_entry.height) == ("png", *image.size)
+    assert bitmap_entry.bitmap_resolution == sprite.costumes[1].bitmap_resolution
+    assert (entries[2].rate, entries[2].sample_count) == (sprite.sounds[0].rate, sprite.sounds[0].sample_count)
+
+@mark.parametrize("image_format", ["PNG", "JPEG", "GIF", "BMP"])
+def test_read_image_size(image_format):
+    file_bytes = BytesIO()
+    Image.new("RGB", (37, 21)).save(file_bytes, image_format)
+    assert read_image_size(file_bytes.getvalue(), image_format.lower()) == (37, 21)
+    assert read_image_size(b"not an image", image_format.lower()) is None
+
+def test_read_image_size_svg():
+    assert read_image_size(b'<svg stroke-width="3" width="10px" height="4.5"/>', "svg") == (10, 4.5)
+    assert read_image_size(b'<?xml version="1.0"?><svg width="100%" viewBox="0 0 30 40"></svg>', "svg") == (30, 40)
+    assert read_image_size(b"<svg></svg>", "svg") is None
+
+@mark.skipif(which("ffmpeg") is None, reason="ffmpeg is required to encode mp3 files")
+def test_read_audio_info_mp3():
+    audio_segment = AudioSegment.silent(duration=1234, frame_rate=22050)
+    file_bytes = BytesIO()
+    audio_segment.export(file_bytes, format="mp3")
+    decoded = AudioSegment.from_file(BytesIO(file_bytes.getvalue()), format="mp3")
+    assert read_audio_info(file_bytes.getvalue(), "mp3") == (22050, decoded.frame_count())
+
@@ -0,0 +1,121 @@
+from copy   import deepcopy
+from pytest import fixture
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import ValidationConfig
+
+from pypenguin.core.merge      import SRMergeConflict, merge_projects
+from pypenguin.core.target     import SRSprite
+from pypenguin.core.vars_lists import SRVariable
+
+
+@fixture
+def base(project):
+    return project
+
+
+
+def test_merge_projects_unchanged(base):
+    ours = deepcopy(base)
+    result = merge_projects(base, ours, deepcopy(base))
+    assert not result.has_conflicts
+    assert result.project == base
+    result = merge_projects(base, ours, base)
+    assert result.project.sprites[0] is ours.sprites[0] # unchanged objects are shared
+
+def test_merge_projects_independent_changes(base):
+    ours = deepcopy(base)
+    theirs = deepcopy(base)
+    ours.tempo = 100
+    ours.sprites[0].volume = 10
+    ours.sprites[0].scripts[0].blocks[0].inputs["MESSAGE"].dropdown.value = "ours"
+    theirs.sprites[0].position = (5, 5)
+    theirs.sprites[0].scripts[1].position = (1, 2)
+    del theirs.sprites[0].scripts[4]
+    theirs.all_sprite_variables.append(SRVariable(name="theirs", current_value=0))
+    theirs.sprites.append(SRSprite.create_empty("Sprite2"))
+    theirs.sprite_layer_stack.append(theirs.sprites[1].uuid)
+
+    result = merge_projects(base, ours, theirs)
+    assert result.conflicts == []
+    merged = result.project
+    expected = deepcopy(ours)
+    expected.sprites[0].position = (5, 5)
+    expected.sprites[0].scripts[1].position = (1, 2)
+    del expected.sprites[0].scripts[4]
+    expected.all_sprite_variables.append(SRVariable(name="theirs", current_value=0))
+    expected.sprites.append(theirs.sprites[1])
+    expected.sprite_layer_stack.append(theirs.sprites[1].uuid)
+    assert merged == expected
+    assert merged.sprites[0].uuid == ours.sprites[0].uuid
+    assert merged.sprite_layer_stack == [sprite.uuid for sprite in merged.sprites]
+    merged.validate(ValidationConfig(), info_api)
+
+def test_merge_projects_added_on_both_sides(base):
+    ours = deepcopy(base)
+    theirs = deepcopy(base)
+    for project in (ours, theirs):
+        project.sprites[0].scripts.append(deepcopy(base.sprites[0].scripts[0]))
+        project.sprites[0].scripts[-1].position = (-100, -100)
+        project.global_monitors.clear()
+    result = merge_projects(base, ours, theirs)
+    assert not result.has_conflicts
+    assert result.project == ours
+
+def test_merge_projects_conflicts(base):
+    ours = deepcopy(base)
+    theirs = deepcopy(base)
+    ours.tempo = 100
+    theirs.tempo = 120
+    ours.sprites[0].scripts[0].blocks[0].inputs["MESSAGE"].dropdown.value = "ours"
+    theirs.sprites[0].scripts[0].blocks[0].inputs["MESSAGE"].dropdown.value = "theirs"
+    ours.sprites[0].scripts[1].position = (1, 1)
+    del theirs.sprites[0].scripts[1]
+    ours.all_sprite_variables[0].current_value = 1
+    theirs.all_sprite_variables[0].current_value = 2
+
+    result = merge_projects(base, ours, theirs)
+    assert [(conflict.path, conflict.message) for conflict in result.conflicts] == [
+        (["tempo"], "modified differently on both sides"),
+        (["sprites", 0, "scripts", 0], "modified differently on both sides"),
+        (["sprites", 0, "scripts", 1], "modified by ours, deleted by theirs"),
+        (["all_sprite_variables", 0], "modified differently on both sides"),
+    ]
+    assert result.conflicts[0].theirs == 120
+    assert result.project == ours # conflicts are resolved in favor of ours
+
+def test_merge_projects_sprite_conflicts(base):
+    ours = deepcopy(base)
+    theirs = deepcopy(base)
+    del ours.sprites[0]
+    ours.sprite_layer_stack.clear()
+    theirs.sprites[0].volume = 0
+    result = merge_projects(base, ours, theirs)
+    assert [(conflict.path, conflict.message) for conflict in result.conflicts] == [
+        (["sprites", 0], "deleted by ours, modified by theirs"),
+    ]
+    assert result.project.sprites == []
+    assert result.project.sprite_layer_stack == []
+
+def test_merge_projects_unloaded_sprites(partially_loaded_project):
+    base = partially_loaded_project
+    ours = deepcopy(base)
+    theirs = deepcopy(base)
+    ours.tempo = 100
+    theirs.unloaded_targets.sprites[0].volume = 0
+    result = merge_projects(base, ours, theirs)
+    assert not result.has_conflicts
+    assert result.project.tempo == 100
+    assert result.project.unloaded_targets.sprites == theirs.unloaded_targets.sprites
+    assert result.project.unloaded_targets.asset_files == base.unloaded_targets.asset_files
+
+    theirs.unloaded_targets = None # e.g. deleted by theirs
+    assert merge_projects(base, base, theirs).project.unloaded_targets is None
+
+def test_SRMergeConflict_to_string():
+    conflict = SRMergeConflict(
+        path=["sprites", 0, "scripts", 1], message="modified differently on both sides",
+        base=None, ours=None, theirs=None,
+    )
+    assert conflict.to_string() == ".sprites[0].scripts[1]: modified differently on both sides"
+
@@ -0,0 +1,44 @@
+from dataclasses import replace
+
+from pypenguin.opcode_info.data import info_api
+
+from pypenguin.core.metrics   import compute_target_metrics, compute_project_metrics
+from pypenguin.core.project   import FRProject
+from pypenguin.core.traversal import walk_sr_blocks
+
+from benchmarks.generator import GeneratorConfig, generate_project_data
+
+
+
+def test_compute_target_metrics(fr_project):
+    sprite = fr_project.targets[1]
+    metrics = compute_target_metrics(sprite.blocks, sprite.name)
+    assert metrics.name == "Sprite1"
+    assert [script.block_count for script in metrics.scripts] == [2, 3, 1, 3, 1, 1, 2]
+    assert metrics.block_count == 13 # the same as in second representation
+    assert metrics.category_counts == {"event": 1, "motion": 1, "operator": 4, "data": 4, "procedures": 2, "control": 1}
+    if_script = metrics.scripts[-1]
+    assert (if_script.max_nesting_depth, if_script.complexity, if_script.loop_count) == (1, 2, 0)
+    assert metrics.scripts[2].custom_block is not None
+    assert metrics.recursive_custom_blocks == []
+
+def test_compute_target_metrics_recursion(fr_project):
+    sprite = fr_project.targets[1]
+    blocks = dict(sprite.blocks)
+    blocks["i"] = replace(blocks["i"], next="x") # the definition calls itself
+    blocks["x"] = replace(blocks["c"], parent="i", top_level=False, inputs={})
+    metrics = compute_target_metrics(blocks)
+    definition = metrics.scripts[2]
+    assert definition.is_recursive and (definition.block_count == 2)
+    assert metrics.recursive_custom_blocks == [definition.custom_block]
+
+def test_compute_project_metrics():
+    project_data, asset_files = generate_project_data(GeneratorConfig(sprites=2, scripts_per_sprite=10))
+    fr_project = FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api)
+    metrics = compute_project_metrics(fr_project)
+    sr_project = fr_project.to_second(info_api)
+    assert metrics.block_count == sum(1 for _ in walk_sr_blocks(sr_project, with_paths=False))
+    assert len(metrics.targets) == 3
+    assert metrics.complexity >= sum(len(target.scripts) for target in sr_project.sprites)
+    assert metrics.max_nesting_depth == max(target.max_nesting_depth for target in metrics.targets)
+
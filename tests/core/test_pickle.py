@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy               import deepcopy
+from pickle             import dumps, loads, HIGHEST_PROTOCOL
+
+from PIL import Image
+
+from pypenguin.core.asset   import SRVectorCostume, SRBitmapCostume
+from pypenguin.core.project import SRProject
+
+from tests.core.constants import ALL_SR_SCRIPTS, FR_PROJECT, SR_PROJECT
+
+
+
+def _count_scripts(project: SRProject) -> int:
+    return sum(len(sprite.scripts) for sprite in [project.stage] + project.sprites)
+
+def _make_bitmap_costume(mode: str) -> SRBitmapCostume:
+    image = Image.new(mode, (96, 64))
+    for x in range(96):
+        image.putpixel((x, x % 64), (x * 2, 0, 255 - x, 255)[:len(mode)] if len(mode) > 1 else x)
+    return SRBitmapCostume(
+        name                  = "bitmap",
+        file_extension        = "png",
+        rotation_center       = (48, 32),
+        has_double_resolution = True,
+        content               = image,
+    )
+
+
+
+def test_pickle_sr_project(project):
+    unpickled = loads(dumps(project, protocol=HIGHEST_PROTOCOL))
+    assert unpickled == project
+    assert [sprite.uuid for sprite in unpickled.sprites] == [sprite.uuid for sprite in project.sprites]
+    assert deepcopy(project) == project
+
+def test_pickle_constants():
+    assert loads(dumps(SR_PROJECT)) == SR_PROJECT
+    assert loads(dumps(FR_PROJECT)) == FR_PROJECT
+    assert loads(dumps(ALL_SR_SCRIPTS)) == ALL_SR_SCRIPTS
+
+def test_pickle_SRVectorCostume():
+    costume = SRVectorCostume.create_empty()
+    unpickled = loads(dumps(costume))
+    assert unpickled == costume
+    assert unpickled.content is not costume.content
+    copied = deepcopy(costume)
+    assert copied == costume
+    assert copied.content is not costume.content
+
+def test_pickle_SRBitmapCostume():
+    for mode in ("RGBA", "RGB", "L", "CMYK"): # png does not support CMYK
+        costume = _make_bitmap_costume(mode)
+        unpickled = loads(dumps(costume))
+        assert unpickled == costume
+        assert unpickled.content.mode == mode
+        assert deepcopy(costume) == costume
+
+def test_pickle_SRBitmapCostume_32_bit():
+    costume = _make_bitmap_costume("I")
+    costume.content.putpixel((0, 0), 2**31 - 1)
+    costume.content.putpixel((1, 0), -2**31)
+    unpickled = loads(dumps(costume))
+    assert unpickled.content.mode == "I"
+    assert unpickled.content.tobytes() == costume.content.tobytes()
+
+def test_pickle_SRBitmapCostume_size():
+    costume = _make_bitmap_costume("RGBA")
+    assert len(dumps(costume)) < len(dumps(costume.content)) // 4 # instead of raw pixel data
+
+def test_pickle_worker_pool(project):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        script_counts = list(executor.map(_count_scripts, [project, project]))
+    assert script_counts == [_count_scripts(project)] * 2
@@ -5,7 +5,7 @@ from uuid   import uuid4
 from pypenguin.utility            import (
     ValidationConfig, 
     ThanksError, TypeValidationError, RangeValidationError, 
-    SameValueTwiceError, SpriteLayerStackError,
+    SameValueTwiceError, SpriteLayerStackError, ConversionError,
 )
 from pypenguin.opcode_info.data import info_api
 
@@ -87,6 +87,22 @@ def test_FRProject_to_second_extensions():
         SRCustomExtension(id="skyhigh173object", url="https://extensions.penguinmod.com/extensions/skyhigh173/object.js"),
     ]
 
+def test_FRProject_to_second_sprite_names(config):
+    assert FR_PROJECT.to_second(info_api, sprite_names=["Sprite1"]) == SR_PROJECT
+    srproject = FR_PROJECT.to_second(info_api, sprite_names=[])
+    assert srproject.stage == SR_PROJECT.stage
+    assert (srproject.sprites == []) and (srproject.sprite_layer_stack == [])
+    assert srproject.unloaded_targets.sprites == FR_PROJECT.targets[1:]
+    assert set(srproject.unloaded_targets.asset_files) == {
+        asset.md5ext for asset in FR_PROJECT.targets[1].costumes + FR_PROJECT.targets[1].sounds
+    }
+    srproject.validate(config, info_api)
+    assert SRProject.from_bytes(srproject.to_bytes(info_api), info_api) == srproject
+
+def test_FRProject_to_second_sprite_names_missing():
+    with raises(ConversionError):
+        FR_PROJECT.to_second(info_api, sprite_names=["a non existing sprite"])
+
 
 
 
@@ -0,0 +1,56 @@
+from dataclasses import replace
+from json        import loads
+from pytest      import fixture
+
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import read_file_of_zip
+
+from pypenguin.core.manifest import build_asset_manifest
+from pypenguin.core.metrics  import compute_project_metrics
+from pypenguin.core.project  import FRProject
+from pypenguin.core.scan     import ProjectScan
+
+from tests.core.constants import PROJECT_PATH
+
+from benchmarks.generator import GeneratorConfig, generate_project_data
+
+
+@fixture
+def scan():
+    return ProjectScan.from_file(PROJECT_PATH)
+
+
+
+def test_ProjectScan_from_file(scan):
+    assert [target.name for target in scan.targets] == ["Stage", "Sprite1"]
+    assert scan.targets[0].is_stage
+    assert scan.block_count == 13
+    assert scan.opcode_counts["data_variable"] == 2 # one top level and one inline reporter
+    assert scan.opcode_counts["procedures_call"] == 1
+    assert "motion_glideto_menu" not in scan.opcode_counts # shadow
+    assert scan.extensions == []
+    assert scan.variable_names == ["my variable"]
+    assert scan.list_names == ["my list"]
+    assert scan.targets[0].broadcast_names == ["my message"]
+
+def test_ProjectScan_assets(scan):
+    assert [(asset.target_name, asset.kind, asset.data_format) for asset in scan.assets] == [
+        ("Stage", "costume", "svg"), ("Sprite1", "costume", "svg"), ("Sprite1", "sound", "wav"),
+    ]
+    assert scan.assets[2].md5ext == "e140d7ff07de8fa35c3d1595bba835ac.wav"
+    assert scan.assets[2].file_size == 16460
+
+    project_data = loads(read_file_of_zip(PROJECT_PATH, "project.json").decode("utf-8"))
+    assert ProjectScan.from_data(project_data).assets[2].file_size is None
+
+def test_ProjectScan_assets_match_manifest(scan, fr_project):
+    header_fields = {"width": None, "height": None, "rate": None, "sample_count": None}
+    assert scan.assets == [replace(entry, **header_fields) for entry in build_asset_manifest(fr_project)]
+
+def test_ProjectScan_from_data():
+    project_data, asset_files = generate_project_data(GeneratorConfig(sprites=2, scripts_per_sprite=10))
+    scan = ProjectScan.from_data(project_data)
+    fr_project = FRProject.from_data(project_data, asset_files=asset_files, info_api=info_api)
+    assert scan.block_count == compute_project_metrics(fr_project).block_count
+    assert len(scan.assets) == sum(len(target.costumes) + len(target.sounds) for target in fr_project.targets)
+
@@ -0,0 +1,75 @@
+from copy   import deepcopy
+from pytest import raises
+
+from pypenguin.core.block     import SRScript, SRBlock
+from pypenguin.core.traversal import walk_sr_blocks, walk_ir_blocks
+
+from tests.core.constants import ALL_IR_BLOCKS, ALL_SR_SCRIPTS
+
+
+def _opcodes(items) -> list[str]:
+    return [block.opcode for _, block in items]
+
+
+
+def test_walk_sr_blocks():
+    items = list(walk_sr_blocks(ALL_SR_SCRIPTS[1]))
+    assert _opcodes(items) == ["pick random (OPERAND1) to (OPERAND2)", "value of [VARIABLE]", "join (STRING1) (STRING2)"]
+    assert [path for path, _ in items] == [
+        ["blocks", 0],
+        ["blocks", 0, "inputs", ("OPERAND1",), "block"],
+        ["blocks", 0, "inputs", ("OPERAND2",), "block"],
+    ]
+
+    items = list(walk_sr_blocks(ALL_SR_SCRIPTS, ["scripts"]))
+    assert len(items) == 18
+    assert items[-1] == (["scripts", 8, "blocks", 0], ALL_SR_SCRIPTS[8].blocks[0])
+    assert (
+        ["scripts", 6, "blocks", 0, "inputs", ("THEN",), "blocks", 1],
+        ALL_SR_SCRIPTS[6].blocks[0].inputs["THEN"].blocks[1],
+    ) in items
+    assert [block for _, block in walk_sr_blocks(ALL_SR_SCRIPTS, with_paths=False)] == [block for _, block in items]
+    assert all(path is None for path, _ in walk_sr_blocks(ALL_SR_SCRIPTS, with_paths=False))
+
+def test_walk_sr_blocks_post_order():
+    assert _opcodes(walk_sr_blocks(ALL_SR_SCRIPTS[6], post_order=True)) == [
+        "change [VARIABLE] by (VALUE)", "show variable [VARIABLE]", "if <CONDITION> then {THEN}",
+    ]
+
+def test_walk_sr_blocks_prune():
+    def prune(path: list, block: SRBlock) -> bool:
+        return block.opcode == "if <CONDITION> then {THEN}"
+    opcodes = _opcodes(walk_sr_blocks(ALL_SR_SCRIPTS, prune=prune))
+    assert "if <CONDITION> then {THEN}" in opcodes
+    assert "show variable [VARIABLE]" not in opcodes
+
+def test_walk_sr_blocks_early_stop():
+    walk = walk_sr_blocks(ALL_SR_SCRIPTS)
+    assert next(walk)[1] is ALL_SR_SCRIPTS[0].blocks[0]
+    assert next(walk)[1] is ALL_SR_SCRIPTS[0].blocks[1]
+
+def test_walk_sr_blocks_invalid():
+    scripts = deepcopy(ALL_SR_SCRIPTS[6:7])
+    scripts[0].blocks[0].inputs["THEN"].blocks.append(5) # e.g. before validation
+    scripts.append("not a script")
+    assert len(list(walk_sr_blocks(scripts))) == 3
+    assert list(walk_sr_blocks(SRScript(position=(0, 0), blocks=None))) == []
+    with raises(TypeError):
+        list(walk_sr_blocks(5))
+
+def test_walk_ir_blocks():
+    items = list(walk_ir_blocks(ALL_IR_BLOCKS, ["d", "f", "n"]))
+    assert [path for path, _ in items] == [
+        [("d",)], [("b",)], [("e",)], [("t",)], [("u",)], [("v",)],
+        [("f",)], [("f",), "inputs", ("FROM",), "immediate_block"], [("g",)],
+        [("n",)], [("o",)], [("q",)],
+    ]
+    assert len(list(walk_ir_blocks(ALL_IR_BLOCKS))) == len(ALL_IR_BLOCKS) + 1 # + the immediate block
+
+def test_walk_ir_blocks_post_order_prune():
+    items = list(walk_ir_blocks(ALL_IR_BLOCKS, ["n"], post_order=True))
+    assert [path for path, _ in items] == [[("o",)], [("q",)], [("n",)]] # q is the next block of o
+
+    items = list(walk_ir_blocks(ALL_IR_BLOCKS, ["d"], prune=lambda path, block: block.opcode == "motion_glideto"))
+    assert [path for path, _ in items] == [[("d",)], [("b",)], [("t",)]]
+
@@ -0,0 +1,80 @@
+from pypenguin.opcode_info.api  import DropdownValueKind
+from pypenguin.opcode_info.data import info_api
+from pypenguin.utility          import ValidationConfig
+
+from pypenguin.core.dropdown   import SRDropdownValue
+from pypenguin.core.enums      import SRVariableMonitorReadoutMode
+from pypenguin.core.monitor    import SRVariableMonitor
+from pypenguin.core.usage      import SRCrossReference, prune_unused_data
+from pypenguin.core.vars_lists import SRVariable, SRList
+
+
+
+def _variable_monitor(name: str, is_visible: bool = True) -> SRVariableMonitor:
+    return SRVariableMonitor(
+        opcode="value of [VARIABLE]",
+        dropdowns={"VARIABLE": SRDropdownValue(kind=DropdownValueKind.VARIABLE, value=name)},
+        position=(0, 0),
+        is_visible=is_visible,
+        readout_mode=SRVariableMonitorReadoutMode.NORMAL,
+        slider_min=0,
+        slider_max=100,
+        allow_only_integers=True,
+    )
+
+
+
+def test_SRCrossReference_from_project(project):
+    cross_reference = SRCrossReference.from_project(project)
+    variable = cross_reference.get_usage(DropdownValueKind.VARIABLE, "my variable")
+    assert (variable.block_references, variable.monitor_references) == (3, 0)
+    my_list = cross_reference.get_usage(DropdownValueKind.LIST, "my list")
+    assert (my_list.block_references, my_list.monitor_references, my_list.visible_monitor_references) == (1, 1, 1)
+    assert cross_reference.get_usage(DropdownValueKind.BROADCAST_MSG, "my message").block_references == 1
+    assert cross_reference.get_usage(DropdownValueKind.VARIABLE, "undeclared") is None
+    assert cross_reference.get_unused() == []
+
+def test_SRCrossReference_sprite_scope(project):
+    sprite = project.sprites[0]
+    sprite.sprite_only_variables.append(SRVariable(name="my variable", current_value=0)) # shadows the global one
+    sprite.local_monitors.append(_variable_monitor("my variable"))
+    cross_reference = SRCrossReference.from_project(project)
+    local = cross_reference.get_usage(DropdownValueKind.VARIABLE, "my variable", sprite.name)
+    assert (local.block_references, local.monitor_references) == (3, 1)
+    assert [usage.name for usage in cross_reference.get_unused()] == ["my variable"] # the global one
+    assert cross_reference.get_unused()[0].sprite_name is None
+
+def test_prune_unused_data(project):
+    sprite = project.sprites[0]
+    project.all_sprite_variables.append(SRVariable(name="unused", current_value=0))
+    project.all_sprite_lists.append(SRList(name="unused list", current_value=[]))
+    project.global_monitors.append(_variable_monitor("unused"))
+    sprite.sprite_only_variables.append(SRVariable(name="hidden", current_value=0))
+    sprite.local_monitors.append(_variable_monitor("hidden", is_visible=False))
+
+    removed = prune_unused_data(project, keep_visible_monitors=True)
+    assert {(usage.kind, usage.name) for usage in removed} == {
+        (DropdownValueKind.LIST, "unused list"), (DropdownValueKind.VARIABLE, "hidden"),
+    }
+    assert [variable.name for variable in project.all_sprite_variables] == ["my variable", "unused"]
+    assert sprite.sprite_only_variables == []
+    assert sprite.local_monitors == []
+
+    removed = prune_unused_data(project)
+    assert [usage.name for usage in removed] == ["unused"]
+    assert [variable.name for variable in project.all_sprite_variables] == ["my variable"]
+    assert [list_.name for list_ in project.all_sprite_lists] == ["my list"]
+    assert len(project.global_monitors) == 1
+    assert prune_unused_data(project) == []
+    project.validate(ValidationConfig(), info_api)
+
+def test_prune_unused_data_unloaded_sprites(partially_loaded_project):
+    project = partially_loaded_project
+    cross_reference = SRCrossReference.from_project(project)
+    assert cross_reference.get_usage(DropdownValueKind.VARIABLE, "my variable").block_references == 3
+    assert cross_reference.get_usage(DropdownValueKind.LIST, "my list").block_references == 1
+    assert cross_reference.get_usage(DropdownValueKind.BROADCAST_MSG, "my message").block_references == 1
+    assert prune_unused_data(project) == []
+    assert [variable.name for variable in project.all_sprite_variables] == ["my variable"]
+    assert [list_.name for list_ in project.all_sprite_lists] == ["my list"]
+
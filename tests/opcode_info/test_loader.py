@@ -0,0 +1,56 @@
+from os   import listdir, path as os_path
+from sys  import implementation
+
+from pypenguin.opcode_info.api         import OpcodeInfoSnapshot
+from pypenguin.opcode_info.data        import loader
+from pypenguin.opcode_info.data.loader import build_info_api, load_info_api, get_snapshot_path
+
+from tests.utility import run_python
+
+
+
+def test_import_opcode_info_data_uses_snapshot():
+    code = "from pypenguin.opcode_info.data import info_api\n"
+    run_python(code) # writes the snapshot file if it doesn't exist yet
+    run_python(code + (
+        "import sys\n"
+        "assert 'pypenguin.opcode_info.data.loader' in sys.modules\n"
+        "assert 'pypenguin.opcode_info.data.main' not in sys.modules\n"
+    ))
+
+def test_snapshot_special_cases_dont_build_api(tmp_path):
+    snapshot_path = str(tmp_path / "opcode_info.snapshot")
+    OpcodeInfoSnapshot.from_api(build_info_api()).to_file(snapshot_path)
+    run_python(
+        "import sys\n"
+        "from pypenguin.opcode_info.api import OpcodeInfoSnapshot\n"
+        f"api = OpcodeInfoSnapshot.from_file({snapshot_path!r}).to_api()\n"
+        "for opcode_info in api.opcode_info.values():\n"
+        "    for special_case in opcode_info.special_cases.values():\n"
+        "        special_case.function.resolve()\n"
+        "assert 'pypenguin.opcode_info.data.special_cases' in sys.modules\n"
+        "assert 'pypenguin.opcode_info.data.main' not in sys.modules\n"
+    )
+
+def test_load_info_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "SNAPSHOT_DIRECTORY", str(tmp_path))
+    built_api = build_info_api()
+    assert load_info_api(use_snapshot=False) is built_api
+    assert load_info_api() is built_api # no snapshot yet
+    assert listdir(tmp_path) == [os_path.basename(get_snapshot_path())]
+
+    loaded_api = load_info_api()
+    assert loaded_api is not built_api
+    assert loaded_api.all_old == built_api.all_old
+    assert OpcodeInfoSnapshot.from_api(loaded_api) == OpcodeInfoSnapshot.from_api(built_api)
+
+def test_load_info_api_invalid_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "SNAPSHOT_DIRECTORY", str(tmp_path))
+    stale_path = tmp_path / f"{loader.SNAPSHOT_FILE_PREFIX}{implementation.cache_tag}.0000000000000000{loader.SNAPSHOT_FILE_SUFFIX}"
+    stale_path.write_bytes(b"snapshot of older source code")
+    with open(get_snapshot_path(), "wb") as file:
+        file.write(b"not a snapshot")
+    assert load_info_api() is build_info_api()
+    assert listdir(tmp_path) == [os_path.basename(get_snapshot_path())]
+    assert OpcodeInfoSnapshot.from_file(get_snapshot_path()) == OpcodeInfoSnapshot.from_api(build_info_api())
+
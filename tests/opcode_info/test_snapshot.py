@@ -0,0 +1,81 @@
+from pytest import raises
+
+from pypenguin.opcode_info.api                import OpcodeInfoSnapshot, ObjectReference, SpecialCaseType, OpcodeInfo, OpcodeType, OpcodeInfoGroup
+from pypenguin.opcode_info.data.loader        import build_info_api
+from pypenguin.opcode_info.data.special_cases import get_stop_script_opcode_type
+from pypenguin.utility                        import OpcodeInfoError, DeserializationError, SameOpcodeTwiceError, DualKeyDict
+
+from pypenguin.core.block_mutation import FRStopScriptMutation
+from pypenguin.important_consts    import OPCODE_STOP_SCRIPT
+
+
+def _without_special_cases(opcode_info):
+    return (opcode_info.opcode_type, opcode_info.inputs, opcode_info.dropdowns, opcode_info.can_have_monitor, 
+        opcode_info.has_shadow, opcode_info.old_mutation_cls, opcode_info.new_mutation_cls)
+
+info_api = build_info_api()
+
+
+
+def test_OpcodeInfoSnapshot_from_api():
+    snapshot = OpcodeInfoSnapshot.from_api(info_api)
+    assert isinstance(snapshot, OpcodeInfoSnapshot)
+    assert set(snapshot.tables.keys()) == set(info_api.all_old)
+    with raises(TypeError):
+        snapshot.tables["new"] = ...
+
+def test_OpcodeInfoSnapshot_to_api():
+    snapshot = OpcodeInfoSnapshot.from_api(info_api)
+    api = snapshot.to_api()
+    assert api.all_old == info_api.all_old
+    assert api.all_new == info_api.all_new
+    for old_opcode in info_api.all_old:
+        opcode_info  = info_api.get_info_by_old(old_opcode)
+        loaded_info  = api.get_info_by_old(old_opcode)
+        assert _without_special_cases(loaded_info) == _without_special_cases(opcode_info)
+        assert set(loaded_info.special_cases.keys()) == set(opcode_info.special_cases.keys())
+        assert api.get_new_by_old(old_opcode) == info_api.get_new_by_old(old_opcode)
+    assert OpcodeInfoSnapshot.from_api(api) == snapshot
+
+def test_OpcodeInfoSnapshot_to_api_lazy():
+    api = OpcodeInfoSnapshot.from_api(info_api).to_api()
+    assert len(api.opcode_info._values) == 0
+    opcode_info = api.get_info_by_old(OPCODE_STOP_SCRIPT)
+    assert len(api.opcode_info._values) == 1
+    assert opcode_info.old_mutation_cls is FRStopScriptMutation
+    special_case = opcode_info.get_special_case(SpecialCaseType.GET_OPCODE_TYPE)
+    assert isinstance(special_case.function, ObjectReference)
+    assert special_case.function.resolve() is get_stop_script_opcode_type
+
+def test_OpcodeInfoSnapshot_to_api_add_opcode():
+    snapshot = OpcodeInfoSnapshot.from_api(info_api)
+    api = snapshot.to_api()
+    opcode_info = OpcodeInfo(opcode_type=OpcodeType.STATEMENT)
+    api.add_group(OpcodeInfoGroup(name="Test", opcode_info=DualKeyDict({("test_opcode", "test opcode"): opcode_info})))
+    assert api.get_info_by_old("test_opcode") is opcode_info
+    assert api.get_new_by_old("test_opcode") == "test opcode"
+    assert len(api.opcode_info) == len(info_api.opcode_info) + 1
+    assert "test_opcode" not in snapshot.tables
+    with raises(SameOpcodeTwiceError):
+        api.add_group(OpcodeInfoGroup(name="Test", opcode_info=DualKeyDict({(OPCODE_STOP_SCRIPT, "new"): opcode_info})))
+
+def test_OpcodeInfoSnapshot_bytes():
+    snapshot = OpcodeInfoSnapshot.from_api(info_api)
+    assert OpcodeInfoSnapshot.from_bytes(snapshot.to_bytes()) == snapshot
+
+def test_OpcodeInfoSnapshot_file(tmp_path):
+    snapshot = OpcodeInfoSnapshot.from_api(info_api)
+    file_path = str(tmp_path / "opcode_info.snapshot")
+    snapshot.to_file(file_path)
+    assert OpcodeInfoSnapshot.from_file(file_path) == snapshot
+
+def test_OpcodeInfoSnapshot_from_bytes_invalid():
+    with raises(DeserializationError):
+        OpcodeInfoSnapshot.from_bytes(b"not a snapshot")
+
+
+def test_ObjectReference_from_object_invalid():
+    def local_function(): pass
+    with raises(OpcodeInfoError):
+        ObjectReference.from_object(local_function)
+
@@ -1,4 +1,7 @@
 from typing      import Any, Type, Callable, TypeVar
+from os          import environ, path as os_path
+from subprocess  import run, CompletedProcess
+from sys         import executable
 from types       import MethodType
 from copy        import copy
 from pytest      import raises
@@ -44,6 +47,35 @@ def execute_attr_validation_tests(
         with raises(error):
             validate_func(modified_obj, *func_args)
 
+REPO_ROOT = os_path.dirname(os_path.dirname(os_path.abspath(__file__)))
 
-__all__ = ["copymodify", "execute_attr_validation_tests"]
+def run_python(code: str, importtime: bool = False) -> CompletedProcess:
+    """
+    Run code in a fresh interpreter, which can import pypenguin and the tests
+
+    Args:
+        code: the python code to run
+        importtime: wether to run with `-X importtime`
+    """
+    env = environ | {"PYTHONPATH": REPO_ROOT}
+    args = [executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return run(args, cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True)
+
+def import_times(code: str) -> dict[str, int]:
+    """
+    Run code in a fresh interpreter with `-X importtime` and get the cumulative import time(us) of every imported module
+
+    Args:
+        code: the python code to run
+    """
+    times = {}
+    for line in run_python(code, importtime=True).stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+__all__ = ["copymodify", "execute_attr_validation_tests", "run_python", "import_times"]
 